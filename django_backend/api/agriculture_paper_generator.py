@@ -13,13 +13,16 @@ import random
 import time
 from collections import defaultdict
 from typing import List, Dict
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 
 class KCSEAgriculturePaperGenerator:
@@ -94,12 +97,7 @@ class KCSEAgriculturePaperGenerator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -222,6 +220,11 @@ class KCSEAgriculturePaperGenerator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper structure"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_a = hydrate_questions(self.selected_section_a)
+        self.selected_section_b = hydrate_questions(self.selected_section_b)
+        self.selected_section_c = hydrate_questions(self.selected_section_c)
+        
         # Combine all selected questions
         all_questions = self.selected_section_a + self.selected_section_b + self.selected_section_c
         
@@ -425,18 +428,12 @@ def validate_agriculture_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
-        
-        # Count questions by marks
-        section_a_count = sum(1 for q in all_questions if q.marks == 2)
-        section_b_count = sum(1 for q in all_questions if q.marks == 5)
-        section_c_count = sum(1 for q in all_questions if q.marks == 20)
+        # Count questions by marks (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        questions_by_marks = census.by_marks()
+        section_a_count = questions_by_marks.get(2, 0)
+        section_b_count = questions_by_marks.get(5, 0)
+        section_c_count = questions_by_marks.get(20, 0)
         
         # Check requirements
         can_generate = (
@@ -461,7 +458,7 @@ def validate_agriculture_paper_pool(request):
                 'section_a_2_marks': section_a_count,
                 'section_b_5_marks': section_b_count,
                 'section_c_20_marks': section_c_count,
-                'total_questions': len(all_questions),
+                'total_questions': sum(questions_by_marks.values()),
             },
             'required_counts': {
                 'section_a': 15,
@@ -485,6 +482,7 @@ def validate_agriculture_paper_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('agriculture')
 def generate_agriculture_paper(request):
     """Generate KCSE Agriculture Paper 1 or 2"""
     try:
@@ -521,13 +519,7 @@ def generate_agriculture_paper(request):
         result = generator.generate()
         
          # Generate unique code
-        current_year = datetime.now().year
-        paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        unique_code = f"AGR{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"AGR{paper_number}")
         
         # Create GeneratedPaper record
         generated_paper = GeneratedPaper.objects.create(
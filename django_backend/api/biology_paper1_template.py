@@ -3,7 +3,7 @@ Biology Paper 1 Exam Template
 Dedicated template for KCSE Biology Paper 1 with optimized styling and print layout
 """
 
-from .coverpage_templates import BiologyPaper1Coverpage
+from .coverpage_templates import BiologyPaper1Coverpage, coverpage_body, coverpage_stylesheet
 from .exam_paper_template import _process_question_text
 
 
@@ -25,8 +25,9 @@ def generate_biology_paper1_html(coverpage_data, questions, paper_data=None, cov
     if coverpage_class is None:
         coverpage_class = BiologyPaper1Coverpage
     
-    # Generate coverpage HTML
-    coverpage_content = coverpage_class.generate_html(coverpage_data)
+    # Coverpage markup; its stylesheet goes into the head once, after the paper's own
+    coverpage_content = coverpage_body(coverpage_class, coverpage_data)
+    coverpage_css = coverpage_stylesheet(coverpage_class, coverpage_data)
     
     # Process all questions in flowing order
     questions_html = ""
@@ -210,6 +211,7 @@ def generate_biology_paper1_html(coverpage_data, questions, paper_data=None, cov
             text-decoration: underline;
         }}
     </style>
+    <style>{coverpage_css}</style>
 </head>
 <body>
     <!-- Coverpage -->
@@ -11,13 +11,16 @@ import random
 import time
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus, in_section
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 class KCSEBiologyPaper2Generator:
     """
@@ -97,12 +100,7 @@ class KCSEBiologyPaper2Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -307,6 +305,10 @@ class KCSEBiologyPaper2Generator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with strictly ordered sections"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_a = hydrate_questions(self.selected_section_a)
+        self.selected_section_b = hydrate_questions(self.selected_section_b)
+        
         # Combine sections in strict order: Section A (1-5), then Section B (6-8)
         all_questions = self.selected_section_a + self.selected_section_b
         
@@ -341,15 +343,13 @@ class KCSEBiologyPaper2Generator:
                 'difficulty': question.difficulty,
             })
         
-        # Count graph vs essay in Section B
-        section_b_graph_count = sum(1 for q in self.selected_section_b 
-                                     if q in self.section_b_20mark_graph)
-        section_b_essay_count = sum(1 for q in self.selected_section_b 
-                                     if q in self.section_b_20mark_essay)
+        # Count graph vs essay in Section B (pools are split on is_graph)
+        section_b_graph_count = sum(1 for q in self.selected_section_b if q.is_graph)
+        section_b_essay_count = len(self.selected_section_b) - section_b_graph_count
         
         # Check if Question 6 is a graph
         has_graph_at_q6 = (len(self.selected_section_b) > 0 and 
-                          self.selected_section_b[0] in self.section_b_20mark_graph)
+                          self.selected_section_b[0].is_graph)
         
         # Calculate marks
         section_a_marks = sum(q.marks for q in self.selected_section_a)
@@ -472,30 +472,12 @@ def validate_paper2_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
-        
-        # Count questions by type
-        section_a_8mark_count = 0
-        section_b_20mark_graph_count = 0
-        section_b_20mark_essay_count = 0
-        
-        for q in all_questions:
-            section_name = q.section.name.upper() if q.section else ""
-            is_graph = getattr(q, 'is_graph', False)
-            
-            if ("SECTION A" in section_name or "SECTION 1" in section_name) and q.marks == 8:
-                section_a_8mark_count += 1
-            elif ("SECTION B" in section_name or "SECTION 2" in section_name) and q.marks == 20:
-                if is_graph:
-                    section_b_20mark_graph_count += 1
-                else:
-                    section_b_20mark_essay_count += 1
+        # Count questions by type (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        in_section_b = in_section("SECTION B", "SECTION 2")
+        section_a_8mark_count = census.count(where=in_section("SECTION A", "SECTION 1"), marks=8)
+        section_b_20mark_graph_count = census.count(where=lambda key: in_section_b(key) and key.is_graph, marks=20)
+        section_b_20mark_essay_count = census.count(where=lambda key: in_section_b(key) and not key.is_graph, marks=20)
         
         # Validate
         section_b_20mark_total = section_b_20mark_graph_count + section_b_20mark_essay_count
@@ -545,6 +527,7 @@ def validate_paper2_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('biology_paper2')
 def generate_biology_paper2(request):
     """Generate KCSE Biology Paper 2"""
     try:
@@ -575,15 +558,7 @@ def generate_biology_paper2(request):
         generator.load_data()
         result = generator.generate()
         # Create unique code
-        current_year = datetime.now().year
-        paper = generator.paper
-        
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        
-        unique_code = f"BIO{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"BIO{paper_number}")
         
         
         # Create GeneratedPaper record
@@ -28,6 +28,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from .models import Paper, Topic, Section, Question, GeneratedPaper
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus
+from .image_store import public_images
 
 
 class QuestionPoolValidator:
@@ -41,27 +44,23 @@ class QuestionPoolValidator:
         Returns:
             Dict with validation results and recommendations
         """
-        questions = Question.objects.filter(
-            paper_id=paper_id,
-            topic_id__in=selected_topic_ids,
-            is_active=True
-        )
+        census = PoolCensus.for_paper(paper_id, selected_topic_ids)
         
-        total = questions.count()
+        total = census.count()
         
         # Nested questions (single questions with is_nested=True, marks 2-8)
-        nested = questions.filter(is_nested=True, marks__gte=2, marks__lte=8).count()
+        nested = census.count(nested=True, min_marks=2, max_marks=8)
         
         # Non-nested questions (marks 1, 2, 3 only)
-        one_mark = questions.filter(is_nested=False, marks=1).count()
-        two_mark = questions.filter(is_nested=False, marks=2).count()
-        three_mark = questions.filter(is_nested=False, marks=3).count()
+        one_mark = census.count(nested=False, marks=1)
+        two_mark = census.count(nested=False, marks=2)
+        three_mark = census.count(nested=False, marks=3)
         
         # Per topic distribution
+        per_topic = census.by_topic()
         topic_dist = {}
         for topic_id in selected_topic_ids:
-            count = questions.filter(topic_id=topic_id).count()
-            topic_dist[str(topic_id)] = count
+            topic_dist[str(topic_id)] = per_topic.get(str(topic_id), 0)
         
         # Validation
         issues = []
@@ -201,11 +200,7 @@ class BiologyPaperGenerator:
             print(f"  {i}. {topic.name}")
         
         # Load all questions
-        questions = list(Question.objects.filter(
-            topic__in=self.topics,
-            paper=self.paper,
-            is_active=True
-        ).select_related('topic', 'section', 'subject'))
+        questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not questions:
             raise ValueError("No questions found for selected topics")
@@ -623,6 +618,9 @@ class BiologyPaperGenerator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build complete result dictionary with all paper data"""
         
+        # Fetch full rows (text, answers, images) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         # Calculate distributions
         mark_distribution = defaultdict(int)
         question_type_distribution = defaultdict(int)
@@ -657,8 +655,8 @@ class BiologyPaperGenerator:
                 } if question.section else None,
                 'question_type': question.kcse_question_type,
                 'difficulty': question.difficulty,
-                'question_inline_images': question.question_inline_images,
-                'answer_inline_images': question.answer_inline_images,
+                'question_inline_images': public_images(question.question_inline_images),
+                'answer_inline_images': public_images(question.answer_inline_images),
                 'question_image_positions': question.question_image_positions,
                 'answer_image_positions': question.answer_image_positions,
                 'question_answer_lines': question.question_answer_lines,
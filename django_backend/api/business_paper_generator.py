@@ -19,13 +19,16 @@ import random
 import time
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_pool import get_question_pool, hydrate_questions, hydrate_question_map
+from .pool_census import PoolCensus
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 
 class KCSEBusinessPaper1Generator:
@@ -86,12 +89,7 @@ class KCSEBusinessPaper1Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -245,6 +243,9 @@ class KCSEBusinessPaper1Generator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper structure"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         # Build questions data
         questions_data = []
         
@@ -392,12 +393,7 @@ class KCSEBusinessPaper2Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -549,6 +545,14 @@ class KCSEBusinessPaper2Generator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper structure"""
         
+        # Fetch full rows (text, answers) only for the selected parts
+        full = hydrate_question_map(
+            part for cq in self.selected_questions for part in (cq['part_a'], cq['part_b'])
+        )
+        for cq in self.selected_questions:
+            cq['part_a'] = full[cq['part_a'].id]
+            cq['part_b'] = full[cq['part_b'].id]
+        
         # Build questions data
         questions_data = []
         
@@ -714,19 +718,16 @@ def validate_business_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        # Count questions by marks (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        questions_by_marks = census.by_marks()
+        total_questions = sum(questions_by_marks.values())
         
         if paper_number == 1:
             # Count questions by marks
-            count_4_marks = sum(1 for q in all_questions if q.marks == 4)
-            count_3_marks = sum(1 for q in all_questions if q.marks == 3)
-            count_5_marks = sum(1 for q in all_questions if q.marks == 5)
+            count_4_marks = questions_by_marks.get(4, 0)
+            count_3_marks = questions_by_marks.get(3, 0)
+            count_5_marks = questions_by_marks.get(5, 0)
             
             # Need 25 questions totaling 100 marks
             # Ideal: 25 x 4-mark questions
@@ -751,7 +752,7 @@ def validate_business_paper_pool(request):
                     '4_mark_questions': count_4_marks,
                     '3_mark_questions': count_3_marks,
                     '5_mark_questions': count_5_marks,
-                    'total_questions': len(all_questions),
+                    'total_questions': total_questions,
                 },
                 'required_counts': {
                     'total_questions': 25,
@@ -768,8 +769,8 @@ def validate_business_paper_pool(request):
         
         else:  # Paper 2
             # Count questions by marks
-            count_12_marks = sum(1 for q in all_questions if q.marks == 12)
-            count_8_marks = sum(1 for q in all_questions if q.marks == 8)
+            count_12_marks = questions_by_marks.get(12, 0)
+            count_8_marks = questions_by_marks.get(8, 0)
             
             # Need 6 x 12-mark and 6 x 8-mark questions
             can_generate = count_12_marks >= 6 and count_8_marks >= 6
@@ -787,7 +788,7 @@ def validate_business_paper_pool(request):
                 'available_counts': {
                     '12_mark_questions': count_12_marks,
                     '8_mark_questions': count_8_marks,
-                    'total_questions': len(all_questions),
+                    'total_questions': total_questions,
                 },
                 'required_counts': {
                     '12_mark_questions': 6,
@@ -810,6 +811,7 @@ def validate_business_paper_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('business')
 def generate_business_paper(request):
     """Generate KCSE Business Studies Paper 1 or 2"""
     try:
@@ -858,13 +860,8 @@ def generate_business_paper(request):
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
         paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        unique_code = f"BUS{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"BUS{paper_number}")
         
         # Create GeneratedPaper record
         generated_paper = GeneratedPaper.objects.create(
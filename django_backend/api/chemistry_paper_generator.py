@@ -20,7 +20,9 @@ import time
 from collections import defaultdict
 from typing import List, Dict, Optional
 
-from .models import Paper, Topic, Question, Subject
+from .models import Paper, Topic, Subject
+from .mark_solver import SectionSpec, InfeasibleSelectionError, solve_section, solve_sections
+from .question_pool import get_question_pool, hydrate_questions
 
 
 class KCSEChemistryPaper1Generator:
@@ -109,12 +111,7 @@ class KCSEChemistryPaper1Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -140,7 +137,7 @@ class KCSEChemistryPaper1Generator:
         random.shuffle(self.standalone_3mark)
         random.shuffle(self.standalone_4mark)
         
-        print(f"\n[CHEMISTRY PAPER 1 DATA LOADED]")
+        print("\n[CHEMISTRY PAPER 1 DATA LOADED]")
         print(f"  Subject: {self.subject.name}")
         print(f"  Paper: {self.paper.name}")
         print(f"  Nested questions: {len(self.nested_questions)}")
@@ -153,287 +150,103 @@ class KCSEChemistryPaper1Generator:
         self.use_standalone_only = len(self.nested_questions) < 8
         if self.use_standalone_only:
             print(f"\n⚠️  WARNING: Not enough nested questions ({len(self.nested_questions)} < 8)")
-            print(f"  → Using STANDALONE-ONLY mode")
+            print("  → Using STANDALONE-ONLY mode")
     
-    def _select_nested_questions(self) -> bool:
+    def _paper_sections(self) -> List[SectionSpec]:
         """
-        Select nested questions to reach target ~62 marks (77.8% of paper)
-        Acceptable range: 58-66 marks
+        Declare the paper structure for the mark solver
         
-        Returns:
-            bool: True if successful
+        Normal mode:
+            - Nested: 58-66 marks (~62, 77.8% of paper)
+            - Standalone: up to 15 questions (1-4 marks) worth 14-22 marks
+        Standalone-only mode:
+            - Any mix of standalone questions reaching exactly 80 marks
         """
-        available = [q for q in self.nested_questions if q.id not in self.used_ids]
-        
-        if len(available) < 8:
-            return False
-        
-        random.shuffle(available)
-        
-        selected = []
-        total_marks = 0
-        target_marks = self.TARGET_NESTED_MARKS
-        
-        # Select questions aiming for ~62 marks
-        for question in available:
-            # Stop if we're in acceptable range and adding more would exceed max
-            if self.MIN_NESTED_MARKS <= total_marks <= self.MAX_NESTED_MARKS:
-                if (total_marks + question.marks) > self.MAX_NESTED_MARKS:
-                    break
-            
-            # Add question
-            selected.append(question)
-            total_marks += question.marks
-            
-            # Break if we hit a good target
-            if self.MIN_NESTED_MARKS <= total_marks <= self.MAX_NESTED_MARKS:
-                # If we're close to target, stop
-                if abs(total_marks - target_marks) <= 2:
-                    break
-        
-        # Validate: must be in acceptable range
-        if not (self.MIN_NESTED_MARKS <= total_marks <= self.MAX_NESTED_MARKS):
-            return False
-        
-        # Accept selection
-        self.selected_questions.extend(selected)
-        for q in selected:
-            self.used_ids.add(q.id)
-            self.selected_question_ids.append(str(q.id))
-        
-        self.nested_count = len(selected)
-        self.nested_marks = total_marks
-        self.total_marks = total_marks
+        all_standalone = (self.standalone_1mark + self.standalone_2mark +
+                          self.standalone_3mark + self.standalone_4mark)
         
-        print(f"\n[NESTED SELECTION]")
-        print(f"  Selected: {self.nested_count} questions")
-        print(f"  Total marks: {self.nested_marks} (target: ~62)")
-        
-        return True
+        if self.use_standalone_only:
+            return [SectionSpec('standalone', all_standalone, min_questions=1)]
+        
+        return [
+            SectionSpec(
+                'nested',
+                self.nested_questions,
+                min_questions=1,
+                min_marks=self.MIN_NESTED_MARKS,
+                max_marks=self.MAX_NESTED_MARKS
+            ),
+            SectionSpec(
+                'standalone',
+                all_standalone,
+                min_questions=1,
+                max_questions=15,
+                min_marks=self.MIN_STANDALONE_MARKS,
+                max_marks=self.MAX_STANDALONE_MARKS
+            ),
+        ]
     
-    def _select_standalone_questions(self) -> bool:
+    def _select_questions(self):
         """
-        Fill remaining marks with standalone questions to reach exactly 80 marks
-        Target: ~18 marks (22.2% of paper)
-        Priority: 3-mark > 2-mark > 4-mark > 1-mark
+        Select nested and standalone questions in one pass using the exact mark solver
         
-        Returns:
-            bool: True if exactly 80 marks achieved
-        """
-        remaining_marks = self.TOTAL_MARKS - self.total_marks
-        
-        print(f"\n[STANDALONE SELECTION]")
-        print(f"  Need: {remaining_marks} marks to reach 80")
-        
-        if remaining_marks <= 0:
-            return self.total_marks == self.TOTAL_MARKS
-        
-        # Validate range
-        if not (self.MIN_STANDALONE_MARKS <= remaining_marks <= self.MAX_STANDALONE_MARKS):
-            return False
-        
-        selected = []
-        current_marks = 0
-        max_questions = 15
-        
-        # Available pools
-        available_4mark = [q for q in self.standalone_4mark if q.id not in self.used_ids]
-        available_3mark = [q for q in self.standalone_3mark if q.id not in self.used_ids]
-        available_2mark = [q for q in self.standalone_2mark if q.id not in self.used_ids]
-        available_1mark = [q for q in self.standalone_1mark if q.id not in self.used_ids]
-        
-        random.shuffle(available_4mark)
-        random.shuffle(available_3mark)
-        random.shuffle(available_2mark)
-        random.shuffle(available_1mark)
-        
-        # Fill marks to exactly reach target
-        while current_marks < remaining_marks and len(selected) < max_questions:
-            marks_left = remaining_marks - current_marks
-            
-            # Exact matches
-            if marks_left == 1 and available_1mark:
-                q = available_1mark.pop(0)
-                selected.append(q)
-                current_marks += 1
-                break
-            elif marks_left == 2 and available_2mark:
-                q = available_2mark.pop(0)
-                selected.append(q)
-                current_marks += 2
-                break
-            elif marks_left == 3 and available_3mark:
-                q = available_3mark.pop(0)
-                selected.append(q)
-                current_marks += 3
-                break
-            elif marks_left == 4 and available_4mark:
-                q = available_4mark.pop(0)
-                selected.append(q)
-                current_marks += 4
-                break
-            
-            # For larger gaps, use priority: 3 > 2 > 4 > 1
-            if marks_left >= 3 and available_3mark and (marks_left % 2 == 1 or marks_left >= 9):
-                q = available_3mark.pop(0)
-                selected.append(q)
-                current_marks += 3
-            elif marks_left >= 2 and available_2mark:
-                q = available_2mark.pop(0)
-                selected.append(q)
-                current_marks += 2
-            elif marks_left >= 4 and available_4mark:
-                q = available_4mark.pop(0)
-                selected.append(q)
-                current_marks += 4
-            elif marks_left >= 3 and available_3mark:
-                q = available_3mark.pop(0)
-                selected.append(q)
-                current_marks += 3
-            elif marks_left >= 1 and available_1mark:
-                q = available_1mark.pop(0)
-                selected.append(q)
-                current_marks += 1
-            else:
-                return False
-        
-        # Verify exact target reached
-        if current_marks == remaining_marks:
-            self.selected_questions.extend(selected)
-            for q in selected:
-                self.used_ids.add(q.id)
-                self.selected_question_ids.append(str(q.id))
-            
-            self.standalone_count = len(selected)
-            self.standalone_marks = current_marks
-            self.total_marks = self.nested_marks + self.standalone_marks
-            
-            print(f"  Selected: {self.standalone_count} questions")
-            print(f"  Total standalone marks: {self.standalone_marks}")
-            
-            return True
-        
-        return False
-    
-    def _select_standalone_only(self) -> bool:
+        Raises:
+            InfeasibleSelectionError if the pools cannot reach exactly 80 marks
         """
-        Fallback: Use only standalone questions if insufficient nested questions
-        Similar to Biology's approach
+        selection = solve_sections(self._paper_sections(), total_marks=self.TOTAL_MARKS)
         
-        Returns:
-            bool: True if exactly 80 marks achieved
-        """
-        print(f"\n[STANDALONE-ONLY MODE]")
-        
-        # Collect all available standalone
-        all_standalone = []
-        all_standalone.extend(self.standalone_1mark)
-        all_standalone.extend(self.standalone_2mark)
-        all_standalone.extend(self.standalone_3mark)
-        all_standalone.extend(self.standalone_4mark)
-        
-        # Group by marks
-        by_marks = defaultdict(list)
-        for q in all_standalone:
-            by_marks[q.marks].append(q)
-        
-        for questions in by_marks.values():
-            random.shuffle(questions)
-        
-        pools = {mark: list(by_marks.get(mark, [])) for mark in [1, 2, 3, 4, 5, 6]}
-        
-        # Try to reach 80 using combinations
-        selected = []
-        current_marks = 0
-        target = 80
-        
-        # Priority: larger marks first
-        priority = [4, 3, 2, 1]
-        
-        while current_marks < target:
-            marks_left = target - current_marks
-            added = False
-            
-            for mark_value in priority:
-                if mark_value <= marks_left and pools.get(mark_value):
-                    q = pools[mark_value].pop(0)
-                    selected.append(q)
-                    current_marks += mark_value
-                    added = True
-                    break
-            
-            if not added:
-                return False
-        
-        if current_marks == target:
-            self.selected_questions = selected
-            for q in selected:
-                self.used_ids.add(q.id)
-                self.selected_question_ids.append(str(q.id))
-            
-            self.nested_count = 0
-            self.nested_marks = 0
-            self.standalone_count = len(selected)
-            self.standalone_marks = current_marks
-            self.total_marks = current_marks
-            
-            print(f"  Selected: {self.standalone_count} questions, {self.total_marks} marks")
-            return True
-        
-        return False
+        nested = selection.get('nested', [])
+        standalone = selection['standalone']
+        
+        self.selected_questions = nested + standalone
+        for q in self.selected_questions:
+            self.used_ids.add(q.id)
+            self.selected_question_ids.append(str(q.id))
+        
+        self.nested_count = len(nested)
+        self.nested_marks = sum(q.marks for q in nested)
+        self.standalone_count = len(standalone)
+        self.standalone_marks = sum(q.marks for q in standalone)
+        self.total_marks = self.nested_marks + self.standalone_marks
+        
+        print("\n[NESTED SELECTION]")
+        print(f"  Selected: {self.nested_count} questions")
+        print(f"  Total marks: {self.nested_marks} (target: ~62)")
+        print("\n[STANDALONE SELECTION]")
+        print(f"  Selected: {self.standalone_count} questions")
+        print(f"  Total standalone marks: {self.standalone_marks}")
     
     def generate(self) -> Dict:
         """Generate Chemistry Paper 1"""
-        max_attempts = 100
         start_time = time.time()
         
         print(f"\n{'='*70}")
-        print(f"KCSE CHEMISTRY PAPER 1 GENERATION")
+        print("KCSE CHEMISTRY PAPER 1 GENERATION")
         print(f"{'='*70}")
         
-        for attempt in range(1, max_attempts + 1):
-            self.attempts = attempt
-            
-            # Reset state
-            self.selected_questions = []
-            self.selected_question_ids = []
-            self.used_ids = set()
-            self.nested_count = 0
-            self.nested_marks = 0
-            self.standalone_count = 0
-            self.standalone_marks = 0
-            self.total_marks = 0
-            
-            if self.use_standalone_only:
-                if not self._select_standalone_only():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at standalone-only")
-                    continue
-            else:
-                # Phase 1: Nested (~62 marks)
-                if not self._select_nested_questions():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at nested selection")
-                    continue
-                
-                # Phase 2: Standalone (~18 marks)
-                if not self._select_standalone_questions():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at standalone selection")
-                    continue
-            
-            # Success!
-            generation_time = time.time() - start_time
-            print(f"\n{'='*70}")
-            print(f"SUCCESS! Generated in {attempt} attempts ({generation_time:.2f}s)")
-            print(f"{'='*70}")
-            
-            return self._build_result(generation_time)
-        
-        raise Exception(f"Failed to generate paper after {max_attempts} attempts")
+        # Reset state
+        self.attempts = 1
+        self.selected_questions = []
+        self.selected_question_ids = []
+        self.used_ids = set()
+        
+        try:
+            self._select_questions()
+        except InfeasibleSelectionError as e:
+            raise Exception(f"Failed to generate paper: {e}")
+        
+        generation_time = time.time() - start_time
+        print(f"\n{'='*70}")
+        print(f"SUCCESS! Generated in one pass ({generation_time:.2f}s)")
+        print(f"{'='*70}")
+        
+        return self._build_result(generation_time)
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper data"""
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         questions_data = []
         for idx, question in enumerate(self.selected_questions, start=1):
             questions_data.append({
@@ -486,10 +299,10 @@ class KCSEChemistryPaper1Generator:
 
 class KCSEChemistryPaper2Generator:
     """
-    KCSE Chemistry Paper 2 Generator - Sequential Selection Strategy
+    KCSE Chemistry Paper 2 Generator - Exact Mark Solver Strategy
     EXACTLY 7 questions, all nested, totaling EXACTLY 80 marks
     Each question: 10-14 marks (Updated range)
-    Strategy: Select questions one by one, calculating remaining marks needed
+    Strategy: Draw a uniformly random valid 7-question combination in one pass
     """
     
     TOTAL_MARKS = 80
@@ -558,15 +371,10 @@ class KCSEChemistryPaper2Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ONLY nested questions with marks between 10-14
-        self.nested_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_nested=True,
-            marks__gte=self.MIN_QUESTION_MARKS,
-            marks__lte=self.MAX_QUESTION_MARKS,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.nested_questions = [
+            q for q in get_question_pool(self.paper, [t.id for t in self.topics])
+            if q.is_nested and self.MIN_QUESTION_MARKS <= q.marks <= self.MAX_QUESTION_MARKS
+        ]
         
         if not self.nested_questions:
             raise ValueError(f"No nested questions ({self.MIN_QUESTION_MARKS}-{self.MAX_QUESTION_MARKS} marks) found for selected topics")
@@ -574,7 +382,7 @@ class KCSEChemistryPaper2Generator:
         # Shuffle for randomness
         random.shuffle(self.nested_questions)
         
-        print(f"\n[CHEMISTRY PAPER 2 DATA LOADED]")
+        print("\n[CHEMISTRY PAPER 2 DATA LOADED]")
         print(f"  Subject: {self.subject.name}")
         print(f"  Paper: {self.paper.name}")
         print(f"  Nested questions ({self.MIN_QUESTION_MARKS}-{self.MAX_QUESTION_MARKS} marks): {len(self.nested_questions)}")
@@ -584,7 +392,7 @@ class KCSEChemistryPaper2Generator:
         for q in self.nested_questions:
             marks_dist[q.marks] += 1
         
-        print(f"  Distribution:")
+        print("  Distribution:")
         for marks in sorted(marks_dist.keys()):
             print(f"    {marks}-mark: {marks_dist[marks]} questions")
         
@@ -592,159 +400,75 @@ class KCSEChemistryPaper2Generator:
         if len(self.nested_questions) < self.TARGET_QUESTIONS:
             raise ValueError(f"Need at least {self.TARGET_QUESTIONS} nested questions ({self.MIN_QUESTION_MARKS}-{self.MAX_QUESTION_MARKS} marks)")
     
-    def _select_questions_sequentially(self) -> bool:
+    def _select_questions(self):
         """
-        Select questions one by one using intelligent sequential selection
-        
-        Strategy:
-        1. For positions 1-6: Select questions that leave valid remaining marks
-        2. For position 7: Select the exact question needed to reach 80 marks
+        Select exactly 7 nested questions (10-14 marks each) totaling exactly 80 marks
+        using the exact mark solver
         
-        Returns:
-            bool: True if successful
+        Raises:
+            InfeasibleSelectionError if no such combination exists in the pool
         """
-        # Get available questions (not yet used)
-        available = [q for q in self.nested_questions if q.id not in self.used_ids]
-        
-        if len(available) < self.TARGET_QUESTIONS:
-            return False
-        
-        # Group questions by marks for efficient lookup
-        questions_by_marks = defaultdict(list)
-        for q in available:
-            questions_by_marks[q.marks].append(q)
-        
-        # Track current selection
-        current_selection = []
-        current_marks = 0
-        
-        # Select first 6 questions
-        for position in range(1, self.TARGET_QUESTIONS):
-            remaining_questions = self.TARGET_QUESTIONS - position
-            remaining_marks = self.TOTAL_MARKS - current_marks
-            
-            # Calculate the marks needed for the last question after this selection
-            # We need to ensure the final question can be between 10-14 marks
-            min_final_mark = self.MIN_QUESTION_MARKS
-            max_final_mark = self.MAX_QUESTION_MARKS
-            
-            # Valid range for current question
-            # If we pick X marks now, the remaining (remaining_questions) questions 
-            # must sum to (remaining_marks - X)
-            valid_marks = []
-            
-            for marks in sorted(questions_by_marks.keys()):
-                if not questions_by_marks[marks]:  # Skip if no questions available
-                    continue
-                
-                marks_after = remaining_marks - marks
-                questions_after = remaining_questions
-                
-                # Check if it's possible to complete with remaining questions
-                # For the last question (when questions_after == 1), we need exact match
-                if questions_after == 1:
-                    if min_final_mark <= marks_after <= max_final_mark:
-                        valid_marks.append(marks)
-                else:
-                    # For earlier positions, check if remaining marks are achievable
-                    min_possible = questions_after * self.MIN_QUESTION_MARKS
-                    max_possible = questions_after * self.MAX_QUESTION_MARKS
-                    
-                    if min_possible <= marks_after <= max_possible:
-                        valid_marks.append(marks)
-            
-            if not valid_marks:
-                return False  # No valid selection possible
-            
-            # Select randomly from valid marks
-            selected_marks = random.choice(valid_marks)
-            selected_question = random.choice(questions_by_marks[selected_marks])
-            
-            # Add to selection
-            current_selection.append(selected_question)
-            current_marks += selected_marks
-            
-            # Remove from available pool
-            questions_by_marks[selected_marks].remove(selected_question)
-            if not questions_by_marks[selected_marks]:
-                del questions_by_marks[selected_marks]
-        
-        # Select the 7th question - must be exact remaining marks
-        final_marks_needed = self.TOTAL_MARKS - current_marks
-        
-        if final_marks_needed not in questions_by_marks or not questions_by_marks[final_marks_needed]:
-            return False  # No question with exact marks needed
-        
-        final_question = random.choice(questions_by_marks[final_marks_needed])
-        current_selection.append(final_question)
-        current_marks += final_marks_needed
-        
-        # Verify selection
-        if len(current_selection) != self.TARGET_QUESTIONS or current_marks != self.TOTAL_MARKS:
-            return False
-        
-        # Success! Store the selection
-        self.selected_questions = current_selection
-        self.total_marks = current_marks
-        
-        for q in current_selection:
+        selected = solve_section(SectionSpec(
+            'paper',
+            self.nested_questions,
+            min_questions=self.TARGET_QUESTIONS,
+            max_questions=self.TARGET_QUESTIONS,
+            min_marks=self.TOTAL_MARKS,
+            max_marks=self.TOTAL_MARKS
+        ))
+        
+        self.selected_questions = selected
+        self.total_marks = sum(q.marks for q in selected)
+        
+        for q in selected:
             self.used_ids.add(q.id)
             self.selected_question_ids.append(str(q.id))
         
-        print(f"\n[QUESTION SELECTION SUCCESS]")
+        print("\n[QUESTION SELECTION SUCCESS]")
         print(f"  Selected: {len(self.selected_questions)} questions")
         print(f"  Total marks: {self.total_marks}")
-        print(f"  Breakdown:")
+        print("  Breakdown:")
         for idx, q in enumerate(self.selected_questions, start=1):
             print(f"    Q{idx}: {q.marks} marks - {q.topic.name}")
-        
-        return True
     
     def generate(self) -> Dict:
         """Generate Chemistry Paper 2"""
-        max_attempts = 1000  # Increased attempts for better success rate
         start_time = time.time()
         
         print(f"\n{'='*70}")
-        print(f"KCSE CHEMISTRY PAPER 2 GENERATION - SEQUENTIAL SELECTION")
+        print("KCSE CHEMISTRY PAPER 2 GENERATION - EXACT MARK SOLVER")
         print(f"{'='*70}")
         
-        for attempt in range(1, max_attempts + 1):
-            self.attempts = attempt
-            
-            # Reset state
-            self.selected_questions = []
-            self.selected_question_ids = []
-            self.used_ids = set()
-            self.total_marks = 0
-            
-            # Shuffle available questions for variety
-            random.shuffle(self.nested_questions)
-            
-            # Select questions sequentially
-            if not self._select_questions_sequentially():
-                if attempt % 100 == 0:
-                    print(f"[ATTEMPT {attempt}] Still searching for valid combination...")
-                continue
-            
-            # Success!
-            generation_time = time.time() - start_time
-            print(f"\n{'='*70}")
-            print(f"SUCCESS! Generated in {attempt} attempts ({generation_time:.2f}s)")
-            print(f"{'='*70}")
-            
-            return self._build_result(generation_time)
-        
-        raise Exception(
-            f"Failed to generate paper after {max_attempts} attempts. "
-            f"Possible issues:\n"
-            f"1. Insufficient question variety in the {self.MIN_QUESTION_MARKS}-{self.MAX_QUESTION_MARKS} marks range\n"
-            f"2. Need more questions in the database\n"
-            f"3. Try selecting different topics"
-        )
+        # Reset state
+        self.attempts = 1
+        self.selected_questions = []
+        self.selected_question_ids = []
+        self.used_ids = set()
+        self.total_marks = 0
+        
+        try:
+            self._select_questions()
+        except InfeasibleSelectionError as e:
+            raise Exception(
+                f"Failed to generate paper: {e}. "
+                f"Possible issues:\n"
+                f"1. Insufficient question variety in the {self.MIN_QUESTION_MARKS}-{self.MAX_QUESTION_MARKS} marks range\n"
+                f"2. Need more questions in the database\n"
+                f"3. Try selecting different topics"
+            )
+        
+        generation_time = time.time() - start_time
+        print(f"\n{'='*70}")
+        print(f"SUCCESS! Generated in one pass ({generation_time:.2f}s)")
+        print(f"{'='*70}")
+        
+        return self._build_result(generation_time)
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper data"""
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         questions_data = []
         for idx, question in enumerate(self.selected_questions, start=1):
             questions_data.append({
@@ -1,11 +1,86 @@
 """
 Coverpage Templates for KCSE Examination Papers
 Generates professional coverpages with dynamic marking grids
+
+Every layout class renders its coverpage as a body fragment:
+- generate_html(data, body_only=True) returns just the coverpage markup, which the
+  exam, marking scheme and printable templates place inside their own document
+- generate_html(data) wraps the fragment in a standalone document
+  (coverpage_document) for the coverpage preview endpoint
+- the layout's CSS is a class constant (STYLESHEET), shared between layouts that
+  look the same and emitted once per document (coverpage_stylesheet)
+- marking grids depend only on question counts and marks, so they are built once
+  per distinct combination (memoized_fragment)
+
+COVERPAGE_LAYOUTS / MARKING_SCHEME_LAYOUTS at the end of this module map each
+subject and paper number to its layout (get_coverpage_layout).
 """
 
 from datetime import datetime
+from functools import lru_cache, wraps
 
 from .models import Question
+from .utils import format_time_allocation
+
+
+def memoized_fragment(builder):
+    """
+    Memoize an HTML fragment builder on its (positional) arguments
+    
+    List arguments are keyed as tuples and the builder gets its own list copy, so a
+    builder that pads its marks list can no longer alter the caller's coverpage data.
+    Calls with unhashable arguments are built without caching.
+    """
+    @lru_cache(maxsize=256)
+    def cached(*key):
+        return builder(*[list(arg) if isinstance(arg, tuple) else arg for arg in key])
+
+    @wraps(builder)
+    def wrapper(*args):
+        key = tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args)
+        try:
+            hash(key)
+        except TypeError:
+            return builder(*args)
+        return cached(*key)
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def coverpage_document(title, stylesheet, body_html, lang='en'):
+    """Standalone HTML document around a coverpage body fragment"""
+    return f"""
+<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>{stylesheet}</style>
+</head>
+<body>{body_html}</body>
+</html>
+"""
+
+
+def coverpage_stylesheet(coverpage_class, data=None):
+    """
+    CSS of a coverpage layout
+    
+    The Kiswahili layouts align their header with the logo, so their stylesheet
+    holds a {logo_position} placeholder that is filled from the coverpage data.
+    """
+    stylesheet = getattr(coverpage_class, 'STYLESHEET', '')
+    if '{logo_position}' in stylesheet:
+        stylesheet = stylesheet.replace('{logo_position}', (data or {}).get('logo_position', 'center'))
+    return stylesheet
+
+
+def coverpage_body(coverpage_class, data):
+    """Coverpage markup without document, head or stylesheet, for combined documents"""
+    return coverpage_class.generate_html(data, body_only=True)
 
 
 def _extract_physics_section_b_marks(generated_paper, section_b_count=5):
@@ -53,27 +128,7 @@ def _extract_physics_section_b_marks(generated_paper, section_b_count=5):
     return fallback_marks[:section_b_count]
 
 
-def format_time_allocation(minutes):
-    """
-    Convert time in minutes to human-readable hours format
-    
-    Args:
-        minutes (int): Time in minutes
-    
-    Returns:
-        str: Formatted time string (e.g., "2 hours", "1 hour 30 minutes", "45 minutes")
-    """
-    if minutes >= 60:
-        hours = minutes // 60
-        remaining_minutes = minutes % 60
-        if remaining_minutes == 0:
-            return f"{hours} {'HOUR' if hours == 1 else 'HOURS'}"
-        else:
-            return f"{hours} {'HOUR' if hours == 1 else 'HOURS'} {remaining_minutes} MINUTES"
-    else:
-        return f"{minutes} MINUTES"
-
-
+@memoized_fragment
 def generate_marking_table(total_questions):
     """
     Generate the marking grid HTML based on number of questions
@@ -167,336 +222,329 @@ class BiologyPaper1Coverpage:
     Biology Paper 1 Coverpage Template
     Includes dynamic marking grid based on question count
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Biology Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "BIOLOGY PAPER 1"
-                - total_questions: Number of questions in the paper
-                - total_marks: Total marks for the paper
-                - time_allocation: Time in minutes
-                - instructions: List of instruction strings
-                - date: Exam date (optional)
-                - candidate_name_field: Show name field (default: True)
-                - candidate_number_field: Show admission number field (default: True)
-                - date_field: Show date field (default: True)
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')  # left, center, right
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BIOLOGY PAPER 1')
-        total_questions = data.get('total_questions', 25)
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 hours')
-        
-        # Calculate total pages: 1 coverpage + question pages (3-4 questions per page)
-        total_pages = 1 + ((total_questions + 2) // 3)  # Coverpage + question pages
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all the questions in this question paper.',
-            'All answers must be written in the spaces provided.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid
-        marking_grid_html = generate_marking_table(total_questions)
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 0;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             width: 210mm;
             height: 297mm;
             padding: 2mm;
             background: white;
             position: relative;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             height: 100%;
             display: flex;
             flex-direction: column;
             justify-content: space-between;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
             position: relative;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             display: flex;
             align-items: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             justify-content: flex-start;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             justify-content: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             justify-content: flex-end;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 100px;
             max-height: 100px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 20px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .class-title {{
+        .class-title {
             font-size: 16px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 16px;
             font-weight: bold;
             margin-bottom: 20px;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 18px;
             font-weight: bold;
             text-decoration: underline;
             margin-bottom: 10px;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             font-size: 14px;
             margin-bottom: 20px;
-        }}
+        }
         
         /* Candidate Information Section */
-        .candidate-info {{
+        .candidate-info {
             border: none;
             padding: 15px;
             margin-bottom: 40px;
-        }}
+        }
         
-        .info-grid {{
+        .info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 40px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 16pt;
             line-height: 1.8;
             font-style: italic;
             paddding:5px;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
             font-size: 16pt !important;
             padding:5px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding: 8px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 13px;
             margin-bottom: 10px;
             padding:5px;
             text-align: center;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             border-collapse: collapse;
             border: 1px solid black;
             padding: 15px;
-        }}
+        }
         
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 10px;
             font-weight: bold;
             height: 30px;
-        }}
+        }
         
-        .question-number {{
+        .question-number {
             min-width: 35px;
             width: 35px;
-        }}
+        }
         
         /* Empty question cells (shown but no number) */
-        .empty-question-cell {{
+        .empty-question-cell {
             min-width: 35px;
             width: 35px;
             background-color: white;
             border: none !important;
-        }}
+        }
         
         /* Add spacing before second row */
-        .row-with-spacing td {{
+        .row-with-spacing td {
             border-top: 2px solid black;
             padding-top: 8px;
-        }}
+        }
         
         /* Override border-top for empty and gap cells in spacing row */
         .row-with-spacing .empty-question-cell,
-        .row-with-spacing .gap-cell {{
+        .row-with-spacing .gap-cell {
             border-top: none !important;
-        }}
+        }
         
         /* Gap cell between questions and Grand Total */
-        .gap-cell {{
+        .gap-cell {
             border-right: none !important;
             border-left: none !important;
             border-bottom: none !important;
             background-color: white;
             min-width: 15px;
             width: 15px;
-        }}
+        }
         
-        .grand-total-cell {{
+        .grand-total-cell {
             background-color: #f0f0f0;
             font-size: 10px;
             font-weight: bold;
             border: 2px solid black;
             padding: 5px 10px;
             min-width: 80px;
-        }}
+        }
         
-        .total-box {{
+        .total-box {
             min-width: 60px;
             width: 60px;
             min-height: 60px;
             border: 2px solid black;
             background-color: white;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 2mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Biology Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "BIOLOGY PAPER 1"
+                - total_questions: Number of questions in the paper
+                - total_marks: Total marks for the paper
+                - time_allocation: Time in minutes
+                - instructions: List of instruction strings
+                - date: Exam date (optional)
+                - candidate_name_field: Show name field (default: True)
+                - candidate_number_field: Show admission number field (default: True)
+                - date_field: Show date field (default: True)
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')  # left, center, right
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BIOLOGY PAPER 1')
+        total_questions = data.get('total_questions', 25)
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 hours')
+        
+        # Calculate total pages: 1 coverpage + question pages (3-4 questions per page)
+        total_pages = 1 + ((total_questions + 2) // 3)  # Coverpage + question pages
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all the questions in this question paper.',
+            'All answers must be written in the spaces provided.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid
+        marking_grid_html = generate_marking_table(total_questions)
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -541,12 +589,13 @@ class BiologyPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(BiologyPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(total_questions):
         """
         Generate the marking grid HTML based on number of questions
@@ -691,328 +740,321 @@ class BiologyPaper2Coverpage:
     Biology Paper 2 Coverpage Template
     Includes sectioned marking grid (Section A and Section B)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Biology Paper 2 coverpage
+
+    STYLESHEET = """
+        @page {
+            size: A4;
+            margin: 20mm;
+        }
         
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "BIOLOGY PAPER 2"
-                - section_a_questions: Number of questions in Section A (default: 5)
-                - section_a_marks: Marks per question in Section A (default: 8)
-                - section_b_questions: Number of questions in Section B (default: 3)
-                - section_b_marks: Marks per question in Section B (default: 20)
-                - total_marks: Total marks for the paper (default: 80)
-                - time_allocation: Time in minutes
-                - instructions: List of instruction strings
-                - date: Exam date (optional)
-                - candidate_name_field: Show name field (default: True)
-                - candidate_number_field: Show admission number field (default: True)
-                - date_field: Show date field (default: True)
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
         
-        Returns:
-            str: HTML content for coverpage
-        """
+        body {
+            font-family: 'Times New Roman', Times, serif;
+            font-size: 12pt;
+            line-height: 1.5;
+            color: black;
+            background: white;
+        }
         
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BIOLOGY PAPER 2')
-        
-        # Section configuration
-        section_a_questions = data.get('section_a_questions', 5)
-        section_a_marks = data.get('section_a_marks', 8)
-        section_b_questions = data.get('section_b_questions', 3)
-        section_b_marks = data.get('section_b_marks', 20)
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 hours')
-        
-        # Calculate total questions and pages
-        total_questions = section_a_questions + section_b_questions
-        total_pages = data.get('total_pages', 12)  # Default 12 printed pages for Paper 2
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of two sections: A and B.',
-            f'Answer all questions in section A answer question 6 (compulsory) and either question 7 or 8 in the spaces provided after question 8.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Paper 2
-        marking_grid_html = BiologyPaper2Coverpage._generate_marking_grid(
-            section_a_questions, section_a_marks,
-            section_b_questions, section_b_marks,
-            total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: 20mm;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            font-size: 12pt;
-            line-height: 1.5;
-            color: black;
-            background: white;
-        }}
-        
-        .coverpage {{
-            width: 100%;
-            min-height: 100vh;
-            padding: 15mm;
-            display: flex;
-            flex-direction: column;
-            page-break-after: always;
-        }}
+        .coverpage {
+            width: 100%;
+            min-height: 100vh;
+            padding: 15mm;
+            display: flex;
+            flex-direction: column;
+            page-break-after: always;
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-code {{
+        .paper-code {
             font-size: 1.2rem;
             font-weight: normal;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: 2px solid black;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section for Paper 2 */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 70%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             font-weight: normal;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #e8e8e8;
             font-weight: bold;
             font-size: 12px;
-        }}
+        }
         
-        .section-label {{
+        .section-label {
             font-size: 13px;
             font-weight: bold;
             vertical-align: middle;
             background-color: #f5f5f5;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #d9d9d9;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
-        .total-row td {{
+        .total-row td {
             font-weight: bold;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Biology Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "BIOLOGY PAPER 2"
+                - section_a_questions: Number of questions in Section A (default: 5)
+                - section_a_marks: Marks per question in Section A (default: 8)
+                - section_b_questions: Number of questions in Section B (default: 3)
+                - section_b_marks: Marks per question in Section B (default: 20)
+                - total_marks: Total marks for the paper (default: 80)
+                - time_allocation: Time in minutes
+                - instructions: List of instruction strings
+                - date: Exam date (optional)
+                - candidate_name_field: Show name field (default: True)
+                - candidate_number_field: Show admission number field (default: True)
+                - date_field: Show date field (default: True)
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BIOLOGY PAPER 2')
+        
+        # Section configuration
+        section_a_questions = data.get('section_a_questions', 5)
+        section_a_marks = data.get('section_a_marks', 8)
+        section_b_questions = data.get('section_b_questions', 3)
+        section_b_marks = data.get('section_b_marks', 20)
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 hours')
+        
+        # Calculate total questions and pages
+        total_questions = section_a_questions + section_b_questions
+        total_pages = data.get('total_pages', 12)  # Default 12 printed pages for Paper 2
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of two sections: A and B.',
+            f'Answer all questions in section A answer question 6 (compulsory) and either question 7 or 8 in the spaces provided after question 8.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Paper 2
+        marking_grid_html = BiologyPaper2Coverpage._generate_marking_grid(
+            section_a_questions, section_a_marks,
+            section_b_questions, section_b_marks,
+            total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -1068,13 +1110,14 @@ class BiologyPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(BiologyPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_a_questions, section_a_marks, 
                                section_b_questions, section_b_marks, total_marks):
         """
@@ -1226,12 +1269,12 @@ class BiologyPaper3Coverpage:
     """
 
     @staticmethod
-    def generate_html(data):
+    def generate_html(data, body_only=False):
         # Reuse BiologyPaper2Coverpage HTML structure but force the paper name
         data = dict(data)
         data['paper_name'] = data.get('paper_name', 'BIOLOGY PAPER 3')
         # Use BiologyPaper2Coverpage renderer for consistent styling
-        return BiologyPaper2Coverpage.generate_html(data)
+        return BiologyPaper2Coverpage.generate_html(data, body_only)
 
     @staticmethod
     def generate_default_coverpage_data(generated_paper, paper):
@@ -1250,136 +1293,91 @@ class BiologyPaper2MarkingSchemeCoverpage:
     Biology Paper 2 Marking Scheme Coverpage Template
     Uses sectioned marking grid (Section A and Section B) - same as question paper
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Biology Paper 2 Marking Scheme coverpage
-        """
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BIOLOGY PAPER 2')
-        
-        # Section configuration
-        section_a_questions = data.get('section_a_questions', 5)
-        section_a_marks = data.get('section_a_marks', 8)
-        section_b_questions = data.get('section_b_questions', 3)
-        section_b_marks = data.get('section_b_marks', 20)
-        total_marks = data.get('total_marks', 80)
-        total_questions = section_a_questions + section_b_questions
-        
-        # Calculate total pages for marking scheme
-        total_pages = data.get('total_pages', 15)  # Marking scheme usually has more pages
-        
-        # Instructions for marking scheme
-        instructions = [
-            'This is a confidential document for authorized examiners only.',
-            'Do not distribute to candidates before or during examination.',
-            'Award marks strictly according to the marking points provided.',
-            'Accept any valid alternative answers that demonstrate understanding.',
-            'For Section A: Award marks for each of the 5 questions (8 marks each).',
-            'For Section B: Question 6 is compulsory (20 marks). For Questions 7 & 8, mark only the one attempted by the candidate.',
-            f'This marking scheme consists of {total_pages} printed pages.',
-            'Check that all pages are printed and no answers are missing.'
-        ]
-        
-        # Generate instruction items HTML
-        instruction_items = "".join([f'<li style="margin-bottom: 8px;">{instruction}</li>' for instruction in instructions])
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - MARKING SCHEME</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 0;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             width: 210mm;
             height: 297mm;
             padding: 20mm;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             height: 100%;
             display: flex;
             flex-direction: column;
             justify-content: space-between;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
             position: relative;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 80px;
             max-height: 80px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.6rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-title {{
+        .class-title {
             font-size: 1.2rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 10px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-scheme-label {{
+        .marking-scheme-label {
             font-size: 1.2rem;
             font-weight: bold;
             color: #d32f2f;
@@ -1387,89 +1385,127 @@ class BiologyPaper2MarkingSchemeCoverpage:
             padding: 8px;
             border: 2px solid #d32f2f;
             display: inline-block;
-        }}
+        }
         
-        .confidential-notice {{
+        .confidential-notice {
             margin: 15px 0;
             padding: 12px;
             background-color: #fff3cd;
             border: 2px solid #856404;
             border-radius: 4px;
-        }}
+        }
         
-        .confidential-text {{
+        .confidential-text {
             font-size: 1.1rem;
             font-weight: bold;
             color: #856404;
             text-align: center;
-        }}
+        }
         
-        .instructions {{
+        .instructions {
             border: 2px solid #000;
             padding: 15px;
             margin: 20px 0;
             flex-grow: 1;
             display: flex;
             flex-direction: column;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-size: 1.2rem;
             font-weight: bold;
             margin-bottom: 12px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 12px;
             line-height: 1.6;
-        }}
+        }
         
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="coverpage">
-        <!-- Header -->
-        <div class="header">
-            <div class="logo-container {logo_position}">
-                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
-            </div>
-            <div class="school-name">{school_name}</div>
-            {f'<div class="class-title">{class_name}</div>' if class_name else ''}
-            <div class="exam-title">{exam_title}</div>
-            <div class="paper-title">{paper_name}</div>
-            <div class="marking-scheme-label">*** MARKING SCHEME ***</div>
-            
-            <!-- Confidential Notice -->
-            <div class="confidential-notice">
-                <div class="confidential-text">CONFIDENTIAL - FOR EXAMINERS ONLY</div>
-            </div>
-        </div>
-        
-        <!-- Instructions Section -->
-        <div class="instructions">
-            <div class="instructions-title">INSTRUCTIONS TO EXAMINERS</div>
-            <ol>
-                {instruction_items}
-            </ol>
-        </div>
-    </div>
-</body>
-</html>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
         """
+        Generate HTML for Biology Paper 2 Marking Scheme coverpage
+        """
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BIOLOGY PAPER 2')
+        
+        # Section configuration
+        section_a_questions = data.get('section_a_questions', 5)
+        section_a_marks = data.get('section_a_marks', 8)
+        section_b_questions = data.get('section_b_questions', 3)
+        section_b_marks = data.get('section_b_marks', 20)
+        total_marks = data.get('total_marks', 80)
+        total_questions = section_a_questions + section_b_questions
+        
+        # Calculate total pages for marking scheme
+        total_pages = data.get('total_pages', 15)  # Marking scheme usually has more pages
+        
+        # Instructions for marking scheme
+        instructions = [
+            'This is a confidential document for authorized examiners only.',
+            'Do not distribute to candidates before or during examination.',
+            'Award marks strictly according to the marking points provided.',
+            'Accept any valid alternative answers that demonstrate understanding.',
+            'For Section A: Award marks for each of the 5 questions (8 marks each).',
+            'For Section B: Question 6 is compulsory (20 marks). For Questions 7 & 8, mark only the one attempted by the candidate.',
+            f'This marking scheme consists of {total_pages} printed pages.',
+            'Check that all pages are printed and no answers are missing.'
+        ]
+        
+        # Generate instruction items HTML
+        instruction_items = "".join([f'<li style="margin-bottom: 8px;">{instruction}</li>' for instruction in instructions])
+        
+        html = f"""
+    <div class="coverpage">
+        <!-- Header -->
+        <div class="header">
+            <div class="logo-container {logo_position}">
+                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
+            </div>
+            <div class="school-name">{school_name}</div>
+            {f'<div class="class-title">{class_name}</div>' if class_name else ''}
+            <div class="exam-title">{exam_title}</div>
+            <div class="paper-title">{paper_name}</div>
+            <div class="marking-scheme-label">*** MARKING SCHEME ***</div>
+            
+            <!-- Confidential Notice -->
+            <div class="confidential-notice">
+                <div class="confidential-text">CONFIDENTIAL - FOR EXAMINERS ONLY</div>
+            </div>
+        </div>
+        
+        <!-- Instructions Section -->
+        <div class="instructions">
+            <div class="instructions-title">INSTRUCTIONS TO EXAMINERS</div>
+            <ol>
+                {instruction_items}
+            </ol>
+        </div>
+    </div>
+"""
         
-        return html.strip()
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - MARKING SCHEME", coverpage_stylesheet(BiologyPaper2MarkingSchemeCoverpage, data), html).strip()
     
     @staticmethod
     def generate_default_data(generated_paper, paper):
@@ -1519,199 +1555,192 @@ class MarkingSchemeCoverpage:
     """
     Marking Scheme Coverpage Template - matches question paper style
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Marking Scheme coverpage (similar to question paper but without candidate section)
-        """
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BIOLOGY PAPER 1')
-        total_questions = data.get('total_questions', 25)
-        total_marks = data.get('total_marks', 80)
-        
-        # Calculate total pages for marking scheme (coverpage + answer pages)
-        total_pages = 1 + ((total_questions + 1) // 2)  # Approximately 2 answers per page
-        
-        # Instructions for marking scheme
-        instructions = [
-            'This is a confidential document for authorized examiners only.',
-            'Do not distribute to candidates before or during examination.',
-            'Award marks strictly according to the marking points provided.',
-            'Accept any valid alternative answers that demonstrate understanding.',
-            f'This marking scheme consists of {total_pages} printed pages.',
-            'Check that all pages are printed and no answers are missing.'
-        ]
-        
-        # Generate instruction items HTML (can't use list comprehension with backslash in f-string)
-        instruction_items = "".join([f'<li style="margin-bottom: 8px;">{instruction}</li>' for instruction in instructions])
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - MARKING SCHEME</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 0;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             width: 210mm;
             height: 297mm;
             padding: 20mm;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             height: 100%;
             display: flex;
             flex-direction: column;
             justify-content: space-between;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
             position: relative;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             display: flex;
             align-items: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             justify-content: flex-start;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             justify-content: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             justify-content: flex-end;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 100px;
             max-height: 100px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 20px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .class-title {{
+        .class-title {
             font-size: 16px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 16px;
             font-weight: bold;
             margin-bottom: 20px;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 18px;
             font-weight: bold;
             text-decoration: underline;
             margin-bottom: 5px;
-        }}
+        }
         
-        .marking-scheme-label {{
+        .marking-scheme-label {
             font-size: 16px;
             font-weight: bold;
             color: #dc2626;
             margin-bottom: 10px;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             font-size: 14px;
             margin-bottom: 20px;
-        }}
+        }
         
         /* Instructions Section - positioned in middle */
-        .instructions {{
+        .instructions {
             border: 2px solid #000;
             padding: 15px;
             margin: 20px 0;
             flex-grow: 1;
             display: flex;
             flex-direction: column;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-size: 14px;
             font-weight: bold;
             margin-bottom: 10px;
             text-decoration: underline;
             text-align: center;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 12px;
             line-height: 1.6;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
         /* Confidential Notice - positioned relative to header */
-        .confidential-notice {{
+        .confidential-notice {
             background: #fee2e2;
             border: 2px solid #dc2626;
             padding: 10px;
             text-align: center;
             margin-top: 10px;
             position: relative;
-        }}
+        }
         
-        .confidential-text {{
+        .confidential-text {
             font-weight: bold;
             color: #991b1b;
             font-size: 14px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Marking Scheme coverpage (similar to question paper but without candidate section)
+        """
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BIOLOGY PAPER 1')
+        total_questions = data.get('total_questions', 25)
+        total_marks = data.get('total_marks', 80)
+        
+        # Calculate total pages for marking scheme (coverpage + answer pages)
+        total_pages = 1 + ((total_questions + 1) // 2)  # Approximately 2 answers per page
+        
+        # Instructions for marking scheme
+        instructions = [
+            'This is a confidential document for authorized examiners only.',
+            'Do not distribute to candidates before or during examination.',
+            'Award marks strictly according to the marking points provided.',
+            'Accept any valid alternative answers that demonstrate understanding.',
+            f'This marking scheme consists of {total_pages} printed pages.',
+            'Check that all pages are printed and no answers are missing.'
+        ]
+        
+        # Generate instruction items HTML (can't use list comprehension with backslash in f-string)
+        instruction_items = "".join([f'<li style="margin-bottom: 8px;">{instruction}</li>' for instruction in instructions])
+        
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -1738,11 +1767,11 @@ class MarkingSchemeCoverpage:
             </ol>
         </div>
     </div>
-</body>
-</html>
-        """
+"""
         
-        return html.strip()
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - MARKING SCHEME", coverpage_stylesheet(MarkingSchemeCoverpage, data), html).strip()
     
     @staticmethod
     def generate_default_data(generated_paper, paper):
@@ -1791,302 +1820,295 @@ class PhysicsPaper1Coverpage:
     Physics Paper 1 Coverpage Template
     Includes sectioned marking grid (Section A and Section B)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Physics Paper 1 coverpage
-        """
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'PHYSICS PAPER 1')
-        
-        section_a_questions = data.get('section_a_questions', 13)
-        section_a_marks = data.get('section_a_marks', 25)
-        section_b_questions = data.get('section_b_questions', 5)
-        section_b_marks = data.get('section_b_marks', 55)
-        section_b_question_marks = data.get('section_b_question_marks', [11, 10, 10, 12, 12])
-        total_marks = data.get('total_marks', 80)
-        total_questions = section_a_questions + section_b_questions
-        total_pages = data.get('total_pages', 12)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'This paper consists of two sections: A and B.',
-            'Answer ALL questions in section A and ANY FIVE questions in section B.',
-            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
-            'Marks may be given for correct working even if the answer is wrong.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        show_class = data.get('class_field', True)
-        
-        # Generate marking grid for Physics Paper 1
-        marking_grid_html = PhysicsPaper1Coverpage._generate_marking_grid(
-            section_a_questions, section_a_marks,
-            section_b_questions, section_b_marks,
-            section_b_question_marks,
-            total_marks
-        )
-        
-        # Build HTML (reusing Biology Paper 2 styles)
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
             border:none;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 70%;
             margin: 0 auto;
             border-collapse: collapse;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             font-weight: normal;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #e8e8e8;
             font-weight: bold;
             font-size: 12px;
-        }}
+        }
         
-        .section-label {{
+        .section-label {
             font-size: 13px;
             font-weight: bold;
             vertical-align: middle;
             background-color: #f5f5f5;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #d9d9d9;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
-        .total-row td {{
+        .total-row td {
             font-weight: bold;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="coverpage">
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Physics Paper 1 coverpage
+        """
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'PHYSICS PAPER 1')
+        
+        section_a_questions = data.get('section_a_questions', 13)
+        section_a_marks = data.get('section_a_marks', 25)
+        section_b_questions = data.get('section_b_questions', 5)
+        section_b_marks = data.get('section_b_marks', 55)
+        section_b_question_marks = data.get('section_b_question_marks', [11, 10, 10, 12, 12])
+        total_marks = data.get('total_marks', 80)
+        total_questions = section_a_questions + section_b_questions
+        total_pages = data.get('total_pages', 12)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'This paper consists of two sections: A and B.',
+            'Answer ALL questions in section A and ANY FIVE questions in section B.',
+            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
+            'Marks may be given for correct working even if the answer is wrong.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        show_class = data.get('class_field', True)
+        
+        # Generate marking grid for Physics Paper 1
+        marking_grid_html = PhysicsPaper1Coverpage._generate_marking_grid(
+            section_a_questions, section_a_marks,
+            section_b_questions, section_b_marks,
+            section_b_question_marks,
+            total_marks
+        )
+        
+        # Build HTML (reusing Biology Paper 2 styles)
+        html = f"""
+    <div class="coverpage">
         <!-- Header -->
         <div class="header">
             <div class="logo-container {logo_position}">
@@ -2140,13 +2162,14 @@ class PhysicsPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(PhysicsPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_a_questions, section_a_marks, 
                                section_b_questions, section_b_marks,
                                section_b_question_marks, total_marks):
@@ -2304,310 +2327,303 @@ class PhysicsPaper2Coverpage:
     Physics Paper 2 Coverpage Template
     Includes sectioned marking grid (Section A and Section B)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Physics Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys similar to other Paper 2 templates
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'PHYSICS PAPER 2')
-        
-        # Section configuration (from screenshot)
-        section_a_questions = data.get('section_a_questions', 5)  # Questions 1-13, 14, 15 (3 questions shown)
-        section_b_questions = data.get('section_b_questions', 3)  # Questions 16, 17, 18 (3 questions)
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total questions and pages
-        total_questions = section_a_questions + section_b_questions
-        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'This paper consists of two sections: A and B.',
-            'Answer all the questions in Section A and B in the spaces provided.',
-            'All working must be clearly shown in the spaces provided in this booklet.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Get section details for marking grid
-        section_a_questions = data.get('section_a_questions', 13)
-        section_a_marks = data.get('section_a_marks', 25)
-        section_b_questions = data.get('section_b_questions', 5)
-        section_b_marks = data.get('section_b_marks', 55)
-        section_b_question_marks = data.get('section_b_question_marks', [11, 10, 10, 12, 12])
-        
-        # Generate marking grid for Physics Paper 2
-        marking_grid_html = PhysicsPaper2Coverpage._generate_marking_grid(
-            section_a_questions, section_a_marks,
-            section_b_questions, section_b_marks,
-            section_b_question_marks,
-            total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 60%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .section-label {{
+        .section-label {
             font-size: 13px;
             font-weight: bold;
             vertical-align: middle;
             background-color: #f5f5f5;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #e0e0e0;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Physics Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys similar to other Paper 2 templates
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'PHYSICS PAPER 2')
+        
+        # Section configuration (from screenshot)
+        section_a_questions = data.get('section_a_questions', 5)  # Questions 1-13, 14, 15 (3 questions shown)
+        section_b_questions = data.get('section_b_questions', 3)  # Questions 16, 17, 18 (3 questions)
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total questions and pages
+        total_questions = section_a_questions + section_b_questions
+        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'This paper consists of two sections: A and B.',
+            'Answer all the questions in Section A and B in the spaces provided.',
+            'All working must be clearly shown in the spaces provided in this booklet.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Get section details for marking grid
+        section_a_questions = data.get('section_a_questions', 13)
+        section_a_marks = data.get('section_a_marks', 25)
+        section_b_questions = data.get('section_b_questions', 5)
+        section_b_marks = data.get('section_b_marks', 55)
+        section_b_question_marks = data.get('section_b_question_marks', [11, 10, 10, 12, 12])
+        
+        # Generate marking grid for Physics Paper 2
+        marking_grid_html = PhysicsPaper2Coverpage._generate_marking_grid(
+            section_a_questions, section_a_marks,
+            section_b_questions, section_b_marks,
+            section_b_question_marks,
+            total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -2663,13 +2679,14 @@ class PhysicsPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(PhysicsPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_a_questions, section_a_marks, 
                                section_b_questions, section_b_marks,
                                section_b_question_marks, total_marks):
@@ -2832,329 +2849,322 @@ class ChemistryPaper1Coverpage:
     Chemistry Paper 1 Coverpage Template
     Includes dynamic marking grid based on question count (similar to Biology Paper 1)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Chemistry Paper 1 coverpage
+
+    STYLESHEET = """
+        @page {
+            size: A4;
+            margin: 0;
+        }
         
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "CHEMISTRY PAPER 1"
-                - total_questions: Number of questions in the paper
-                - total_marks: Total marks for the paper
-                - time_allocation: Time in minutes
-                - instructions: List of instruction strings
-                - date: Exam date (optional)
-                - candidate_name_field: Show name field (default: True)
-                - candidate_number_field: Show admission number field (default: True)
-                - date_field: Show date field (default: True)
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
         
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'CHEMISTRY PAPER 1')
-        total_questions = data.get('total_questions', 25)
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 HOURS')
-        
-        # Calculate total pages
-        total_pages = 1 + ((total_questions + 2) // 3)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all the questions in the spaces provided.',
-            'ALL working MUST be clearly shown where necessary.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid (reuse Biology Paper 1 grid structure)
-        marking_grid_html = BiologyPaper1Coverpage._generate_marking_grid(total_questions)
-        
-        # Build HTML (similar to Biology Paper 1)
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: 0;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             width: 210mm;
             height: 297mm;
             padding: 20mm;
             background: white;
             position: relative;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             height: 100%;
             display: flex;
             flex-direction: column;
             justify-content: space-between;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
             position: relative;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             display: flex;
             align-items: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             justify-content: flex-start;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             justify-content: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             justify-content: flex-end;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 100px;
             max-height: 100px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 20px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .class-title {{
+        .class-title {
             font-size: 16px;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 5px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 16px;
             font-weight: bold;
             margin-bottom: 20px;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 18px;
             font-weight: bold;
             text-decoration: underline;
             margin-bottom: 10px;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             font-size: 14px;
             margin-bottom: 20px;
-        }}
+        }
         
         /* Candidate Information Section */
-        .candidate-info {{
+        .candidate-info {
             border: none;
             padding: 15px;
             margin-bottom: 20px;
-        }}
+        }
         
-        .info-grid {{
+        .info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 13px;
             margin-bottom: 10px;
             text-align: center;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             border-collapse: collapse;
             border: 1px solid black;
-        }}
+        }
         
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 10px;
             font-weight: bold;
             padding: 8px 4px;
             height: 30px;
-        }}
+        }
         
-        .question-number {{
+        .question-number {
             min-width: 35px;
             width: 35px;
-        }}
+        }
         
-        .empty-question-cell {{
+        .empty-question-cell {
             min-width: 35px;
             width: 35px;
             background-color: white;
             border: none !important;
-        }}
+        }
         
-        .row-with-spacing td {{
+        .row-with-spacing td {
             border-top: 2px solid black;
             padding-top: 8px;
-        }}
+        }
         
         .row-with-spacing .empty-question-cell,
-        .row-with-spacing .gap-cell {{
+        .row-with-spacing .gap-cell {
             border-top: none !important;
-        }}
+        }
         
-        .gap-cell {{
+        .gap-cell {
             border-right: none !important;
             border-left: none !important;
             border-bottom: none !important;
             background-color: white;
             min-width: 15px;
             width: 15px;
-        }}
+        }
         
-        .grand-total-cell {{
+        .grand-total-cell {
             background-color: #f0f0f0;
             font-size: 10px;
             font-weight: bold;
             border: 2px solid black;
             padding: 5px 10px;
             min-width: 80px;
-        }}
+        }
         
-        .total-box {{
+        .total-box {
             min-width: 60px;
             width: 60px;
             min-height: 60px;
             border: 2px solid black;
             background-color: white;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Chemistry Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "CHEMISTRY PAPER 1"
+                - total_questions: Number of questions in the paper
+                - total_marks: Total marks for the paper
+                - time_allocation: Time in minutes
+                - instructions: List of instruction strings
+                - date: Exam date (optional)
+                - candidate_name_field: Show name field (default: True)
+                - candidate_number_field: Show admission number field (default: True)
+                - date_field: Show date field (default: True)
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'CHEMISTRY PAPER 1')
+        total_questions = data.get('total_questions', 25)
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 HOURS')
+        
+        # Calculate total pages
+        total_pages = 1 + ((total_questions + 2) // 3)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all the questions in the spaces provided.',
+            'ALL working MUST be clearly shown where necessary.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid (reuse Biology Paper 1 grid structure)
+        marking_grid_html = BiologyPaper1Coverpage._generate_marking_grid(total_questions)
+        
+        # Build HTML (similar to Biology Paper 1)
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -3199,10 +3209,10 @@ class ChemistryPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(ChemistryPaper1Coverpage, data), html)
     
     @staticmethod
     def generate_default_coverpage_data(generated_paper, paper):
@@ -3259,306 +3269,299 @@ class ChemistryPaper2Coverpage:
     Chemistry Paper 2 Coverpage Template
     Includes marking grid with individual question rows (Questions 1-8)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Chemistry Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "CHEMISTRY PAPER 2"
-                - total_questions: Number of questions (default: 8)
-                - question_marks: List of marks per question (default: [11,12,13,13,11,10,10,10])
-                - total_marks: Total marks for the paper (default: 80)
-                - time_allocation: Time in minutes
-                - instructions: List of instruction strings
-                - date: Exam date (optional)
-                - candidate_name_field: Show name field (default: True)
-                - candidate_number_field: Show admission number field (default: True)
-                - date_field: Show date field (default: True)
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'CHEMISTRY PAPER 2')
-        
-        # Question configuration (from screenshot)
-        total_questions = data.get('total_questions', 7)  # Default to 7 for Chemistry Paper 2
-        question_marks = data.get('question_marks', [11, 12, 13, 12, 11, 11, 10])  # 7 questions totaling 80
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 HOURS')
-        
-        # Calculate total pages
-        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all questions in the spaces provided below each question.',
-            'All working must be clearly shown in the spaces provided in this booklet.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Chemistry Paper 2
-        marking_grid_html = ChemistryPaper2Coverpage._generate_marking_grid(
-            total_questions, question_marks, total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section for Chemistry Paper 2 */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 50%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #e0e0e0;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="coverpage">
-        <!-- Header -->
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Chemistry Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "CHEMISTRY PAPER 2"
+                - total_questions: Number of questions (default: 8)
+                - question_marks: List of marks per question (default: [11,12,13,13,11,10,10,10])
+                - total_marks: Total marks for the paper (default: 80)
+                - time_allocation: Time in minutes
+                - instructions: List of instruction strings
+                - date: Exam date (optional)
+                - candidate_name_field: Show name field (default: True)
+                - candidate_number_field: Show admission number field (default: True)
+                - date_field: Show date field (default: True)
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'CHEMISTRY PAPER 2')
+        
+        # Question configuration (from screenshot)
+        total_questions = data.get('total_questions', 7)  # Default to 7 for Chemistry Paper 2
+        question_marks = data.get('question_marks', [11, 12, 13, 12, 11, 11, 10])  # 7 questions totaling 80
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 HOURS')
+        
+        # Calculate total pages
+        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all questions in the spaces provided below each question.',
+            'All working must be clearly shown in the spaces provided in this booklet.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Chemistry Paper 2
+        marking_grid_html = ChemistryPaper2Coverpage._generate_marking_grid(
+            total_questions, question_marks, total_marks
+        )
+        
+        # Build HTML
+        html = f"""
+    <div class="coverpage">
+        <!-- Header -->
         <div class="header">
             <div class="logo-container {logo_position}">
                 <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
@@ -3612,13 +3615,14 @@ class ChemistryPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(ChemistryPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(total_questions, question_marks, total_marks):
         """
         Generate marking grid HTML for Chemistry Paper 2
@@ -3768,397 +3772,391 @@ class MathematicsPaper1Coverpage:
     Mathematics Paper 1 Coverpage Template
     Includes sectioned marking grid (Section I and Section II)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Mathematics Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "MATHEMATICS PAPER 1"
-                - section_1_questions: Number of questions in Section I (default: 16)
-                - section_1_marks: Marks per question in Section I (default: 50)
-                - section_2_questions: Number of questions in Section II (default: 8)
-                - section_2_marks: Marks per question in Section II (default: 50)
-                - total_marks: Total marks for the paper (default: 100)
-                - time_allocation: Time in minutes
-                - instructions: List of instruction strings
-                - date: Exam date (optional)
-                - candidate_name_field: Show name field (default: True)
-                - candidate_number_field: Show admission number field (default: True)
-                - date_field: Show date field (default: True)
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'MATHEMATICS PAPER 1')
-        
-        # Section configuration
-        section_1_questions = data.get('section_1_questions', 16)
-        section_1_marks = data.get('section_1_marks', 50)
-        section_2_questions = data.get('section_2_questions', 8)
-        section_2_marks = data.get('section_2_marks', 50)
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total questions and pages
-        total_questions = section_1_questions + section_2_questions
-        total_pages = data.get('total_pages', 16)  # Default 16 printed pages for Math Paper 1
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of two sections: Section I and Section II.',
-            f'Answer all the questions in Section I and only five questions in Section II.',
-            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
-            'Marks may be given for correct working even if the answer is wrong.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Mathematics Paper 1
-        marking_grid_html = MathematicsPaper1Coverpage._generate_marking_grid(
-            section_1_questions, section_1_marks,
-            section_2_questions, section_2_marks,
-            total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section for Mathematics Paper 1 */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 11px;
             font-weight: bold;
             padding: 8px 4px;
             vertical-align: middle;
-        }}
+        }
         
-        .section-label-cell {{
+        .section-label-cell {
             font-size: 12px;
             font-weight: bold;
             background-color: #f5f5f5;
             min-width: 80px;
-        }}
+        }
         
-        .question-number-cell {{
+        .question-number-cell {
             min-width: 35px;
             width: 35px;
-        }}
+        }
         
-        .total-label-cell {{
+        .total-label-cell {
             background-color: #e0e0e0;
             font-weight: bold;
             min-width: 80px;
-        }}
+        }
         
-        .grand-total-cell {{
+        .grand-total-cell {
             background-color: #d0d0d0;
             font-weight: bold;
             font-size: 12px;
             min-width: 100px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="coverpage">
-        <!-- Header -->
-        <div class="header">
-            <div class="logo-container {logo_position}">
-                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
-            </div>
-            <div class="school-name">{school_name}</div>
-            {f'<div class="class-name">{class_name}</div>' if class_name else ''}
-            <div class="exam-title">{exam_title}</div>
-            
-            <div class="paper-details">
-                <span class="paper-name">{paper_name}</span>
-            </div>
-            
-            <div class="time-allocation">{time_allocation}</div>
-        </div>
-        
-        <!-- Candidate Information -->
-        <div class="candidate-info">
-            <div class="candidate-info-grid">
-                {f'<div class="info-row-full"><span class="info-label">NAME:</span><div class="info-field"></div></div>' if show_name else ''}
-                <div class="info-row-full" style="display: flex; gap: 20px;">
-                    {f'<div class="info-row" style="flex: 1;"><span class="info-label">Adm No:</span><div class="info-field"></div></div>' if show_number else ''}
-                    <div class="info-row" style="flex: 1;"><span class="info-label">Class:</span><div class="info-field"></div></div>
-                    {f'<div class="info-row-item"><span class="info-label">DATE:</span><div class="info-field"></div></div>' if show_date else ''}
-                    <div class="info-row" style="flex: 1;"><span class="info-label">Signature:</span><div class="info-field"></div></div>
-                </div>
-            </div>
-        </div>
-        
-        <!-- Instructions -->
-        <div class="instructions">
-            <div class="instructions-title">Instructions to Candidates</div>
-            <ol style="font-style: italic; list-style: none; counter-reset: list-counter; margin-left: 20px;">
-"""
-        
-        # Add instructions
-        for idx, instruction in enumerate(instructions, 1):
-            # Make section-related instructions bold
-            is_bold = 'section' in instruction.lower() or 'all' in instruction.lower() or 'five' in instruction.lower()
-            class_attr = ' class="bold"' if is_bold else ''
-            html += f'                <li style="counter-increment: list-counter;"{class_attr}>{instruction}</li>\n'
-        
-        html += f"""
-            </ol>
-        </div>
-        
-        <!-- Marking Grid -->
-        <div class="marking-grid-container">
-            <div class="grid-title">For Examiner's Use Only</div>
-            {marking_grid_html}
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        return html
+            }
+        }
+    """
     
     @staticmethod
-    def _generate_marking_grid(section_1_questions, section_1_marks, 
-                               section_2_questions, section_2_marks, total_marks):
+    def generate_html(data, body_only=False):
         """
-        Generate marking grid HTML for Mathematics Paper 1
-        
-        Grid structure (based on screenshot):
-        - Row 1: Section I label | Questions 1-16 | Total
-        - Row 2: (blank) | Answer boxes for 1-16 | Total box
-        - Row 3: Section II label | Questions 17-24 | Total | Grand Total label
-        - Row 4: (blank) | Answer boxes for 17-24 | Total box | Grand Total box
+        Generate HTML for Mathematics Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "MATHEMATICS PAPER 1"
+                - section_1_questions: Number of questions in Section I (default: 16)
+                - section_1_marks: Marks per question in Section I (default: 50)
+                - section_2_questions: Number of questions in Section II (default: 8)
+                - section_2_marks: Marks per question in Section II (default: 50)
+                - total_marks: Total marks for the paper (default: 100)
+                - time_allocation: Time in minutes
+                - instructions: List of instruction strings
+                - date: Exam date (optional)
+                - candidate_name_field: Show name field (default: True)
+                - candidate_number_field: Show admission number field (default: True)
+                - date_field: Show date field (default: True)
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'MATHEMATICS PAPER 1')
+        
+        # Section configuration
+        section_1_questions = data.get('section_1_questions', 16)
+        section_1_marks = data.get('section_1_marks', 50)
+        section_2_questions = data.get('section_2_questions', 8)
+        section_2_marks = data.get('section_2_marks', 50)
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total questions and pages
+        total_questions = section_1_questions + section_2_questions
+        total_pages = data.get('total_pages', 16)  # Default 16 printed pages for Math Paper 1
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of two sections: Section I and Section II.',
+            f'Answer all the questions in Section I and only five questions in Section II.',
+            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
+            'Marks may be given for correct working even if the answer is wrong.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Mathematics Paper 1
+        marking_grid_html = MathematicsPaper1Coverpage._generate_marking_grid(
+            section_1_questions, section_1_marks,
+            section_2_questions, section_2_marks,
+            total_marks
+        )
+        
+        # Build HTML
+        html = f"""
+    <div class="coverpage">
+        <!-- Header -->
+        <div class="header">
+            <div class="logo-container {logo_position}">
+                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
+            </div>
+            <div class="school-name">{school_name}</div>
+            {f'<div class="class-name">{class_name}</div>' if class_name else ''}
+            <div class="exam-title">{exam_title}</div>
+            
+            <div class="paper-details">
+                <span class="paper-name">{paper_name}</span>
+            </div>
+            
+            <div class="time-allocation">{time_allocation}</div>
+        </div>
+        
+        <!-- Candidate Information -->
+        <div class="candidate-info">
+            <div class="candidate-info-grid">
+                {f'<div class="info-row-full"><span class="info-label">NAME:</span><div class="info-field"></div></div>' if show_name else ''}
+                <div class="info-row-full" style="display: flex; gap: 20px;">
+                    {f'<div class="info-row" style="flex: 1;"><span class="info-label">Adm No:</span><div class="info-field"></div></div>' if show_number else ''}
+                    <div class="info-row" style="flex: 1;"><span class="info-label">Class:</span><div class="info-field"></div></div>
+                    {f'<div class="info-row-item"><span class="info-label">DATE:</span><div class="info-field"></div></div>' if show_date else ''}
+                    <div class="info-row" style="flex: 1;"><span class="info-label">Signature:</span><div class="info-field"></div></div>
+                </div>
+            </div>
+        </div>
+        
+        <!-- Instructions -->
+        <div class="instructions">
+            <div class="instructions-title">Instructions to Candidates</div>
+            <ol style="font-style: italic; list-style: none; counter-reset: list-counter; margin-left: 20px;">
+"""
+        
+        # Add instructions
+        for idx, instruction in enumerate(instructions, 1):
+            # Make section-related instructions bold
+            is_bold = 'section' in instruction.lower() or 'all' in instruction.lower() or 'five' in instruction.lower()
+            class_attr = ' class="bold"' if is_bold else ''
+            html += f'                <li style="counter-increment: list-counter;"{class_attr}>{instruction}</li>\n'
+        
+        html += f"""
+            </ol>
+        </div>
+        
+        <!-- Marking Grid -->
+        <div class="marking-grid-container">
+            <div class="grid-title">For Examiner's Use Only</div>
+            {marking_grid_html}
+        </div>
+    </div>
+"""
+        
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(MathematicsPaper1Coverpage, data), html)
+    
+    @staticmethod
+    @memoized_fragment
+    def _generate_marking_grid(section_1_questions, section_1_marks, 
+                               section_2_questions, section_2_marks, total_marks):
+        """
+        Generate marking grid HTML for Mathematics Paper 1
+        
+        Grid structure (based on screenshot):
+        - Row 1: Section I label | Questions 1-16 | Total
+        - Row 2: (blank) | Answer boxes for 1-16 | Total box
+        - Row 3: Section II label | Questions 17-24 | Total | Grand Total label
+        - Row 4: (blank) | Answer boxes for 17-24 | Total box | Grand Total box
         
         Args:
             section_1_questions (int): Number of questions in Section I
@@ -4280,331 +4278,324 @@ class MathematicsPaper2Coverpage:
     Mathematics Paper 2 Coverpage Template
     Includes sectioned marking grid (Section I and Section II)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Mathematics Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys similar to Paper 1
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'MATHEMATICS PAPER 2')
-        
-        # Section configuration (same as Paper 1)
-        section_1_questions = data.get('section_1_questions', 16)
-        section_1_marks = data.get('section_1_marks', 50)
-        section_2_questions = data.get('section_2_questions', 8)
-        section_2_marks = data.get('section_2_marks', 50)
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total questions and pages
-        total_questions = section_1_questions + section_2_questions
-        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of two sections: Section I and Section II.',
-            f'Answer all the questions in Section I and only five questions in Section II.',
-            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
-            'Marks may be given for correct working even if the answer is wrong.',
-            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Mathematics Paper 2 (same structure as Paper 1)
-        marking_grid_html = MathematicsPaper1Coverpage._generate_marking_grid(
-            section_1_questions, section_1_marks,
-            section_2_questions, section_2_marks,
-            total_marks
-        )
-        
-        # Build HTML (reusing Paper 1 styles)
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 11px;
             font-weight: bold;
             padding: 8px 4px;
             vertical-align: middle;
-        }}
+        }
         
-        .section-label-cell {{
+        .section-label-cell {
             font-size: 12px;
             font-weight: bold;
             background-color: #f5f5f5;
             min-width: 80px;
-        }}
+        }
         
-        .question-number-cell {{
+        .question-number-cell {
             min-width: 35px;
             width: 35px;
-        }}
+        }
         
-        .total-label-cell {{
+        .total-label-cell {
             background-color: #e0e0e0;
             font-weight: bold;
             min-width: 80px;
-        }}
+        }
         
-        .grand-total-cell {{
+        .grand-total-cell {
             background-color: #d0d0d0;
             font-weight: bold;
             font-size: 12px;
             min-width: 100px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="coverpage">
-        <!-- Header -->
-        <div class="header">
-            <div class="logo-container {logo_position}">
-                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
-            </div>
-            <div class="school-name">{school_name}</div>
-            {f'<div class="class-name">{class_name}</div>' if class_name else ''}
-            <div class="exam-title">{exam_title}</div>
-            
-            <div class="paper-details">
-                <span class="paper-name">{paper_name}</span>
-            </div>
-            
-            <div class="time-allocation">{time_allocation}</div>
-        </div>
-        
-        <!-- Candidate Information -->
-        <div class="candidate-info">
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Mathematics Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys similar to Paper 1
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'MATHEMATICS PAPER 2')
+        
+        # Section configuration (same as Paper 1)
+        section_1_questions = data.get('section_1_questions', 16)
+        section_1_marks = data.get('section_1_marks', 50)
+        section_2_questions = data.get('section_2_questions', 8)
+        section_2_marks = data.get('section_2_marks', 50)
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total questions and pages
+        total_questions = section_1_questions + section_2_questions
+        total_pages = data.get('total_pages', 16)  # Default 16 printed pages
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of two sections: Section I and Section II.',
+            f'Answer all the questions in Section I and only five questions in Section II.',
+            f'Show all the steps in your calculations, giving your answers at each stage in the spaces provided below each question.',
+            'Marks may be given for correct working even if the answer is wrong.',
+            'Non-programmable silent electronic calculators and KNEC Mathematical tables may be used, except where stated otherwise.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Mathematics Paper 2 (same structure as Paper 1)
+        marking_grid_html = MathematicsPaper1Coverpage._generate_marking_grid(
+            section_1_questions, section_1_marks,
+            section_2_questions, section_2_marks,
+            total_marks
+        )
+        
+        # Build HTML (reusing Paper 1 styles)
+        html = f"""
+    <div class="coverpage">
+        <!-- Header -->
+        <div class="header">
+            <div class="logo-container {logo_position}">
+                <img src="{school_logo}" alt="School Logo" class="school-logo" onerror="this.src='/exam.png'">
+            </div>
+            <div class="school-name">{school_name}</div>
+            {f'<div class="class-name">{class_name}</div>' if class_name else ''}
+            <div class="exam-title">{exam_title}</div>
+            
+            <div class="paper-details">
+                <span class="paper-name">{paper_name}</span>
+            </div>
+            
+            <div class="time-allocation">{time_allocation}</div>
+        </div>
+        
+        <!-- Candidate Information -->
+        <div class="candidate-info">
             <div class="candidate-info-grid">
                 {f'<div class="info-row-full"><span class="info-label">NAME:</span><div class="info-field"></div></div>' if show_name else ''}
                 <div class="info-row-full" style="display: flex; gap: 20px;">
@@ -4639,11 +4630,11 @@ class MathematicsPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(MathematicsPaper2Coverpage, data), html)
     
     @staticmethod
     def generate_default_coverpage_data(generated_paper, paper):
@@ -4713,9 +4704,11 @@ class GeographyPaper1Coverpage:
     Geography Paper 1 Coverpage Template
     Includes sectioned marking grid (Section A and Section B)
     """
+
+    STYLESHEET = PhysicsPaper2Coverpage.STYLESHEET
     
     @staticmethod
-    def generate_html(data):
+    def generate_html(data, body_only=False):
         """
         Generate HTML for Geography Paper 1 coverpage
         
@@ -4782,245 +4775,6 @@ class GeographyPaper1Coverpage:
         
         # Build HTML
         html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: 20mm;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            font-size: 12pt;
-            line-height: 1.5;
-            color: black;
-            background: white;
-        }}
-        
-        .coverpage {{
-            width: 100%;
-            min-height: 100vh;
-            padding: 15mm;
-            display: flex;
-            flex-direction: column;
-            page-break-after: always;
-        }}
-        
-        /* Header Section */
-        .header {{
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-        
-        .logo-container {{
-            margin-bottom: 15px;
-        }}
-        
-        .logo-container.left {{
-            text-align: left;
-        }}
-        
-        .logo-container.center {{
-            text-align: center;
-        }}
-        
-        .logo-container.right {{
-            text-align: right;
-        }}
-        
-        .school-logo {{
-            max-width: 90px;
-            max-height: 90px;
-            object-fit: contain;
-        }}
-        
-        .school-name {{
-            font-size: 1.8rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-        }}
-        
-        .class-name {{
-            font-size: 1.3rem;
-            font-weight: bold;
-            margin-bottom: 8px;
-        }}
-        
-        .exam-title {{
-            font-size: 1.4rem;
-            font-weight: bold;
-            margin-bottom: 15px;
-            text-transform: uppercase;
-        }}
-        
-        .paper-details {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 5px;
-        }}
-        
-        .paper-name {{
-            font-size: 1.5rem;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        
-        .time-allocation {{
-            font-size: 1.3rem;
-            margin-top: 5px;
-        }}
-        
-        /* Candidate Info Section */
-        .candidate-info {{
-            margin: 20px 0;
-            padding: 15px;
-            border: none;
-        }}
-        
-        .candidate-info-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr 1fr;
-            gap: 15px 20px;
-        }}
-        
-        .info-row {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-row-full {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-item {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-label {{
-            font-weight: bold;
-            font-size: 12px;
-            min-width: 40px;
-        }}
-        
-        .info-field {{
-            flex: 1;
-            border-bottom: 1px dotted black;
-            min-height: 25px;
-            padding: 2px 5px;
-        }}
-        
-        /* Instructions Section */
-        .instructions {{
-            margin-bottom: 20px;
-        }}
-        
-        .instructions-title {{
-            font-weight: bold;
-            font-size: 1.6rem;
-            margin-bottom: 10px;
-            text-decoration: underline;
-        }}
-        
-        .instructions ol {{
-            margin-left: 20px;
-            font-size: 1.5rem;
-            line-height: 1.6;
-            font-style: italic;
-        }}
-        
-        .instructions li {{
-            margin-bottom: 8px;
-        }}
-        
-        .instructions li.bold {{
-            font-weight: bold;
-        }}
-        
-        /* Marking Grid Section */
-        .marking-grid-container {{
-            margin-top: auto;
-            padding-top: 20px;
-        }}
-        
-        .grid-title {{
-            font-weight: bold;
-            font-size: 14px;
-            margin-bottom: 12px;
-            text-align: center;
-            text-transform: uppercase;
-        }}
-        
-        .marking-grid {{
-            width: 60%;
-            margin: 0 auto;
-            border-collapse: collapse;
-            border: 2px solid black;
-        }}
-        
-        .marking-grid th,
-        .marking-grid td {{
-            border: 1px solid black;
-            text-align: center;
-            font-size: 12px;
-            padding: 10px 8px;
-        }}
-        
-        .marking-grid th {{
-            background-color: #f0f0f0;
-            font-weight: bold;
-        }}
-        
-        .section-label {{
-            font-size: 13px;
-            font-weight: bold;
-            vertical-align: middle;
-            background-color: #f5f5f5;
-        }}
-        
-        .total-row {{
-            background-color: #e0e0e0;
-            font-weight: bold;
-            font-size: 13px;
-        }}
-        
-        /* Print Styles */
-        @media print {{
-            body {{
-                margin: 0;
-                padding: 20mm;
-            }}
-            
-            .coverpage {{
-                page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -5076,13 +4830,14 @@ class GeographyPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(GeographyPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_a_questions, section_a_marks, 
                                section_b_question, section_b_marks, total_marks):
         """
@@ -5225,9 +4980,11 @@ class GeographyPaper2Coverpage:
     Geography Paper 2 Coverpage Template
     Includes sectioned marking grid (Section A and Section B)
     """
+
+    STYLESHEET = PhysicsPaper2Coverpage.STYLESHEET
     
     @staticmethod
-    def generate_html(data):
+    def generate_html(data, body_only=False):
         """
         Generate HTML for Geography Paper 2 coverpage
         
@@ -5279,261 +5036,22 @@ class GeographyPaper2Coverpage:
             f'This paper consists of {total_pages} printed pages.',
             'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
             'Candidates should answer the questions in English'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Geography Paper 2
-        marking_grid_html = GeographyPaper2Coverpage._generate_marking_grid(
-            section_a_questions, section_a_marks,
-            section_b_question, section_b_marks,
-            total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: 20mm;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            font-size: 12pt;
-            line-height: 1.5;
-            color: black;
-            background: white;
-        }}
-        
-        .coverpage {{
-            width: 100%;
-            min-height: 100vh;
-            padding: 15mm;
-            display: flex;
-            flex-direction: column;
-            page-break-after: always;
-        }}
-        
-        /* Header Section */
-        .header {{
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-        
-        .logo-container {{
-            margin-bottom: 15px;
-        }}
-        
-        .logo-container.left {{
-            text-align: left;
-        }}
-        
-        .logo-container.center {{
-            text-align: center;
-        }}
-        
-        .logo-container.right {{
-            text-align: right;
-        }}
-        
-        .school-logo {{
-            max-width: 90px;
-            max-height: 90px;
-            object-fit: contain;
-        }}
-        
-        .school-name {{
-            font-size: 1.8rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-        }}
-        
-        .class-name {{
-            font-size: 1.3rem;
-            font-weight: bold;
-            margin-bottom: 8px;
-        }}
-        
-        .exam-title {{
-            font-size: 1.4rem;
-            font-weight: bold;
-            margin-bottom: 15px;
-            text-transform: uppercase;
-        }}
-        
-        .paper-details {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 5px;
-        }}
-        
-        .paper-name {{
-            font-size: 1.5rem;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        
-        .time-allocation {{
-            font-size: 1.3rem;
-            margin-top: 5px;
-        }}
-        
-        /* Candidate Info Section */
-        .candidate-info {{
-            margin: 20px 0;
-            padding: 15px;
-            border: none;
-        }}
-        
-        .candidate-info-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr 1fr;
-            gap: 15px 20px;
-        }}
-        
-        .info-row {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-row-full {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-item {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-label {{
-            font-weight: bold;
-            font-size: 12px;
-            min-width: 40px;
-        }}
-        
-        .info-field {{
-            flex: 1;
-            border-bottom: 1px dotted black;
-            min-height: 25px;
-            padding: 2px 5px;
-        }}
-        
-        /* Instructions Section */
-        .instructions {{
-            margin-bottom: 20px;
-        }}
-        
-        .instructions-title {{
-            font-weight: bold;
-            font-size: 1.6rem;
-            margin-bottom: 10px;
-            text-decoration: underline;
-        }}
-        
-        .instructions ol {{
-            margin-left: 20px;
-            font-size: 1.5rem;
-            line-height: 1.6;
-            font-style: italic;
-        }}
-        
-        .instructions li {{
-            margin-bottom: 8px;
-        }}
-        
-        .instructions li.bold {{
-            font-weight: bold;
-        }}
-        
-        /* Marking Grid Section */
-        .marking-grid-container {{
-            margin-top: auto;
-            padding-top: 20px;
-        }}
-        
-        .grid-title {{
-            font-weight: bold;
-            font-size: 14px;
-            margin-bottom: 12px;
-            text-align: center;
-            text-transform: uppercase;
-        }}
-        
-        .marking-grid {{
-            width: 60%;
-            margin: 0 auto;
-            border-collapse: collapse;
-            border: 2px solid black;
-        }}
-        
-        .marking-grid th,
-        .marking-grid td {{
-            border: 1px solid black;
-            text-align: center;
-            font-size: 12px;
-            padding: 10px 8px;
-        }}
-        
-        .marking-grid th {{
-            background-color: #f0f0f0;
-            font-weight: bold;
-        }}
-        
-        .section-label {{
-            font-size: 13px;
-            font-weight: bold;
-            vertical-align: middle;
-            background-color: #f5f5f5;
-        }}
+        ])
         
-        .total-row {{
-            background-color: #e0e0e0;
-            font-weight: bold;
-            font-size: 13px;
-        }}
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
         
-        /* Print Styles */
-        @media print {{
-            body {{
-                margin: 0;
-                padding: 20mm;
-            }}
-            
-            .coverpage {{
-                page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+        # Generate marking grid for Geography Paper 2
+        marking_grid_html = GeographyPaper2Coverpage._generate_marking_grid(
+            section_a_questions, section_a_marks,
+            section_b_question, section_b_marks,
+            total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -5589,13 +5107,14 @@ class GeographyPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(GeographyPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_a_questions, section_a_marks, 
                                section_b_question, section_b_marks, total_marks):
         """
@@ -5740,95 +5259,29 @@ class EnglishPaper1Coverpage:
     English Paper 1 Coverpage Template
     Includes simple marking grid with individual questions
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for English Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "ENGLISH PAPER 1"
-                - total_questions: Number of questions (default: 3)
-                - question_marks: List of marks per question (default: [20, 10, 30])
-                - total_marks: Total marks (default: 60)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'ENGLISH PAPER 1')
-        
-        # Question configuration (from screenshot)
-        total_questions = data.get('total_questions', 3)
-        question_marks = data.get('question_marks', [20, 10, 30])
-        total_marks = data.get('total_marks', 60)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total pages
-        total_pages = data.get('total_pages', 8)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all the questions in this paper.',
-            'All your answers must be written in the question paper.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates must answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for English Paper 1
-        marking_grid_html = EnglishPaper1Coverpage._generate_marking_grid(
-            total_questions, question_marks, total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 0;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
             padding: 20mm;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100%;
             padding: 0;
@@ -5836,205 +5289,264 @@ class EnglishPaper1Coverpage:
             flex-direction: column;
             page-break-after: always;
             justify-content: space-between;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 50%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #e0e0e0;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for English Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "ENGLISH PAPER 1"
+                - total_questions: Number of questions (default: 3)
+                - question_marks: List of marks per question (default: [20, 10, 30])
+                - total_marks: Total marks (default: 60)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'ENGLISH PAPER 1')
+        
+        # Question configuration (from screenshot)
+        total_questions = data.get('total_questions', 3)
+        question_marks = data.get('question_marks', [20, 10, 30])
+        total_marks = data.get('total_marks', 60)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total pages
+        total_pages = data.get('total_pages', 8)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all the questions in this paper.',
+            'All your answers must be written in the question paper.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates must answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for English Paper 1
+        marking_grid_html = EnglishPaper1Coverpage._generate_marking_grid(
+            total_questions, question_marks, total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -6090,13 +5602,14 @@ class EnglishPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(EnglishPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(total_questions, question_marks, total_marks):
         """
         Generate marking grid HTML for English Paper 1
@@ -6217,301 +5730,294 @@ class EnglishPaper1Coverpage:
 class EnglishPaper2Coverpage:
     """
     English Paper 2 Coverpage Template
-    Includes simple marking grid with individual questions
-    """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for English Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
-                - paper_name: e.g., "ENGLISH PAPER 2"
-                - total_questions: Number of questions (default: 4)
-                - question_marks: List of marks per question (default: [20, 25, 20, 15])
-                - total_marks: Total marks (default: 80)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'ENGLISH PAPER 2')
-        
-        # Question configuration (from screenshot)
-        total_questions = data.get('total_questions', 4)
-        question_marks = data.get('question_marks', [20, 25, 20, 15])
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total pages
-        total_pages = data.get('total_pages', 8)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all the questions in this question paper.',
-            'All your answers must be written in the spaces provided in this question paper.',
-            f'This paper consists of 12 printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates must answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for English Paper 2
-        marking_grid_html = EnglishPaper2Coverpage._generate_marking_grid(
-            total_questions, question_marks, total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+    Includes simple marking grid with individual questions
+    """
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
             text-decoration: underline;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 50%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #e0e0e0;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for English Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM 3 EXAMINATION 2025"
+                - paper_name: e.g., "ENGLISH PAPER 2"
+                - total_questions: Number of questions (default: 4)
+                - question_marks: List of marks per question (default: [20, 25, 20, 15])
+                - total_marks: Total marks (default: 80)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'ENGLISH PAPER 2')
+        
+        # Question configuration (from screenshot)
+        total_questions = data.get('total_questions', 4)
+        question_marks = data.get('question_marks', [20, 25, 20, 15])
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total pages
+        total_pages = data.get('total_pages', 8)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all the questions in this question paper.',
+            'All your answers must be written in the spaces provided in this question paper.',
+            f'This paper consists of 12 printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates must answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for English Paper 2
+        marking_grid_html = EnglishPaper2Coverpage._generate_marking_grid(
+            total_questions, question_marks, total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -6567,13 +6073,14 @@ class EnglishPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(EnglishPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(total_questions, question_marks, total_marks):
         """
         Generate marking grid HTML for English Paper 2
@@ -6696,9 +6203,11 @@ class EnglishPaper3Coverpage:
     English Paper 3 Coverpage Template
     Includes simple marking grid with individual questions
     """
+
+    STYLESHEET = EnglishPaper2Coverpage.STYLESHEET
     
     @staticmethod
-    def generate_html(data):
+    def generate_html(data, body_only=False):
         """
         Generate HTML for English Paper 3 coverpage
         
@@ -6760,239 +6269,7 @@ class EnglishPaper3Coverpage:
         )
         
         # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
-            size: A4;
-            margin: 20mm;
-        }}
-        
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        
-        body {{
-            font-family: 'Times New Roman', Times, serif;
-            font-size: 12pt;
-            line-height: 1.5;
-            color: black;
-            background: white;
-        }}
-        
-        .coverpage {{
-            width: 100%;
-            min-height: 100vh;
-            padding: 15mm;
-            display: flex;
-            flex-direction: column;
-            page-break-after: always;
-        }}
-        
-        /* Header Section */
-        .header {{
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-        
-        .logo-container {{
-            margin-bottom: 15px;
-        }}
-        
-        .logo-container.left {{
-            text-align: left;
-        }}
-        
-        .logo-container.center {{
-            text-align: center;
-        }}
-        
-        .logo-container.right {{
-            text-align: right;
-        }}
-        
-        .school-logo {{
-            max-width: 90px;
-            max-height: 90px;
-            object-fit: contain;
-        }}
-        
-        .school-name {{
-            font-size: 1.8rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-        }}
-        
-        .class-name {{
-            font-size: 1.3rem;
-            font-weight: bold;
-            margin-bottom: 8px;
-        }}
-        
-        .exam-title {{
-            font-size: 1.4rem;
-            font-weight: bold;
-            margin-bottom: 15px;
-            text-transform: uppercase;
-        }}
-        
-        .paper-details {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 5px;
-        }}
-        
-        .paper-name {{
-            font-size: 1.5rem;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        
-        .time-allocation {{
-            font-size: 1.3rem;
-            margin-top: 5px;
-        }}
-        
-        /* Candidate Info Section */
-        .candidate-info {{
-            margin: 20px 0;
-            padding: 15px;
-            border: none;
-        }}
-        
-        .candidate-info-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr 1fr 1fr;
-            gap: 15px 20px;
-        }}
-        
-        .info-row {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-row-full {{
-            display: flex;
-            align-items: center;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-grid {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-bottom: 15px;
-        }}
-        
-        .info-row-item {{
-            display: flex;
-            align-items: center;
-        }}
-        
-        .info-label {{
-            font-weight: bold;
-            font-size: 12px;
-            min-width: 40px;
-        }}
-        
-        .info-field {{
-            flex: 1;
-            border-bottom: 1px dotted black;
-            min-height: 25px;
-            padding: 2px 5px;
-        }}
-        
-        /* Instructions Section */
-        .instructions {{
-            margin-bottom: 20px;
-        }}
-        
-        .instructions-title {{
-            font-weight: bold;
-            font-size: 1.6rem;
-            margin-bottom: 10px;
-            text-decoration: underline;
-        }}
-        
-        .instructions ol {{
-            margin-left: 20px;
-            font-size: 1.5rem;
-            line-height: 1.6;
-            font-style: italic;
-        }}
-        
-        .instructions li {{
-            margin-bottom: 8px;
-        }}
-        
-        .instructions li.bold {{
-            font-weight: bold;
-        }}
-        
-        /* Marking Grid Section */
-        .marking-grid-container {{
-            margin-top: auto;
-            padding-top: 20px;
-        }}
-        
-        .grid-title {{
-            font-weight: bold;
-            font-size: 14px;
-            margin-bottom: 12px;
-            text-align: center;
-            text-transform: uppercase;
-        }}
-        
-        .marking-grid {{
-            width: 50%;
-            margin: 0 auto;
-            border-collapse: collapse;
-            border: 2px solid black;
-        }}
-        
-        .marking-grid th,
-        .marking-grid td {{
-            border: 1px solid black;
-            text-align: center;
-            font-size: 12px;
-            padding: 10px 8px;
-        }}
-        
-        .marking-grid th {{
-            background-color: #f0f0f0;
-            font-weight: bold;
-        }}
-        
-        .total-row {{
-            background-color: #e0e0e0;
-            font-weight: bold;
-            font-size: 13px;
-        }}
-        
-        /* Print Styles */
-        @media print {{
-            body {{
-                margin: 0;
-                padding: 20mm;
-            }}
-            
-            .coverpage {{
-                page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -7051,13 +6328,14 @@ class EnglishPaper3Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(EnglishPaper3Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(total_questions, question_marks, total_marks):
         """
         Generate marking grid HTML for English Paper 3
@@ -7184,283 +6462,275 @@ class KiswahiliPaper2Coverpage:
     Kiswahili Paper 2 Coverpage Template
     Includes sectioned marking grid (4 sections: Ufhamu, Ufupisho, Matumizi ya Lugha, Isimu Jamii)
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Kiswahili Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "MTIHANI WA MWISHO WA MUHULA 2025"
-                - paper_name: e.g., "KISWAHILI KARATASI YA PILI"
-                - section_1_marks: Marks for Ufhamu (default: 15)
-                - section_2_marks: Marks for Ufupisho (default: 15)
-                - section_3_marks: Marks for Matumizi ya Lugha (default: 40)
-                - section_4_marks: Marks for Isimu Jamii (default: 10)
-                - total_marks: Total marks (default: 80)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'KITUO CHA MTIHANI')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'MTIHANI WA MWISHO WA MUHULA 2025')
-        paper_name = data.get('paper_name', 'KISWAHILI KARATASI YA PILI')
-        
-        # Section configuration (from screenshot)
-        section_1_marks = data.get('section_1_marks', 15)  # Ufhamu
-        section_2_marks = data.get('section_2_marks', 15)  # Ufupisho
-        section_3_marks = data.get('section_3_marks', 40)  # Matumizi ya Lugha
-        section_4_marks = data.get('section_4_marks', 10)  # Isimu Jamii
-        total_marks = data.get('total_marks', 80)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total pages
-        total_pages = data.get('total_pages', 16)
-        
-        instructions = data.get('instructions', [
-            'Andika jina lako na nambari yako ya mtihani katika nafasi zilizotolewa hapa juu.',
-            'Tia sahihi sasa kisha uandike tarehe ya mtihani katika nafasi zilizotolewa hapa juu.',
-            'Jibu maswali yote.',
-            'Majibu yako yaandikwe katika nafasi zilizotolewa katika kijitabu hiki cha maswali.',
-            'Punguzo la alama hata kwa swali moja halitakubalika.',
-            'Karatasi hii ina kurasa 12 zilizochapwa.',
-            'Wagombea wanafaa kuziangalia karatasi zote ili zithibitishe chapa zote zimefanyika kama zilivyoorodheshwa na kuwa hakuna maswali yote yanaonekana.',
-            'Wagombea wanapaswa kujibu maswali kwa Kiswahili sanifu.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Kiswahili Paper 2
-        marking_grid_html = KiswahiliPaper2Coverpage._generate_marking_grid(
-            section_1_marks, section_2_marks, section_3_marks, section_4_marks, total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="sw">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Ukurasa wa Mbele</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: {logo_position};
             margin-bottom: 15px;
             border-bottom: 3px solid black;
             padding-bottom: 10px;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 80px;
             max-height: 80px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 16pt;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 3px;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 12pt;
             font-weight: bold;
             margin-top: 5px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 13pt;
             font-weight: bold;
             text-align: left;
             margin: 15px 0;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 14pt;
             font-weight: bold;
             text-align: left;
             margin: 15px 0;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             text-align: left;
             margin: 15px 0;
             font-size: 11pt;
-        }}
+        }
         
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             border: 2px solid black;
             padding: 15px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             justify-content: space-between;
             margin-bottom: 15px;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             margin-bottom: 15px;
             align-items: center;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             min-width: 150px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px solid black;
             min-height: 30px;
             margin-left: 10px;
-        }}
+        }
         
-        .instructions {{
+        .instructions {
             margin: 20px 0;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-size: 13pt;
             font-weight: bold;
             margin-bottom: 10px;
             text-transform: uppercase;
-        }}
+        }
         
-        .instructions-list {{
+        .instructions-list {
             list-style-position: outside;
             padding-left: 25px;
-        }}
+        }
         
-        .instructions-list li {{
+        .instructions-list li {
             margin-bottom: 8px;
             line-height: 1.4;
-        }}
+        }
         
-        .marking-section {{
+        .marking-section {
             margin-top: 25px;
             page-break-inside: avoid;
-        }}
+        }
         
-        .marking-title {{
+        .marking-title {
             font-size: 11pt;
             font-weight: bold;
             text-align: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             border-collapse: collapse;
             margin: 0 auto;
             max-width: 400px;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 2px solid black;
             padding: 10px;
             text-align: center;
             font-size: 11pt;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .marking-grid .section-cell {{
+        .marking-grid .section-cell {
             text-align: center;
             font-weight: bold;
-        }}
+        }
         
-        .marking-grid .marks-cell {{
+        .marking-grid .marks-cell {
             text-align: center;
-        }}
+        }
         
-        .marking-grid .answer-cell {{
+        .marking-grid .answer-cell {
             background-color: white;
             min-height: 40px;
-        }}
+        }
         
-        .marking-grid .total-row {{
+        .marking-grid .total-row {
             font-weight: bold;
             background-color: #f0f0f0;
-        }}
+        }
         
-        @media print {{
-            .coverpage {{
+        @media print {
+            .coverpage {
                 page-break-after: always;
-            }}
+            }
             
-            body {{
+            body {
                 print-color-adjust: exact;
                 -webkit-print-color-adjust: exact;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Kiswahili Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "MTIHANI WA MWISHO WA MUHULA 2025"
+                - paper_name: e.g., "KISWAHILI KARATASI YA PILI"
+                - section_1_marks: Marks for Ufhamu (default: 15)
+                - section_2_marks: Marks for Ufupisho (default: 15)
+                - section_3_marks: Marks for Matumizi ya Lugha (default: 40)
+                - section_4_marks: Marks for Isimu Jamii (default: 10)
+                - total_marks: Total marks (default: 80)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'KITUO CHA MTIHANI')
+        school_logo = data.get('school_logo', '/exam.png')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'MTIHANI WA MWISHO WA MUHULA 2025')
+        paper_name = data.get('paper_name', 'KISWAHILI KARATASI YA PILI')
+        
+        # Section configuration (from screenshot)
+        section_1_marks = data.get('section_1_marks', 15)  # Ufhamu
+        section_2_marks = data.get('section_2_marks', 15)  # Ufupisho
+        section_3_marks = data.get('section_3_marks', 40)  # Matumizi ya Lugha
+        section_4_marks = data.get('section_4_marks', 10)  # Isimu Jamii
+        total_marks = data.get('total_marks', 80)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total pages
+        total_pages = data.get('total_pages', 16)
+        
+        instructions = data.get('instructions', [
+            'Andika jina lako na nambari yako ya mtihani katika nafasi zilizotolewa hapa juu.',
+            'Tia sahihi sasa kisha uandike tarehe ya mtihani katika nafasi zilizotolewa hapa juu.',
+            'Jibu maswali yote.',
+            'Majibu yako yaandikwe katika nafasi zilizotolewa katika kijitabu hiki cha maswali.',
+            'Punguzo la alama hata kwa swali moja halitakubalika.',
+            'Karatasi hii ina kurasa 12 zilizochapwa.',
+            'Wagombea wanafaa kuziangalia karatasi zote ili zithibitishe chapa zote zimefanyika kama zilivyoorodheshwa na kuwa hakuna maswali yote yanaonekana.',
+            'Wagombea wanapaswa kujibu maswali kwa Kiswahili sanifu.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Kiswahili Paper 2
+        marking_grid_html = KiswahiliPaper2Coverpage._generate_marking_grid(
+            section_1_marks, section_2_marks, section_3_marks, section_4_marks, total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header with Logo and School Name -->
         <div class="header">
@@ -7533,13 +6803,14 @@ class KiswahiliPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Ukurasa wa Mbele", coverpage_stylesheet(KiswahiliPaper2Coverpage, data), html, lang='sw')
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(section_1_marks, section_2_marks, section_3_marks, section_4_marks, total_marks):
         """
         Generate marking grid HTML for Kiswahili Paper 2
@@ -7653,301 +6924,293 @@ class KiswahiliPaper2Coverpage:
                 'Majibu yako yaandikwe katika nafasi zilizotolewa katika kijitabu hiki cha maswali.',
                 'Punguzo la alama hata kwa swali moja halitakubalika.',
                 f'Karatasi hii ina kurasa {total_pages} zilizochapwa.',
-                'Wagombea wanafaa kuziangalia karatasi zote ili zithibitishe chapa zote zimefanyika kama zilivyoorodheshwa na kuwa hakuna maswali yote yanaonekana.',
-                'Wagombea wanapaswa kujibu maswali kwa Kiswahili sanifu.'
-            ],
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'candidate_name_field': True,
-            'candidate_number_field': True,
-            'date_field': True
-        }
-
-
-
-class KiswahiliPaper1Coverpage:
-    """
-    Kiswahili Paper 1 Coverpage Template
-    Question 1 is compulsory, choose 1 from remaining 3 questions
-    """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Kiswahili Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "MTIHANI WA MWISHO WA MUHULA 2025"
-                - paper_name: e.g., "KISWAHILI KARATASI YA KWANZA"
-                - question_1_marks: Marks for Question 1 (default: 20)
-                - question_2_4_marks: Marks for Questions 2-4 (default: 20)
-                - total_marks: Total marks (default: 40)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'KITUO CHA MTIHANI')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'MTIHANI WA MWISHO WA MUHULA 2025')
-        paper_name = data.get('paper_name', 'KISWAHILI KARATASI YA KWANZA')
-        
-        # Question configuration (from screenshot)
-        question_1_marks = data.get('question_1_marks', 20)  # Compulsory
-        question_2_4_marks = data.get('question_2_4_marks', 20)  # Choose 1 from 3
-        total_marks = data.get('total_marks', 40)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        
-        # Calculate total pages
-        total_pages = data.get('total_pages', 12)
-        
-        instructions = data.get('instructions', [
-            'Andika jina lako na nambari yako ya mtihani katika nafasi ulizoachiwa hapa juu.',
-            'Tia sahihi sasa uandike tarehe ya mtihani katika nafasi zilizoochiwa hapa juu.',
-            'Andika insha mbili. Insha ya kwanza ni ya lazima.',
-            'Kisha chagua insha nyingine moja kati ya hizo tatu zilizobakia.',
-            'Kila insha isipungue maneno 450.',
-            'Kila insha ina alama 20.',
-            'Jibu maswali kwenye andikwe kwa lugha ya Kiswahili.',
-            'Insha zote sharti zandikwe katika nafasi ulizoachibwa katika kijitabu hiki cha maswali.',
-            'Karatasi hii ina kurasa 12 zilizopigwa chapa.',
-            'Watahiniwa ni lazima wahakikishe kwamba kurasa zote za karatasi hii zimepigwa chapa sawasawa na kuwa maswali yote yamo.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Kiswahili Paper 1
-        marking_grid_html = KiswahiliPaper1Coverpage._generate_marking_grid(
-            question_1_marks, question_2_4_marks, total_marks
-        )
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="sw">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Ukurasa wa Mbele</title>
-    <style>
-        @page {{
+                'Wagombea wanafaa kuziangalia karatasi zote ili zithibitishe chapa zote zimefanyika kama zilivyoorodheshwa na kuwa hakuna maswali yote yanaonekana.',
+                'Wagombea wanapaswa kujibu maswali kwa Kiswahili sanifu.'
+            ],
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'candidate_name_field': True,
+            'candidate_number_field': True,
+            'date_field': True
+        }
+
+
+
+class KiswahiliPaper1Coverpage:
+    """
+    Kiswahili Paper 1 Coverpage Template
+    Question 1 is compulsory, choose 1 from remaining 3 questions
+    """
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: {logo_position};
             margin-bottom: 15px;
             border-bottom: 3px solid black;
             padding-bottom: 10px;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 80px;
             max-height: 80px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 16pt;
             font-weight: bold;
             text-transform: uppercase;
             margin-bottom: 3px;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 12pt;
             font-weight: bold;
             margin-top: 5px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 13pt;
             font-weight: bold;
             text-align: left;
             margin: 15px 0;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-title {{
+        .paper-title {
             font-size: 14pt;
             font-weight: bold;
             text-align: left;
             margin: 15px 0;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             text-align: left;
             margin: 15px 0;
             font-size: 11pt;
-        }}
+        }
         
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             border: 2px solid black;
             padding: 15px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             justify-content: space-between;
             margin-bottom: 15px;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             margin-bottom: 15px;
             align-items: center;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             min-width: 150px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px solid black;
             min-height: 30px;
             margin-left: 10px;
-        }}
+        }
         
-        .instructions {{
+        .instructions {
             margin: 20px 0;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-size: 13pt;
             font-weight: bold;
             margin-bottom: 10px;
             text-transform: uppercase;
-        }}
+        }
         
-        .instructions-list {{
+        .instructions-list {
             list-style-position: outside;
             padding-left: 25px;
-        }}
+        }
         
-        .instructions-list li {{
+        .instructions-list li {
             margin-bottom: 8px;
             line-height: 1.4;
-        }}
+        }
         
-        .instructions-list li strong {{
+        .instructions-list li strong {
             font-weight: bold;
-        }}
+        }
         
-        .marking-section {{
+        .marking-section {
             margin-top: 25px;
             page-break-inside: avoid;
-        }}
+        }
         
-        .marking-title {{
+        .marking-title {
             font-size: 11pt;
             font-weight: bold;
             text-align: center;
             margin-bottom: 10px;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             border-collapse: collapse;
             margin: 0 auto;
             max-width: 400px;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 2px solid black;
             padding: 10px;
             text-align: center;
             font-size: 11pt;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .marking-grid .question-cell {{
+        .marking-grid .question-cell {
             text-align: center;
             font-weight: bold;
-        }}
+        }
         
-        .marking-grid .marks-cell {{
+        .marking-grid .marks-cell {
             text-align: center;
-        }}
+        }
         
-        .marking-grid .answer-cell {{
+        .marking-grid .answer-cell {
             background-color: white;
             min-height: 40px;
-        }}
+        }
         
-        .marking-grid .total-row {{
+        .marking-grid .total-row {
             font-weight: bold;
             background-color: #f0f0f0;
-        }}
+        }
         
-        @media print {{
-            .coverpage {{
+        @media print {
+            .coverpage {
                 page-break-after: always;
-            }}
+            }
             
-            body {{
+            body {
                 print-color-adjust: exact;
                 -webkit-print-color-adjust: exact;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Kiswahili Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "MTIHANI WA MWISHO WA MUHULA 2025"
+                - paper_name: e.g., "KISWAHILI KARATASI YA KWANZA"
+                - question_1_marks: Marks for Question 1 (default: 20)
+                - question_2_4_marks: Marks for Questions 2-4 (default: 20)
+                - total_marks: Total marks (default: 40)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'KITUO CHA MTIHANI')
+        school_logo = data.get('school_logo', '/exam.png')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'MTIHANI WA MWISHO WA MUHULA 2025')
+        paper_name = data.get('paper_name', 'KISWAHILI KARATASI YA KWANZA')
+        
+        # Question configuration (from screenshot)
+        question_1_marks = data.get('question_1_marks', 20)  # Compulsory
+        question_2_4_marks = data.get('question_2_4_marks', 20)  # Choose 1 from 3
+        total_marks = data.get('total_marks', 40)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        
+        # Calculate total pages
+        total_pages = data.get('total_pages', 12)
+        
+        instructions = data.get('instructions', [
+            'Andika jina lako na nambari yako ya mtihani katika nafasi ulizoachiwa hapa juu.',
+            'Tia sahihi sasa uandike tarehe ya mtihani katika nafasi zilizoochiwa hapa juu.',
+            'Andika insha mbili. Insha ya kwanza ni ya lazima.',
+            'Kisha chagua insha nyingine moja kati ya hizo tatu zilizobakia.',
+            'Kila insha isipungue maneno 450.',
+            'Kila insha ina alama 20.',
+            'Jibu maswali kwenye andikwe kwa lugha ya Kiswahili.',
+            'Insha zote sharti zandikwe katika nafasi ulizoachibwa katika kijitabu hiki cha maswali.',
+            'Karatasi hii ina kurasa 12 zilizopigwa chapa.',
+            'Watahiniwa ni lazima wahakikishe kwamba kurasa zote za karatasi hii zimepigwa chapa sawasawa na kuwa maswali yote yamo.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Kiswahili Paper 1
+        marking_grid_html = KiswahiliPaper1Coverpage._generate_marking_grid(
+            question_1_marks, question_2_4_marks, total_marks
+        )
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header with Logo and School Name -->
         <div class="header">
@@ -8029,13 +7292,14 @@ class KiswahiliPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Ukurasa wa Mbele", coverpage_stylesheet(KiswahiliPaper1Coverpage, data), html, lang='sw')
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid(question_1_marks, question_2_4_marks, total_marks):
         """
         Generate marking grid HTML for Kiswahili Paper 1
@@ -8153,311 +7417,304 @@ class BusinessPaper1Coverpage:
     - 25 questions (Questions 1-25)
     - Individual marking grid for each question
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Business Studies Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM EXAMINATION 2025"
-                - paper_name: e.g., "BUSINESS STUDIES PAPER 1"
-                - total_marks: Total marks (default: 100)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BUSINESS STUDIES PAPER 1')
-        
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        total_pages = data.get('total_pages', 16)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            'Answer all the questions in the spaces provided in the question paper.',
-            'Non-programmable silent electronic calculators may be used.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Business Paper 1 (25 questions)
-        marking_grid_html = BusinessPaper1Coverpage._generate_marking_grid()
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.4rem;
             margin-bottom: 10px;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.2rem;
             line-height: 1.6;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 4px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 100%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 11px;
             font-weight: bold;
             padding: 8px 4px;
             vertical-align: middle;
-        }}
+        }
         
-        .question-label {{
+        .question-label {
             background-color: #f5f5f5;
             font-size: 10px;
-        }}
+        }
         
-        .marks-cell {{
+        .marks-cell {
             min-height: 35px;
             background-color: white;
-        }}
+        }
+        
+        .total-marks-container {
+            margin-top: 15px;
+            text-align: center;
+        }
+        
+        .total-marks-box {
+            display: inline-block;
+            border: 2px solid black;
+            padding: 10px 20px;
+        }
+        
+        .total-marks-label {
+            font-weight: bold;
+            font-size: 12px;
+            margin-right: 20px;
+        }
+        
+        .total-marks-field {
+            width: 80px;
+            height: 30px;
+            vertical-align: middle;
+        }
+        
+        /* Print Styles */
+        @media print {
+            body {
+                margin: 0;
+                padding: 20mm;
+            }
+            
+            .coverpage {
+                page-break-after: always;
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Business Studies Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM EXAMINATION 2025"
+                - paper_name: e.g., "BUSINESS STUDIES PAPER 1"
+                - total_marks: Total marks (default: 100)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BUSINESS STUDIES PAPER 1')
         
-        .total-marks-container {{
-            margin-top: 15px;
-            text-align: center;
-        }}
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        total_pages = data.get('total_pages', 16)
         
-        .total-marks-box {{
-            display: inline-block;
-            border: 2px solid black;
-            padding: 10px 20px;
-        }}
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            'Answer all the questions in the spaces provided in the question paper.',
+            'Non-programmable silent electronic calculators may be used.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
         
-        .total-marks-label {{
-            font-weight: bold;
-            font-size: 12px;
-            margin-right: 20px;
-        }}
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
         
-        .total-marks-field {{
-            width: 80px;
-            height: 30px;
-            vertical-align: middle;
-        }}
+        # Generate marking grid for Business Paper 1 (25 questions)
+        marking_grid_html = BusinessPaper1Coverpage._generate_marking_grid()
         
-        /* Print Styles */
-        @media print {{
-            body {{
-                margin: 0;
-                padding: 20mm;
-            }}
-            
-            .coverpage {{
-                page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -8521,13 +7778,14 @@ class BusinessPaper1Coverpage:
             </div>
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(BusinessPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid():
         """
         Generate marking grid HTML for Business Studies Paper 1
@@ -8637,295 +7895,288 @@ class BusinessPaper2Coverpage:
     - Each question: 20 marks
     - Total: 100 marks
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for Business Studies Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM EXAMINATION 2025"
-                - paper_name: e.g., "BUSINESS STUDIES PAPER 2"
-                - total_marks: Total marks (default: 100)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'BUSINESS STUDIES PAPER 2')
-        
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        total_pages = data.get('total_pages', 18)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of six questions.',
-            'Answer any five questions in the spaces provided after question 6.',
-            'All questions carry equal marks.',
-            'Non-programmable silent electronic calculators may be used.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for Business Paper 2 (5 questions × 20 marks)
-        marking_grid_html = BusinessPaper2Coverpage._generate_marking_grid()
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 60%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 12px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .question-row {{
+        .question-row {
             height: 45px;
-        }}
+        }
         
-        .total-row {{
+        .total-row {
             background-color: #e0e0e0;
             font-weight: bold;
             font-size: 13px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for Business Studies Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM EXAMINATION 2025"
+                - paper_name: e.g., "BUSINESS STUDIES PAPER 2"
+                - total_marks: Total marks (default: 100)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'BUSINESS STUDIES PAPER 2')
+        
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        total_pages = data.get('total_pages', 18)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of six questions.',
+            'Answer any five questions in the spaces provided after question 6.',
+            'All questions carry equal marks.',
+            'Non-programmable silent electronic calculators may be used.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for Business Paper 2 (5 questions × 20 marks)
+        marking_grid_html = BusinessPaper2Coverpage._generate_marking_grid()
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -8984,13 +8235,14 @@ class BusinessPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(BusinessPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid():
         """
         Generate marking grid HTML for Business Studies Paper 2
@@ -9104,295 +8356,288 @@ class CREPaper1Coverpage:
     - Each question: 20 marks
     - Total: 100 marks
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for CRE Paper 1 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM EXAMINATION 2025"
-                - paper_name: e.g., "CHRISTIAN RELIGIOUS EDUCATION PAPER 1"
-                - total_marks: Total marks (default: 100)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'CHRISTIAN RELIGIOUS EDUCATION PAPER 1')
-        
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        total_pages = data.get('total_pages', 16)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of six questions.',
-            'Answer five questions in the spaces provided at the end of question 6.',
-            'Each question carries 20 marks.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Candidates should answer from the Atlas provided.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for CRE Paper 1
-        marking_grid_html = CREPaper1Coverpage._generate_marking_grid()
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 0px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 70%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .question-row {{
+        .question-row {
             height: 40px;
-        }}
+        }
         
-        .score-row {{
+        .score-row {
             background-color: #f5f5f5;
             font-weight: bold;
             height: 40px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for CRE Paper 1 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM EXAMINATION 2025"
+                - paper_name: e.g., "CHRISTIAN RELIGIOUS EDUCATION PAPER 1"
+                - total_marks: Total marks (default: 100)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'CHRISTIAN RELIGIOUS EDUCATION PAPER 1')
+        
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        total_pages = data.get('total_pages', 16)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of six questions.',
+            'Answer five questions in the spaces provided at the end of question 6.',
+            'Each question carries 20 marks.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Candidates should answer from the Atlas provided.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for CRE Paper 1
+        marking_grid_html = CREPaper1Coverpage._generate_marking_grid()
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -9451,13 +8696,14 @@ class CREPaper1Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(CREPaper1Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid():
         """
         Generate marking grid HTML for CRE Paper 1
@@ -9564,295 +8810,288 @@ class CREPaper2Coverpage:
     - Each question: 20 marks
     - Total: 100 marks
     """
-    
-    @staticmethod
-    def generate_html(data):
-        """
-        Generate HTML for CRE Paper 2 coverpage
-        
-        Args:
-            data (dict): Coverpage data with keys:
-                - school_name: Name of the school
-                - school_logo: Base64 encoded logo or URL
-                - exam_title: e.g., "END TERM EXAMINATION 2025"
-                - paper_name: e.g., "CHRISTIAN RELIGIOUS EDUCATION PAPER 2"
-                - total_marks: Total marks (default: 100)
-                - time_allocation: Time in minutes
-                - total_pages: Total pages
-        
-        Returns:
-            str: HTML content for coverpage
-        """
-        
-        # Extract data with defaults
-        school_name = data.get('school_name', 'EXAMINATION CENTRE')
-        school_logo = data.get('school_logo', '/exam.png')
-        logo_position = data.get('logo_position', 'center')
-        class_name = data.get('class_name', '')
-        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
-        paper_name = data.get('paper_name', 'CHRISTIAN RELIGIOUS EDUCATION PAPER 2')
-        
-        total_marks = data.get('total_marks', 100)
-        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
-        total_pages = data.get('total_pages', 16)
-        
-        instructions = data.get('instructions', [
-            'Write your name and admission number in the spaces provided above.',
-            'Sign and write the date of examination in the spaces provided above.',
-            f'This paper consists of six questions.',
-            'Answer any five questions in the spaces provided at the end of question 6.',
-            'Each question carries 20 marks.',
-            f'This paper consists of {total_pages} printed pages.',
-            'Do not remove any pages from this booklet.',
-            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
-            'Candidates should answer the questions in English.'
-        ])
-        
-        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
-        show_name = data.get('candidate_name_field', True)
-        show_number = data.get('candidate_number_field', True)
-        show_date = data.get('date_field', True)
-        
-        # Generate marking grid for CRE Paper 2
-        marking_grid_html = CREPaper2Coverpage._generate_marking_grid()
-        
-        # Build HTML
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{paper_name} - Coverpage</title>
-    <style>
-        @page {{
+
+    STYLESHEET = """
+        @page {
             size: A4;
             margin: 20mm;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Times New Roman', Times, serif;
             font-size: 12pt;
             line-height: 1.5;
             color: black;
             background: white;
-        }}
+        }
         
-        .coverpage {{
+        .coverpage {
             width: 100%;
             min-height: 100vh;
             padding: 15mm;
             display: flex;
             flex-direction: column;
             page-break-after: always;
-        }}
+        }
         
         /* Header Section */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .logo-container {{
+        .logo-container {
             margin-bottom: 15px;
-        }}
+        }
         
-        .logo-container.left {{
+        .logo-container.left {
             text-align: left;
-        }}
+        }
         
-        .logo-container.center {{
+        .logo-container.center {
             text-align: center;
-        }}
+        }
         
-        .logo-container.right {{
+        .logo-container.right {
             text-align: right;
-        }}
+        }
         
-        .school-logo {{
+        .school-logo {
             max-width: 90px;
             max-height: 90px;
             object-fit: contain;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             font-size: 1.8rem;
             font-weight: bold;
             margin-bottom: 5px;
             text-transform: uppercase;
-        }}
+        }
         
-        .class-name {{
+        .class-name {
             font-size: 1.3rem;
             font-weight: bold;
             margin-bottom: 8px;
-        }}
+        }
         
-        .exam-title {{
+        .exam-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: 15px;
             text-transform: uppercase;
-        }}
+        }
         
-        .paper-details {{
+        .paper-details {
             display: flex;
             justify-content: center;
             align-items: center;
             gap: 20px;
             margin-bottom: 5px;
-        }}
+        }
         
-        .paper-name {{
+        .paper-name {
             font-size: 1.5rem;
             font-weight: bold;
             text-transform: uppercase;
-        }}
+        }
         
-        .time-allocation {{
+        .time-allocation {
             font-size: 1.3rem;
             margin-top: 5px;
-        }}
+        }
         
         /* Candidate Info Section */
-        .candidate-info {{
+        .candidate-info {
             margin: 20px 0;
             padding: 15px;
             border: none;
-        }}
+        }
         
-        .candidate-info-grid {{
+        .candidate-info-grid {
             display: grid;
             grid-template-columns: 1fr 1fr 1fr 1fr;
             gap: 15px 20px;
-        }}
+        }
         
-        .info-row {{
+        .info-row {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-row-full {{
+        .info-row-full {
             display: flex;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-grid {{
+        .info-row-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 15px;
             margin-bottom: 15px;
-        }}
+        }
         
-        .info-row-item {{
+        .info-row-item {
             display: flex;
             align-items: center;
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: bold;
             font-size: 12px;
             min-width: 40px;
-        }}
+        }
         
-        .info-field {{
+        .info-field {
             flex: 1;
             border-bottom: 1px dotted black;
             min-height: 25px;
             padding: 2px 5px;
-        }}
+        }
         
         /* Instructions Section */
-        .instructions {{
+        .instructions {
             margin-bottom: 20px;
-        }}
+        }
         
-        .instructions-title {{
+        .instructions-title {
             font-weight: bold;
             font-size: 1.6rem;
             margin-bottom: 10px;
-        }}
+        }
         
-        .instructions ol {{
+        .instructions ol {
             margin-left: 20px;
             font-size: 1.5rem;
             line-height: 1.6;
             font-style: italic;
-        }}
+        }
         
-        .instructions li {{
+        .instructions li {
             margin-bottom: 8px;
-        }}
+        }
         
-        .instructions li.bold {{
+        .instructions li.bold {
             font-weight: bold;
-        }}
+        }
         
         /* Marking Grid Section */
-        .marking-grid-container {{
+        .marking-grid-container {
             margin-top: auto;
             padding-top: 20px;
-        }}
+        }
         
-        .grid-title {{
+        .grid-title {
             font-weight: bold;
             font-size: 14px;
             margin-bottom: 12px;
             text-align: center;
             text-transform: uppercase;
-        }}
+        }
         
-        .marking-grid {{
+        .marking-grid {
             width: 70%;
             margin: 0 auto;
             border-collapse: collapse;
             border: 2px solid black;
-        }}
+        }
         
         .marking-grid th,
-        .marking-grid td {{
+        .marking-grid td {
             border: 1px solid black;
             text-align: center;
             font-size: 12px;
             padding: 10px 8px;
-        }}
+        }
         
-        .marking-grid th {{
+        .marking-grid th {
             background-color: #f0f0f0;
             font-weight: bold;
-        }}
+        }
         
-        .question-row {{
+        .question-row {
             height: 40px;
-        }}
+        }
         
-        .score-row {{
+        .score-row {
             background-color: #f5f5f5;
             font-weight: bold;
             height: 40px;
-        }}
+        }
         
         /* Print Styles */
-        @media print {{
-            body {{
+        @media print {
+            body {
                 margin: 0;
                 padding: 20mm;
-            }}
+            }
             
-            .coverpage {{
+            .coverpage {
                 page-break-after: always;
-            }}
-        }}
-    </style>
-</head>
-<body>
+            }
+        }
+    """
+    
+    @staticmethod
+    def generate_html(data, body_only=False):
+        """
+        Generate HTML for CRE Paper 2 coverpage
+        
+        Args:
+            data (dict): Coverpage data with keys:
+                - school_name: Name of the school
+                - school_logo: Base64 encoded logo or URL
+                - exam_title: e.g., "END TERM EXAMINATION 2025"
+                - paper_name: e.g., "CHRISTIAN RELIGIOUS EDUCATION PAPER 2"
+                - total_marks: Total marks (default: 100)
+                - time_allocation: Time in minutes
+                - total_pages: Total pages
+        
+        Returns:
+            str: HTML content for coverpage
+        """
+        
+        # Extract data with defaults
+        school_name = data.get('school_name', 'EXAMINATION CENTRE')
+        school_logo = data.get('school_logo', '/exam.png')
+        logo_position = data.get('logo_position', 'center')
+        class_name = data.get('class_name', '')
+        exam_title = data.get('exam_title', 'END TERM EXAMINATION 2025')
+        paper_name = data.get('paper_name', 'CHRISTIAN RELIGIOUS EDUCATION PAPER 2')
+        
+        total_marks = data.get('total_marks', 100)
+        time_allocation = data.get('time_allocation', '2 HOURS 30 MINUTES')
+        total_pages = data.get('total_pages', 16)
+        
+        instructions = data.get('instructions', [
+            'Write your name and admission number in the spaces provided above.',
+            'Sign and write the date of examination in the spaces provided above.',
+            f'This paper consists of six questions.',
+            'Answer any five questions in the spaces provided at the end of question 6.',
+            'Each question carries 20 marks.',
+            f'This paper consists of {total_pages} printed pages.',
+            'Do not remove any pages from this booklet.',
+            'Candidates should check the question paper to ascertain that all the pages are printed as indicated and that no questions are missing.',
+            'Candidates should answer the questions in English.'
+        ])
+        
+        exam_date = data.get('date', datetime.now().strftime('%Y-%m-%d'))
+        show_name = data.get('candidate_name_field', True)
+        show_number = data.get('candidate_number_field', True)
+        show_date = data.get('date_field', True)
+        
+        # Generate marking grid for CRE Paper 2
+        marking_grid_html = CREPaper2Coverpage._generate_marking_grid()
+        
+        # Build HTML
+        html = f"""
     <div class="coverpage">
         <!-- Header -->
         <div class="header">
@@ -9912,13 +9151,14 @@ class CREPaper2Coverpage:
             {marking_grid_html}
         </div>
     </div>
-</body>
-</html>
 """
         
-        return html
+        if body_only:
+            return html
+        return coverpage_document(f"{paper_name} - Coverpage", coverpage_stylesheet(CREPaper2Coverpage, data), html)
     
     @staticmethod
+    @memoized_fragment
     def _generate_marking_grid():
         """
         Generate marking grid HTML for CRE Paper 2
@@ -10015,3 +9255,60 @@ class CREPaper2Coverpage:
             'date_field': True
         }
 
+
+
+# ==================== Coverpage registry ====================
+# (subject, paper number) -> layout; paper number None is the layout for any other
+# paper of the subject.
+
+SUBJECT_ALIASES = {
+    'BUSINESS STUDIES': 'BUSINESS',
+    'CHRISTIAN RELIGIOUS EDUCATION': 'CRE',
+}
+
+COVERPAGE_LAYOUTS = {
+    ('BIOLOGY', 2): BiologyPaper2Coverpage,
+    ('BIOLOGY', 3): BiologyPaper3Coverpage,
+    ('BIOLOGY', None): BiologyPaper1Coverpage,
+    ('PHYSICS', 1): PhysicsPaper1Coverpage,
+    ('PHYSICS', None): PhysicsPaper2Coverpage,
+    ('CHEMISTRY', 2): ChemistryPaper2Coverpage,
+    ('CHEMISTRY', None): ChemistryPaper1Coverpage,
+    ('MATHEMATICS', 1): MathematicsPaper1Coverpage,
+    ('MATHEMATICS', None): MathematicsPaper2Coverpage,
+    ('GEOGRAPHY', 1): GeographyPaper1Coverpage,
+    ('GEOGRAPHY', None): GeographyPaper2Coverpage,
+    ('KISWAHILI', 1): KiswahiliPaper1Coverpage,
+    ('KISWAHILI', None): KiswahiliPaper2Coverpage,
+    ('BUSINESS', 1): BusinessPaper1Coverpage,
+    ('BUSINESS', None): BusinessPaper2Coverpage,
+    ('CRE', 1): CREPaper1Coverpage,
+    ('CRE', None): CREPaper2Coverpage,
+    ('ENGLISH', 1): EnglishPaper1Coverpage,
+    ('ENGLISH', 3): EnglishPaper3Coverpage,
+    ('ENGLISH', None): EnglishPaper2Coverpage,
+}
+
+MARKING_SCHEME_LAYOUTS = {
+    ('BIOLOGY', 2): BiologyPaper2MarkingSchemeCoverpage,
+    # No separate Paper 3 marking scheme layout; Paper 3 uses the Paper 2 structure
+    ('BIOLOGY', 3): BiologyPaper2MarkingSchemeCoverpage,
+}
+
+
+def get_coverpage_layout(subject_name, paper_number, is_marking_scheme=False):
+    """
+    Coverpage class of a subject's paper
+    
+    Args:
+        subject_name (str): Subject name (case-insensitive, long names accepted)
+        paper_number (int): Paper number, or None if unknown
+        is_marking_scheme (bool): Look up the marking scheme coverpage instead
+    
+    Returns:
+        The layout class, or None when the subject has no layout of its own
+    """
+    subject = (subject_name or '').strip().upper()
+    subject = SUBJECT_ALIASES.get(subject, subject)
+    layouts = MARKING_SCHEME_LAYOUTS if is_marking_scheme else COVERPAGE_LAYOUTS
+    return layouts.get((subject, paper_number)) or layouts.get((subject, None))
@@ -19,13 +19,16 @@ import re
 import time
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 class KCSECREPaperGenerator:
     """
@@ -129,12 +132,7 @@ class KCSECREPaperGenerator:
                 self.topic_order_map[topic_id] = 999
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -353,6 +351,9 @@ class KCSECREPaperGenerator:
         #        Amos/Prophetic -> Nehemiah/Jeremiah -> African Culture
         self.selected_questions.sort(key=lambda q: self._get_topic_order(q.topic))
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         # Build questions data
         questions_data = []
         
@@ -485,22 +486,13 @@ def validate_cre_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
-        
-        # Count questions by topic
-        questions_by_topic = defaultdict(int)
-        for q in all_questions:
-            questions_by_topic[str(q.topic_id)] += 1
+        # Count questions by topic (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        questions_by_topic = census.by_topic()
         
         # Check if we can generate
         num_topics = len(topics)
-        total_questions = len(all_questions)
+        total_questions = sum(questions_by_topic.values())
         
         # Need at least 6 questions total
         can_generate = total_questions >= 6
@@ -548,6 +540,7 @@ def validate_cre_paper_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('cre')
 def generate_cre_paper(request):
     """Generate KCSE CRE Paper 1 or 2"""
     try:
@@ -585,13 +578,8 @@ def generate_cre_paper(request):
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
         paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        unique_code = f"CRE{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"CRE{paper_number}")
         
         # Create GeneratedPaper record
         generated_paper = GeneratedPaper.objects.create(
@@ -10,6 +10,7 @@ from rest_framework.permissions import AllowAny
 from io import StringIO
 
 from .models import User
+from .schema_version import schema_status
 from .utils import success_response, error_response
 
 logger = logging.getLogger(__name__)
@@ -67,6 +68,7 @@ def initialize_database(request):
                 migration_output = output.getvalue()
                 
                 logger.info(f"[DATABASE] Migrations completed: {migration_output}")
+                schema = schema_status(refresh=True)
                 
                 # Verify tables were created
                 user_count = User.objects.count()
@@ -77,6 +79,7 @@ def initialize_database(request):
                         'status': 'initialized',
                         'migrations_applied': True,
                         'users_count': user_count,
+                        'schema_version': schema['applied_schema_version'],
                         'output': migration_output
                     },
                     status=status.HTTP_201_CREATED
@@ -129,14 +132,15 @@ def database_health(request):
             health_data['migrations_needed'] = True
             health_data['error'] = str(table_error)
         
-        # Check for pending migrations
-        from django.db.migrations.executor import MigrationExecutor
-        executor = MigrationExecutor(connection)
-        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        # Check for pending migrations (cached; ?refresh=1 rechecks)
+        schema = schema_status(refresh=request.GET.get('refresh') in ('1', 'true'))
+        health_data['schema_version'] = schema['schema_version']
+        health_data['applied_schema_version'] = schema['applied_schema_version']
+        health_data['schema_checked_seconds_ago'] = schema['checked_seconds_ago']
         
-        if plan:
+        if schema['pending_migrations']:
             health_data['migrations_needed'] = True
-            health_data['pending_migrations'] = len(plan)
+            health_data['pending_migrations'] = schema['pending_migrations']
         
         overall_status = 'healthy' if (
             health_data['database_connected'] and 
@@ -24,6 +24,26 @@ import time
 from typing import List, Dict, Optional
 
 from .models import Paper, Topic, Question, Subject
+from .question_pool import load_pool_records, hydrate_question_map
+
+
+def _hydrate_selected(generator, attrs: List[str], list_attrs: List[str] = ()):
+    """
+    Replace selected pool records on the generator with full Question rows
+    
+    Selection runs on compact records (no text/images); the text and answers are
+    fetched here in one query for the handful of questions that made the paper.
+    """
+    singles = [getattr(generator, attr) for attr in attrs if getattr(generator, attr)]
+    lists = [q for attr in list_attrs for q in getattr(generator, attr)]
+    full = hydrate_question_map(singles + lists)
+    
+    for attr in attrs:
+        record = getattr(generator, attr)
+        if record:
+            setattr(generator, attr, full[record.id])
+    for attr in list_attrs:
+        setattr(generator, attr, [full[q.id] for q in getattr(generator, attr)])
 
 
 class KCSEEnglishPaper1Generator:
@@ -152,7 +172,7 @@ class KCSEEnglishPaper1Generator:
         if functional_topics:
             functional_query = functional_query.filter(topic__in=functional_topics)
         
-        self.functional_writing_tasks = list(functional_query.select_related('topic'))
+        self.functional_writing_tasks = load_pool_records(functional_query)
         
         # Q2: Cloze Test - select from cloze topics (10 marks)
         cloze_query = Question.objects.filter(
@@ -163,7 +183,7 @@ class KCSEEnglishPaper1Generator:
         if cloze_topics:
             cloze_query = cloze_query.filter(topic__in=cloze_topics)
         
-        self.cloze_test_passages = list(cloze_query)
+        self.cloze_test_passages = load_pool_records(cloze_query)
         
         # Q3a: Riddles - select from riddle topics (check topic name for 'riddle')
         riddles_query = Question.objects.filter(
@@ -176,7 +196,7 @@ class KCSEEnglishPaper1Generator:
             # Fallback to general oral topics if no specific riddle topics
             riddles_query = riddles_query.filter(topic__in=oral_topics, question_type='riddle')
         
-        self.riddles = list(riddles_query)
+        self.riddles = load_pool_records(riddles_query)
         
         # Q3b: Homophones - select from homophone topics (check topic name for 'homophone')
         homophones_query = Question.objects.filter(
@@ -189,7 +209,7 @@ class KCSEEnglishPaper1Generator:
             # Fallback to general oral topics if no specific homophone topics
             homophones_query = homophones_query.filter(topic__in=oral_topics, question_type='homophones')
         
-        self.homophone_sets = list(homophones_query)
+        self.homophone_sets = load_pool_records(homophones_query)
         
         # Q3c: Word Stress - select from word stress topics (check topic name for 'stress')
         word_stress_query = Question.objects.filter(
@@ -202,7 +222,7 @@ class KCSEEnglishPaper1Generator:
             # Fallback to general oral topics if no specific word stress topics
             word_stress_query = word_stress_query.filter(topic__in=oral_topics, question_type='word_stress')
         
-        self.word_stress_sets = list(word_stress_query)
+        self.word_stress_sets = load_pool_records(word_stress_query)
         
         # Q3d: Discussion Leadership - select from discussion topics (check topic name for 'discussion')
         discussion_query = Question.objects.filter(
@@ -215,7 +235,7 @@ class KCSEEnglishPaper1Generator:
             # Fallback to general oral topics if no specific discussion topics
             discussion_query = discussion_query.filter(topic__in=oral_topics, question_type='discussion_skills')
         
-        self.discussion_scenarios = list(discussion_query)
+        self.discussion_scenarios = load_pool_records(discussion_query)
         
         # Q3e: Telephone Etiquette - select from telephone topics (check topic name for 'telephone'/'phone')
         telephone_query = Question.objects.filter(
@@ -228,7 +248,7 @@ class KCSEEnglishPaper1Generator:
             # Fallback to general oral topics if no specific telephone topics
             telephone_query = telephone_query.filter(topic__in=oral_topics, question_type='telephone_etiquette')
         
-        self.telephone_scenarios = list(telephone_query)
+        self.telephone_scenarios = load_pool_records(telephone_query)
         
         # ALTERNATIVE Q3 FORMATS: Load standalone oral questions if sub-sections not available
         # 30 marks single questions
@@ -239,7 +259,7 @@ class KCSEEnglishPaper1Generator:
         )
         if oral_topics:
             oral_30_query = oral_30_query.filter(topic__in=oral_topics)
-        self.oral_30_marks_questions = list(oral_30_query)
+        self.oral_30_marks_questions = load_pool_records(oral_30_query)
         
         # 20 marks oral questions (to combine with 10 marks)
         oral_20_query = Question.objects.filter(
@@ -249,7 +269,7 @@ class KCSEEnglishPaper1Generator:
         )
         if oral_topics:
             oral_20_query = oral_20_query.filter(topic__in=oral_topics)
-        self.oral_20_marks_questions = list(oral_20_query)
+        self.oral_20_marks_questions = load_pool_records(oral_20_query)
         
         # 15 marks oral questions (to combine two of them)
         oral_15_query = Question.objects.filter(
@@ -259,7 +279,7 @@ class KCSEEnglishPaper1Generator:
         )
         if oral_topics:
             oral_15_query = oral_15_query.filter(topic__in=oral_topics)
-        self.oral_15_marks_questions = list(oral_15_query)
+        self.oral_15_marks_questions = load_pool_records(oral_15_query)
         
         # 10 marks oral questions (to combine with 20 marks)
         oral_10_query = Question.objects.filter(
@@ -269,7 +289,7 @@ class KCSEEnglishPaper1Generator:
         )
         if oral_topics:
             oral_10_query = oral_10_query.filter(topic__in=oral_topics)
-        self.oral_10_marks_questions = list(oral_10_query)
+        self.oral_10_marks_questions = load_pool_records(oral_10_query)
         
         # Shuffle all
         random.shuffle(self.functional_writing_tasks)
@@ -411,6 +431,14 @@ class KCSEEnglishPaper1Generator:
     
     def _build_result(self, generation_time: float, q3_format: str) -> Dict:
         """Build Paper 1 result"""
+        _hydrate_selected(
+            self,
+            ['selected_functional_task', 'selected_cloze_passage', 'selected_riddle',
+             'selected_homophones', 'selected_word_stress', 'selected_discussion',
+             'selected_telephone'],
+            ['selected_oral_questions']
+        )
+        
         result = {
             'paper': {
                 'id': str(self.paper.id),
@@ -551,6 +579,7 @@ class KCSEEnglishPaper2Generator:
         self.selected_passage = None
         self.selected_excerpt = None
         self.selected_oral_literature = None
+        self.selected_grammar_questions = []  # Questions behind the 5 parts
         self.selected_grammar_parts = []  # List of 5 parts (a-e)
         
         self.attempts = 0
@@ -609,7 +638,7 @@ class KCSEEnglishPaper2Generator:
         if passage_topics:
             passage_query = passage_query.filter(topic__in=passage_topics)
         
-        self.passage_questions = list(passage_query.select_related('topic'))
+        self.passage_questions = load_pool_records(passage_query)
         
         # Q2: Excerpt - select questions worth 25 marks
         excerpt_query = Question.objects.filter(
@@ -620,7 +649,7 @@ class KCSEEnglishPaper2Generator:
         if excerpt_topics:
             excerpt_query = excerpt_query.filter(topic__in=excerpt_topics)
         
-        self.excerpt_questions = list(excerpt_query.select_related('topic'))
+        self.excerpt_questions = load_pool_records(excerpt_query)
         
         # Q3: Oral Literature - select questions worth 20 marks
         oral_query = Question.objects.filter(
@@ -631,7 +660,7 @@ class KCSEEnglishPaper2Generator:
         if oral_literature_topics:
             oral_query = oral_query.filter(topic__in=oral_literature_topics)
         
-        self.oral_literature_questions = list(oral_query.select_related('topic'))
+        self.oral_literature_questions = load_pool_records(oral_query)
         
         # Q4: Grammar - select questions from grammar topics (any marks, will combine to 15)
         grammar_query = Question.objects.filter(
@@ -641,7 +670,7 @@ class KCSEEnglishPaper2Generator:
         if grammar_topics:
             grammar_query = grammar_query.filter(topic__in=grammar_topics)
         
-        self.grammar_questions = list(grammar_query.select_related('topic'))
+        self.grammar_questions = load_pool_records(grammar_query)
         
         # Shuffle all
         random.shuffle(self.passage_questions)
@@ -695,7 +724,7 @@ class KCSEEnglishPaper2Generator:
                 self.selected_passage.marks +
                 self.selected_excerpt.marks +
                 self.selected_oral_literature.marks +
-                sum(part['marks'] for part in self.selected_grammar_parts)
+                sum(q.marks for q in self.selected_grammar_questions)
             )
             
             if self.total_marks != self.TOTAL_MARKS:
@@ -705,7 +734,7 @@ class KCSEEnglishPaper2Generator:
             print(f"\n[Q1: PASSAGE/COMPREHENSION] {self.selected_passage.marks} marks")
             print(f"[Q2: EXCERPT] {self.selected_excerpt.marks} marks")
             print(f"[Q3: ORAL LITERATURE] {self.selected_oral_literature.marks} marks")
-            print(f"[Q4: GRAMMAR] {sum(part['marks'] for part in self.selected_grammar_parts)} marks (5 parts)")
+            print(f"[Q4: GRAMMAR] {sum(q.marks for q in self.selected_grammar_questions)} marks (5 parts)")
             print(f"\nTotal: {self.total_marks}/{self.TOTAL_MARKS} marks")
             print(f"\n{'='*70}")
             print(f"SUCCESS! Generated in {attempt} attempts ({generation_time:.2f}s)")
@@ -734,24 +763,32 @@ class KCSEEnglishPaper2Generator:
                 total = sum(q.marks for q in selected)
                 
                 if total == self.Q4_GRAMMAR_MARKS:
-                    # Found valid combination
-                    self.selected_grammar_parts = [
-                        {
-                            'id': str(q.id),
-                            'question_number': f"4({chr(97 + idx)})",
-                            'marks': q.marks,
-                            'text': q.question_text,
-                            'answer': q.answer_text,
-                            'topic': q.topic.name if q.topic else 'Grammar'
-                        }
-                        for idx, q in enumerate(selected)
-                    ]
+                    # Found valid combination (parts are built once text is fetched)
+                    self.selected_grammar_questions = selected
                     return True
         
         return False
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build Paper 2 result"""
+        _hydrate_selected(
+            self,
+            ['selected_passage', 'selected_excerpt', 'selected_oral_literature'],
+            ['selected_grammar_questions']
+        )
+        
+        self.selected_grammar_parts = [
+            {
+                'id': str(q.id),
+                'question_number': f"4({chr(97 + idx)})",
+                'marks': q.marks,
+                'text': q.question_text,
+                'answer': q.answer_text,
+                'topic': q.topic.name if q.topic else 'Grammar'
+            }
+            for idx, q in enumerate(self.selected_grammar_questions)
+        ]
+        
         return {
             'paper': {
                 'id': str(self.paper.id),
@@ -878,7 +915,7 @@ class KCSEEnglishPaper3Generator:
             raise ValueError("This generator is only for English Paper 3")
         
         # Q1a: Creative Story (question_type: 'creative_story')
-        self.creative_story_prompts = list(Question.objects.filter(
+        self.creative_story_prompts = load_pool_records(Question.objects.filter(
             paper=self.paper,
             question_type='creative_story',
             marks=self.Q1_CREATIVE_MARKS,
@@ -886,7 +923,7 @@ class KCSEEnglishPaper3Generator:
         ))
         
         # Q1b: Creative Composition (question_type: 'creative_composition')
-        self.creative_composition_prompts = list(Question.objects.filter(
+        self.creative_composition_prompts = load_pool_records(Question.objects.filter(
             paper=self.paper,
             question_type='creative_composition',
             marks=self.Q1_CREATIVE_MARKS,
@@ -904,9 +941,9 @@ class KCSEEnglishPaper3Generator:
         if compulsory_text_id:
             compulsory_filter['topic_id'] = compulsory_text_id
         
-        self.compulsory_set_text_essays = list(Question.objects.filter(
+        self.compulsory_set_text_essays = load_pool_records(Question.objects.filter(
             **compulsory_filter
-        ).select_related('topic'))
+        ))
         
         # Q3a: Optional Short Story Essay (question_type: 'optional_short_story_essay')
         optional_texts = self.selections.get('optional_set_texts', [])
@@ -919,23 +956,23 @@ class KCSEEnglishPaper3Generator:
         if optional_texts:
             short_story_filter['topic_id__in'] = optional_texts
         
-        self.optional_short_story_essays = list(Question.objects.filter(
+        self.optional_short_story_essays = load_pool_records(Question.objects.filter(
             **short_story_filter
-        ).select_related('topic'))
+        ))
         
         # Q3b: Optional Drama Essay (question_type: 'optional_drama_essay')
         drama_filter = short_story_filter.copy()
         drama_filter['question_type'] = 'optional_drama_essay'
-        self.optional_drama_essays = list(Question.objects.filter(
+        self.optional_drama_essays = load_pool_records(Question.objects.filter(
             **drama_filter
-        ).select_related('topic'))
+        ))
         
         # Q3c: Optional Novel Essay (question_type: 'optional_novel_essay')
         novel_filter = short_story_filter.copy()
         novel_filter['question_type'] = 'optional_novel_essay'
-        self.optional_novel_essays = list(Question.objects.filter(
+        self.optional_novel_essays = load_pool_records(Question.objects.filter(
             **novel_filter
-        ).select_related('topic'))
+        ))
         
         # Shuffle all
         random.shuffle(self.creative_story_prompts)
@@ -987,6 +1024,14 @@ class KCSEEnglishPaper3Generator:
         self.selected_optional_drama = random.choice(self.optional_drama_essays)
         self.selected_optional_novel = random.choice(self.optional_novel_essays)
         
+        # Fetch full rows now - the prompt text is logged below
+        _hydrate_selected(
+            self,
+            ['selected_creative_story', 'selected_creative_composition',
+             'selected_compulsory_essay', 'selected_optional_short_story',
+             'selected_optional_drama', 'selected_optional_novel']
+        )
+        
         # Calculate total marks (all questions are worth 20 marks each)
         self.total_marks = (
             self.selected_creative_story.marks +  # Q1 (either option)
@@ -7,9 +7,12 @@ With simple bold titles before each question (no section headers)
 from .coverpage_templates import (
     EnglishPaper1Coverpage,
     BiologyPaper1Coverpage, 
-    MarkingSchemeCoverpage
+    MarkingSchemeCoverpage,
+    coverpage_body,
 )
 import re
+from .image_store import public_image_url
+from .question_markup import table_occupancy
 
 
 def generate_english_paper1_html(coverpage_data, questions, coverpage_class=None):
@@ -35,21 +38,7 @@ def generate_english_paper1_html(coverpage_data, questions, coverpage_class=None
         coverpage_class = EnglishPaper1Coverpage
     
     # Generate coverpage HTML (page 1)
-    # EnglishPaper1Coverpage uses static method, not instance method
-    if hasattr(coverpage_class, 'generate_html') and callable(getattr(coverpage_class, 'generate_html')):
-        # Static method - call directly with data
-        coverpage_html = coverpage_class.generate_html(coverpage_data)
-    else:
-        # Instance method - create instance first
-        coverpage_instance = coverpage_class(coverpage_data)
-        coverpage_html = coverpage_instance.generate_html()
-    
-    # Extract coverpage content (remove html/body tags to combine later)
-    coverpage_body = re.search(r'<body>(.*?)</body>', coverpage_html, re.DOTALL)
-    if coverpage_body:
-        coverpage_content = coverpage_body.group(1)
-    else:
-        coverpage_content = coverpage_html
+    coverpage_content = coverpage_body(coverpage_class, coverpage_data)
     
     # Calculate total pages
     total_pages = 2  # 1 coverpage + 1 question page (all questions continuous)
@@ -721,28 +710,15 @@ def _process_question_text(text, images=None, answer_lines=None):
                     except (ValueError, IndexError):
                         pass
                     
-                    # Helper to check if cell should be skipped
-                    def is_cell_merged(row_idx, col_idx):
-                        for r in range(row_idx + 1):
-                            for c in range(col_idx + 1):
-                                if r in merged_cells and c in merged_cells[r]:
-                                    cell = merged_cells[r][c]
-                                    colspan = cell.get('colspan', 1)
-                                    rowspan = cell.get('rowspan', 1)
-                                    end_row = r + rowspan - 1
-                                    end_col = c + colspan - 1
-                                    if (row_idx >= r and row_idx <= end_row and col_idx >= c and col_idx <= end_col):
-                                        if r == row_idx and c == col_idx:
-                                            return False
-                                        return True
-                        return False
+                    # Cells covered by another cell's merged span
+                    covered = table_occupancy(merged_cells, rows, cols)
                     
                     # Build HTML table
-                    table_html = '<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>'
+                    table_html = ['<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>']
                     for row_idx in range(rows):
-                        table_html += '<tr>'
+                        table_html.append('<tr>')
                         for col_idx in range(cols):
-                            if is_cell_merged(row_idx, col_idx):
+                            if covered[row_idx][col_idx]:
                                 continue
                             cell_index = row_idx * cols + col_idx
                             cell_value = cell_data[cell_index] if cell_index < len(cell_data) else ''
@@ -754,10 +730,10 @@ def _process_question_text(text, images=None, answer_lines=None):
                             rowspan = merge_info.get('rowspan', 1)
                             colspan_attr = f' colspan="{colspan}"' if colspan > 1 else ''
                             rowspan_attr = f' rowspan="{rowspan}"' if rowspan > 1 else ''
-                            table_html += f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {width}px; height: {height}px; min-width: 60px; min-height: 30px;">{cell_html}</td>'
-                        table_html += '</tr>'
-                    table_html += '</tbody></table>'
-                    result.append(table_html)
+                            table_html.append(f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {width}px; height: {height}px; min-width: 60px; min-height: 30px;">{cell_html}</td>')
+                        table_html.append('</tr>')
+                    table_html.append('</tbody></table>')
+                    result.append(''.join(table_html))
                     continue
             except Exception:
                 result.append(part)
@@ -931,7 +907,7 @@ def _process_question_text(text, images=None, answer_lines=None):
                 image = images_dict.get(image_id)
                 
                 if image and image.get('url'):
-                    img_url = image['url']
+                    img_url = public_image_url(image['url'])
                     img_alt = image.get('name', 'Question image')
                     style = f"width: {image_width}px;"
                     if image_height:
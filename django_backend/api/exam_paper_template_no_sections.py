@@ -12,9 +12,12 @@ from .coverpage_templates import (
     ChemistryPaper1Coverpage,
     ChemistryPaper2Coverpage,
     KiswahiliPaper2Coverpage,
+    coverpage_body,
 )
 import re
+from .image_store import public_image_url
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_markup import build_graph_html, table_occupancy
 
 
 def get_coverpage_class(paper_data, is_marking_scheme=False):
@@ -64,15 +67,8 @@ def generate_full_exam_html(coverpage_data, questions, paper_data=None, coverpag
         else:
             coverpage_class = get_coverpage_class(coverpage_data)
     
-    # Generate coverpage HTML (page 1)
-    coverpage_html = coverpage_class.generate_html(coverpage_data)
-    
-    # Extract coverpage content
-    coverpage_body = re.search(r'<body>(.*?)</body>', coverpage_html, re.DOTALL)
-    if coverpage_body:
-        coverpage_content = coverpage_body.group(1)
-    else:
-        coverpage_content = coverpage_html
+    # Generate coverpage HTML (page 1) as a body fragment
+    coverpage_content = coverpage_body(coverpage_class, coverpage_data)
     
     # Get paper name
     paper_name = coverpage_data.get('paper_name', '').upper()
@@ -673,21 +669,13 @@ def _process_question_text(text, images=None, answer_lines=None):
                                     merged_cells[r][c] = {'colspan': colspan, 'rowspan': rowspan}
                     except (ValueError, IndexError):
                         pass
-                    def is_cell_merged(row_idx, col_idx):
-                        for r in range(row_idx + 1):
-                            for c in range(col_idx + 1):
-                                if r in merged_cells and c in merged_cells[r]:
-                                    cell = merged_cells[r][c]
-                                    colspan = cell.get('colspan', 1)
-                                    rowspan = cell.get('rowspan', 1)
-                                    if (row_idx >= r and row_idx <= r + rowspan - 1 and col_idx >= c and col_idx <= c + colspan - 1):
-                                        return r != row_idx or c != col_idx
-                        return False
-                    table_html = '<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>'
+                    # Cells covered by another cell's merged span
+                    covered = table_occupancy(merged_cells, rows, cols)
+                    table_html = ['<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>']
                     for row_idx in range(rows):
-                        table_html += '<tr>'
+                        table_html.append('<tr>')
                         for col_idx in range(cols):
-                            if is_cell_merged(row_idx, col_idx):
+                            if covered[row_idx][col_idx]:
                                 continue
                             cell_index = row_idx * cols + col_idx
                             cell_value = cell_data[cell_index] if cell_index < len(cell_data) else ''
@@ -695,10 +683,10 @@ def _process_question_text(text, images=None, answer_lines=None):
                             merge_info = merged_cells.get(row_idx, {}).get(col_idx, {'colspan': 1, 'rowspan': 1})
                             colspan_attr = f' colspan="{merge_info["colspan"]}"' if merge_info['colspan'] > 1 else ''
                             rowspan_attr = f' rowspan="{merge_info["rowspan"]}"' if merge_info['rowspan'] > 1 else ''
-                            table_html += f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {col_widths[col_idx]}px; height: {row_heights[row_idx]}px; min-width: 60px; min-height: 30px;">{cell_html}</td>'
-                        table_html += '</tr>'
-                    table_html += '</tbody></table>'
-                    result.append(table_html)
+                            table_html.append(f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {col_widths[col_idx]}px; height: {row_heights[row_idx]}px; min-width: 60px; min-height: 30px;">{cell_html}</td>')
+                        table_html.append('</tr>')
+                    table_html.append('</tbody></table>')
+                    result.append(''.join(table_html))
                     continue
             except Exception:
                 result.append(part)
@@ -858,35 +846,7 @@ def _process_question_text(text, images=None, answer_lines=None):
                 width_cm = max(1, width_cm)
                 height_cm = max(1, height_cm)
                 # Render inline SVG for print-safe grids
-                width_mm = max(10, int(round(width_cm * 10)))
-                height_mm = max(10, int(round(height_cm * 10)))
-                svg_lines = []
-                for x in range(width_mm + 1):
-                    if x % 10 == 0:
-                        stroke = '#000000'; sw = 0.45
-                    elif x % 5 == 0:
-                        stroke = 'rgba(15, 23, 42, 0.9)'; sw = 0.28
-                    else:
-                        stroke = 'rgba(156, 163, 175, 0.65)'; sw = 0.18
-                    svg_lines.append(f'<line x1="{x}" y1="0" x2="{x}" y2="{height_mm}" stroke="{stroke}" stroke-width="{sw}" />')
-                for y in range(height_mm + 1):
-                    if y % 10 == 0:
-                        stroke = '#000000'; sw = 0.45
-                    elif y % 5 == 0:
-                        stroke = 'rgba(15, 23, 42, 0.9)'; sw = 0.28
-                    else:
-                        stroke = 'rgba(156, 163, 175, 0.65)'; sw = 0.18
-                    svg_lines.append(f'<line x1="0" y1="{y}" x2="{width_mm}" y2="{y}" stroke="{stroke}" stroke-width="{sw}" />')
-                svg_content = ''.join(svg_lines)
-                graph_html = ('<span style="display:inline-block; margin:8px 4px; vertical-align:middle;">'
-                              f'<svg xmlns="http://www.w3.org/2000/svg" width="{width_cm}cm" height="{height_cm}cm" '
-                              f'viewBox="0 0 {width_mm} {height_mm}" preserveAspectRatio="none" '
-                              f'style="display:block; background:#fff; border:2px solid #0f766e; border-radius:4px; box-sizing:border-box;">'
-                              f'<rect x="0" y="0" width="{width_mm}" height="{height_mm}" fill="#ffffff" />'
-                              f'{svg_content}'
-                              f'<rect x="0" y="0" width="{width_mm}" height="{height_mm}" fill="none" stroke="#000000" stroke-width="0.5" />'
-                              '</svg>'
-                              '</span>')
+                graph_html = build_graph_html(width_cm, height_cm)
                 result.append(graph_html)
                 continue
 
@@ -908,7 +868,7 @@ def _process_question_text(text, images=None, answer_lines=None):
                 image = images_dict.get(image_id)
                 
                 if image and image.get('url'):
-                    img_url = image['url']
+                    img_url = public_image_url(image['url'])
                     img_alt = image.get('name', 'Question image')
                     style = f"width: {image_width}px;"
                     if image_height:
@@ -0,0 +1,186 @@
+"""
+Rendered Fragment Cache
+Per-question HTML fragments keyed by a hash of the rendered content
+
+The same question text used to be converted to HTML in every preview of every
+paper that contains it, in every marking scheme and in topic printable documents.
+Rendering now goes through render_question_fragment() / render_answer_fragment(),
+which look the fragment up by
+- emitter ('question' or 'answer', see api/question_markup.py)
+- question_markup.RENDERER_VERSION
+- text, inline images (with IMAGE_BASE_URL applied) and answer lines
+before parsing anything.
+
+Fragments live in a process-level LRU (FRAGMENT_CACHE_MAX_BYTES) and, per question,
+in the QuestionFragment table:
+- rows are refreshed when a question is saved (see api/signals.py)
+- paper previews call prefetch_fragments() once, which loads the rows of all the
+  paper's questions in one query and renders + stores any that are missing or stale
+
+Keys are content hashes, so an out-of-date row is simply never hit.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.db import transaction
+
+from .image_store import public_images
+from .models import QuestionFragment
+from .question_markup import RENDERER_VERSION, answer_emitter, question_emitter, render_markup
+from .render_cache import RenderCache
+
+logger = logging.getLogger(__name__)
+
+
+fragment_cache = RenderCache(
+    max_bytes=getattr(settings, 'FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+)
+
+# kind -> (emitter, text field, images field, answer lines field) of a snapshot entry
+FRAGMENT_KINDS = {
+    'question': (question_emitter, 'question_text', 'question_inline_images', 'question_answer_lines'),
+    # The marking scheme renders answers without their answer lines
+    'answer': (answer_emitter, 'answer_text', 'answer_inline_images', None),
+    'answer_printable': (question_emitter, 'answer_text', 'answer_inline_images', 'answer_answer_lines'),
+}
+
+
+def fragment_key(emitter, text: str, images=None, answer_lines=None) -> str:
+    """SHA-256 of everything that determines a fragment's HTML"""
+    payload = json.dumps(
+        [RENDERER_VERSION, emitter.name, text, images or [], answer_lines or []],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_fragment(emitter, text: str, images=None, answer_lines=None) -> str:
+    """Render text with an emitter, reusing the cached fragment when the content is unchanged"""
+    images = public_images(images)
+    key = fragment_key(emitter, text, images, answer_lines)
+    html = fragment_cache.get(key)
+    if html is None:
+        html = render_markup(text, images, answer_lines, emitter)
+        fragment_cache.set(key, html)
+    return html
+
+
+def render_question_fragment(text, images=None, answer_lines=None) -> str:
+    """Question text as rendered on the exam paper"""
+    if not text:
+        return ""
+    return render_fragment(question_emitter, text, images, answer_lines)
+
+
+def render_answer_fragment(text, images=None, answer_lines=None) -> str:
+    """Answer text as rendered in the marking scheme"""
+    if not text:
+        return "No answer provided"
+    return render_fragment(answer_emitter, text, images, answer_lines)
+
+
+def fragment_source(question) -> Dict:
+    """Fields of a Question that fragments are rendered from (same keys as snapshot entries)"""
+    return {
+        'id': str(question.id),
+        'question_text': question.question_text,
+        'question_inline_images': question.question_inline_images,
+        'question_answer_lines': question.question_answer_lines,
+        'answer_text': question.answer_text,
+        'answer_inline_images': question.answer_inline_images,
+        'answer_answer_lines': question.answer_answer_lines,
+    }
+
+
+def _entry_input(entry: Dict, kind: str):
+    emitter, text_field, images_field, lines_field = FRAGMENT_KINDS[kind]
+    text = entry.get(text_field)
+    images = public_images(entry.get(images_field))
+    answer_lines = entry.get(lines_field) if lines_field else None
+    return emitter, text, images, answer_lines
+
+
+def prefetch_fragments(entries: Iterable[Dict], kinds: Iterable[str] = ('question',)) -> int:
+    """
+    Make the fragments of these questions available in the process cache
+
+    Args:
+        entries: Snapshot entries (see api/paper_snapshot.py) or fragment_source() dicts
+        kinds: Fragment kinds to load (keys of FRAGMENT_KINDS)
+
+    Returns:
+        Number of fragments that had to be rendered
+    """
+    wanted = {}  # (question_id, kind) -> (key, emitter, text, images, answer_lines)
+    for entry in entries:
+        for kind in kinds:
+            emitter, text, images, answer_lines = _entry_input(entry, kind)
+            if not text:
+                continue
+            key = fragment_key(emitter, text, images, answer_lines)
+            if fragment_cache.get(key) is None:
+                wanted[(entry['id'], kind)] = (key, emitter, text, images, answer_lines)
+
+    if not wanted:
+        return 0
+
+    question_ids = {question_id for question_id, _ in wanted}
+    stored = QuestionFragment.objects.filter(
+        question_id__in=question_ids, kind__in=list(kinds)
+    ).values_list('question_id', 'kind', 'key', 'html')
+
+    for question_id, kind, key, html in stored:
+        wanted_fragment = wanted.get((str(question_id), kind))
+        if wanted_fragment is not None and wanted_fragment[0] == key:
+            fragment_cache.set(key, html)
+            del wanted[(str(question_id), kind)]
+
+    # Missing or stale rows: render now and store for the next process
+    fragments = []
+    for (question_id, kind), (key, emitter, text, images, answer_lines) in wanted.items():
+        try:
+            html = render_markup(text, images, answer_lines, emitter)
+        except Exception:
+            # Left to the caller's own rendering (and error handling)
+            continue
+        fragment_cache.set(key, html)
+        fragments.append(QuestionFragment(question_id=question_id, kind=kind, key=key, html=html))
+    _store_fragments(fragments)
+    return len(fragments)
+
+
+def _store_fragments(fragments: List[QuestionFragment]):
+    if not fragments:
+        return
+    try:
+        # Savepoint, so a failed write never breaks the caller's transaction
+        with transaction.atomic():
+            QuestionFragment.objects.bulk_create(
+                fragments,
+                update_conflicts=True,
+                unique_fields=['question', 'kind'],
+                update_fields=['key', 'html', 'updated_at'],
+            )
+    except Exception as e:
+        # The process cache already holds them; storing is only an optimization
+        logger.warning(f"[FRAGMENTS] Could not store {len(fragments)} fragments: {str(e)}")
+
+
+def store_question_fragments(question) -> None:
+    """Re-render and store every fragment kind of a question (called on save)"""
+    source = fragment_source(question)
+    fragments = []
+    for kind in FRAGMENT_KINDS:
+        emitter, text, images, answer_lines = _entry_input(source, kind)
+        if not text:
+            continue
+        key = fragment_key(emitter, text, images, answer_lines)
+        html = render_markup(text, images, answer_lines, emitter)
+        fragment_cache.set(key, html)
+        fragments.append(QuestionFragment(question_id=question.id, kind=kind, key=key, html=html))
+    _store_fragments(fragments)
@@ -0,0 +1,279 @@
+"""
+Paper Generation Jobs
+Runs heavy paper generations in a worker process instead of the web request
+
+Generate endpoints are wrapped with @generation_job('<kind>'):
+- Small pools (fewer than GENERATION_JOB_POOL_THRESHOLD active questions in the
+  selected topics) keep the synchronous fast path and respond exactly as before.
+- Larger pools, or requests sent with "async": true, are stored as a GenerationJob
+  and the endpoint answers 202 Accepted with the job ID and a status URL.
+- `python manage.py run_generation_jobs` claims pending jobs and calls the same view
+  function with the stored request body, saving its response on the job.
+- GET /api/papers/jobs/<job_id> reports the job status and, once finished, the
+  response the generate endpoint produced. Only the requesting user (or staff) can
+  read a job; jobs queued without a logged-in user carry an unguessable
+  access_token that must be sent as `?token=`.
+- A running job whose worker died is claimed again once its lease
+  (GENERATION_JOB_LEASE_SECONDS since started_at) expires, up to
+  GENERATION_JOB_MAX_ATTEMPTS claims; after that it is marked failed.
+
+Jobs are only queued when GENERATION_JOBS_ENABLED is set, because they need the
+worker command running next to the web processes. "async": false always forces
+the synchronous path.
+"""
+
+import importlib
+import json
+import logging
+import secrets
+from datetime import timedelta
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .models import GenerationJob, Question
+
+logger = logging.getLogger(__name__)
+
+
+# kind -> undecorated generate view function
+_job_views: Dict[str, Callable] = {}
+
+
+class JobRequest:
+    """
+    Stand-in for the original request when a worker replays a generate view
+
+    Provides both the DRF (`request.data`) and plain Django (`request.body`)
+    access paths used by the generate views.
+    """
+
+    method = 'POST'
+
+    def __init__(self, payload: dict, user=None):
+        self.data = payload
+        self.body = json.dumps(payload).encode('utf-8')
+        self.user = user if user is not None else AnonymousUser()
+        self.GET = {}
+        self.query_params = {}
+        self.META = {}
+
+
+def _request_payload(request) -> dict:
+    """Read the JSON body of a DRF or plain Django request"""
+    try:
+        data = getattr(request, 'data', None)
+        if data is None:
+            data = json.loads(request.body or b'{}')
+    except Exception:
+        return {}
+    return dict(data) if isinstance(data, dict) else {}
+
+
+def _pool_size(payload: dict) -> int:
+    """Count the active questions a generate request would draw from"""
+    paper_id = payload.get('paper_id')
+    if not paper_id:
+        return 0
+
+    topic_ids = payload.get('topic_ids') or payload.get('selected_topics') or payload.get('topics')
+    try:
+        queryset = Question.objects.filter(paper_id=paper_id, is_active=True)
+        if topic_ids:
+            queryset = queryset.filter(topic_id__in=topic_ids)
+        return queryset.count()
+    except Exception:
+        # Malformed IDs: let the view run synchronously and report the error itself
+        return 0
+
+
+def should_queue(payload: dict) -> bool:
+    """Decide between the synchronous fast path and a queued job"""
+    if not getattr(settings, 'GENERATION_JOBS_ENABLED', False):
+        return False
+
+    requested = payload.get('async')
+    if requested is not None:
+        return str(requested).lower() in ('1', 'true', 'yes')
+
+    threshold = getattr(settings, 'GENERATION_JOB_POOL_THRESHOLD', 400)
+    return _pool_size(payload) >= threshold
+
+
+def generation_job(kind: str):
+    """
+    Let a generate view run as a background job for large question pools
+
+    Place it directly above the view function, below @api_view /
+    @permission_classes / @require_http_methods, so authentication and method
+    checks still run in the web request.
+    """
+    def decorator(view_func):
+        _job_views[kind] = view_func
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            payload = _request_payload(request)
+            if not should_queue(payload):
+                return view_func(request, *args, **kwargs)
+
+            user = request.user if getattr(request, 'user', None) and request.user.is_authenticated else None
+            # Without an owner, only whoever holds the token may read the job
+            access_token = '' if user else secrets.token_urlsafe(32)
+            job = GenerationJob.objects.create(
+                kind=kind, payload=payload, requested_by=user, access_token=access_token
+            )
+            logger.info(f"[GENERATION JOB] Queued {kind} job {job.id}")
+
+            status_url = f'/api/papers/jobs/{job.id}'
+            data = {
+                'success': True,
+                'message': 'Paper generation queued',
+                'job_id': str(job.id),
+                'status': job.status,
+                'status_url': f'{status_url}?token={access_token}' if access_token else status_url,
+            }
+            if access_token:
+                data['job_token'] = access_token
+            return JsonResponse(data, status=202)
+
+        return wrapper
+    return decorator
+
+
+def get_job_view(kind: str) -> Callable:
+    """Return the generate view registered for a job kind"""
+    if kind not in _job_views:
+        # Worker processes only register views once the URL modules are imported,
+        # including the subject modules urls.py routes lazily
+        importlib.import_module(settings.ROOT_URLCONF)
+        from .lazy_registry import load_lazy_views
+        load_lazy_views()
+    try:
+        return _job_views[kind]
+    except KeyError:
+        raise ValueError(f"No generate endpoint registered for job kind '{kind}'")
+
+
+def _response_data(response) -> Optional[dict]:
+    """Extract JSON-safe data from a DRF Response or a JsonResponse"""
+    if hasattr(response, 'data'):
+        return json.loads(json.dumps(response.data, cls=DjangoJSONEncoder))
+    try:
+        return json.loads(response.content)
+    except (ValueError, AttributeError):
+        return None
+
+
+def reclaim_stale_jobs() -> int:
+    """
+    Requeue running jobs whose lease expired (their worker crashed or was killed)
+
+    Jobs that already used GENERATION_JOB_MAX_ATTEMPTS claims are failed instead,
+    so a job that kills its worker cannot block the queue forever.
+
+    Returns:
+        Number of jobs requeued or failed
+    """
+    lease = getattr(settings, 'GENERATION_JOB_LEASE_SECONDS', 900)
+    max_attempts = getattr(settings, 'GENERATION_JOB_MAX_ATTEMPTS', 3)
+    stale = GenerationJob.objects.filter(
+        status='running',
+        started_at__lt=timezone.now() - timedelta(seconds=lease),
+    )
+
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status='failed',
+        error=f'Worker stopped before finishing the job ({max_attempts} attempts)',
+        finished_at=timezone.now(),
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(status='pending', started_at=None)
+    if failed or requeued:
+        logger.warning(f"[GENERATION JOB] Expired leases: {requeued} requeued, {failed} failed")
+    return failed + requeued
+
+
+def claim_next_job() -> Optional[GenerationJob]:
+    """Mark the oldest pending job as running and return it (None if the queue is empty)"""
+    reclaim_stale_jobs()
+    with transaction.atomic():
+        job = (
+            GenerationJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.attempts += 1
+        job.save(update_fields=['status', 'started_at', 'attempts'])
+    return job
+
+
+def run_job(job: GenerationJob) -> GenerationJob:
+    """Run a claimed job through its generate view and store the outcome"""
+    try:
+        if job.requested_by is None and not job.access_token:
+            # Queued by a logged-in user whose account has since been deleted;
+            # the view would run as AnonymousUser and fail on the missing user
+            raise ValueError('The user who requested this job no longer exists')
+        view_func = get_job_view(job.kind)
+        response = view_func(JobRequest(job.payload, job.requested_by))
+        job.result = _response_data(response)
+        job.response_status = response.status_code
+        job.status = 'completed' if response.status_code < 400 else 'failed'
+    except Exception as e:
+        logger.error(f"[GENERATION JOB] {job.kind} job {job.id} crashed: {str(e)}", exc_info=True)
+        job.status = 'failed'
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    # Only the worker holding the current lease may store the outcome
+    stored = GenerationJob.objects.filter(id=job.id, status='running', started_at=job.started_at).update(
+        status=job.status,
+        result=job.result,
+        response_status=job.response_status,
+        error=job.error,
+        finished_at=job.finished_at,
+    )
+    if not stored:
+        logger.warning(f"[GENERATION JOB] {job.kind} job {job.id} lost its lease; outcome discarded")
+    logger.info(f"[GENERATION JOB] {job.kind} job {job.id} {job.status}")
+    return job
+
+
+def can_read_job(job: GenerationJob, user, token: str = '') -> bool:
+    """Only the requester, staff, or (for jobs without a requester) the token holder"""
+    if job.requested_by_id is not None:
+        return job.requested_by_id == user.pk or user.is_staff
+    if job.access_token:
+        return secrets.compare_digest(job.access_token, token or '') or user.is_staff
+    # Requester deleted
+    return user.is_staff
+
+
+def serialize_job(job: GenerationJob) -> dict:
+    """Status payload for the poll endpoint"""
+    data = {
+        'job_id': str(job.id),
+        'kind': job.kind,
+        'status': job.status,
+        'attempts': job.attempts,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+    if job.status in ('completed', 'failed'):
+        data['response_status'] = job.response_status
+        data['result'] = job.result
+        data['error'] = job.error
+    return data
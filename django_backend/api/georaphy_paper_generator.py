@@ -17,13 +17,17 @@ import random
 import time
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .mark_solver import SectionSpec, InfeasibleSelectionError, solve_section
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus, in_section
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 
 class KCSEGeographyPaperGenerator:
@@ -92,12 +96,7 @@ class KCSEGeographyPaperGenerator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -148,38 +147,34 @@ class KCSEGeographyPaperGenerator:
     def _select_section_a(self) -> bool:
         """
         Select Section A questions: 5-6 questions totaling exactly 25 marks
-        Uses a combination approach to reach exactly 25 marks
+        Uses the exact mark solver so an impossible pool fails immediately
         """
         available = [q for q in self.section_a_questions if q.id not in self.used_ids]
         
-        if len(available) < self.SECTION_A_MIN_QUESTIONS:
+        try:
+            selected = solve_section(SectionSpec(
+                'section_a',
+                available,
+                min_questions=self.SECTION_A_MIN_QUESTIONS,
+                max_questions=self.SECTION_A_MAX_QUESTIONS,
+                min_marks=self.SECTION_A_TOTAL_MARKS,
+                max_marks=self.SECTION_A_TOTAL_MARKS
+            ))
+        except InfeasibleSelectionError as e:
+            print(f"  Section A FAILED: {e}")
             return False
         
-        # Try to find a combination that sums to exactly 25 marks
-        # with 5-6 questions
-        for num_questions in range(self.SECTION_A_MIN_QUESTIONS, self.SECTION_A_MAX_QUESTIONS + 1):
-            if len(available) < num_questions:
-                continue
-            
-            # Try different combinations
-            for attempt in range(50):  # Try 50 random combinations
-                selected = random.sample(available, num_questions)
-                total_marks = sum(q.marks for q in selected)
-                
-                if total_marks == self.SECTION_A_TOTAL_MARKS:
-                    # Found valid combination!
-                    self.selected_section_a = selected
-                    for q in selected:
-                        self.used_ids.add(q.id)
-                    
-                    print(f"\n[SECTION A SELECTED]")
-                    print(f"  Questions: {len(selected)} (all compulsory)")
-                    print(f"  Total marks: {total_marks}")
-                    print(f"  Question marks: {[q.marks for q in selected]}")
-                    
-                    return True
-        
-        return False
+        total_marks = sum(q.marks for q in selected)
+        self.selected_section_a = selected
+        for q in selected:
+            self.used_ids.add(q.id)
+        
+        print(f"\n[SECTION A SELECTED]")
+        print(f"  Questions: {len(selected)} (all compulsory)")
+        print(f"  Total marks: {total_marks}")
+        print(f"  Question marks: {[q.marks for q in selected]}")
+        
+        return True
     
     def _select_section_b(self) -> bool:
         """
@@ -216,16 +211,15 @@ class KCSEGeographyPaperGenerator:
             self.used_ids = set()
             
             # Select Section A (5-6 questions, 25 marks total)
+            # The solver is exact, so a failure means no valid combination exists
             if not self._select_section_a():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section A selection")
-                continue
+                print(f"[ATTEMPT {attempt}] No Section A combination reaches {self.SECTION_A_TOTAL_MARKS} marks")
+                break
             
             # Select Section B (5 X 25-mark)
             if not self._select_section_b():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section B selection")
-                continue
+                print(f"[ATTEMPT {attempt}] Failed at Section B selection")
+                break
             
             # Success!
             generation_time = time.time() - self.generation_start_time
@@ -262,7 +256,7 @@ class KCSEGeographyPaperGenerator:
         
         # Failed
         raise Exception(
-            f"Failed to generate paper after {max_attempts} attempts. "
+            f"Failed to generate paper after {self.attempts} attempts. "
             f"Available: Section A={len(self.section_a_questions)}, "
             f"25-mark map={len(self.section_b_25mark_map)}, "
             f"25-mark regular={len(self.section_b_25mark_regular)}"
@@ -271,6 +265,10 @@ class KCSEGeographyPaperGenerator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with strictly ordered sections"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_a = hydrate_questions(self.selected_section_a)
+        self.selected_section_b = hydrate_questions(self.selected_section_b)
+        
         # Combine sections in strict order: Section A, then Section B
         all_questions = self.selected_section_a + self.selected_section_b
         
@@ -309,12 +307,11 @@ class KCSEGeographyPaperGenerator:
             })
         
         # Count map questions in Section B
-        section_b_map_count = sum(1 for q in self.selected_section_b 
-                                  if q in self.section_b_25mark_map)
+        section_b_map_count = sum(1 for q in self.selected_section_b if q.is_map)
         
         # Check if Question 6 is a map (first question in Section B)
         has_map_at_q6 = (len(self.selected_section_b) > 0 and 
-                        self.selected_section_b[0] in self.section_b_25mark_map)
+                        self.selected_section_b[0].is_map)
         
         # Calculate marks
         section_a_marks = sum(q.marks for q in self.selected_section_a)
@@ -548,30 +545,12 @@ def validate_geography_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
-        
-        # Count questions by type
-        section_a_count = 0
-        section_b_25mark_map_count = 0
-        section_b_25mark_regular_count = 0
-        
-        for q in all_questions:
-            section_name = q.section.name.upper() if q.section else ""
-            is_map = getattr(q, 'is_map', False)
-            
-            if ("SECTION A" in section_name or "SECTION 1" in section_name) and q.marks < 25:
-                section_a_count += 1
-            elif ("SECTION B" in section_name or "SECTION 2" in section_name) and q.marks == 25:
-                if is_map:
-                    section_b_25mark_map_count += 1
-                else:
-                    section_b_25mark_regular_count += 1
+        # Count questions by type (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        in_section_b = in_section("SECTION B", "SECTION 2")
+        section_a_count = census.count(where=in_section("SECTION A", "SECTION 1"), max_marks=24)
+        section_b_25mark_map_count = census.count(where=lambda key: in_section_b(key) and key.is_map, marks=25)
+        section_b_25mark_regular_count = census.count(where=lambda key: in_section_b(key) and not key.is_map, marks=25)
         
         # Validate
         section_b_25mark_total = section_b_25mark_map_count + section_b_25mark_regular_count
@@ -629,6 +608,7 @@ def validate_geography_paper_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('geography')
 def generate_geography_paper(request):
     """Generate KCSE Geography Paper 1 or 2"""
     try:
@@ -675,13 +655,7 @@ def generate_geography_paper(request):
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
-        paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        unique_code = f"GEO{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"GEO{paper_number}")
         
         # Create GeneratedPaper record
         generated_paper = GeneratedPaper.objects.create(
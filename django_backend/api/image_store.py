@@ -0,0 +1,213 @@
+"""
+Question Image Store
+Content-addressed storage for question and answer inline images
+
+Inline images used to be kept as base64 data URLs inside
+Question.question_inline_images / answer_inline_images, so every question fetch,
+serializer response and rendered page carried the image bytes. Images now live in
+the StoredImage table, keyed by the SHA-256 of their bytes:
+- the same diagram used by several questions is stored once
+- the JSON entry keeps its id/name/... and gets `url` set to the relative path
+  /api/images/<sha256>.<ext>, plus `sha256`, `natural_width` and `natural_height`
+- the stored path carries no host: IMAGE_BASE_URL is added when images are
+  serialized or rendered (public_image_url / public_images), so changing the
+  deployment URL does not require rewriting question rows
+- /api/images/ is served with long-lived, immutable cache headers, since the
+  content behind a hash never changes
+
+New and edited questions are converted when saved (see api/signals.py). Existing
+rows are converted with `python manage.py extract_inline_images`.
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import re
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .models import StoredImage
+
+
+DATA_URL_PATTERN = re.compile(r'^data:(image/[\w.+-]+);base64,(.*)$', re.DOTALL)
+IMAGE_PATH_PATTERN = re.compile(r'/api/images/([0-9a-f]{64})(?:\.\w+)?$')
+
+IMAGE_EXTENSIONS = {
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'image/jpg': 'jpg',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+    'image/svg+xml': 'svg',
+    'image/bmp': 'bmp',
+}
+
+INLINE_IMAGE_FIELDS = ('question_inline_images', 'answer_inline_images')
+
+
+def parse_data_url(url) -> Optional[Tuple[str, bytes]]:
+    """(content type, bytes) of a base64 image data URL, or None for anything else"""
+    if not isinstance(url, str) or not url.startswith('data:'):
+        return None
+    match = DATA_URL_PATTERN.match(url)
+    if not match:
+        return None
+    try:
+        data = base64.b64decode(match.group(2), validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    if not data:
+        return None
+    return match.group(1).lower(), data
+
+
+def image_dimensions(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+    """Pixel size of an image, (None, None) when Pillow cannot read it (e.g. SVG)"""
+    try:
+        from PIL import Image
+        with Image.open(io.BytesIO(data)) as image:
+            return image.width, image.height
+    except Exception:
+        return None, None
+
+
+def image_path(sha256: str, content_type: str) -> str:
+    """Relative path of a stored image, as kept in the inline images JSON"""
+    extension = IMAGE_EXTENSIONS.get(content_type, 'img')
+    return f"/api/images/{sha256}.{extension}"
+
+
+def public_image_url(url):
+    """URL clients should load: stored image paths get IMAGE_BASE_URL, others are returned as-is"""
+    if not isinstance(url, str):
+        return url
+    match = IMAGE_PATH_PATTERN.search(url.split('?', 1)[0])
+    if not match:
+        return url
+    base_url = getattr(settings, 'IMAGE_BASE_URL', '')
+    return f"{base_url}{match.group(0)}"
+
+
+def public_images(images):
+    """Copy of an inline images list with every stored image url made public"""
+    if not images:
+        return images
+    result = []
+    for image in images:
+        if isinstance(image, dict):
+            result.append({**image, 'url': public_image_url(image.get('url'))} if 'url' in image else image)
+        else:
+            result.append(public_image_url(image))
+    return result
+
+
+def load_image(sha256: str) -> Optional[Tuple[str, bytes]]:
+    """(content type, bytes) of a stored image, or None if it does not exist"""
+    image = StoredImage.objects.filter(sha256=sha256).values_list('content_type', 'data').first()
+    if image is None:
+        return None
+    content_type, data = image
+    return content_type, bytes(data)
+
+
+def stored_image_sha256(url) -> Optional[str]:
+    """SHA-256 of a stored image URL (with or without IMAGE_BASE_URL), None for other URLs"""
+    if not isinstance(url, str):
+        return None
+    match = IMAGE_PATH_PATTERN.search(url.split('?', 1)[0])
+    return match.group(1) if match else None
+
+
+def _relative_image_path(url) -> Optional[str]:
+    """Path of an absolute stored image URL, None if the url is not one (or already relative)"""
+    if not isinstance(url, str) or url.startswith('/'):
+        return None
+    match = IMAGE_PATH_PATTERN.search(url.split('?', 1)[0])
+    return match.group(0) if match else None
+
+
+def store_image(content_type: str, data: bytes) -> Dict:
+    """
+    Store image bytes (once per content) and return their reference
+
+    Returns:
+        Dict with url, sha256, natural_width and natural_height
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    stored = StoredImage.objects.filter(sha256=sha256).values('content_type', 'width', 'height').first()
+
+    if stored is None:
+        width, height = image_dimensions(data)
+        stored = {'content_type': content_type, 'width': width, 'height': height}
+        # ignore_conflicts: another process may store the same image concurrently
+        StoredImage.objects.bulk_create([
+            StoredImage(
+                sha256=sha256,
+                content_type=content_type,
+                width=width,
+                height=height,
+                size=len(data),
+                data=data,
+            )
+        ], ignore_conflicts=True)
+
+    return {
+        'url': image_path(sha256, stored['content_type']),
+        'sha256': sha256,
+        'natural_width': stored['width'],
+        'natural_height': stored['height'],
+    }
+
+
+def extract_inline_images(images) -> Tuple[List, int]:
+    """
+    Replace base64 data URLs in an inline images list with stored image references
+
+    Entries may be dicts with a `url` or plain URL strings (as the renderers accept);
+    plain strings stay strings and only get the new URL. Stored image URLs that
+    still carry a host (written before paths were kept relative) are reduced to
+    their path and counted as converted too.
+
+    Returns:
+        (images list, number of images extracted)
+    """
+    if not images:
+        return images, 0
+
+    extracted = 0
+    result = []
+    for image in images:
+        url = image.get('url') if isinstance(image, dict) else image
+        parsed = parse_data_url(url)
+        if parsed is None:
+            path = _relative_image_path(url)
+            if path is None:
+                result.append(image)
+                continue
+            result.append({**image, 'url': path} if isinstance(image, dict) else path)
+            extracted += 1
+            continue
+
+        reference = store_image(*parsed)
+        if isinstance(image, dict):
+            result.append({**image, **reference})
+        else:
+            result.append(reference['url'])
+        extracted += 1
+
+    return result, extracted
+
+
+def extract_question_images(question) -> int:
+    """Move a question's base64 inline images into the store; returns the number moved"""
+    converted = {}
+    for field in INLINE_IMAGE_FIELDS:
+        images, count = extract_inline_images(getattr(question, field))
+        if count:
+            converted[field] = (images, count)
+    # Only touch the question once every image is stored
+    for field, (images, _) in converted.items():
+        setattr(question, field, images)
+    return sum(count for _, count in converted.values())
@@ -18,7 +18,9 @@ import time
 from collections import defaultdict
 from typing import List, Dict, Optional
 
-from .models import Paper, Topic, Question, Subject
+from .models import Paper, Topic, Subject
+from .mark_solver import SectionSpec, InfeasibleSelectionError, solve_sections
+from .question_pool import get_question_pool, hydrate_questions
 
 
 class KCSEBiologyPaper1Generator:
@@ -61,6 +63,7 @@ class KCSEBiologyPaper1Generator:
         self.selected_questions = []
         self.selected_question_ids = []  # List of IDs for paper generation
         self.used_ids = set()
+        self.excluded_ids = set()  # Questions kept out of the draw (batch variants)
         
         # Statistics
         self.nested_count = 0
@@ -90,12 +93,7 @@ class KCSEBiologyPaper1Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions from Biology subject for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -118,7 +116,7 @@ class KCSEBiologyPaper1Generator:
         random.shuffle(self.standalone_2mark)
         random.shuffle(self.standalone_3mark)
         
-        print(f"\n[DATA LOADED]")
+        print("\n[DATA LOADED]")
         print(f"  Nested questions: {len(self.nested_questions)}")
         print(f"  1-mark standalone: {len(self.standalone_1mark)}")
         print(f"  2-mark standalone: {len(self.standalone_2mark)}")
@@ -128,416 +126,230 @@ class KCSEBiologyPaper1Generator:
         self.use_standalone_only = len(self.nested_questions) < self.MIN_NESTED_QUESTIONS
         if self.use_standalone_only:
             print(f"\nWARNING: Not enough nested questions ({len(self.nested_questions)} < {self.MIN_NESTED_QUESTIONS})")
-            print(f"  → Using STANDALONE-ONLY mode with priority for 4-6 mark questions")
+            print("  → Using STANDALONE-ONLY mode with priority for 4-6 mark questions")
     
-    def _select_nested_questions(self) -> bool:
+    def _paper_sections(self) -> List[SectionSpec]:
         """
-        Select nested questions dynamically based on marks.
-        Target: ~52 marks, aiming for close to 16 questions (but flexible: 10-18 range).
-        All questions have equal chance of selection (shuffled).
-        
-        Returns:
-            bool: True if successful (10-18 questions, 47-58 marks)
+        Declare the paper structure for the mark solver
+
+        Normal mode:
+            - Nested: 10-18 questions worth 47-58 marks
+            - Standalone: up to 15 questions (2/3-mark, at most one 1-mark to fill an odd gap)
+        Standalone-only mode:
+            - Any mix of standalone questions reaching exactly 80 marks
         """
-        available = [q for q in self.nested_questions if q.id not in self.used_ids]
+        all_standalone = self._available(self.standalone_1mark + self.standalone_2mark + self.standalone_3mark)
         
-        if len(available) < 10:  # Need minimum 10 nested questions
-            return False
+        if self.use_standalone_only:
+            return [SectionSpec('standalone', all_standalone, min_questions=1)]
+        
+        return [
+            SectionSpec(
+                'nested',
+                self._available(self.nested_questions),
+                min_questions=self.MIN_NESTED_QUESTIONS,
+                max_questions=self.MAX_NESTED_QUESTIONS,
+                min_marks=47,
+                max_marks=58
+            ),
+            SectionSpec(
+                'standalone',
+                all_standalone,
+                max_questions=15,
+                mark_counts={1: (0, 1)}
+            ),
+        ]
+    
+    def _available(self, questions: List) -> List:
+        """Drop questions excluded from the current draw"""
+        if not self.excluded_ids:
+            return questions
+        return [q for q in questions if str(q.id) not in self.excluded_ids]
+    
+    def _select_questions(self):
+        """
+        Select nested and standalone questions in one pass using the exact mark solver
         
-        # Shuffle to give all questions equal chance
-        random.shuffle(available)
+        Raises:
+            InfeasibleSelectionError if the pools cannot reach exactly 80 marks
+        """
+        selection = solve_sections(self._paper_sections(), total_marks=self.TOTAL_MARKS)
         
-        selected = []
-        total_marks = 0
-        target_marks = 52
+        nested = selection.get('nested', [])
+        standalone = selection['standalone']
         
-        # Select questions one by one, counting marks as we go
-        for question in available:
-            current_count = len(selected)
-            
-            # Stop conditions:
-            # 1. If we have 10+ questions and adding this would exceed 58 marks
-            if current_count >= 10 and (total_marks + question.marks) > 58:
-                break
-            
-            # 2. If we have 18 questions (maximum)
-            if current_count >= 18:
-                break
-            
-            # Add the question
-            selected.append(question)
-            total_marks += question.marks
-            
-            # 3. If we're in the sweet spot: 10-18 questions and 47-58 marks
-            if current_count >= 10 and 47 <= total_marks <= 58:
-                # We're good! Can stop here or continue if we're far from 16
-                if current_count >= 14:  # Close enough to 16
-                    break
-        
-        # Final validation: must have 10-18 questions and 47-58 marks
-        question_count = len(selected)
-        if not (10 <= question_count <= 18 and 47 <= total_marks <= 58):
-            return False
-        
-        # Accept selection
-        self.selected_questions.extend(selected)
-        for q in selected:
+        self.selected_questions = nested + standalone
+        for q in self.selected_questions:
             self.used_ids.add(q.id)
             self.selected_question_ids.append(str(q.id))
         
-        self.nested_count = len(selected)
-        self.nested_marks = total_marks
-        self.total_marks = total_marks
-        
-        print(f"\n[NESTED SELECTION]")
-        print(f"  Selected: {self.nested_count} questions (target: ~16)")
-        print(f"  Total marks: {self.nested_marks} (target: ~52)")
-        
-        return True
+        self.nested_count = len(nested)
+        self.nested_marks = sum(q.marks for q in nested)
+        self.standalone_count = len(standalone)
+        self.standalone_marks = sum(q.marks for q in standalone)
+        self.total_marks = self.nested_marks + self.standalone_marks
+        
+        print("\n[NESTED SELECTION]")
+        print(f"  Selected: {self.nested_count} questions, {self.nested_marks} marks")
+        print("\n[STANDALONE SELECTION]")
+        print(f"  Selected: {self.standalone_count} questions, {self.standalone_marks} marks")
+        marks_dist = defaultdict(int)
+        for q in standalone:
+            marks_dist[q.marks] += 1
+        for mark_value, count in sorted(marks_dist.items()):
+            print(f"    {mark_value}-mark: {count} questions ({mark_value * count} marks)")
     
-    def _select_standalone_questions(self) -> bool:
+    def generate(self) -> Dict:
         """
-        Fill remaining marks with standalone questions to reach exactly 80 marks
-        Priority: 2-mark and 3-mark questions
-        Use 1-mark only when exactly 1 mark is needed
+        Generate Biology Paper 1
         
         Returns:
-            bool: True if exactly 80 marks achieved
-        """
-        remaining_marks = self.TOTAL_MARKS - self.total_marks
-        
-        print(f"\n[STANDALONE SELECTION]")
-        print(f"  Need: {remaining_marks} marks (flexible question count)")
-        
-        if remaining_marks <= 0:
-            return self.total_marks == self.TOTAL_MARKS
+            Dict with paper data including question IDs list
         
-        selected = []
-        current_marks = 0
-        max_questions = 15  # Safety limit to prevent infinite loops
+        Raises:
+            Exception if the question pool cannot produce a valid paper
+        """
+        start_time = time.time()
         
-        # Strategy: Use combination of 2-mark and 3-mark to get close
-        # Then use 1-mark to fill exact remaining marks
+        print(f"\n{'='*70}")
+        print("KCSE BIOLOGY PAPER 1 GENERATION")
+        print(f"{'='*70}")
         
-        available_2mark = [q for q in self.standalone_2mark if q.id not in self.used_ids]
-        available_3mark = [q for q in self.standalone_3mark if q.id not in self.used_ids]
-        available_1mark = [q for q in self.standalone_1mark if q.id not in self.used_ids]
+        self._draw()
         
-        # Shuffle for randomness
-        random.shuffle(available_2mark)
-        random.shuffle(available_3mark)
-        random.shuffle(available_1mark)
+        generation_time = time.time() - start_time
+        print(f"\n{'='*70}")
+        print(f"SUCCESS! Generated in one pass ({generation_time:.2f}s)")
+        print(f"{'='*70}")
         
-        # Fill marks until we reach exactly the target
-        while current_marks < remaining_marks and len(selected) < max_questions:
-            marks_left = remaining_marks - current_marks
-            
-            # If exactly 1 mark left, use 1-mark question
-            if marks_left == 1:
-                if available_1mark:
-                    q = available_1mark.pop(0)
-                    selected.append(q)
-                    current_marks += 1
-                    break
-                else:
-                    return False  # Need 1-mark but none available
-            
-            # If exactly 2 marks left, use 2-mark question
-            if marks_left == 2:
-                if available_2mark:
-                    q = available_2mark.pop(0)
-                    selected.append(q)
-                    current_marks += 2
-                    break
-                else:
-                    return False
-            
-            # If 3+ marks left, prefer 2-mark or 3-mark
-            # Use 3-mark if marks_left is odd or if we have many marks to fill
-            if marks_left >= 3 and available_3mark and (marks_left % 2 == 1 or marks_left >= 9):
-                q = available_3mark.pop(0)
-                selected.append(q)
-                current_marks += 3
-            elif marks_left >= 2 and available_2mark:
-                q = available_2mark.pop(0)
-                selected.append(q)
-                current_marks += 2
-            elif marks_left >= 3 and available_3mark:
-                q = available_3mark.pop(0)
-                selected.append(q)
-                current_marks += 3
-            elif marks_left >= 1 and available_1mark:
-                q = available_1mark.pop(0)
-                selected.append(q)
-                current_marks += 1
-            else:
-                return False  # Can't continue
-        
-        # Check if we hit exactly the target
-        if current_marks == remaining_marks:
-            self.selected_questions.extend(selected)
-            for q in selected:
-                self.used_ids.add(q.id)
-                self.selected_question_ids.append(str(q.id))
-            
-            self.standalone_count = len(selected)
-            self.standalone_marks = current_marks
-            self.total_marks = self.nested_marks + self.standalone_marks
-            
-            print(f"  Selected: {self.standalone_count} standalone questions")
-            print(f"  Marks breakdown:")
-            marks_dist = defaultdict(int)
-            for q in selected:
-                marks_dist[q.marks] += 1
-            for mark_value, count in sorted(marks_dist.items()):
-                print(f"    {mark_value}-mark: {count} questions ({mark_value * count} marks)")
-            
-            return True
+        return self._build_result(generation_time)
+    
+    def _draw(self):
+        """
+        Reset selection state and draw one paper
         
-        return False
+        Raises:
+            Exception if the question pool cannot produce a valid paper
+        """
+        try:
+            self._draw_excluding(set())
+        except InfeasibleSelectionError as e:
+            raise Exception(
+                f"Failed to generate paper: {e}. "
+                f"Available: Nested={len(self.nested_questions)}, "
+                f"2-mark={len(self.standalone_2mark)}, "
+                f"3-mark={len(self.standalone_3mark)}, "
+                f"1-mark={len(self.standalone_1mark)}"
+            )
     
-    def _select_standalone_only(self) -> bool:
+    def _draw_excluding(self, excluded_ids: set):
         """
-        Select standalone questions to reach exactly 80 marks when no nested questions available.
-        Two-phase approach:
-        - Phase 1: Use 4-mark, 5-mark, 6-mark questions to reach ~52 marks (mimicking nested section)
-        - Phase 2: Fill remaining ~28 marks with 3-mark, 2-mark, 1-mark questions
+        Reset selection state and draw one paper without the excluded questions
         
-        Returns:
-            bool: True if exactly 80 marks achieved
+        Raises:
+            InfeasibleSelectionError if the remaining pool cannot produce a valid paper
         """
-        print(f"\n[STANDALONE-ONLY SELECTION - TWO PHASE]")
-        print(f"  Phase 1 Target: ~52 marks using 4-6 mark questions (Priority: 4 > 5 > 6)")
-        print(f"  Phase 2 Target: Remaining marks using 3, 2, 1 mark questions")
-        
-        # Get all available standalone questions
-        all_standalone = []
-        all_standalone.extend(self.standalone_1mark)
-        all_standalone.extend(self.standalone_2mark)
-        all_standalone.extend(self.standalone_3mark)
-        
-        # Group by marks
-        by_marks = defaultdict(list)
-        for q in all_standalone:
-            by_marks[q.marks].append(q)
-        
-        # Shuffle each group for randomization
-        for questions in by_marks.values():
-            random.shuffle(questions)
-        
-        # Create pools for each mark value
-        pools = {mark: list(by_marks.get(mark, [])) for mark in [1, 2, 3, 4, 5, 6]}
-        
-        # PHASE 1: Select 4-6 mark questions to reach ~52 marks (if available)
-        # Priority: 4-mark > 5-mark > 6-mark
-        phase1_priority = [4, 5, 6]
-        phase1_selected = []
-        phase1_marks = 0
-        phase1_target = 52
-        
-        # Check if any 4-6 mark questions exist
-        has_high_mark_questions = any(pools[mark] for mark in phase1_priority)
-        
-        if has_high_mark_questions:
-            print(f"\n  [Phase 1] Selecting 4-6 mark questions...")
-            while phase1_marks < phase1_target:
-                marks_left = phase1_target - phase1_marks
-                added = False
-                
-                # Try each priority in order
-                for mark_value in phase1_priority:
-                    if mark_value <= marks_left and pools[mark_value]:
-                        q = pools[mark_value].pop(0)
-                        phase1_selected.append(q)
-                        phase1_marks += mark_value
-                        added = True
-                        break
-                
-                if not added:
-                    # Can't reach target with available questions
-                    # Check if we're close enough (47-58 range)
-                    if 47 <= phase1_marks <= 58:
-                        print(f"  Phase 1: Achieved {phase1_marks} marks (acceptable range)")
-                        break
-                    else:
-                        print(f"  Phase 1: Stopped at {phase1_marks} marks (will use Phase 2 for remainder)")
-                        break
-            
-            print(f"   Phase 1: Selected {len(phase1_selected)} questions, {phase1_marks} marks")
-        else:
-            print(f"\n  [Phase 1] SKIPPED - No 4-6 mark questions available")
-            print(f"  → Will use only 1-3 mark questions for entire paper")
-        
-        # PHASE 2: Fill remaining marks with 3, 2, 1 mark questions
-        # Priority: 3-mark > 2-mark > 1-mark (only when needed)
-        phase2_priority = [3, 2, 1]
-        phase2_selected = []
-        phase2_marks = 0
-        remaining_target = 80 - phase1_marks
-        
-        print(f"\n  [Phase 2] Need {remaining_target} more marks...")
-        
-        current_marks = 0
-        while current_marks < remaining_target:
-            marks_left = remaining_target - current_marks
-            added = False
-            
-            # Special case: exactly 1 mark needed
-            if marks_left == 1:
-                if pools[1]:
-                    q = pools[1].pop(0)
-                    phase2_selected.append(q)
-                    current_marks += 1
-                    break
-                else:
-                    return False
-            
-            # Special case: exactly 2 marks needed
-            if marks_left == 2:
-                if pools[2]:
-                    q = pools[2].pop(0)
-                    phase2_selected.append(q)
-                    current_marks += 2
-                    break
-                else:
-                    return False
-            
-            # For 3+ marks: prefer 3-mark or 2-mark
-            # Use 3-mark if marks_left is odd or if we have many marks to fill
-            if marks_left >= 3 and pools[3] and (marks_left % 2 == 1 or marks_left >= 9):
-                q = pools[3].pop(0)
-                phase2_selected.append(q)
-                current_marks += 3
-            elif marks_left >= 2 and pools[2]:
-                q = pools[2].pop(0)
-                phase2_selected.append(q)
-                current_marks += 2
-            elif marks_left >= 3 and pools[3]:
-                q = pools[3].pop(0)
-                phase2_selected.append(q)
-                current_marks += 3
-            elif marks_left >= 1 and pools[1]:
-                q = pools[1].pop(0)
-                phase2_selected.append(q)
-                current_marks += 1
-            else:
-                return False  # Can't continue
+        self.attempts = 1
+        self.selected_questions = []
+        self.selected_question_ids = []
+        self.used_ids = set()
         
-        # Check if we hit exactly the target
-        if current_marks == remaining_target:
-            phase2_marks = current_marks
-            print(f"  Phase 2: Selected {len(phase2_selected)} questions, {phase2_marks} marks")
-            
-            # Combine both phases
-            all_selected = phase1_selected + phase2_selected
-            total_marks = phase1_marks + phase2_marks
-            
-            self.selected_questions = all_selected
-            for q in all_selected:
-                self.used_ids.add(q.id)
-                self.selected_question_ids.append(str(q.id))
-            
-            # Update counts
-            self.nested_count = 0
-            self.nested_marks = 0
-            self.standalone_count = len(all_selected)
-            self.standalone_marks = total_marks
-            self.total_marks = total_marks
-            
-            print(f"\n  TOTAL: {self.standalone_count} questions, {self.total_marks} marks")
-            
-            # Show marks distribution by phase
-            print(f"\n  Marks Distribution:")
-            print(f"    Phase 1 (4-6 marks): {len(phase1_selected)} questions, {phase1_marks} marks")
-            phase1_dist = defaultdict(int)
-            for q in phase1_selected:
-                phase1_dist[q.marks] += 1
-            for mark_value in sorted(phase1_dist.keys(), reverse=True):
-                count = phase1_dist[mark_value]
-                print(f"      {mark_value}-mark: {count} questions")
-            
-            print(f"    Phase 2 (1-3 marks): {len(phase2_selected)} questions, {phase2_marks} marks")
-            phase2_dist = defaultdict(int)
-            for q in phase2_selected:
-                phase2_dist[q.marks] += 1
-            for mark_value in sorted(phase2_dist.keys(), reverse=True):
-                count = phase2_dist[mark_value]
-                print(f"      {mark_value}-mark: {count} questions")
-            
-            return True
+        self.excluded_ids = excluded_ids
+        try:
+            self._select_questions()
+        finally:
+            self.excluded_ids = set()
+    
+    @staticmethod
+    def _reusable_ids(previous: List[set], max_overlap: int) -> set:
+        """
+        Random set of already used questions that a new variant may draw again
         
-        return False
+        A question is admitted only while every earlier variant containing it still
+        has fewer than `max_overlap` admitted questions, so any paper drawn from the
+        unused questions plus this set shares at most `max_overlap` questions with
+        each earlier variant.
+        """
+        admitted_per_variant = [0] * len(previous)
+        candidates = list(set().union(*previous))
+        random.shuffle(candidates)
+        
+        reusable = set()
+        for question_id in candidates:
+            containing = [i for i, ids in enumerate(previous) if question_id in ids]
+            if all(admitted_per_variant[i] < max_overlap for i in containing):
+                reusable.add(question_id)
+                for i in containing:
+                    admitted_per_variant[i] += 1
+        return reusable
     
-    def generate(self) -> Dict:
+    def generate_variants(self, variants: int, max_overlap: int = 0) -> List[Dict]:
         """
-        Generate Biology Paper 1
+        Generate several versions of the paper from the already loaded pool
+        
+        Each variant is first drawn from the questions no earlier variant used. If
+        the pool is too small for that and `max_overlap` allows it, the variant is
+        drawn once more with a budget of reused questions (see _reusable_ids), so
+        the overlap limit holds by construction and no draw is ever rejected.
+        
+        Args:
+            variants: Number of papers to generate
+            max_overlap: Maximum questions a variant may share with any earlier one
         
         Returns:
-            Dict with paper data including question IDs list
+            List of results (same shape as generate()), with statistics['variant']
         
         Raises:
-            Exception if generation fails
+            Exception if a variant cannot satisfy the overlap limit
         """
-        max_attempts = 100
-        start_time = time.time()
+        results = []
+        previous = []  # Question ID sets of accepted variants
+        used_ids = set()
         
-        print(f"\n{'='*70}")
-        print(f"KCSE BIOLOGY PAPER 1 GENERATION")
-        print(f"{'='*70}")
-        
-        for attempt in range(1, max_attempts + 1):
-            self.attempts = attempt
+        for index in range(variants):
+            start_time = time.time()
+            print(f"\n[VARIANT {index + 1}/{variants}]")
             
-            # Reset state
-            self.selected_questions = []
-            self.selected_question_ids = []
-            self.used_ids = set()
-            self.nested_count = 0
-            self.nested_marks = 0
-            self.standalone_count = 0
-            self.standalone_marks = 0
-            self.total_marks = 0
-            
-            # Check if we should use standalone-only mode
-            if self.use_standalone_only:
-                # Use only standalone questions with priority for 4-6 marks
-                if not self._select_standalone_only():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at standalone-only selection")
-                    continue
-            else:
-                # Normal mode: Phase 1 - Select 10-18 nested questions (~60 marks)
-                if not self._select_nested_questions():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at nested selection")
-                    continue
-                
-                # Phase 2: Fill remaining marks with standalone (2-mark, 3-mark, 1-mark)
-                if not self._select_standalone_questions():
-                    if attempt % 10 == 0:
-                        print(f"[ATTEMPT {attempt}] Failed at standalone selection")
-                    continue
+            try:
+                # Disjoint draw: exclude everything earlier variants used
+                self._draw_excluding(used_ids)
+            except InfeasibleSelectionError as e:
+                if not previous or max_overlap == 0:
+                    raise Exception(
+                        f"Could not generate variant {index + 1} without reusing questions "
+                        f"of earlier variants: {e}"
+                    )
+                # Overlap draw: readmit a bounded number of used questions
+                try:
+                    self._draw_excluding(used_ids - self._reusable_ids(previous, max_overlap))
+                    self.attempts = 2
+                except InfeasibleSelectionError as e:
+                    raise Exception(
+                        f"Could not generate variant {index + 1} sharing at most {max_overlap} "
+                        f"questions with earlier variants: {e}"
+                    )
             
-            # Success!
-            generation_time = time.time() - start_time
-            print(f"\n{'='*70}")
-            print(f"SUCCESS! Generated in {attempt} attempts ({generation_time:.2f}s)")
-            print(f"{'='*70}")
+            ids = set(self.selected_question_ids)
+            overlap = max((len(ids & other) for other in previous), default=0)
             
-            return self._build_result(generation_time)
-        
-        # Failed
-        raise Exception(
-            f"Failed to generate paper after {max_attempts} attempts. "
-            f"Available: Nested={len(self.nested_questions)}, "
-            f"2-mark={len(self.standalone_2mark)}, "
-            f"3-mark={len(self.standalone_3mark)}, "
-            f"1-mark={len(self.standalone_1mark)}"
-        )
+            result = self._build_result(time.time() - start_time)
+            result['statistics']['variant'] = {
+                'index': index + 1,
+                'label': chr(ord('A') + index) if index < 26 else str(index + 1),
+                'max_overlap_with_previous': overlap,
+            }
+            results.append(result)
+            previous.append(ids)
+            used_ids = used_ids | ids
+        
+        return results
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper data and question IDs list"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_questions = hydrate_questions(self.selected_questions)
+        
         # Build questions data
         questions_data = []
         for idx, question in enumerate(self.selected_questions, start=1):
@@ -6,9 +6,12 @@ With bold titles and marks before each question
 
 from .coverpage_templates import (
     KiswahiliPaper2Coverpage,
-    MarkingSchemeCoverpage
+    MarkingSchemeCoverpage,
+    coverpage_body,
 )
 import re
+from .image_store import public_image_url
+from .question_markup import table_occupancy
 
 
 def generate_kiswahili_paper2_html(coverpage_data, questions, coverpage_class=None):
@@ -35,20 +38,7 @@ def generate_kiswahili_paper2_html(coverpage_data, questions, coverpage_class=No
         coverpage_class = KiswahiliPaper2Coverpage
     
     # Generate coverpage HTML (page 1)
-    if hasattr(coverpage_class, 'generate_html') and callable(getattr(coverpage_class, 'generate_html')):
-        # Static method - call directly with data
-        coverpage_html = coverpage_class.generate_html(coverpage_data)
-    else:
-        # Instance method - create instance first
-        coverpage_instance = coverpage_class(coverpage_data)
-        coverpage_html = coverpage_instance.generate_html()
-    
-    # Extract coverpage content (remove html/body tags to combine later)
-    coverpage_body = re.search(r'<body>(.*?)</body>', coverpage_html, re.DOTALL)
-    if coverpage_body:
-        coverpage_content = coverpage_body.group(1)
-    else:
-        coverpage_content = coverpage_html
+    coverpage_content = coverpage_body(coverpage_class, coverpage_data)
     
     # Calculate total pages
     total_pages = 2  # 1 coverpage + 1 question page (all questions continuous)
@@ -733,21 +723,13 @@ def _process_question_text(text, images=None, answer_lines=None):
                                     merged_cells[r][c] = {'colspan': colspan, 'rowspan': rowspan}
                     except (ValueError, IndexError):
                         pass
-                    def is_cell_merged(row_idx, col_idx):
-                        for r in range(row_idx + 1):
-                            for c in range(col_idx + 1):
-                                if r in merged_cells and c in merged_cells[r]:
-                                    cell = merged_cells[r][c]
-                                    colspan = cell.get('colspan', 1)
-                                    rowspan = cell.get('rowspan', 1)
-                                    if (row_idx >= r and row_idx <= r + rowspan - 1 and col_idx >= c and col_idx <= c + colspan - 1):
-                                        return r != row_idx or c != col_idx
-                        return False
-                    table_html = '<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>'
+                    # Cells covered by another cell's merged span
+                    covered = table_occupancy(merged_cells, rows, cols)
+                    table_html = ['<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>']
                     for row_idx in range(rows):
-                        table_html += '<tr>'
+                        table_html.append('<tr>')
                         for col_idx in range(cols):
-                            if is_cell_merged(row_idx, col_idx):
+                            if covered[row_idx][col_idx]:
                                 continue
                             cell_index = row_idx * cols + col_idx
                             cell_value = cell_data[cell_index] if cell_index < len(cell_data) else ''
@@ -755,10 +737,10 @@ def _process_question_text(text, images=None, answer_lines=None):
                             merge_info = merged_cells.get(row_idx, {}).get(col_idx, {'colspan': 1, 'rowspan': 1})
                             colspan_attr = f' colspan="{merge_info["colspan"]}"' if merge_info['colspan'] > 1 else ''
                             rowspan_attr = f' rowspan="{merge_info["rowspan"]}"' if merge_info['rowspan'] > 1 else ''
-                            table_html += f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {col_widths[col_idx]}px; height: {row_heights[row_idx]}px; min-width: 60px; min-height: 30px;">{cell_html}</td>'
-                        table_html += '</tr>'
-                    table_html += '</tbody></table>'
-                    result.append(table_html)
+                            table_html.append(f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {col_widths[col_idx]}px; height: {row_heights[row_idx]}px; min-width: 60px; min-height: 30px;">{cell_html}</td>')
+                        table_html.append('</tr>')
+                    table_html.append('</tbody></table>')
+                    result.append(''.join(table_html))
                     continue
             except Exception:
                 result.append(part)
@@ -961,7 +943,7 @@ def _process_question_text(text, images=None, answer_lines=None):
                 image = images_dict.get(image_id)
                 
                 if image and image.get('url'):
-                    img_url = image['url']
+                    img_url = public_image_url(image['url'])
                     img_alt = image.get('name', 'Question image')
                     style = f"width: {image_width}px;"
                     if image_height:
@@ -19,13 +19,16 @@ import re
 import time
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
-from .models import Paper, Topic, Question, Subject, GeneratedPaper
+from .models import Paper, Topic, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 class KCSEKiswahiliPaper1Generator:
     """
@@ -103,12 +106,7 @@ class KCSEKiswahiliPaper1Generator:
             )
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -258,8 +256,12 @@ class KCSEKiswahiliPaper1Generator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper structure"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        all_questions = hydrate_questions([self.selected_question_1] + self.selected_questions_2_4)
+        
         # Combine all questions: Question 1 + Questions 2-4
-        all_questions = [self.selected_question_1] + self.selected_questions_2_4
+        self.selected_question_1 = all_questions[0]
+        self.selected_questions_2_4 = all_questions[1:]
         
         # Build questions data
         questions_data = []
@@ -490,12 +492,7 @@ class KCSEKiswahiliPaper2Generator:
         ))
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -666,13 +663,15 @@ class KCSEKiswahiliPaper2Generator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with paper structure"""
         
-        # Collect all selected questions
-        all_questions = [
+        # Collect all selected questions, fetching full rows (text, answers) only for these
+        all_questions = hydrate_questions([
             self.selected_ufhamu,
             self.selected_ufupisho,
             self.selected_matumizi,
             self.selected_isimu_jamii
-        ]
+        ])
+        (self.selected_ufhamu, self.selected_ufupisho,
+         self.selected_matumizi, self.selected_isimu_jamii) = all_questions
         
         # Build questions data
         questions_data = []
@@ -832,27 +831,19 @@ def validate_kiswahili_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Load all questions
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        # Count questions by topic (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        questions_by_topic = census.by_topic()
+        total_questions = sum(questions_by_topic.values())
         
         if paper_number == 1:
-            # Query Topic model directly for is_step topics
-            is_step_topics = list(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                paper=paper,
-                is_active=True,
-                is_step=True
-            ))
+            # Topic flags come with the selected topics loaded above
+            is_step_topics = [t for t in topics if t.is_step]
             
             is_step_topic_count = len(is_step_topics)
             is_step_topic_ids = {t.id for t in is_step_topics}
-            is_step_question_count = sum(1 for q in all_questions if q.topic_id in is_step_topic_ids)
-            regular_question_count = len(all_questions) - is_step_question_count
+            is_step_question_count = sum(questions_by_topic.get(str(topic_id), 0) for topic_id in is_step_topic_ids)
+            regular_question_count = total_questions - is_step_question_count
             
             # Need: 1+ is_step questions, 3+ regular questions from different topics
             can_generate = (is_step_topic_count >= 1 and 
@@ -879,7 +870,7 @@ def validate_kiswahili_paper_pool(request):
                     'is_step_topics': is_step_topic_count,
                     'is_step_questions': is_step_question_count,
                     'regular_questions': regular_question_count,
-                    'total_questions': len(all_questions),
+                    'total_questions': total_questions,
                 },
                 'required_counts': {
                     'is_step_questions': 1,
@@ -893,60 +884,19 @@ def validate_kiswahili_paper_pool(request):
             })
         
         else:  # Paper 2
-            # Categorize topics by boolean fields using direct Topic model queries
-            comprehension_topics = list(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                paper=paper,
-                is_active=True,
-                is_comprehension=True
-            ))
-            
-            summary_topics = list(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                paper=paper,
-                is_active=True,
-                is_summary=True
-            ))
+            # Categorize topics by their boolean fields
+            comprehension_topics = [t for t in topics if t.is_comprehension]
+            summary_topics = [t for t in topics if t.is_summary]
+            lugha_topics = [t for t in topics if t.is_lugha]
+            isimu_topics = [t for t in topics if t.is_isimu]
             
-            lugha_topics = list(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                paper=paper,
-                is_active=True,
-                is_lugha=True
-            ))
+            def count_for(topic_group):
+                return sum(questions_by_topic.get(str(t.id), 0) for t in topic_group)
             
-            isimu_topics = list(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                paper=paper,
-                is_active=True,
-                is_isimu=True
-            ))
-            
-            comprehension_topic_ids = set(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                is_comprehension=True
-            ).values_list('id', flat=True))
-            
-            summary_topic_ids = set(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                is_summary=True
-            ).values_list('id', flat=True))
-            
-            lugha_topic_ids = set(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                is_lugha=True
-            ).values_list('id', flat=True))
-            
-            isimu_topic_ids = set(Topic.objects.filter(
-                id__in=selected_topic_ids,
-                is_isimu=True
-            ).values_list('id', flat=True))
-            
-            # Count questions by topic category
-            ufhamu_count = sum(1 for q in all_questions if q.topic_id in comprehension_topic_ids)
-            ufupisho_count = sum(1 for q in all_questions if q.topic_id in summary_topic_ids)
-            matumizi_count = sum(1 for q in all_questions if q.topic_id in lugha_topic_ids)
-            isimu_jamii_count = sum(1 for q in all_questions if q.topic_id in isimu_topic_ids)
+            ufhamu_count = count_for(comprehension_topics)
+            ufupisho_count = count_for(summary_topics)
+            matumizi_count = count_for(lugha_topics)
+            isimu_jamii_count = count_for(isimu_topics)
             
             # Need: 1+ of each section type
             can_generate = (ufhamu_count >= 1 and 
@@ -1043,6 +993,7 @@ def extract_paper_number_from_name(paper_name: str) -> int:
 
 
 @require_http_methods(["POST"])
+@generation_job('kiswahili')
 def generate_kiswahili_paper(request):
     """Generate KCSE Kiswahili Paper 1 or 2"""
     try:
@@ -1109,15 +1060,7 @@ def generate_kiswahili_paper(request):
         result = generator.generate()
         
         # Create unique code
-        current_year = datetime.now().year
-        paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        
-        
-        unique_code = f"KIS{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"KIS{paper_number}")
         
         # Create GeneratedPaper record
         generated_paper = GeneratedPaper.objects.create(
@@ -0,0 +1,172 @@
+"""
+Lazy Generator and Template Registry
+Resolves paper generators, exam templates and generate views on first use
+
+api/urls.py used to import every subject's generator module and
+paper_generation_views.py every coverpage class and generator, so the first request
+of a cold start (Vercel, Passenger) paid for importing all of them even when it
+only listed questions. Implementations are now referenced by dotted path and
+imported when they are first needed:
+- GENERATORS: (subject, paper number) -> generator class (get_generator)
+- EXAM_TEMPLATES: (subject, paper number) -> subject specific exam template
+  (get_exam_template); other papers use the standard sectioned template
+- lazy_view(): URL patterns of the subject generate/validate endpoints
+
+Each first import is logged with its duration and kept in load_times(); the
+startup timing report (api/startup_timing.py) lists the modules still deferred.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# (subject, paper number) -> generator class; paper number None covers every paper
+GENERATORS = {
+    ('BIOLOGY', 1): 'api.kcse_biology_paper1_generator.KCSEBiologyPaper1Generator',
+    ('BIOLOGY', 2): 'api.biology_paper2_generation.KCSEBiologyPaper2Generator',
+    ('PHYSICS', 1): 'api.physics_paper_generation.KCSEPhysicsPaper1Generator',
+    ('PHYSICS', 2): 'api.physics_paper_generation.KCSEPhysicsPaper2Generator',
+    ('CHEMISTRY', 1): 'api.chemistry_paper_generator.KCSEChemistryPaper1Generator',
+    ('CHEMISTRY', 2): 'api.chemistry_paper_generator.KCSEChemistryPaper2Generator',
+    ('MATHEMATICS', 1): 'api.mathematics_generator.KCSEMathematicsPaper1Generator',
+    ('MATHEMATICS', 2): 'api.mathematics_generator.KCSEMathematicsPaper2Generator',
+    ('GEOGRAPHY', 1): 'api.georaphy_paper_generator.KCSEGeographyPaper1Generator',
+    ('GEOGRAPHY', 2): 'api.georaphy_paper_generator.KCSEGeographyPaper2Generator',
+    ('ENGLISH', 1): 'api.english_generator.KCSEEnglishPaper1Generator',
+    ('ENGLISH', 2): 'api.english_generator.KCSEEnglishPaper2Generator',
+    ('ENGLISH', 3): 'api.english_generator.KCSEEnglishPaper3Generator',
+    ('KISWAHILI', 1): 'api.kiswahili_paper_generator.KCSEKiswahiliPaper1Generator',
+    ('KISWAHILI', 2): 'api.kiswahili_paper_generator.KCSEKiswahiliPaper2Generator',
+    ('BUSINESS', 1): 'api.business_paper_generator.KCSEBusinessPaper1Generator',
+    ('BUSINESS', 2): 'api.business_paper_generator.KCSEBusinessPaper2Generator',
+    ('CRE', None): 'api.cre_paper_generator.KCSECREPaperGenerator',
+    ('AGRICULTURE', None): 'api.agriculture_paper_generator.KCSEAgriculturePaperGenerator',
+}
+
+# (subject, paper number) -> full exam HTML function(coverpage_data, questions, coverpage_class=...)
+EXAM_TEMPLATES = {
+    ('BIOLOGY', 1): 'api.biology_paper1_template.generate_biology_paper1_html',
+    ('ENGLISH', 1): 'api.english_paper1_template.generate_english_paper1_html',
+    ('KISWAHILI', 2): 'api.kiswahili_paper2_template.generate_kiswahili_paper2_html',
+    ('BUSINESS', 1): 'api.exam_paper_template_no_sections.generate_full_exam_html',
+    ('CHEMISTRY', 1): 'api.exam_paper_template_no_sections.generate_full_exam_html',
+}
+
+# Streams the standard sectioned template question by question
+STANDARD_EXAM_TEMPLATE = 'api.exam_paper_template.iter_full_exam_html'
+
+_resolved: Dict[str, object] = {}
+_load_times: Dict[str, float] = {}  # module -> seconds its first import took
+_lock = threading.RLock()
+_lazy_views: List['LazyView'] = []
+
+
+def resolve(dotted_path: str):
+    """Import 'package.module.attribute' on first use and return the attribute"""
+    target = _resolved.get(dotted_path)
+    if target is not None:
+        return target
+
+    module_name, attribute = dotted_path.rsplit('.', 1)
+    with _lock:
+        already_imported = module_name in sys.modules
+        started = time.perf_counter()
+        module = importlib.import_module(module_name)
+        if not already_imported:
+            _load_times[module_name] = time.perf_counter() - started
+            logger.info(f"[LAZY] Imported {module_name} in {_load_times[module_name] * 1000:.0f} ms")
+    target = getattr(module, attribute)
+    _resolved[dotted_path] = target
+    return target
+
+
+def load_times() -> Dict[str, float]:
+    """Seconds each lazily imported module took to import (first import only)"""
+    return dict(_load_times)
+
+
+def get_generator(subject_name: str, paper_number: Optional[int]):
+    """Generator class of a subject's paper, or None if the subject has none for it"""
+    subject = (subject_name or '').strip().upper()
+    path = GENERATORS.get((subject, paper_number)) or GENERATORS.get((subject, None))
+    return resolve(path) if path else None
+
+
+def get_exam_template(paper_name: str, paper_number: Optional[int]) -> Optional[Callable]:
+    """
+    Subject specific exam template of a paper, matched on its paper name
+
+    Returns:
+        The template function, or None for papers using the standard template
+    """
+    paper_name = (paper_name or '').upper()
+    for (subject, number), path in EXAM_TEMPLATES.items():
+        if subject in paper_name and number == paper_number:
+            return resolve(path)
+    return None
+
+
+class LazyView:
+    """
+    URL pattern callback that imports its view module on the first request
+
+    Carries the view's dotted name so URL resolving and reversing never import it;
+    `cls` and `initkwargs` resolve the view for schema generation (drf-yasg).
+    """
+
+    def __init__(self, dotted_path: str):
+        self.dotted_path = dotted_path
+        self.__module__, self.__name__ = dotted_path.rsplit('.', 1)
+        self.__qualname__ = self.__name__
+
+    @property
+    def view(self):
+        return resolve(self.dotted_path)
+
+    @property
+    def csrf_exempt(self):
+        # CsrfViewMiddleware reads this just before the call; mirror the view itself
+        # (the generate/validate endpoints are plain Django views, not exempt)
+        return getattr(self.view, 'csrf_exempt', False)
+
+    @property
+    def cls(self):
+        return self.view.cls
+
+    @property
+    def initkwargs(self):
+        return getattr(self.view, 'initkwargs', {})
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+    def __repr__(self):
+        return f"<LazyView {self.dotted_path}>"
+
+
+def lazy_view(dotted_path: str) -> LazyView:
+    """View callback for urls.py that defers importing the view's module"""
+    view = LazyView(dotted_path)
+    _lazy_views.append(view)
+    return view
+
+
+def load_lazy_views() -> int:
+    """Import every lazily routed view module (registers their generation jobs)"""
+    for view in _lazy_views:
+        resolve(view.dotted_path)
+    return len(_lazy_views)
+
+
+def pending_modules() -> List[str]:
+    """Registered modules that have not been imported yet"""
+    paths = list(GENERATORS.values()) + list(EXAM_TEMPLATES.values()) + [STANDARD_EXAM_TEMPLATE]
+    paths += [view.dotted_path for view in _lazy_views]
+    modules = {path.rsplit('.', 1)[0] for path in paths}
+    return sorted(module for module in modules if module not in sys.modules)
@@ -0,0 +1,71 @@
+"""
+Management command to index questions for near-duplicate search
+
+Computes the MinHash signature and LSH buckets (api/near_duplicates.py) of every
+question without a current QuestionSignature row. Safe to re-run: questions whose
+normalized text hash matches their row are skipped without computing a MinHash.
+
+python manage.py build_question_signatures
+python manage.py build_question_signatures --dry-run
+"""
+from django.core.management.base import BaseCommand
+from api.models import Question, QuestionSignature
+from api.near_duplicates import text_hash, text_signature
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Build the near-duplicate signatures of questions that have none or an outdated one'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Questions loaded and written per batch (default: 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the questions that need a new signature',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        stored_hashes = dict(QuestionSignature.objects.values_list('question_id', 'text_hash'))
+        question_ids = list(Question.objects.order_by('id').values_list('id', flat=True))
+
+        outdated = []
+        for start in range(0, len(question_ids), batch_size):
+            batch = Question.objects.filter(id__in=question_ids[start:start + batch_size]).only('id', 'question_text')
+            for question in batch:
+                if stored_hashes.get(question.id) == text_hash(question.question_text):
+                    continue
+                current_hash, signature, buckets = text_signature(question.question_text)
+                outdated.append(QuestionSignature(
+                    question_id=question.id, text_hash=current_hash,
+                    signature=signature, buckets=buckets,
+                ))
+
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(f"Questions: {len(question_ids)}, signatures to write: {len(outdated)}")
+        self.stdout.write(f"{'='*60}\n")
+
+        if dry_run or not outdated:
+            return
+
+        for start in range(0, len(outdated), batch_size):
+            QuestionSignature.objects.bulk_create(
+                outdated[start:start + batch_size],
+                update_conflicts=True,
+                unique_fields=['question'],
+                update_fields=['text_hash', 'signature', 'buckets', 'updated_at'],
+            )
+            self.stdout.write(f"  Written {min(start + batch_size, len(outdated))}/{len(outdated)} signatures")
+
+        logger.info(f"[SIGNATURES] Indexed {len(outdated)} questions")
+        self.stdout.write(self.style.SUCCESS(f"\n✓ Indexed {len(outdated)} questions"))
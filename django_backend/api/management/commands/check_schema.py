@@ -0,0 +1,39 @@
+"""
+Management command to verify that every shipped migration is applied
+
+Runs after `migrate` in build.sh; exits with status 1 while migrations are pending:
+python manage.py check_schema
+python manage.py check_schema --migrate
+"""
+import sys
+
+from django.core.management.base import BaseCommand
+
+from api.schema_version import migrate_if_needed, schema_status
+
+
+class Command(BaseCommand):
+    help = 'Report the applied schema version and fail if migrations are pending'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--migrate',
+            action='store_true',
+            help='Apply pending migrations (under an advisory lock) before checking',
+        )
+
+    def handle(self, *args, **options):
+        if options['migrate']:
+            migrate_if_needed(verbosity=options['verbosity'])
+
+        status = schema_status(refresh=True)
+        self.stdout.write(f"Shipped schema version: {status['schema_version']}")
+        self.stdout.write(f"Applied schema version: {status['applied_schema_version']}")
+
+        if status['pending_migrations']:
+            self.stdout.write(self.style.ERROR(
+                f"{status['pending_migrations']} pending migrations: {', '.join(status['pending'])}"
+            ))
+            sys.exit(1)
+
+        self.stdout.write(self.style.SUCCESS('Database schema is up-to-date'))
@@ -0,0 +1,90 @@
+"""
+Management command to move base64 inline images out of question JSON
+
+Stores every data URL found in question_inline_images / answer_inline_images in
+the content-addressed image store (api/image_store.py) and rewrites the JSON to
+reference it. Stored image URLs saved with a host (before paths were kept
+relative) are reduced to /api/images/<sha256>.<ext>. Safe to re-run: converted
+images are skipped.
+
+python manage.py extract_inline_images
+python manage.py extract_inline_images --dry-run
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from api.image_store import INLINE_IMAGE_FIELDS, extract_question_images
+from api.models import Question
+from api.paper_snapshot import invalidate_question_snapshots
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Move base64 inline images of questions into the content-addressed image store'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Questions loaded and updated per transaction (default: 100)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count the questions that still hold base64 or absolute image URLs',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+
+        to_convert = Q()
+        for field in INLINE_IMAGE_FIELDS:
+            to_convert |= Q(**{f'{field}__icontains': 'data:image'})
+            to_convert |= Q(**{f'{field}__icontains': '://'}) & Q(**{f'{field}__icontains': '/api/images/'})
+
+        question_ids = list(
+            Question.objects.filter(to_convert).order_by('id').values_list('id', flat=True)
+        )
+
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(f"Questions with base64 or absolute inline images: {len(question_ids)}")
+        self.stdout.write(f"{'='*60}\n")
+
+        if dry_run or not question_ids:
+            return
+
+        total_questions = 0
+        total_images = 0
+
+        for start in range(0, len(question_ids), batch_size):
+            batch_ids = question_ids[start:start + batch_size]
+
+            with transaction.atomic():
+                questions = list(
+                    Question.objects.filter(id__in=batch_ids).only('id', *INLINE_IMAGE_FIELDS)
+                )
+                changed = []
+                for question in questions:
+                    extracted = extract_question_images(question)
+                    if extracted:
+                        changed.append(question)
+                        total_images += extracted
+
+                # bulk_update sends no signals: drop affected paper snapshots here
+                Question.objects.bulk_update(changed, list(INLINE_IMAGE_FIELDS))
+                for question in changed:
+                    invalidate_question_snapshots(question.id)
+
+            total_questions += len(changed)
+            self.stdout.write(
+                f"  Processed {min(start + batch_size, len(question_ids))}/{len(question_ids)} questions"
+            )
+
+        logger.info(f"[IMAGES] Extracted {total_images} images from {total_questions} questions")
+        self.stdout.write(self.style.SUCCESS(
+            f"\n✓ Extracted {total_images} images from {total_questions} questions"
+        ))
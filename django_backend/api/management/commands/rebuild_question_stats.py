@@ -0,0 +1,42 @@
+"""
+Management command to recompute the materialized question statistics
+
+The question_stats table is maintained by a trigger on questions; rebuild it after
+restoring data with triggers disabled, or to verify that it matches:
+python manage.py rebuild_question_stats
+python manage.py rebuild_question_stats --check
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+from api.models import Question, QuestionStat
+from api.question_stats import rebuild_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Recompute the question_stats table from the questions table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only compare the stored totals with the questions table',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            stored = QuestionStat.objects.aggregate(count=Sum('question_count'), usage=Sum('usage_sum'))
+            actual = Question.objects.aggregate(count=Count('id'), usage=Sum('times_used'))
+            self.stdout.write(f"Stored: {stored['count'] or 0} questions, usage {stored['usage'] or 0}")
+            self.stdout.write(f"Actual: {actual['count'] or 0} questions, usage {actual['usage'] or 0}")
+            if (stored['count'] or 0, stored['usage'] or 0) != (actual['count'] or 0, actual['usage'] or 0):
+                self.stdout.write(self.style.WARNING('Statistics are out of date, run without --check'))
+            else:
+                self.stdout.write(self.style.SUCCESS('Statistics match the questions table'))
+            return
+
+        rows = rebuild_stats()
+        logger.info(f"[STATS] Rebuilt question_stats ({rows} rows)")
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt question statistics ({rows} rows)"))
@@ -0,0 +1,68 @@
+"""
+Management command that processes queued paper generation jobs
+
+Run it next to the web processes when GENERATION_JOBS_ENABLED is set:
+python manage.py run_generation_jobs
+
+Use --once from cron to drain the queue and exit.
+"""
+from django.core.management.base import BaseCommand
+from api.generation_jobs import claim_next_job, run_job
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process queued paper generation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process all pending jobs and exit instead of polling',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to wait between queue checks when idle (default: 1)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=0,
+            help='Exit after processing this many jobs (default: 0 = no limit)',
+        )
+
+    def handle(self, *args, **options):
+        once = options['once']
+        poll_interval = options['poll_interval']
+        max_jobs = options['max_jobs']
+        processed = 0
+
+        self.stdout.write("Generation worker started")
+
+        try:
+            while True:
+                job = claim_next_job()
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                started = time.time()
+                run_job(job)
+                processed += 1
+                self.stdout.write(
+                    f"  {job.kind} job {job.id}: {job.status} ({time.time() - started:.2f}s)"
+                )
+
+                if max_jobs and processed >= max_jobs:
+                    break
+        except KeyboardInterrupt:
+            self.stdout.write("Generation worker stopped")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} generation jobs"))
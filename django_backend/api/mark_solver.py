@@ -0,0 +1,263 @@
+"""
+Exact Mark-Sum Solver
+Shared constrained subset-sum engine for the KCSE paper generators
+
+Generators declare their paper structure as a list of sections:
+- Each section has its own question pool, a question count range and a mark range
+- Optional per-mark-value count bounds (e.g. Physics Section A: 4x1 + 6x2 + 3x3)
+- Optional exact paper total across all sections (e.g. 80 marks)
+
+The solver runs a bounded knapsack DP over the mark values of each pool and counts
+how many distinct question subsets reach every (question count, marks) state.
+A draw then walks the tables backwards, choosing every step with probability
+proportional to the number of completions, so each valid paper is equally likely.
+With an exact paper total, states above it are pruned, so the tables are bounded by
+the paper size (marks x questions) rather than by the size of the pool.
+
+If no valid paper exists the solver raises InfeasibleSelectionError immediately,
+instead of burning 100-1000 random attempts.
+"""
+
+import random
+from collections import defaultdict
+from math import comb
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class InfeasibleSelectionError(Exception):
+    """Raised when no combination of the question pools satisfies the paper structure"""
+    pass
+
+
+class SectionSpec:
+    """
+    Declarative structure of one section of a paper
+
+    Args:
+        name: Section key used in the result (e.g. 'nested', 'section_a')
+        questions: Candidate questions (anything with a `.marks` attribute)
+        min_questions / max_questions: Allowed question count range
+        min_marks / max_marks: Allowed marks range for the section (max_marks defaults
+                               to the pool sum; solve_sections caps it at total_marks)
+        mark_counts: Optional {marks: (min_count, max_count)} bounds per mark value.
+                     Mark values missing from this dict are unbounded.
+    """
+
+    def __init__(self, name: str, questions: Sequence, min_questions: int = 0,
+                 max_questions: Optional[int] = None, min_marks: int = 0,
+                 max_marks: Optional[int] = None,
+                 mark_counts: Optional[Dict[int, Tuple[int, int]]] = None):
+        self.name = name
+        self.questions = list(questions)
+        self.min_questions = min_questions
+        self.max_questions = max_questions if max_questions is not None else len(self.questions)
+        self.min_marks = min_marks
+        self.max_marks = max_marks if max_marks is not None else sum(q.marks for q in self.questions)
+        self.mark_counts = mark_counts or {}
+
+    def __repr__(self):
+        return (
+            f"SectionSpec({self.name!r}, {len(self.questions)} questions, "
+            f"count={self.min_questions}-{self.max_questions}, "
+            f"marks={self.min_marks}-{self.max_marks})"
+        )
+
+
+def group_by_marks(questions: Sequence) -> Dict[int, List]:
+    """Group questions into buckets keyed by mark value"""
+    buckets = defaultdict(list)
+    for q in questions:
+        buckets[q.marks].append(q)
+    return dict(buckets)
+
+
+def _weighted_choice(options: List[Tuple[object, int]], rng) -> object:
+    """Pick an option with probability proportional to its (big integer) weight"""
+    total = sum(weight for _, weight in options)
+    point = rng.randrange(total)
+    for value, weight in options:
+        if point < weight:
+            return value
+        point -= weight
+    return options[-1][0]
+
+
+class _SectionTable:
+    """
+    DP tables for one section
+
+    layers[i] maps (count, marks) -> number of subsets using only the first i
+    mark values. The last layer, filtered by the section constraints, gives the
+    number of valid section draws for every (count, marks) state.
+    """
+
+    def __init__(self, spec: SectionSpec, marks_cap: Optional[int] = None):
+        self.spec = spec
+        self.buckets = group_by_marks(spec.questions)
+        self.mark_values = sorted(self.buckets.keys())
+
+        # With an exact paper total no section can exceed it, so states above the
+        # cap are never built (the pool sum default would make the tables grow with
+        # the pool size instead of the paper size)
+        self.max_marks = spec.max_marks
+        self.max_questions = spec.max_questions
+        if marks_cap is not None:
+            self.max_marks = min(self.max_marks, marks_cap)
+            smallest = min((marks for marks in self.mark_values if marks > 0), default=None)
+            if smallest is not None and 0 not in self.buckets:
+                self.max_questions = min(self.max_questions, marks_cap // smallest)
+
+        # comb(available, n) for every allowed n, per mark value
+        self.subsets = {
+            marks: {n: comb(len(self.buckets[marks]), n) for n in self._count_range(marks)}
+            for marks in self.mark_values
+        }
+
+        # Mark values that must appear but have no questions make the section infeasible
+        self.missing_required = [
+            marks for marks, (low, _) in spec.mark_counts.items()
+            if low > 0 and len(self.buckets.get(marks, [])) < low
+        ]
+
+        self.layers = [{(0, 0): 1}]
+        for marks in self.mark_values:
+            self.layers.append(self._extend(self.layers[-1], marks))
+
+        self.final = {}
+        if not self.missing_required:
+            for (count, total), ways in self.layers[-1].items():
+                if (spec.min_questions <= count <= self.max_questions and
+                        spec.min_marks <= total <= self.max_marks):
+                    self.final[(count, total)] = ways
+
+    def _count_range(self, marks: int) -> range:
+        available = len(self.buckets[marks])
+        low, high = self.spec.mark_counts.get(marks, (0, available))
+        return range(low, min(high, available, self.max_questions) + 1)
+
+    def _extend(self, previous: Dict[Tuple[int, int], int], marks: int) -> Dict[Tuple[int, int], int]:
+        subsets = self.subsets[marks]
+        current = defaultdict(int)
+        for (count, total), ways in previous.items():
+            for n, n_subsets in subsets.items():
+                new_count = count + n
+                new_total = total + n * marks
+                # Partial sums only grow, so anything above the caps is pruned here
+                if new_count > self.max_questions or new_total > self.max_marks:
+                    break
+                current[(new_count, new_total)] += ways * n_subsets
+        return dict(current)
+
+    def ways_by_marks(self) -> Dict[int, int]:
+        """Number of valid draws for every reachable section total"""
+        result = defaultdict(int)
+        for (_, total), ways in self.final.items():
+            result[total] += ways
+        return dict(result)
+
+    def draw(self, section_total: int, rng) -> List:
+        """Draw one uniformly random valid question subset with the given total"""
+        count = _weighted_choice(
+            [(c, ways) for (c, total), ways in self.final.items() if total == section_total],
+            rng
+        )
+
+        # Walk the layers backwards, fixing how many questions of each mark value to take
+        picks = {}
+        state = (count, section_total)
+        for index in range(len(self.mark_values), 0, -1):
+            marks = self.mark_values[index - 1]
+            previous = self.layers[index - 1]
+            options = []
+            for n, n_subsets in self.subsets[marks].items():
+                prev_state = (state[0] - n, state[1] - n * marks)
+                ways = previous.get(prev_state)
+                if ways:
+                    options.append((n, ways * n_subsets))
+            n = _weighted_choice(options, rng)
+            picks[marks] = n
+            state = (state[0] - n, state[1] - n * marks)
+
+        selected = []
+        for marks in self.mark_values:
+            if picks.get(marks):
+                selected.extend(rng.sample(self.buckets[marks], picks[marks]))
+        rng.shuffle(selected)
+        return selected
+
+
+def solve_sections(sections: List[SectionSpec], total_marks: Optional[int] = None,
+                   rng=None) -> Dict[str, List]:
+    """
+    Draw one valid paper for the declared section structure in a single pass
+
+    Args:
+        sections: Section specifications (pools must not share questions)
+        total_marks: Optional exact total across all sections
+        rng: Optional random.Random instance (defaults to the module RNG)
+
+    Returns:
+        Dict mapping section name -> list of selected questions
+
+    Raises:
+        InfeasibleSelectionError if the pools cannot satisfy the structure
+    """
+    rng = rng or random
+    tables = [_SectionTable(spec, marks_cap=total_marks) for spec in sections]
+
+    for table in tables:
+        if table.missing_required:
+            raise InfeasibleSelectionError(
+                f"{table.spec.name}: not enough questions for required mark values "
+                f"{table.missing_required}"
+            )
+        if not table.final:
+            raise InfeasibleSelectionError(
+                f"{table.spec.name}: no combination of {len(table.spec.questions)} questions gives "
+                f"{table.spec.min_questions}-{table.max_questions} questions worth "
+                f"{table.spec.min_marks}-{table.max_marks} marks"
+            )
+
+    # Combine sections: paper_layers[i] maps running total -> number of papers using sections[:i]
+    section_ways = [table.ways_by_marks() for table in tables]
+    paper_layers = [{0: 1}]
+    for ways_by_total in section_ways:
+        current = defaultdict(int)
+        for running, ways in paper_layers[-1].items():
+            for section_total, section_count in ways_by_total.items():
+                new_total = running + section_total
+                if total_marks is not None and new_total > total_marks:
+                    continue
+                current[new_total] += ways * section_count
+        paper_layers.append(dict(current))
+
+    final_totals = paper_layers[-1]
+    if total_marks is not None:
+        final_totals = {total_marks: final_totals[total_marks]} if final_totals.get(total_marks) else {}
+    if not final_totals:
+        raise InfeasibleSelectionError(
+            f"No combination of sections {[t.spec.name for t in tables]} reaches "
+            f"exactly {total_marks} marks"
+        )
+
+    # Walk sections backwards, choosing each section total by number of completions
+    running = _weighted_choice(list(final_totals.items()), rng)
+    section_totals = [0] * len(tables)
+    for index in range(len(tables), 0, -1):
+        options = []
+        for section_total, section_count in section_ways[index - 1].items():
+            ways = paper_layers[index - 1].get(running - section_total)
+            if ways:
+                options.append((section_total, ways * section_count))
+        section_totals[index - 1] = _weighted_choice(options, rng)
+        running -= section_totals[index - 1]
+
+    return {
+        table.spec.name: table.draw(section_total, rng)
+        for table, section_total in zip(tables, section_totals)
+    }
+
+
+def solve_section(spec: SectionSpec, rng=None) -> List:
+    """Convenience wrapper for a single-section draw"""
+    return solve_sections([spec], rng=rng)[spec.name]
@@ -28,7 +28,9 @@ import time
 from collections import defaultdict
 from typing import List, Dict, Optional
 
-from .models import Paper, Topic, Question, Subject
+from .models import Paper, Topic, Subject
+from .mark_solver import SectionSpec, InfeasibleSelectionError, solve_section
+from .question_pool import get_question_pool, hydrate_questions
 
 
 class KCSEMathematicsPaper1Generator:
@@ -106,12 +108,7 @@ class KCSEMathematicsPaper1Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -151,51 +148,43 @@ class KCSEMathematicsPaper1Generator:
     def _select_section_i(self) -> bool:
         """
         Select Section I questions: 1×2mk + 12×3mk + 3×4mk = 16 questions, 50 marks
+        Declared as an exact mark-solver section so a short pool fails immediately
         """
-        # Check availability
-        if (len(self.section_i_2mark) < self.SECTION_I_2MARK_COUNT or
-            len(self.section_i_3mark) < self.SECTION_I_3MARK_COUNT or
-            len(self.section_i_4mark) < self.SECTION_I_4MARK_COUNT):
-            return False
-        
-        available_2 = [q for q in self.section_i_2mark if q.id not in self.used_ids]
-        available_3 = [q for q in self.section_i_3mark if q.id not in self.used_ids]
-        available_4 = [q for q in self.section_i_4mark if q.id not in self.used_ids]
-        
-        if (len(available_2) < self.SECTION_I_2MARK_COUNT or
-            len(available_3) < self.SECTION_I_3MARK_COUNT or
-            len(available_4) < self.SECTION_I_4MARK_COUNT):
+        available = [
+            q for q in self.section_i_2mark + self.section_i_3mark + self.section_i_4mark
+            if q.id not in self.used_ids
+        ]
+        question_count = self.SECTION_I_2MARK_COUNT + self.SECTION_I_3MARK_COUNT + self.SECTION_I_4MARK_COUNT
+        
+        try:
+            selected = solve_section(SectionSpec(
+                'section_i',
+                available,
+                min_questions=question_count,
+                max_questions=question_count,
+                min_marks=self.SECTION_I_MARKS,
+                max_marks=self.SECTION_I_MARKS,
+                mark_counts={
+                    2: (self.SECTION_I_2MARK_COUNT, self.SECTION_I_2MARK_COUNT),
+                    3: (self.SECTION_I_3MARK_COUNT, self.SECTION_I_3MARK_COUNT),
+                    4: (self.SECTION_I_4MARK_COUNT, self.SECTION_I_4MARK_COUNT),
+                }
+            ))
+        except InfeasibleSelectionError as e:
+            print(f"  [FAILED] Section I: {e}")
             return False
         
-        # Select exact counts needed
-        selected = []
-        
-        # Add 1 × 2-mark
-        for i in range(self.SECTION_I_2MARK_COUNT):
-            selected.append(available_2[i])
+        # Keep the 2-mark, 3-mark, 4-mark ordering of the original layout
+        selected.sort(key=lambda q: q.marks)
         
-        # Add 12 × 3-mark
-        for i in range(self.SECTION_I_3MARK_COUNT):
-            selected.append(available_3[i])
-        
-        # Add 3 × 4-mark
-        for i in range(self.SECTION_I_4MARK_COUNT):
-            selected.append(available_4[i])
-        
-        # Verify totals
-        total_marks = (self.SECTION_I_2MARK_COUNT * 2) + (self.SECTION_I_3MARK_COUNT * 3) + (self.SECTION_I_4MARK_COUNT * 4)
-        
-        if len(selected) == self.SECTION_I_TOTAL and total_marks == self.SECTION_I_MARKS:
-            self.selected_section_i = selected
-            for q in selected:
-                self.used_ids.add(q.id)
-            
-            print(f"\n[SECTION I SELECTED - PAPER 1]")
-            print(f"  2-mark: {self.SECTION_I_2MARK_COUNT}, 3-mark: {self.SECTION_I_3MARK_COUNT} (majority), 4-mark: {self.SECTION_I_4MARK_COUNT}")
-            print(f"  Total: {len(selected)} questions, {total_marks} marks")
-            return True
+        self.selected_section_i = selected
+        for q in selected:
+            self.used_ids.add(q.id)
         
-        return False
+        print(f"\n[SECTION I SELECTED - PAPER 1]")
+        print(f"  2-mark: {self.SECTION_I_2MARK_COUNT}, 3-mark: {self.SECTION_I_3MARK_COUNT} (majority), 4-mark: {self.SECTION_I_4MARK_COUNT}")
+        print(f"  Total: {len(selected)} questions, {sum(q.marks for q in selected)} marks")
+        return True
     
     def _select_section_ii(self) -> bool:
         """Select Section II questions: 8x10mk
@@ -245,16 +234,15 @@ class KCSEMathematicsPaper1Generator:
             self.used_ids = set()
             
             # Select Section I
+            # Selection is exact, so a failure means the pool cannot satisfy the structure
             if not self._select_section_i():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section I selection")
-                continue
+                print(f"[ATTEMPT {attempt}] Failed at Section I selection")
+                break
             
             # Select Section II
             if not self._select_section_ii():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section II selection")
-                continue
+                print(f"[ATTEMPT {attempt}] Failed at Section II selection")
+                break
             
             # Success!
             generation_time = time.time() - start_time
@@ -265,11 +253,15 @@ class KCSEMathematicsPaper1Generator:
             return self._build_result(generation_time)
         
         # Failed
-        raise Exception(f"Failed to generate paper after {max_attempts} attempts")
+        raise Exception(f"Failed to generate paper after {self.attempts} attempts")
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with strictly ordered sections"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_i = hydrate_questions(self.selected_section_i)
+        self.selected_section_ii = hydrate_questions(self.selected_section_ii)
+        
         # Combine sections in strict order: Section I first, then Section II
         all_questions = self.selected_section_i + self.selected_section_ii
         
@@ -395,12 +387,7 @@ class KCSEMathematicsPaper2Generator:
             raise ValueError("No valid topics found for the selected IDs")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             raise ValueError("No questions found for selected topics")
@@ -441,51 +428,43 @@ class KCSEMathematicsPaper2Generator:
         """
         Select Section I questions for Paper 2.
         Paper 2: 1x2mk + 3x4mk + 12x3mk = 2+12+36 = 50 marks exactly
+        Declared as an exact mark-solver section so a short pool fails immediately
         """
-        # Check minimum availability
-        if (len(self.section_i_2mark) < self.SECTION_I_2MARK_COUNT or
-            len(self.section_i_3mark) < self.SECTION_I_3MARK_COUNT or
-            len(self.section_i_4mark) < self.SECTION_I_4MARK_COUNT):
-            return False
-        
-        available_2 = [q for q in self.section_i_2mark if q.id not in self.used_ids]
-        available_3 = [q for q in self.section_i_3mark if q.id not in self.used_ids]
-        available_4 = [q for q in self.section_i_4mark if q.id not in self.used_ids]
-        
-        if (len(available_2) < self.SECTION_I_2MARK_COUNT or
-            len(available_3) < self.SECTION_I_3MARK_COUNT or
-            len(available_4) < self.SECTION_I_4MARK_COUNT):
+        available = [
+            q for q in self.section_i_2mark + self.section_i_3mark + self.section_i_4mark
+            if q.id not in self.used_ids
+        ]
+        question_count = self.SECTION_I_2MARK_COUNT + self.SECTION_I_3MARK_COUNT + self.SECTION_I_4MARK_COUNT
+        
+        try:
+            selected = solve_section(SectionSpec(
+                'section_i',
+                available,
+                min_questions=question_count,
+                max_questions=question_count,
+                min_marks=self.SECTION_I_MARKS,
+                max_marks=self.SECTION_I_MARKS,
+                mark_counts={
+                    2: (self.SECTION_I_2MARK_COUNT, self.SECTION_I_2MARK_COUNT),
+                    3: (self.SECTION_I_3MARK_COUNT, self.SECTION_I_3MARK_COUNT),
+                    4: (self.SECTION_I_4MARK_COUNT, self.SECTION_I_4MARK_COUNT),
+                }
+            ))
+        except InfeasibleSelectionError as e:
+            print(f"  [FAILED] Section I: {e}")
             return False
         
-        # Select exactly the required counts (Paper 2 needs no additional questions)
-        selected = []
-        
-        # Add 3 × 2-mark
-        for i in range(self.SECTION_I_2MARK_COUNT):
-            selected.append(available_2[i])
-        
-        # Add 2 × 4-mark
-        for i in range(self.SECTION_I_4MARK_COUNT):
-            selected.append(available_4[i])
+        # Keep the 2-mark, 3-mark, 4-mark ordering of the original layout
+        selected.sort(key=lambda q: q.marks)
         
-        # Add 12 × 3-mark
-        for i in range(self.SECTION_I_3MARK_COUNT):
-            selected.append(available_3[i])
-        
-        # Verify total (should be exactly 50)
-        total_marks = (self.SECTION_I_2MARK_COUNT * 2) + (self.SECTION_I_3MARK_COUNT * 3) + (self.SECTION_I_4MARK_COUNT * 4)
-        
-        if total_marks == self.SECTION_I_MARKS:
-            self.selected_section_i = selected
-            for q in selected:
-                self.used_ids.add(q.id)
-            
-            print(f"\n[SECTION I SELECTED - PAPER 2]")
-            print(f"  2-mark: {self.SECTION_I_2MARK_COUNT}, 3-mark: {self.SECTION_I_3MARK_COUNT} (majority), 4-mark: {self.SECTION_I_4MARK_COUNT}")
-            print(f"  Total: {len(selected)} questions, {total_marks} marks")
-            return True
+        self.selected_section_i = selected
+        for q in selected:
+            self.used_ids.add(q.id)
         
-        return False
+        print(f"\n[SECTION I SELECTED - PAPER 2]")
+        print(f"  2-mark: {self.SECTION_I_2MARK_COUNT}, 3-mark: {self.SECTION_I_3MARK_COUNT} (majority), 4-mark: {self.SECTION_I_4MARK_COUNT}")
+        print(f"  Total: {len(selected)} questions, {sum(q.marks for q in selected)} marks")
+        return True
     
     def _select_section_ii(self) -> bool:
         """Select Section II questions: 8x10mk
@@ -535,16 +514,15 @@ class KCSEMathematicsPaper2Generator:
             self.used_ids = set()
             
             # Select Section I
+            # Selection is exact, so a failure means the pool cannot satisfy the structure
             if not self._select_section_i():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section I selection")
-                continue
+                print(f"[ATTEMPT {attempt}] Failed at Section I selection")
+                break
             
             # Select Section II
             if not self._select_section_ii():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section II selection")
-                continue
+                print(f"[ATTEMPT {attempt}] Failed at Section II selection")
+                break
             
             # Success!
             generation_time = time.time() - start_time
@@ -555,11 +533,15 @@ class KCSEMathematicsPaper2Generator:
             return self._build_result(generation_time)
         
         # Failed
-        raise Exception(f"Failed to generate paper after {max_attempts} attempts")
+        raise Exception(f"Failed to generate paper after {self.attempts} attempts")
     
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with strictly ordered sections"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_i = hydrate_questions(self.selected_section_i)
+        self.selected_section_ii = hydrate_questions(self.selected_section_ii)
+        
         # Combine sections in strict order: Section I first, then Section II
         all_questions = self.selected_section_i + self.selected_section_ii
         
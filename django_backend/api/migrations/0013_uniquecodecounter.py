@@ -0,0 +1,26 @@
+# Generated by Django 4.2.26 on 2026-10-16 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_generationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniqueCodeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(help_text='Code prefix, e.g. PHY1, BIO2, CH1', max_length=12)),
+                ('year', models.IntegerField()),
+                ('last_value', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'unique_code_counters',
+                'unique_together': {('prefix', 'year')},
+            },
+        ),
+    ]
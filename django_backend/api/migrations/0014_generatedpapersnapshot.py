@@ -0,0 +1,29 @@
+# Generated by Django 4.2.26 on 2026-10-16 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_uniquecodecounter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedPaperSnapshot',
+            fields=[
+                ('generated_paper', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='api.generatedpaper')),
+                ('version', models.IntegerField(default=1, help_text='Snapshot format version; older versions are rebuilt on read')),
+                ('question_ids', models.JSONField(help_text='question_ids of the paper when the snapshot was built')),
+                ('questions', models.JSONField(help_text='Ordered question payloads including answers, topic and section')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'generated_paper_snapshots',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['question_ids'], name='snapshot_question_ids_gin')],
+            },
+        ),
+    ]
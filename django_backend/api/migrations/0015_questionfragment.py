@@ -0,0 +1,29 @@
+# Generated by Django 4.2.26 on 2026-10-16 14:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_generatedpapersnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionFragment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('question', 'Question text (exam paper)'), ('answer', 'Answer text (marking scheme)'), ('answer_printable', 'Answer text (printable topic document)')], max_length=20)),
+                ('key', models.CharField(db_index=True, help_text='SHA-256 of the rendered input', max_length=64)),
+                ('html', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rendered_fragments', to='api.question')),
+            ],
+            options={
+                'db_table': 'question_fragments',
+                'unique_together': {('question', 'kind')},
+            },
+        ),
+    ]
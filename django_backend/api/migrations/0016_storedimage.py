@@ -0,0 +1,28 @@
+# Generated by Django 4.2.26 on 2026-10-16 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_questionfragment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredImage',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content_type', models.CharField(max_length=50)),
+                ('width', models.IntegerField(blank=True, help_text='Pixel width (null if unreadable)', null=True)),
+                ('height', models.IntegerField(blank=True, help_text='Pixel height (null if unreadable)', null=True)),
+                ('size', models.IntegerField(help_text='Size in bytes')),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'stored_images',
+            },
+        ),
+    ]
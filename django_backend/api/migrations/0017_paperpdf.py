@@ -0,0 +1,32 @@
+# Generated by Django 4.2.26 on 2026-10-16 16:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_storedimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaperPdf',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_type', models.CharField(choices=[('questions', 'Exam paper'), ('marking_scheme', 'Marking scheme')], max_length=20)),
+                ('key', models.CharField(help_text='SHA-256 of the render key the PDF was built from', max_length=64)),
+                ('status', models.CharField(choices=[('ready', 'Ready'), ('failed', 'Failed')], default='ready', max_length=20)),
+                ('data', models.BinaryField(blank=True, null=True)),
+                ('size', models.IntegerField(default=0, help_text='Size in bytes')),
+                ('error', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('generated_paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdfs', to='api.generatedpaper')),
+            ],
+            options={
+                'db_table': 'paper_pdfs',
+                'unique_together': {('generated_paper', 'view_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.26 on 2026-10-16 18:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# Keeps questions.search_vector current on every insert and text update, including
+# bulk_create and queryset.update(), which send no signals. The configuration must
+# match api.question_search.SEARCH_CONFIG.
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION questions_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW."questionText", '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW."answerText", '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER questions_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF "questionText", "answerText" ON questions
+    FOR EACH ROW EXECUTE FUNCTION questions_search_vector_update();
+
+UPDATE questions SET search_vector =
+    setweight(to_tsvector('english', coalesce("questionText", '')), 'A') ||
+    setweight(to_tsvector('english', coalesce("answerText", '')), 'B');
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS questions_search_vector_trigger ON questions;
+DROP FUNCTION IF EXISTS questions_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_paperpdf'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='question',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+        migrations.AddIndex(
+            model_name='question',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='questions_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['question_text'], name='questions_text_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['answer_text'], name='questions_answer_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.26 on 2026-10-16 19:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_question_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSignature',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='api.question')),
+                ('text_hash', models.CharField(help_text='SHA-1 of the normalized text and signature version', max_length=40)),
+                ('signature', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), help_text='MinHash values', size=None)),
+                ('buckets', django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), help_text='One LSH bucket per band', size=None)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'question_signatures',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['buckets'], name='question_signature_buckets_gin')],
+            },
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 4.2.26 on 2026-10-16 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.conf import settings
+
+# One row per (subject, paper, topic, creator, marks, is_nested, is_active); questions
+# without a creator share the row of the nil UUID in the unique index.
+CREATE_TRIGGER = """
+CREATE UNIQUE INDEX question_stats_key ON question_stats (
+    subject_id, paper_id, topic_id,
+    (COALESCE(created_by_id, '00000000-0000-0000-0000-000000000000'::uuid)),
+    marks, is_nested, is_active
+);
+
+CREATE OR REPLACE FUNCTION question_stats_apply(
+    s uuid, p uuid, t uuid, c uuid, m integer, n boolean, a boolean,
+    delta_count integer, delta_usage bigint
+) RETURNS void AS $$
+BEGIN
+    INSERT INTO question_stats
+        (subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active, question_count, usage_sum)
+    VALUES (s, p, t, c, m, n, a, delta_count, delta_usage)
+    ON CONFLICT (
+        subject_id, paper_id, topic_id,
+        (COALESCE(created_by_id, '00000000-0000-0000-0000-000000000000'::uuid)),
+        marks, is_nested, is_active
+    )
+    DO UPDATE SET question_count = question_stats.question_count + EXCLUDED.question_count,
+                  usage_sum = question_stats.usage_sum + EXCLUDED.usage_sum;
+
+    IF delta_count < 0 THEN
+        DELETE FROM question_stats
+        WHERE subject_id = s AND paper_id = p AND topic_id = t
+          AND created_by_id IS NOT DISTINCT FROM c
+          AND marks = m AND is_nested = n AND is_active = a
+          AND question_count <= 0;
+    END IF;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION question_stats_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND (OLD.subject_id, OLD.paper_id, OLD.topic_id, OLD.created_by_id, OLD.marks, OLD.is_nested, OLD.is_active)
+           IS NOT DISTINCT FROM
+           (NEW.subject_id, NEW.paper_id, NEW.topic_id, NEW.created_by_id, NEW.marks, NEW.is_nested, NEW.is_active) THEN
+        -- Same row of the stats table: only usage can change
+        IF NEW.times_used IS DISTINCT FROM OLD.times_used THEN
+            PERFORM question_stats_apply(NEW.subject_id, NEW.paper_id, NEW.topic_id, NEW.created_by_id,
+                NEW.marks, NEW.is_nested, NEW.is_active, 0, NEW.times_used - OLD.times_used);
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM question_stats_apply(OLD.subject_id, OLD.paper_id, OLD.topic_id, OLD.created_by_id,
+            OLD.marks, OLD.is_nested, OLD.is_active, -1, -OLD.times_used);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM question_stats_apply(NEW.subject_id, NEW.paper_id, NEW.topic_id, NEW.created_by_id,
+            NEW.marks, NEW.is_nested, NEW.is_active, 1, NEW.times_used);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER question_stats_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF subject_id, paper_id, topic_id, created_by_id,
+        marks, is_nested, is_active, times_used ON questions
+    FOR EACH ROW EXECUTE FUNCTION question_stats_update();
+
+INSERT INTO question_stats
+    (subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active, question_count, usage_sum)
+SELECT subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active, COUNT(*), COALESCE(SUM(times_used), 0)
+FROM questions
+GROUP BY subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active;
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS question_stats_trigger ON questions;
+DROP FUNCTION IF EXISTS question_stats_update();
+DROP FUNCTION IF EXISTS question_stats_apply(uuid, uuid, uuid, uuid, integer, boolean, boolean, integer, bigint);
+DROP INDEX IF EXISTS question_stats_key;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('api', '0019_questionsignature'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marks', models.IntegerField()),
+                ('is_nested', models.BooleanField()),
+                ('is_active', models.BooleanField()),
+                ('question_count', models.IntegerField(default=0)),
+                ('usage_sum', models.BigIntegerField(default=0, help_text='Sum of times_used')),
+                ('created_by', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('paper', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.paper')),
+                ('subject', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.subject')),
+                ('topic', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='api.topic')),
+            ],
+            options={
+                'db_table': 'question_stats',
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
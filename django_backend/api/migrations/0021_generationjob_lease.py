@@ -0,0 +1,23 @@
+# Generated by Django 4.2.26 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_questionstat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='access_token',
+            field=models.CharField(blank=True, default='', help_text='Secret that lets the caller poll a job queued without a logged-in user', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, help_text='Times a worker claimed this job (stale running jobs are claimed again)'),
+        ),
+    ]
@@ -5,6 +5,9 @@ Equivalent to the PostgreSQL schema with UUID primary keys
 
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 import bcrypt
@@ -318,6 +321,13 @@ class Section(models.Model):
 
 # ==================== QUESTION MODEL ====================
 
+class QuestionManager(models.Manager):
+    """Leaves the search document out of question rows; only search queries use it"""
+    
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
 class Question(models.Model):
         
     """Question bank"""
@@ -381,7 +391,7 @@ class Question(models.Model):
     question_text = models.TextField(db_column='questionText')
     answer_text = models.TextField(db_column='answerText')
     
-    # Inline images (base64 encoded)
+    # Inline images (stored by content hash, see api/image_store.py; older rows may hold base64)
     question_inline_images = models.JSONField(
         default=list,
         blank=True,
@@ -489,6 +499,11 @@ class Question(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Full-text search document, maintained by a database trigger (see api/question_search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    objects = QuestionManager()
+    
     class Meta:
         db_table = 'questions'
         ordering = ['-created_at']
@@ -497,6 +512,11 @@ class Question(models.Model):
             models.Index(fields=['is_active']),
             models.Index(fields=['question_type', 'difficulty']),
             models.Index(fields=['-created_at']),  # For ordering queries
+            GinIndex(fields=['search_vector'], name='questions_search_vector_gin'),
+            GinIndex(fields=['question_text'], name='questions_text_trgm',
+                     opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['answer_text'], name='questions_answer_trgm',
+                     opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -763,3 +783,280 @@ class GeneratedPaper(models.Model):
     
     def __str__(self):
         return f"{self.paper.name} - {self.unique_code}"
+
+
+class GenerationJob(models.Model):
+    """Queued paper generation run, processed by `manage.py run_generation_jobs`"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(
+        max_length=50,
+        help_text='Registered generate endpoint that runs this job (e.g. physics, chemistry)'
+    )
+    payload = models.JSONField(
+        default=dict,
+        help_text='Request body of the original generate request'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    
+    # Outcome: the response the generate endpoint would have returned
+    result = models.JSONField(null=True, blank=True)
+    response_status = models.IntegerField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='generation_jobs'
+    )
+    access_token = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text='Secret that lets the caller poll a job queued without a logged-in user'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text='Times a worker claimed this job (stale running jobs are claimed again)'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'generation_jobs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} job {self.id} ({self.status})"
+
+
+class UniqueCodeCounter(models.Model):
+    """
+    Last GeneratedPaper.unique_code sequence number handed out per (prefix, year)
+    
+    Incremented under a row lock by api.unique_codes.allocate_unique_codes(), so
+    concurrent generations never compute the same code.
+    """
+    
+    prefix = models.CharField(max_length=12, help_text='Code prefix, e.g. PHY1, BIO2, CH1')
+    year = models.IntegerField()
+    last_value = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'unique_code_counters'
+        unique_together = [['prefix', 'year']]
+    
+    def __str__(self):
+        return f"{self.prefix}-{self.year}: {self.last_value}"
+
+
+class GeneratedPaperSnapshot(models.Model):
+    """
+    Materialized question/answer payloads of a generated paper
+    
+    Built once from the paper's questions (see api/paper_snapshot.py) so the
+    view, preview and download endpoints read one row instead of re-querying
+    and re-serializing every question. Deleted when a referenced question changes.
+    """
+    
+    generated_paper = models.OneToOneField(
+        GeneratedPaper,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='snapshot'
+    )
+    version = models.IntegerField(
+        default=1,
+        help_text='Snapshot format version; older versions are rebuilt on read'
+    )
+    question_ids = models.JSONField(
+        help_text='question_ids of the paper when the snapshot was built'
+    )
+    questions = models.JSONField(
+        help_text='Ordered question payloads including answers, topic and section'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'generated_paper_snapshots'
+        indexes = [
+            GinIndex(fields=['question_ids'], name='snapshot_question_ids_gin'),
+        ]
+    
+    def __str__(self):
+        return f"Snapshot of {self.generated_paper_id}"
+
+
+class QuestionFragment(models.Model):
+    """
+    Rendered HTML of one question's text or answer, refreshed when the question is saved
+    
+    `key` is a hash of the rendered input (text, images, answer lines, renderer
+    version), so a row is only used while it still matches the question content
+    (see api/fragment_cache.py).
+    """
+    
+    KIND_CHOICES = [
+        ('question', 'Question text (exam paper)'),
+        ('answer', 'Answer text (marking scheme)'),
+        ('answer_printable', 'Answer text (printable topic document)'),
+    ]
+    
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name='rendered_fragments'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    key = models.CharField(max_length=64, db_index=True, help_text='SHA-256 of the rendered input')
+    html = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'question_fragments'
+        unique_together = [['question', 'kind']]
+    
+    def __str__(self):
+        return f"{self.kind} fragment of {self.question_id}"
+
+
+class StoredImage(models.Model):
+    """
+    Image bytes stored once per content hash
+    
+    Question inline images reference rows by SHA-256 instead of carrying base64
+    data in their JSON (see api/image_store.py). Identical images used by several
+    questions share one row.
+    """
+    
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=50)
+    width = models.IntegerField(null=True, blank=True, help_text='Pixel width (null if unreadable)')
+    height = models.IntegerField(null=True, blank=True, help_text='Pixel height (null if unreadable)')
+    size = models.IntegerField(help_text='Size in bytes')
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'stored_images'
+    
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.content_type}, {self.size} bytes)"
+
+
+class PaperPdf(models.Model):
+    """
+    Server-rendered PDF of a generated paper or its marking scheme
+    
+    One row per paper and view; `key` identifies what it was rendered from
+    (coverpage data, template version, question snapshot), so an outdated PDF is
+    re-rendered on the next download (see api/paper_pdf.py).
+    """
+    
+    VIEW_CHOICES = [
+        ('questions', 'Exam paper'),
+        ('marking_scheme', 'Marking scheme'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
+    generated_paper = models.ForeignKey(
+        GeneratedPaper,
+        on_delete=models.CASCADE,
+        related_name='pdfs'
+    )
+    view_type = models.CharField(max_length=20, choices=VIEW_CHOICES)
+    key = models.CharField(max_length=64, help_text='SHA-256 of the render key the PDF was built from')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ready')
+    data = models.BinaryField(null=True, blank=True)
+    size = models.IntegerField(default=0, help_text='Size in bytes')
+    error = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'paper_pdfs'
+        unique_together = [['generated_paper', 'view_type']]
+    
+    def __str__(self):
+        return f"{self.view_type} PDF of {self.generated_paper_id} ({self.status})"
+
+
+class QuestionSignature(models.Model):
+    """
+    MinHash signature and LSH buckets of a question's text, for near-duplicate search
+    
+    Refreshed when the question is saved; `text_hash` identifies the normalized text
+    the row was computed from (see api/near_duplicates.py).
+    """
+    
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature'
+    )
+    text_hash = models.CharField(max_length=40, help_text='SHA-1 of the normalized text and signature version')
+    signature = ArrayField(models.BigIntegerField(), help_text='MinHash values')
+    buckets = ArrayField(models.BigIntegerField(), help_text='One LSH bucket per band')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'question_signatures'
+        indexes = [
+            GinIndex(fields=['buckets'], name='question_signature_buckets_gin'),
+        ]
+    
+    def __str__(self):
+        return f"Signature of {self.question_id}"
+
+
+class QuestionStat(models.Model):
+    """
+    Number of questions (and their usage) per subject, paper, topic, creator, marks,
+    nesting and status
+    
+    Maintained by a trigger on the questions table, so every insert, update and
+    delete (including bulk operations) adjusts the matching row in the same
+    transaction. The statistics endpoints aggregate these rows instead of the
+    questions table (see api/question_stats.py).
+    """
+    
+    # Foreign keys without constraints: rows are only written by the trigger
+    subject = models.ForeignKey(Subject, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    paper = models.ForeignKey(Paper, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    topic = models.ForeignKey(Topic, on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    created_by = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+'
+    )
+    marks = models.IntegerField()
+    is_nested = models.BooleanField()
+    is_active = models.BooleanField()
+    question_count = models.IntegerField(default=0)
+    usage_sum = models.BigIntegerField(default=0, help_text='Sum of times_used')
+    
+    class Meta:
+        db_table = 'question_stats'
+    
+    def __str__(self):
+        return f"{self.question_count} questions of {self.marks} marks in topic {self.topic_id}"
@@ -0,0 +1,187 @@
+"""
+Near-Duplicate Questions
+MinHash signatures with LSH buckets for duplicate detection while authoring
+
+search_similar_questions_post (the editor's duplicate check) used to pull a few
+keyword matches and compare every keyword with every word of each candidate, so it
+was quadratic per candidate and missed duplicates outside the first rows. Each
+question now has a QuestionSignature row (refreshed when the question is saved,
+see api/signals.py):
+- the question text is normalized (lowercase words, image/lines/space/graph
+  placeholders dropped) and cut into character shingles of SHINGLE_SIZE
+- NUM_PERMUTATIONS MinHash values estimate the Jaccard similarity of two shingle
+  sets (fraction of equal values)
+- the first BANDS * ROWS_PER_BAND values are split into BANDS bands; each band is
+  hashed into a bucket, and questions sharing a bucket with the query are the
+  candidates (GIN-indexed array overlap, one query)
+- rows store a hash of the normalized text; the MinHash is only computed for
+  questions whose hash changed
+
+The banding threshold (1/BANDS)^(1/ROWS_PER_BAND) is ~0.29, next to MIN_JACCARD:
+with 42 bands of 3 rows, pairs with a Jaccard similarity of 0.3 share a bucket
+with ~68% probability, 0.4 with ~94%, 0.5 with ~99.6% and unrelated text (0.1)
+with ~4%.
+find_near_duplicates() only scores the candidates, so a query costs about the same
+however large the question bank grows.
+
+Questions created before this table existed are indexed by
+`python manage.py build_question_signatures`.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import zlib
+from typing import Iterable, List, Tuple
+
+from django.db import transaction
+
+from .models import Question, QuestionSignature
+
+logger = logging.getLogger(__name__)
+
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+BANDS = 42
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Bump when normalization, shingling, hashing or banding change; older rows are rebuilt
+SIGNATURE_VERSION = 2
+
+# Estimated similarity below which a candidate is not reported
+MIN_JACCARD = 0.3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed: signatures stored in the database must stay comparable across processes
+_rng = random.Random(20261016)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_PLACEHOLDER_PATTERN = re.compile(r'\[(?:IMAGE|LINES|SPACE|GRAPH):[^\]]*\]')
+_WORD_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words of the text, without markup and placeholders"""
+    text = _PLACEHOLDER_PATTERN.sub(' ', text or '')
+    return ' '.join(_WORD_PATTERN.findall(text.lower()))
+
+
+def shingles(text: str) -> set:
+    """CRC32 hashes of the character shingles of normalized text"""
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode('utf-8'))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(shingle_hashes: Iterable[int]) -> List[int]:
+    """NUM_PERMUTATIONS MinHash values of a shingle set (empty list for an empty set)"""
+    values = list(shingle_hashes)
+    if not values:
+        return []
+    return [
+        min((a * x + b) % _MERSENNE_PRIME for x in values)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_buckets(signature: List[int]) -> List[int]:
+    """One signed 64-bit bucket per band; the band number is part of the hash"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        payload = f"{band}:{','.join(map(str, rows))}".encode('ascii')
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+def estimate_jaccard(signature: List[int], other: List[int]) -> float:
+    """Fraction of equal MinHash values"""
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(1 for a, b in zip(signature, other) if a == b) / len(signature)
+
+
+def _normalized_hash(normalized: str) -> str:
+    return hashlib.sha1(f"{SIGNATURE_VERSION}:{normalized}".encode('utf-8')).hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Hash of the normalized question text (cheap; decides whether a signature is current)"""
+    return _normalized_hash(normalize_text(text))
+
+
+def text_signature(text: str) -> Tuple[str, List[int], List[int]]:
+    """(normalized text hash, MinHash signature, LSH buckets) of question text"""
+    normalized = normalize_text(text)
+    signature = minhash(shingles(normalized))
+    return _normalized_hash(normalized), signature, band_buckets(signature) if signature else []
+
+
+def store_question_signature(question) -> bool:
+    """
+    Create or refresh the signature row of a question
+
+    Returns:
+        True if the row was written, False if it was already current
+    """
+    existing = QuestionSignature.objects.filter(question_id=question.id).values_list('text_hash', flat=True).first()
+    if existing == text_hash(question.question_text):
+        return False
+    current_hash, signature, buckets = text_signature(question.question_text)
+    with transaction.atomic():
+        QuestionSignature.objects.update_or_create(
+            question_id=question.id,
+            defaults={'text_hash': current_hash, 'signature': signature, 'buckets': buckets},
+        )
+    return True
+
+
+def find_near_duplicates(text: str, subject=None, limit: int = 5,
+                         min_jaccard: float = MIN_JACCARD, exclude_id=None) -> List[Tuple[Question, float]]:
+    """
+    Top questions by estimated Jaccard similarity of their text to the given text
+
+    Args:
+        text: Question text being authored
+        subject: Only consider active questions of this subject (None: all subjects)
+        limit: Number of questions returned
+        min_jaccard: Minimum estimated similarity of a returned question
+        exclude_id: Question being edited, left out of the results
+
+    Returns:
+        List of (question, jaccard) tuples, most similar first
+    """
+    _, signature, buckets = text_signature(text)
+    if not signature:
+        return []
+
+    candidates = QuestionSignature.objects.filter(
+        buckets__overlap=buckets,
+        question__is_active=True,
+    )
+    if subject is not None:
+        candidates = candidates.filter(question__subject=subject)
+    if exclude_id:
+        candidates = candidates.exclude(question_id=exclude_id)
+
+    scored = []
+    for question_id, candidate_signature in candidates.values_list('question_id', 'signature'):
+        jaccard = estimate_jaccard(signature, candidate_signature)
+        if jaccard >= min_jaccard:
+            scored.append((jaccard, question_id))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    scored = scored[:limit]
+
+    questions = Question.objects.select_related('subject', 'paper', 'topic', 'section').in_bulk(
+        [question_id for _, question_id in scored]
+    )
+    return [(questions[question_id], jaccard) for jaccard, question_id in scored if question_id in questions]
@@ -3,6 +3,8 @@ Views for KCSE Paper Generation
 
 This module contains all API endpoints for:
 - Generating KCSE Biology Paper 1 
+- Generating batches of distinct Biology Paper 1 variants
+- Polling queued generation jobs (see generation_jobs.py)
 - Retrieving generated papers
 - Listing generated papers
 - Managing paper configurations
@@ -22,47 +24,31 @@ which uses an intelligent dynamic algorithm:
 from collections import defaultdict
 import logging
 import time
+import uuid
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
 from django.http import Http404
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from datetime import datetime
 import re
 
 
 from .models import (
-    Paper, Topic, PaperConfiguration, GeneratedPaper, Question
-)
-from .mathematics_generator import KCSEMathematicsPaper1Generator, KCSEMathematicsPaper2Generator
-from .georaphy_paper_generator import KCSEGeographyPaper1Generator, KCSEGeographyPaper2Generator, Paper, Topic, Question
-from .kcse_biology_paper1_generator import KCSEBiologyPaper1Generator
-from .coverpage_templates import (
-    BiologyPaper1Coverpage, 
-    BiologyPaper2Coverpage, 
-    BiologyPaper2MarkingSchemeCoverpage,
-    BiologyPaper3Coverpage,
-    GeographyPaper1Coverpage,
-    GeographyPaper2Coverpage,
-    PhysicsPaper1Coverpage,
-    PhysicsPaper2Coverpage,
-    ChemistryPaper1Coverpage,
-    ChemistryPaper2Coverpage,
-    CREPaper1Coverpage,
-    CREPaper2Coverpage,
-    KiswahiliPaper1Coverpage,
-    KiswahiliPaper2Coverpage,
-    BusinessPaper1Coverpage,
-    BusinessPaper2Coverpage,
-    EnglishPaper1Coverpage,
-    EnglishPaper2Coverpage,
-    EnglishPaper3Coverpage,
-    MarkingSchemeCoverpage, 
-    format_time_allocation
+    Paper, Topic, PaperConfiguration, GeneratedPaper, GenerationJob, Question
 )
+from .lazy_registry import STANDARD_EXAM_TEMPLATE, get_exam_template, get_generator, resolve
+from .utils import format_time_allocation
 from .page_number_extrctor import extract_paper_number_from_name
+from .mark_solver import InfeasibleSelectionError
+from .generation_jobs import can_read_job, generation_job, serialize_job
+from .unique_codes import allocate_unique_code, allocate_unique_codes
+from .paper_snapshot import get_paper_snapshot, marking_scheme_payload, question_payload, store_paper_snapshot
+from .render_cache import make_render_key, render_cache, streaming_html_response
+from .fragment_cache import prefetch_fragments
+from .image_store import public_images
+from .paper_pdf import PdfEngineUnavailable, pdf_key, pdf_response, request_pdf
+from .pool_census import PoolCensus, in_section
 
 logger = logging.getLogger(__name__)
 
@@ -72,15 +58,20 @@ class PaperGenerationException(Exception):
     pass
 
 
-def _get_user_generated_paper_or_404(user, paper_id):
+def _get_user_generated_paper_or_404(user, paper_id, with_snapshot=False):
     """
     Resolve a generated paper for the current user.
 
     - Primary path: paper owned by the authenticated user.
     - Legacy compatibility: if the paper is unowned (generated_by is NULL),
       claim it for this user on first access.
+    - with_snapshot: also fetch the question snapshot in the same query.
     """
-    generated_paper = GeneratedPaper.objects.filter(
+    related = ['paper__subject', 'generated_by']
+    if with_snapshot:
+        related.append('snapshot')
+
+    generated_paper = GeneratedPaper.objects.select_related(*related).filter(
         id=paper_id,
         generated_by=user
     ).first()
@@ -102,108 +93,40 @@ def _get_user_generated_paper_or_404(user, paper_id):
 def _select_coverpage_class_and_default(generated_paper, paper, is_marking_scheme=False):
     """
     Select the most appropriate coverpage/marking-scheme class and default data
-    for a given generated paper. This centralizes logic and makes the selection
-    robust (case-insensitive, checks both metadata and paper name).
+    for a given generated paper. The layout comes from the coverpage registry
+    (COVERPAGE_LAYOUTS / MARKING_SCHEME_LAYOUTS in coverpage_templates.py), looked
+    up by subject and the paper number detected from the paper name.
 
     Returns: (CoverpageClass, default_data_dict)
     """
-    metadata = getattr(generated_paper, 'metadata', {}) or {}
-    paper_type = (metadata.get('paper_type') or '').upper()
-    subject_name = (paper.subject.name or '').upper()
-    paper_name = (paper.name or '').lower()
-    
-    # Use the extract_paper_number_from_name function for accurate paper number detection
-    paper_number = extract_paper_number_from_name(paper_name)
+    from .coverpage_templates import BiologyPaper1Coverpage, MarkingSchemeCoverpage, get_coverpage_layout
 
-    def is_paper1():
-        return paper_number == 1
+    subject_name = paper.subject.name or ''
+    paper_number = extract_paper_number_from_name((paper.name or '').lower())
 
-    def is_paper2():
-        return paper_number == 2
+    layout = get_coverpage_layout(subject_name, paper_number, is_marking_scheme=is_marking_scheme)
 
-    def is_paper3():
-        return paper_number == 3
-
-    # Prefer subject-specific classes first
     try:
         if is_marking_scheme:
-            # Marking scheme selection
-            if subject_name == 'BIOLOGY' and is_paper2():
-                return BiologyPaper2MarkingSchemeCoverpage, BiologyPaper2MarkingSchemeCoverpage.generate_default_data(generated_paper, paper)
-            if subject_name == 'BIOLOGY' and is_paper3():
-                # No separate Paper 3 marking scheme class exists; reuse Paper 2 marking scheme structure
-                return BiologyPaper2MarkingSchemeCoverpage, BiologyPaper2MarkingSchemeCoverpage.generate_default_data(generated_paper, paper)
             # Generic marking scheme class fallback
-            return MarkingSchemeCoverpage, MarkingSchemeCoverpage.generate_default_data(generated_paper, paper)
-
-        # Question paper coverpage selection
-        if subject_name == 'PHYSICS':
-            if is_paper1():
-                return PhysicsPaper1Coverpage, PhysicsPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return PhysicsPaper2Coverpage, PhysicsPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-
-        if subject_name == 'CHEMISTRY':
-            if is_paper2():
-                return ChemistryPaper2Coverpage, ChemistryPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            # default to paper1 if not explicit
-            return ChemistryPaper1Coverpage, ChemistryPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-
-        # If it's explicitly a Paper 3 (and subject biology), prefer Biology Paper3
-        if subject_name == 'BIOLOGY' and is_paper3():
-            return BiologyPaper3Coverpage, BiologyPaper3Coverpage.generate_default_coverpage_data(generated_paper, paper)
-
-        # If it's explicitly a Paper 2 for Biology specifically, use Biology Paper2
-        if subject_name == 'BIOLOGY' and is_paper2():
-            return BiologyPaper2Coverpage, BiologyPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-
-        # Fallback: if subject is biology use Biology Paper 1, otherwise check other subjects below
-        if subject_name == 'BIOLOGY':
-            return BiologyPaper1Coverpage, BiologyPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'GEOGRAPHY':
-            if is_paper1():
-                return GeographyPaper1Coverpage, GeographyPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return GeographyPaper2Coverpage, GeographyPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'KISWAHILI':
-            if is_paper1():
-                return KiswahiliPaper1Coverpage, KiswahiliPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return KiswahiliPaper2Coverpage, KiswahiliPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'BUSINESS STUDIES' or subject_name == 'BUSINESS':
-            if is_paper1():
-                return BusinessPaper1Coverpage, BusinessPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return BusinessPaper2Coverpage, BusinessPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'CHRISTIAN RELIGIOUS EDUCATION' or subject_name == 'CRE':
-            if is_paper1():
-                return CREPaper1Coverpage, CREPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return CREPaper2Coverpage, CREPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'MATHEMATICS':
-            if is_paper1():
-                return KCSEMathematicsPaper1Generator, KCSEMathematicsPaper1Generator.generate_default_coverpage_data(generated_paper, paper)
-            return KCSEMathematicsPaper2Generator, KCSEMathematicsPaper2Generator.generate_default_coverpage_data(generated_paper, paper)
-        
-        if subject_name == 'ENGLISH':
-            if is_paper1():
-                return EnglishPaper1Coverpage, EnglishPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            elif is_paper3():
-                return EnglishPaper3Coverpage, EnglishPaper3Coverpage.generate_default_coverpage_data(generated_paper, paper)
-            return EnglishPaper2Coverpage, EnglishPaper2Coverpage.generate_default_coverpage_data(generated_paper, paper)
+            layout = layout or MarkingSchemeCoverpage
+            return layout, layout.generate_default_data(generated_paper, paper)
+        if layout is not None:
+            return layout, layout.generate_default_coverpage_data(generated_paper, paper)
+    except Exception:
+        # If any class doesn't expose expected helper, fallback to a safe default below
+        pass
 
+    try:
+        return BiologyPaper1Coverpage, BiologyPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
     except Exception:
-        # If any class doesn't expose expected helper, fallback to a safe default
-        try:
-            return BiologyPaper1Coverpage, BiologyPaper1Coverpage.generate_default_coverpage_data(generated_paper, paper)
-        except Exception:
-            # Last resort: return MarkingSchemeCoverpage default
-            return MarkingSchemeCoverpage, MarkingSchemeCoverpage.generate_default_data(generated_paper, paper)
+        # Last resort: return MarkingSchemeCoverpage default
+        return MarkingSchemeCoverpage, MarkingSchemeCoverpage.generate_default_data(generated_paper, paper)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@generation_job('biology_paper1')
 def generate_paper(request):
     """
     Generate a KCSE Biology Paper 1
@@ -266,7 +189,7 @@ def generate_paper(request):
                    f"with {len(selected_topic_ids)} topics")
         
         # Initialize generator with new KCSE algorithm
-        generator = KCSEBiologyPaper1Generator(
+        generator = get_generator('BIOLOGY', 1)(
             paper_id=str(paper_id),
             selected_topic_ids=[str(tid) for tid in selected_topic_ids]
         )
@@ -278,13 +201,7 @@ def generate_paper(request):
         result = generator.generate()
         
         # Create GeneratedPaper record from result
-        from datetime import datetime
-        current_year = datetime.now().year
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper, 
-            created_at__year=current_year
-        ).count()
-        unique_code = f"{paper.subject.name[:2].upper()}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(paper.subject.name[:2].upper())
         
         generated_paper = GeneratedPaper.objects.create(
             paper=paper,
@@ -350,6 +267,239 @@ def generate_paper(request):
         )
 
 
+MAX_BATCH_VARIANTS = 10
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@generation_job('biology_paper1_batch')
+def generate_paper_batch(request):
+    """
+    Generate several distinct variants of a KCSE Biology Paper 1 in one request
+    
+    The question pool is loaded once and every variant is drawn from it. Variants
+    share at most `max_overlap` questions with each other (with the default 0 the
+    request fails at once if the pool cannot supply disjoint papers). All papers
+    are saved with a single bulk insert.
+    
+    POST /api/papers/generate/batch
+    {
+        "paper_id": "uuid",
+        "topics": ["topic_uuid1", "topic_uuid2", ...],
+        "variants": 3,
+        "max_overlap": 0
+    }
+    """
+    try:
+        paper_id = request.data.get('paper_id')
+        selected_topic_ids = request.data.get('topics') or request.data.get('selected_topics', [])
+        
+        try:
+            variants = int(request.data.get('variants', 2))
+            max_overlap = int(request.data.get('max_overlap', 0))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'variants and max_overlap must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not paper_id:
+            return Response(
+                {'error': 'paper_id is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not selected_topic_ids:
+            return Response(
+                {'error': 'At least one topic must be selected'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not 1 <= variants <= MAX_BATCH_VARIANTS:
+            return Response(
+                {'error': f'variants must be between 1 and {MAX_BATCH_VARIANTS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if max_overlap < 0:
+            return Response(
+                {'error': 'max_overlap cannot be negative'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Validate paper exists
+        paper = get_object_or_404(Paper.objects.select_related('subject'), id=paper_id, is_active=True)
+        
+        # Only generators that can draw variants (currently KCSE Biology Paper 1)
+        generator_class = get_generator(paper.subject.name, extract_paper_number_from_name(paper.name))
+        if generator_class is None or not hasattr(generator_class, 'generate_variants'):
+            return Response(
+                {'error': f'Batch generation is not available for {paper.subject.name} {paper.name}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Validate topics exist
+        valid_topics = Topic.objects.filter(
+            id__in=selected_topic_ids,
+            paper=paper,
+            is_active=True
+        )
+        
+        if valid_topics.count() != len(selected_topic_ids):
+            return Response(
+                {'error': 'Some selected topics are invalid'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        logger.info(f"[GENERATE BATCH] User {request.user.full_name} generating {variants} variants "
+                   f"of {paper.name} with {len(selected_topic_ids)} topics (max overlap {max_overlap})")
+        
+        batch_start = time.time()
+        
+        # Load the pool once for all variants
+        generator = generator_class(
+            paper_id=str(paper_id),
+            selected_topic_ids=[str(tid) for tid in selected_topic_ids]
+        )
+        generator.load_data()
+        
+        if len(generator.nested_questions) + len(generator.standalone_1mark) + \
+                len(generator.standalone_2mark) + len(generator.standalone_3mark) < 25:
+            return Response(
+                {'error': 'Insufficient questions in database'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            results = generator.generate_variants(variants, max_overlap=max_overlap)
+        except Exception as e:
+            raise PaperGenerationException(str(e))
+        
+        # Build all records first, then insert them in one query
+        batch_id = str(uuid.uuid4())
+        unique_codes = allocate_unique_codes(paper.subject.name[:2].upper(), len(results))
+        
+        generated_papers = []
+        for index, result in enumerate(results):
+            statistics = result['statistics']
+            generated_papers.append(GeneratedPaper(
+                paper=paper,
+                unique_code=unique_codes[index],
+                status='draft',
+                question_ids=result['question_ids'],
+                selected_topics=[str(tid) for tid in selected_topic_ids],
+                total_marks=statistics['total_marks'],
+                total_questions=statistics['total_questions'],
+                mark_distribution=statistics['marks_distribution'],
+                topic_distribution=statistics['topic_distribution'],
+                question_type_distribution={},
+                generation_attempts=statistics['generation_attempts'],
+                backtracking_count=0,
+                generation_time_seconds=statistics['generation_time_seconds'],
+                generated_by=request.user,
+                validation_passed=all(statistics['validation'].values()),
+                validation_report=statistics['validation'],
+                metadata={
+                    'batch_id': batch_id,
+                    'variant': statistics['variant']['label'],
+                    'variant_index': statistics['variant']['index'],
+                    'batch_size': variants,
+                    'max_overlap': max_overlap,
+                }
+            ))
+        
+        GeneratedPaper.objects.bulk_create(generated_papers)
+        
+        # bulk_create sends no post_save, so snapshot the variants here
+        # (same as signals.snapshot_new_generated_paper for single papers)
+        for generated_paper in generated_papers:
+            try:
+                store_paper_snapshot(generated_paper)
+            except Exception as e:
+                logger.warning(f"[SNAPSHOT] Could not snapshot {generated_paper.unique_code}: {str(e)}")
+        
+        variant_summaries = []
+        for generated_paper, result in zip(generated_papers, results):
+            statistics = result['statistics']
+            variant_summaries.append({
+                'id': str(generated_paper.id),
+                'unique_code': generated_paper.unique_code,
+                'variant': statistics['variant']['label'],
+                'status': generated_paper.status,
+                'total_marks': generated_paper.total_marks,
+                'total_questions': generated_paper.total_questions,
+                'nested_count': statistics['nested_count'],
+                'nested_marks': statistics['nested_marks'],
+                'standalone_count': statistics['standalone_count'],
+                'standalone_marks': statistics['standalone_marks'],
+                'mark_distribution': generated_paper.mark_distribution,
+                'topic_distribution': generated_paper.topic_distribution,
+                'max_overlap_with_previous': statistics['variant']['max_overlap_with_previous'],
+                'validation_passed': generated_paper.validation_passed,
+                'generation_time_seconds': generated_paper.generation_time_seconds,
+                'generation_attempts': generated_paper.generation_attempts,
+                'created_at': generated_paper.created_at,
+            })
+        
+        return Response({
+            'success': True,
+            'message': f'{len(generated_papers)} paper variants generated successfully',
+            'batch_id': batch_id,
+            'variants': variant_summaries,
+            'generation_time_seconds': round(time.time() - batch_start, 3),
+        }, status=status.HTTP_201_CREATED)
+        
+    except PaperGenerationException as e:
+        logger.error(f"[GENERATE BATCH] Generation failed: {str(e)}")
+        return Response(
+            {
+                'error': 'Paper generation failed',
+                'details': str(e)
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    except Http404:
+        raise
+    
+    except Exception as e:
+        logger.error(f"[GENERATE BATCH] Unexpected error: {str(e)}", exc_info=True)
+        return Response(
+            {
+                'error': 'Internal server error',
+                'details': str(e)
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_generation_job(request, job_id):
+    """
+    Poll a queued paper generation job
+    
+    GET /api/papers/jobs/<job_id>
+    GET /api/papers/jobs/<job_id>?token=<job_token>   (jobs queued without a login)
+    
+    Open to anonymous requests: the plain generate views queue jobs for callers
+    without a login, so access is decided by can_read_job (owner, staff or token).
+    
+    Once the job has finished, `result` holds the response the generate
+    endpoint produced and `response_status` its HTTP status.
+    """
+    job = GenerationJob.objects.filter(id=job_id).first()
+    
+    # Jobs of other users are reported as missing, not as forbidden
+    if job is None or not can_read_job(job, request.user, request.query_params.get('token', '')):
+        return Response(
+            {'error': 'Generation job not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(serialize_job(job))
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_generated_paper(request, paper_id):
@@ -365,62 +515,18 @@ def get_generated_paper(request, paper_id):
         - Answers (for marking scheme)
     """
     try:
-        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id)
-        
-        # Load all questions in order using the stored question_ids list
-        question_ids = generated_paper.question_ids
-        questions = Question.objects.filter(id__in=question_ids).select_related(
-            'topic', 'section'
-        )
-        
-        # Create ordered list maintaining the sequence from generation
-        question_map = {str(q.id): q for q in questions}
-        ordered_questions = []
-        marking_scheme = []
-        
-        for idx, qid in enumerate(question_ids, start=1):
-            question = question_map.get(qid)
-            if question:
-                # Question data for paper
-                question_data = {
-                    'id': str(question.id),
-                    'question_number': idx,
-                    'question_text': question.question_text,
-                    'question_inline_images': question.question_inline_images,
-                    'question_image_positions': question.question_image_positions,
-                    'question_answer_lines': question.question_answer_lines,
-                    'marks': question.marks,
-                    'is_nested': question.is_nested,
-                    'nested_parts': question.nested_parts if question.is_nested else None,
-                    'question_type': question.question_type,
-                    'kcse_question_type': question.kcse_question_type,
-                    'difficulty': question.difficulty,
-                    'topic': {
-                        'id': str(question.topic.id),
-                        'name': question.topic.name
-                    },
-                    'section': {
-                        'id': str(question.section.id),
-                        'name': question.section.name,
-                        'order': question.section.order
-                    } if question.section else None,
-                }
-                ordered_questions.append(question_data)
-                
-                # Answer data for marking scheme
-                answer_data = {
-                    'question_number': idx,
-                    'question_id': str(question.id),
-                    'question_text_preview': question.question_text[:100] + '...' if len(question.question_text) > 100 else question.question_text,
-                    'answer_text': question.answer_text,
-                    'answer_inline_images': question.answer_inline_images,
-                    'answer_image_positions': question.answer_image_positions,
-                    'answer_answer_lines': question.answer_answer_lines,
-                    'marks': question.marks,
-                    'is_nested': question.is_nested,
-                    'marking_points': question.nested_parts if question.is_nested else None,
-                }
-                marking_scheme.append(answer_data)
+        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id, with_snapshot=True)
+        
+        # Ordered question payloads from the stored snapshot (no question queries)
+        entries = get_paper_snapshot(generated_paper)
+        ordered_questions = [
+            question_payload(entry, question_number=idx)
+            for idx, entry in enumerate(entries, start=1)
+        ]
+        marking_scheme = [
+            marking_scheme_payload(entry, question_number=idx)
+            for idx, entry in enumerate(entries, start=1)
+        ]
         
         return Response({
             'id': str(generated_paper.id),
@@ -682,37 +788,25 @@ def get_topic_statistics(request, paper_id):
     """
     try:
         paper = get_object_or_404(Paper, id=paper_id)
-        topics = Topic.objects.filter(paper=paper, is_active=True)
+        topics = list(Topic.objects.filter(paper=paper, is_active=True))
+        
+        # One grouped query for all topics (see api/pool_census.py)
+        census = PoolCensus.for_paper(paper.id, [topic.id for topic in topics])
         
         topic_stats = []
         
         for topic in topics:
-            # Count nested questions
-            nested_questions = Question.objects.filter(
-                topic=topic,
-                is_active=True,
-                is_nested=True
-            )
-            nested_by_mark = nested_questions.values('marks').annotate(count=Count('id'))
-            nested_counts = {}
-            for item in nested_by_mark:
-                nested_counts[item['marks']] = item['count']
+            # Count nested questions by mark value
+            nested_counts = census.by_marks(topics=[topic.id], nested=True)
             
             # Count standalone questions by mark value
-            standalone_questions = Question.objects.filter(
-                topic=topic,
-                is_active=True,
-                is_nested=False
-            )
-            standalone_by_mark = standalone_questions.values('marks').annotate(count=Count('id'))
-            
             standalone_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0}
-            for item in standalone_by_mark:
-                if item['marks'] <= 6:
-                    standalone_counts[item['marks']] = item['count']
+            for marks, count in census.by_marks(topics=[topic.id], nested=False).items():
+                if marks <= 6:
+                    standalone_counts[marks] = count
             
-            total_nested = nested_questions.count()
-            total_standalone = standalone_questions.count()
+            total_nested = sum(nested_counts.values())
+            total_standalone = census.count(topics=[topic.id], nested=False)
             total_questions = total_nested + total_standalone
             
             # Combine nested and standalone counts into questions_by_marks (1-6 marks)
@@ -764,6 +858,9 @@ def view_full_paper(request, paper_id):
     
     GET /api/papers/generated/{paper_id}/view
     
+    Query params:
+    - include: 'questions', 'marking_scheme' or 'all' (default: all)
+    
     Returns:
         - Paper metadata
         - All questions in order (without answers)
@@ -771,7 +868,12 @@ def view_full_paper(request, paper_id):
         - Special rendering for Business Paper 2 (6 sections with paired questions a and b)
     """
     try:
-        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id)
+        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id, with_snapshot=True)
+        
+        # ?include=questions|marking_scheme builds only one part (default: both)
+        include = request.query_params.get('include', 'all')
+        include_questions = include in ('all', 'questions')
+        include_marking_scheme = include in ('all', 'marking_scheme')
         
         # Check if this is Business Paper 2
         subject_name = generated_paper.paper.subject.name.upper()
@@ -782,171 +884,62 @@ def view_full_paper(request, paper_id):
             (paper_number == 2)
         )
         
-        # Load all questions in order using the stored question_ids list
-        question_ids = generated_paper.question_ids
-        questions = Question.objects.filter(id__in=question_ids).select_related(
-            'topic', 'section'
-        )
-        
-        # Create ordered list maintaining the sequence from generation
-        question_map = {str(q.id): q for q in questions}
+        # Ordered question payloads from the stored snapshot (no question queries)
+        entries = get_paper_snapshot(generated_paper)
         ordered_questions = []
         marking_scheme = []
         
         # Business Paper 2: Special rendering - 12 questions displayed as 6 sections with parts a and b
         if is_business_paper_2:
             # Group every 2 consecutive questions as one question with parts a and b
-            for i in range(0, len(question_ids), 2):
-                if i + 1 < len(question_ids):
-                    question_number = (i // 2) + 1  # 1, 2, 3, 4, 5, 6
-                    
-                    q_a_id = question_ids[i]
-                    q_b_id = question_ids[i + 1]
-                    
-                    q_a = question_map.get(q_a_id)
-                    q_b = question_map.get(q_b_id)
-                    
-                    if q_a and q_b:
-                        # Create combined question with parts a and b
-                        combined_question = {
-                            'question_number': question_number,
-                            'total_marks': q_a.marks + q_b.marks,
-                            'is_combined': True,
-                            'is_business_paper_2': True,
-                            'part_a': {
-                                'id': str(q_a.id),
-                                'part_label': 'a',
-                                'question_text': q_a.question_text,
-                                'question_inline_images': q_a.question_inline_images,
-                                'question_image_positions': q_a.question_image_positions,
-                                'question_answer_lines': q_a.question_answer_lines,
-                                'marks': q_a.marks,
-                                'is_nested': q_a.is_nested,
-                                'nested_parts': q_a.nested_parts if q_a.is_nested else None,
-                                'question_type': q_a.question_type,
-                                'kcse_question_type': q_a.kcse_question_type,
-                                'difficulty': q_a.difficulty,
-                                'topic': {
-                                    'id': str(q_a.topic.id),
-                                    'name': q_a.topic.name
-                                },
-                                'section': {
-                                    'id': str(q_a.section.id),
-                                    'name': q_a.section.name,
-                                    'order': q_a.section.order
-                                } if q_a.section else None,
-                            },
-                            'part_b': {
-                                'id': str(q_b.id),
-                                'part_label': 'b',
-                                'question_text': q_b.question_text,
-                                'question_inline_images': q_b.question_inline_images,
-                                'question_image_positions': q_b.question_image_positions,
-                                'question_answer_lines': q_b.question_answer_lines,
-                                'marks': q_b.marks,
-                                'is_nested': q_b.is_nested,
-                                'nested_parts': q_b.nested_parts if q_b.is_nested else None,
-                                'question_type': q_b.question_type,
-                                'kcse_question_type': q_b.kcse_question_type,
-                                'difficulty': q_b.difficulty,
-                                'topic': {
-                                    'id': str(q_b.topic.id),
-                                    'name': q_b.topic.name
-                                },
-                                'section': {
-                                    'id': str(q_b.section.id),
-                                    'name': q_b.section.name,
-                                    'order': q_b.section.order
-                                } if q_b.section else None,
-                            }
-                        }
-                        ordered_questions.append(combined_question)
-                        
-                        # Marking scheme with both parts
-                        marking_scheme.append({
-                            'question_number': question_number,
-                            'is_combined': True,
-                            'is_business_paper_2': True,
-                            'total_marks': q_a.marks + q_b.marks,
-                            'part_a': {
-                                'question_id': str(q_a.id),
-                                'part_label': 'a',
-                                'marks': q_a.marks,
-                                'question_text_preview': q_a.question_text[:100] + '...' if len(q_a.question_text) > 100 else q_a.question_text,
-                                'answer_text': q_a.answer_text,
-                                'answer_inline_images': q_a.answer_inline_images,
-                                'answer_image_positions': q_a.answer_image_positions,
-                                'answer_answer_lines': q_a.answer_answer_lines,
-                                'is_nested': q_a.is_nested,
-                                'marking_points': q_a.nested_parts if q_a.is_nested else None,
-                            },
-                            'part_b': {
-                                'question_id': str(q_b.id),
-                                'part_label': 'b',
-                                'marks': q_b.marks,
-                                'question_text_preview': q_b.question_text[:100] + '...' if len(q_b.question_text) > 100 else q_b.question_text,
-                                'answer_text': q_b.answer_text,
-                                'answer_inline_images': q_b.answer_inline_images,
-                                'answer_image_positions': q_b.answer_image_positions,
-                                'answer_answer_lines': q_b.answer_answer_lines,
-                                'is_nested': q_b.is_nested,
-                                'marking_points': q_b.nested_parts if q_b.is_nested else None,
-                            }
-                        })
+            for i in range(0, len(entries) - 1, 2):
+                question_number = (i // 2) + 1  # 1, 2, 3, 4, 5, 6
+                q_a = entries[i]
+                q_b = entries[i + 1]
+                total_marks = q_a['marks'] + q_b['marks']
+                
+                if include_questions:
+                    # Create combined question with parts a and b
+                    ordered_questions.append({
+                        'question_number': question_number,
+                        'total_marks': total_marks,
+                        'is_combined': True,
+                        'is_business_paper_2': True,
+                        'part_a': question_payload(q_a, part_label='a'),
+                        'part_b': question_payload(q_b, part_label='b'),
+                    })
+                
+                if include_marking_scheme:
+                    # Marking scheme with both parts
+                    marking_scheme.append({
+                        'question_number': question_number,
+                        'is_combined': True,
+                        'is_business_paper_2': True,
+                        'total_marks': total_marks,
+                        'part_a': marking_scheme_payload(q_a, part_label='a'),
+                        'part_b': marking_scheme_payload(q_b, part_label='b'),
+                    })
         else:
             # Standard rendering for all other papers
-            for idx, qid in enumerate(question_ids, start=1):
-                question = question_map.get(qid)
-                if question:
-                    # Question data for paper preview (no answers)
-                    question_data = {
-                        'id': str(question.id),
-                        'question_number': idx,
-                        'question_text': question.question_text,
-                        'question_inline_images': question.question_inline_images,
-                        'question_image_positions': question.question_image_positions,
-                        'question_answer_lines': question.question_answer_lines,
-                        'marks': question.marks,
-                        'is_nested': question.is_nested,
-                        'nested_parts': question.nested_parts if question.is_nested else None,
-                        'question_type': question.question_type,
-                        'kcse_question_type': question.kcse_question_type,
-                        'difficulty': question.difficulty,
-                        'topic': {
-                            'id': str(question.topic.id),
-                            'name': question.topic.name
-                        },
-                        'section': {
-                            'id': str(question.section.id),
-                            'name': question.section.name,
-                            'order': question.section.order
-                        } if question.section else None,
-                    }
-                    ordered_questions.append(question_data)
-                    
-                    # Answer data for marking scheme preview
-                    answer_data = {
-                        'question_number': idx,
-                        'question_id': str(question.id),
-                        'question_text_preview': question.question_text[:100] + '...' if len(question.question_text) > 100 else question.question_text,
-                        'answer_text': question.answer_text,
-                        'answer_inline_images': question.answer_inline_images,
-                        'answer_image_positions': question.answer_image_positions,
-                        'answer_answer_lines': question.answer_answer_lines,
-                        'marks': question.marks,
-                        'is_nested': question.is_nested,
-                        'marking_points': question.nested_parts if question.is_nested else None,
-                    }
-                    marking_scheme.append(answer_data)
+            if include_questions:
+                ordered_questions = [
+                    question_payload(entry, question_number=idx)
+                    for idx, entry in enumerate(entries, start=1)
+                ]
+            if include_marking_scheme:
+                marking_scheme = [
+                    marking_scheme_payload(entry, question_number=idx)
+                    for idx, entry in enumerate(entries, start=1)
+                ]
         
         # Calculate question statistics
         if is_business_paper_2:
             # For Business Paper 2, count combined questions (not individual parts)
             nested_count = 0
-            standalone_count = len(ordered_questions)  # 6 combined questions
+            standalone_count = len(entries) // 2  # 6 combined questions
         else:
-            nested_count = sum(1 for q in ordered_questions if q.get('is_nested', False))
-            standalone_count = len(ordered_questions) - nested_count
+            nested_count = sum(1 for entry in entries if entry['is_nested'])
+            standalone_count = len(entries) - nested_count
         
         return Response({
             'id': str(generated_paper.id),
@@ -1046,8 +1039,12 @@ def coverpage_data(request, paper_id):
                 coverpage_data['time_allocation'] = format_time_allocation(coverpage_data['time_allocation'])
             
             if output_format == 'html':
-                # Generate HTML coverpage
-                html_content = CoverpageClass.generate_html(coverpage_data)
+                # Generate HTML coverpage (cached per coverpage data)
+                cache_key = make_render_key(generated_paper, 'coverpage', coverpage_data)
+                html_content = render_cache.get(cache_key)
+                if html_content is None:
+                    html_content = CoverpageClass.generate_html(coverpage_data)
+                    render_cache.set(cache_key, html_content)
                 
                 from django.http import HttpResponse
                 return HttpResponse(html_content, content_type='text/html')
@@ -1083,6 +1080,7 @@ def coverpage_data(request, paper_id):
             generated_paper.coverpage_data['total_questions'] = generated_paper.total_questions
             
             generated_paper.save()
+            render_cache.invalidate_paper(generated_paper.id)
             
             return Response({
                 'success': True,
@@ -1103,6 +1101,39 @@ def coverpage_data(request, paper_id):
         )
 
 
+def _download_paper_file(request, generated_paper, format_type, include_answers):
+    """Serve the server-rendered PDF of a paper or its marking scheme (see api/paper_pdf.py)"""
+    if format_type != 'pdf':
+        return Response(
+            {'error': f"File output is only available for format=pdf (got '{format_type}')"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    view_type = 'marking_scheme' if include_answers else 'questions'
+    entries = get_paper_snapshot(generated_paper)
+    if view_type == 'marking_scheme':
+        _, coverpage, _ = _marking_scheme_preview(generated_paper, entries)
+    else:
+        _, coverpage, _ = _questions_preview(generated_paper, entries)
+    key = pdf_key(make_render_key(generated_paper, view_type, coverpage))
+    
+    def build_page():
+        # Store the PDF under the key of the HTML actually rendered
+        html, render_key = _render_paper_html(generated_paper, view_type)
+        return html, pdf_key(render_key)
+    
+    try:
+        pdf = request_pdf(generated_paper, view_type, key, build_page)
+    except PdfEngineUnavailable as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+    
+    suffix = 'Marking_Scheme' if include_answers else 'Paper'
+    return pdf_response(request, pdf, f"{generated_paper.unique_code}_{suffix}.pdf")
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def download_paper(request, paper_id):
@@ -1115,45 +1146,42 @@ def download_paper(request, paper_id):
     - format: 'pdf' or 'docx' (default: pdf)
     - include_answers: 'true' or 'false' (default: false)
     - include_coverpage: 'true' or 'false' (default: true)
+    - output: 'json' or 'file' (default: json)
     
     Returns:
-        Complete paper data formatted for printing/download
+        Complete paper data formatted for printing/download, or with output=file
+        the rendered PDF (exam paper, or marking scheme when include_answers=true;
+        both always include their coverpage)
     """
     try:
-        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id)
+        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id, with_snapshot=True)
         
         # Query params
         format_type = request.query_params.get('format', 'pdf')
         include_answers = request.query_params.get('include_answers', 'false').lower() == 'true'
         include_coverpage = request.query_params.get('include_coverpage', 'true').lower() == 'true'
         
-        # Load questions
-        question_ids = generated_paper.question_ids
-        questions = Question.objects.filter(id__in=question_ids).select_related(
-            'topic', 'section'
-        )
-        question_map = {str(q.id): q for q in questions}
+        if request.query_params.get('output', 'json') == 'file':
+            return _download_paper_file(request, generated_paper, format_type, include_answers)
         
-        # Build questions list
+        # Build questions list from the stored snapshot
         ordered_questions = []
-        for idx, qid in enumerate(question_ids, start=1):
-            question = question_map.get(qid)
-            if question:
-                question_data = {
-                    'question_number': idx,
-                    'question_text': question.question_text,
-                    'question_inline_images': question.question_inline_images,
-                    'marks': question.marks,
-                    'is_nested': question.is_nested,
-                    'nested_parts': question.nested_parts if question.is_nested else None,
-                }
-                
-                # Include answers if requested
-                if include_answers:
-                    question_data['answer_text'] = question.answer_text
-                    question_data['answer_inline_images'] = question.answer_inline_images
-                
-                ordered_questions.append(question_data)
+        for idx, entry in enumerate(get_paper_snapshot(generated_paper), start=1):
+            question_data = {
+                'question_number': idx,
+                'question_text': entry['question_text'],
+                'question_inline_images': public_images(entry['question_inline_images']),
+                'marks': entry['marks'],
+                'is_nested': entry['is_nested'],
+                'nested_parts': entry['nested_parts'],
+            }
+            
+            # Include answers if requested
+            if include_answers:
+                question_data['answer_text'] = entry['answer_text']
+                question_data['answer_inline_images'] = public_images(entry['answer_inline_images'])
+            
+            ordered_questions.append(question_data)
         
         # Get coverpage data
         coverpage_data = None
@@ -1249,6 +1277,139 @@ def update_paper_status(request, paper_id):
         )
 
 
+def _marking_scheme_preview(generated_paper, entries):
+    """(marking scheme class, coverpage data, items) of a marking scheme preview"""
+    # Select Marking Scheme class and default data robustly
+    MarkingSchemeClass, marking_scheme_coverpage = _select_coverpage_class_and_default(generated_paper, generated_paper.paper, is_marking_scheme=True)
+    
+    # Create ordered marking scheme from the stored snapshot
+    marking_scheme_items = []
+    
+    for idx, entry in enumerate(entries, start=1):
+        marking_scheme_items.append({
+            'number': idx,
+            'question_preview': entry['question_text'][:100] + '...' if len(entry['question_text']) > 100 else entry['question_text'],
+            'answer': entry['answer_text'],
+            'answer_inline_images': public_images(entry['answer_inline_images']),
+            'answer_image_positions': entry['answer_image_positions'],
+            'marks': entry['marks'],
+            'is_nested': entry['is_nested'],
+            'marking_points': entry['nested_parts'],
+        })
+    
+    return MarkingSchemeClass, marking_scheme_coverpage, marking_scheme_items
+
+
+def _questions_preview(generated_paper, entries):
+    """(coverpage class, coverpage data, ordered questions) of an exam paper preview"""
+    # Get coverpage data
+    coverpage_data_dict = getattr(generated_paper, 'coverpage_data', None) or {}
+    
+    # Select Coverpage class and default data robustly
+    CoverpageClass, default_coverpage = _select_coverpage_class_and_default(generated_paper, generated_paper.paper, is_marking_scheme=False)
+
+    coverpage_data = {**default_coverpage, **coverpage_data_dict}
+    
+    # Create ordered list from the stored snapshot
+    ordered_questions = []
+    
+    for idx, entry in enumerate(entries, start=1):
+        ordered_questions.append({
+            'number': idx,
+            'text': entry['question_text'],
+            'question_inline_images': public_images(entry['question_inline_images']),
+            'question_image_positions': entry['question_image_positions'],
+            'question_answer_lines': entry['question_answer_lines'],
+            'marks': entry['marks'],
+            'is_nested': entry['is_nested'],
+            'nested_parts': entry['nested_parts'],
+            'topic': entry['topic']['name'] if entry['topic'] else 'Unknown Topic',
+            'section': entry['section']
+        })
+    
+    return CoverpageClass, coverpage_data, ordered_questions
+
+
+def _iter_exam_html(coverpage_data, ordered_questions, CoverpageClass):
+    """
+    Render an exam paper with the template matching its paper name
+    
+    Returns an iterable of HTML chunks: the standard template is rendered question
+    by question, the subject-specific templates as a single chunk.
+    """
+    # Determine which template to use based on paper type
+    # Use the paper number extraction function to handle both "PAPER 2" and "PAPER II" formats
+    paper_name_upper = coverpage_data.get('paper_name', '').upper()
+
+    try:
+        paper_number = extract_paper_number_from_name(paper_name_upper)
+    except ValueError:
+        # If extraction fails, default to standard template
+        paper_number = 0
+
+    # Subject specific templates (see EXAM_TEMPLATES) render the page in one chunk
+    template = get_exam_template(paper_name_upper, paper_number)
+    if template is not None:
+        return [template(
+            coverpage_data, 
+            ordered_questions,
+            coverpage_class=CoverpageClass
+        )]
+    
+    # Use the standard template with sections, streamed question by question
+    iter_full_exam_html = resolve(STANDARD_EXAM_TEMPLATE)
+    return iter_full_exam_html(
+        coverpage_data, 
+        ordered_questions,
+        coverpage_class=CoverpageClass
+    )
+
+
+def _marking_scheme_html(marking_scheme_coverpage, marking_scheme_items, MarkingSchemeClass):
+    from .marking_scheme_template import generate_marking_scheme_html
+    return generate_marking_scheme_html(
+        marking_scheme_coverpage, 
+        marking_scheme_items,
+        coverpage_class=MarkingSchemeClass
+    )
+
+
+def _render_paper_html(generated_paper, view_type, stream=False):
+    """
+    Complete preview HTML of a generated paper ('questions' or 'marking_scheme')
+    
+    Args:
+        stream: Return an uncached questions page as an iterator of HTML chunks
+            (for streaming_html_response, which caches it once fully sent)
+    
+    Returns:
+        (html, render cache key) - the page preview_full_exam serves
+    """
+    entries = get_paper_snapshot(generated_paper)
+    
+    if view_type == 'marking_scheme':
+        MarkingSchemeClass, coverpage, items = _marking_scheme_preview(generated_paper, entries)
+        cache_key = make_render_key(generated_paper, 'marking_scheme', coverpage)
+        html_content = render_cache.get(cache_key)
+        if html_content is None:
+            prefetch_fragments(entries, kinds=('answer',))
+            html_content = _marking_scheme_html(coverpage, items, MarkingSchemeClass)
+            render_cache.set(cache_key, html_content)
+        return html_content, cache_key
+    
+    CoverpageClass, coverpage_data, ordered_questions = _questions_preview(generated_paper, entries)
+    cache_key = make_render_key(generated_paper, 'questions', coverpage_data)
+    html_content = render_cache.get(cache_key)
+    if html_content is None:
+        prefetch_fragments(entries, kinds=('question',))
+        html_chunks = _iter_exam_html(coverpage_data, ordered_questions, CoverpageClass)
+        if stream:
+            return html_chunks, cache_key
+        html_content = ''.join(html_chunks)
+        render_cache.set(cache_key, html_content)
+    return html_content, cache_key
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def preview_full_exam(request, paper_id):
@@ -1266,166 +1427,29 @@ def preview_full_exam(request, paper_id):
         
         output_format = request.GET.get('output', 'json')
         view_type = request.GET.get('view', 'questions')  # 'questions' or 'marking_scheme'
-        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id)
+        generated_paper = _get_user_generated_paper_or_404(request.user, paper_id, with_snapshot=True)
+        
+        if output_format == 'html':
+            # Rendered HTML is cached per coverpage data and snapshot
+            html_content, cache_key = _render_paper_html(generated_paper, view_type, stream=True)
+            if not isinstance(html_content, str):
+                # Cached once the whole page has been streamed
+                return streaming_html_response(html_content, cache_key=cache_key)
+            return HttpResponse(html_content, content_type='text/html')
+        
+        entries = get_paper_snapshot(generated_paper)
         
         if view_type == 'marking_scheme':
             # Generate marking scheme preview
-            # Detect paper type for correct marking scheme coverpage
-            paper_type = generated_paper.metadata.get('paper_type', '')
-            subject_name = generated_paper.paper.subject.name.upper()
-            paper_name = generated_paper.paper.name.upper()
-            
-            # Select Marking Scheme class and default data robustly
-            MarkingSchemeClass, marking_scheme_coverpage = _select_coverpage_class_and_default(generated_paper, generated_paper.paper, is_marking_scheme=True)
-            
-            # Get all questions in order with answers
-            question_ids = generated_paper.question_ids
-            questions = Question.objects.filter(id__in=question_ids).select_related(
-                'topic', 'section'
-            )
-            
-            # Create ordered marking scheme
-            question_map = {str(q.id): q for q in questions}
-            marking_scheme_items = []
-            
-            for idx, qid in enumerate(question_ids, start=1):
-                question = question_map.get(qid)
-                if question:
-                    marking_scheme_items.append({
-                        'number': idx,
-                        'question_preview': question.question_text[:100] + '...' if len(question.question_text) > 100 else question.question_text,
-                        'answer': question.answer_text,
-                        'answer_inline_images': question.answer_inline_images,
-                        'answer_image_positions': question.answer_image_positions,
-                        'marks': question.marks,
-                        'is_nested': question.is_nested,
-                        'marking_points': question.nested_parts if question.is_nested else None,
-                    })
-            
-            if output_format == 'html':
-                # Generate marking scheme HTML
-                from .marking_scheme_template import generate_marking_scheme_html
-                html_content = generate_marking_scheme_html(
-                    marking_scheme_coverpage, 
-                    marking_scheme_items,
-                    coverpage_class=MarkingSchemeClass
-                )
-                return HttpResponse(html_content, content_type='text/html')
+            _, marking_scheme_coverpage, marking_scheme_items = _marking_scheme_preview(generated_paper, entries)
             
             return Response({
                 'coverpage': marking_scheme_coverpage,
                 'marking_scheme': marking_scheme_items
             })
         
-        else:
-            # Generate questions preview (default)
-            # Get coverpage data
-            coverpage_data_dict = getattr(generated_paper, 'coverpage_data', None) or {}
-            
-            # Detect paper type and use appropriate coverpage template
-            paper_type = generated_paper.metadata.get('paper_type', '')
-            subject_name = generated_paper.paper.subject.name.upper()
-            paper_name = generated_paper.paper.name.upper()
-            
-            # Select Coverpage class and default data robustly
-            CoverpageClass, default_coverpage = _select_coverpage_class_and_default(generated_paper, generated_paper.paper, is_marking_scheme=False)
-
-            coverpage_data = {**default_coverpage, **coverpage_data_dict}
-            
-            # Get all questions in order
-            question_ids = generated_paper.question_ids
-            questions = Question.objects.filter(id__in=question_ids).select_related(
-                'topic', 'section'
-            )
-            
-            # Create ordered list
-            question_map = {str(q.id): q for q in questions}
-            ordered_questions = []
-            
-            for idx, qid in enumerate(question_ids, start=1):
-                question = question_map.get(qid)
-                if question:
-                    ordered_questions.append({
-                        'number': idx,
-                        'text': question.question_text,
-                        'question_inline_images': question.question_inline_images,
-                        'question_image_positions': question.question_image_positions,
-                        'question_answer_lines': question.question_answer_lines,
-                        'marks': question.marks,
-                        'is_nested': question.is_nested,
-                        'nested_parts': question.nested_parts if question.is_nested else None,
-                        'topic': question.topic.name if question.topic else 'Unknown Topic',
-                        'section': {
-                            'id': str(question.section.id),
-                            'name': question.section.name,
-                            'order': question.section.order
-                        } if question.section else None
-                    })
-            
-            if output_format == 'html':
-                # Determine which template to use based on paper type
-                # Use the paper number extraction function to handle both "PAPER 2" and "PAPER II" formats
-                from .page_number_extrctor import extract_paper_number_from_name
-                
-                paper_name_upper = coverpage_data.get('paper_name', '').upper()
-                
-                try:
-                    paper_number = extract_paper_number_from_name(paper_name_upper)
-                except ValueError:
-                    # If extraction fails, default to standard template
-                    paper_number = 0
-                
-                # Check paper type for template selection
-                is_english_paper1 = 'ENGLISH' in paper_name_upper and paper_number == 1
-                is_kiswahili_paper2 = 'KISWAHILI' in paper_name_upper and paper_number == 2
-                is_biology_paper1 = 'BIOLOGY' in paper_name_upper and paper_number == 1
-                is_business_paper1 = 'BUSINESS' in paper_name_upper and paper_number == 1
-                is_chemistry_paper1 = 'CHEMISTRY' in paper_name_upper and paper_number == 1
-                
-                use_no_sections_template = is_business_paper1 or is_chemistry_paper1
-                
-                if is_biology_paper1:
-                    # Use the BIOLOGY PAPER 1 specific template
-                    from .biology_paper1_template import generate_biology_paper1_html
-                    html_content = generate_biology_paper1_html(
-                        coverpage_data, 
-                        ordered_questions,
-                        coverpage_class=CoverpageClass
-                    )
-                elif is_english_paper1:
-                    # Use the ENGLISH PAPER 1 specific template
-                    from .english_paper1_template import generate_english_paper1_html
-                    html_content = generate_english_paper1_html(
-                        coverpage_data, 
-                        ordered_questions,
-                        coverpage_class=CoverpageClass
-                    )
-                elif is_kiswahili_paper2:
-                    # Use the KISWAHILI PAPER 2 specific template
-                    from .kiswahili_paper2_template import generate_kiswahili_paper2_html
-                    html_content = generate_kiswahili_paper2_html(
-                        coverpage_data, 
-                        ordered_questions,
-                        coverpage_class=CoverpageClass
-                    )
-                elif use_no_sections_template:
-                    # Use the NO SECTIONS template
-                    from .exam_paper_template_no_sections import generate_full_exam_html
-                    html_content = generate_full_exam_html(
-                        coverpage_data, 
-                        ordered_questions,
-                        coverpage_class=CoverpageClass
-                    )
-                else:
-                    # Use the standard template with sections
-                    from .exam_paper_template import generate_full_exam_html
-                    html_content = generate_full_exam_html(
-                        coverpage_data, 
-                        ordered_questions,
-                        coverpage_class=CoverpageClass
-                    )
-                
-                return HttpResponse(html_content, content_type='text/html')
+        # Generate questions preview (default)
+        _, coverpage_data, ordered_questions = _questions_preview(generated_paper, entries)
         
         # Return JSON
         return Response({
@@ -1500,25 +1524,11 @@ def validate_geography_paper_pool(request):
                 'can_generate': False,
                 'message': 'No valid topics found'
             }, status=status.HTTP_404_NOT_FOUND)
-        all_questions = list(Question.objects.filter(
-            subject=paper.subject,
-            paper=paper,
-            topic__in=topics,
-            is_active=True
-        ).select_related('topic', 'section'))
-        section_a_count = 0
-        section_b_25mark_map_count = 0
-        section_b_25mark_regular_count = 0
-        for q in all_questions:
-            section_name = q.section.name.upper() if q.section else ""
-            is_map = getattr(q, 'is_map', False)
-            if ("SECTION A" in section_name or "SECTION 1" in section_name) and q.marks < 25:
-                section_a_count += 1
-            elif ("SECTION B" in section_name or "SECTION 2" in section_name) and q.marks == 25:
-                if is_map:
-                    section_b_25mark_map_count += 1
-                else:
-                    section_b_25mark_regular_count += 1
+        census = PoolCensus.for_paper(paper.id, [topic.id for topic in topics])
+        in_section_b = in_section("SECTION B", "SECTION 2")
+        section_a_count = census.count(where=in_section("SECTION A", "SECTION 1"), max_marks=24)
+        section_b_25mark_map_count = census.count(where=lambda key: in_section_b(key) and key.is_map, marks=25)
+        section_b_25mark_regular_count = census.count(where=lambda key: in_section_b(key) and not key.is_map, marks=25)
         section_b_25mark_total = section_b_25mark_map_count + section_b_25mark_regular_count
         section_a_ok = section_a_count >= 5
         section_b_ok = section_b_25mark_total >= 5
@@ -1588,29 +1598,17 @@ def generate_geography_paper(request):
                 'success': False,
                 'message': 'Invalid paper_number. Must be 1 or 2'
             }, status=status.HTTP_400_BAD_REQUEST)
-        if paper_number == 1:
-            generator = KCSEGeographyPaper1Generator(
-                paper_id=paper_id,
-                selected_topic_ids=selected_topic_ids,
-                user=user
-            )
-        else:
-            generator = KCSEGeographyPaper2Generator(
-                paper_id=paper_id,
-                selected_topic_ids=selected_topic_ids,
-                user=user
-            )
+        generator = get_generator('GEOGRAPHY', paper_number)(
+            paper_id=paper_id,
+            selected_topic_ids=selected_topic_ids,
+            user=user
+        )
         generator.load_data()
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
         paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        unique_code = f"GEO{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"GEO{paper_number}")
         
         #save generated paper record
         generated_paper = GeneratedPaper.objects.create(
@@ -1667,6 +1665,7 @@ def generate_geography_paper(request):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@generation_job('english')
 def generate_english_paper(request):
     """
     Generate any English paper (1, 2, or 3) based on paper_number.
@@ -1700,10 +1699,8 @@ def generate_english_paper(request):
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
         paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(paper=paper, created_at__year=current_year).count()
-        unique_code = f"EN{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"EN{paper_number}")
         
         #save generated paper record
         generated_paper = GeneratedPaper.objects.create(
@@ -1754,6 +1751,7 @@ def generate_english_paper(request):
 # Mathematics Paper Generation (both papers)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@generation_job('mathematics')
 def generate_mathematics_paper(request):
     """
     Generate Mathematics Paper 1 or 2 based on paper_number.
@@ -1782,10 +1780,8 @@ def generate_mathematics_paper(request):
         generator.load_data()
         result = generator.generate()
         # Generate unique code
-        current_year = datetime.now().year
         paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(paper=paper, created_at__year=current_year).count()
-        unique_code = f"MA{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"MA{paper_number}")
         #save generated paper record
         generated_paper = GeneratedPaper.objects.create(
             paper=paper,
@@ -1903,6 +1899,7 @@ def determine_chemistry_paper_number(paper_name: str) -> int:
 # Chemistry Paper Generation (both papers)
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@generation_job('chemistry')
 def generate_chemistry_paper(request):
     """
     Generate Chemistry Paper 1 or 2.
@@ -1958,12 +1955,7 @@ def generate_chemistry_paper(request):
         result = generator.generate()
         
         # Create unique code
-        current_year = datetime.now().year
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper, 
-            created_at__year=current_year
-        ).count()
-        unique_code = f"CH{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"CH{paper_number}")
         
         # Create generated paper record
         generated_paper = GeneratedPaper.objects.create(
@@ -2099,6 +2091,13 @@ def validate_chemistry_paper_pool(request):
             # Paper 1 can work with standalone-only mode if needed
             can_generate = (nested_available >= 8 and standalone_available >= 5) or standalone_available >= 20
             
+            # Confirm an exact 80-mark combination exists (deterministic, no random retries)
+            if can_generate:
+                try:
+                    generator._select_questions()
+                except InfeasibleSelectionError:
+                    can_generate = False
+            
             return Response({
                 "can_generate": can_generate,
                 "paper_number": 1,
@@ -2123,6 +2122,13 @@ def validate_chemistry_paper_pool(request):
             nested_available = len(generator.nested_questions)
             can_generate = nested_available >= generator.TARGET_QUESTIONS
             
+            # Confirm an exact 7-question, 80-mark combination exists
+            if can_generate:
+                try:
+                    generator._select_questions()
+                except InfeasibleSelectionError:
+                    can_generate = False
+            
             logger.info(f"[CHEMISTRY P2 VALIDATE] nested={nested_available}, required={generator.TARGET_QUESTIONS}")
             
             # Count by marks for detailed info
@@ -2301,9 +2307,11 @@ def validate_f_paper_pool(request):
         else:
             return Response({"can_generate": False, "message": "Invalid paper_number for Chemistry (must be 1 or 2)"}, status=status.HTTP_400_BAD_REQUEST)
         generator.load_data()
-        valid_nested = generator._select_nested_questions()
-        valid_standalone = generator._select_standalone_questions()
-        can_generate = valid_nested and valid_standalone
+        try:
+            generator._select_questions()
+            can_generate = True
+        except InfeasibleSelectionError:
+            can_generate = False
         return Response({
             "can_generate": can_generate,
             "nested_count": len(getattr(generator, "nested_questions", [])),
@@ -1,12 +1,16 @@
 """
 KCSE Biology Paper 1 Generation Algorithm
 Database-driven paper generation with comprehensive validation
+
+The eligible question pool is loaded once per generation; selection, backtracking
+and fine-tuning sample from it in memory (PoolSampler) instead of issuing an
+ORDER BY RANDOM() query per step.
 """
 
 import random
 import logging
 import time
-from datetime import datetime
+from collections import defaultdict
 from typing import List, Dict, Tuple, Optional
 from django.db.models import Q, Count
 from django.utils import timezone
@@ -15,6 +19,8 @@ from .models import (
     Paper, Topic, Question, PaperConfiguration, 
     GeneratedPaper, Subject
 )
+from .question_pool import PoolRecord, PoolSampler, get_question_pool, hydrate_questions
+from .unique_codes import allocate_unique_code
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +30,114 @@ class PaperGenerationException(Exception):
     pass
 
 
+class SelectionState:
+    """
+    Incremental constraint state of a paper under construction
+    
+    Keeps running totals per topic, per mark value and per kcse_question_type, so
+    adding, removing or replacing a question is O(1) instead of a rescan of the
+    selected list. Every change is journaled: undo() reverts the last change and
+    rollback(checkpoint()) reverts a whole batch.
+    """
+    
+    QUESTION_TYPES = (
+        'name_identify', 'state_give_reasons', 'distinguish',
+        'explain_account', 'describe', 'calculate',
+    )
+    
+    def __init__(self, topic_ids: List[str] = ()):
+        self.questions = []
+        self.ids = set()  # Question IDs as strings
+        self.total_marks = 0
+        self.mark_value_counts = defaultdict(int, {marks: 0 for marks in range(1, 9)})
+        self.topic_mark_counts = defaultdict(int, {str(t): 0 for t in topic_ids})
+        self.question_type_counts = defaultdict(int, {t: 0 for t in self.QUESTION_TYPES})
+        self.by_marks = defaultdict(dict)  # marks -> {question id: question}
+        self._positions = {}  # question id -> index in self.questions
+        self._journal = []
+    
+    def __len__(self):
+        return len(self.questions)
+    
+    def __contains__(self, question_id) -> bool:
+        return str(question_id) in self.ids
+    
+    def _count(self, question, sign: int):
+        question_id = str(question.id)
+        self.total_marks += sign * question.marks
+        self.mark_value_counts[question.marks] += sign
+        self.topic_mark_counts[str(question.topic_id)] += sign * question.marks
+        if question.kcse_question_type:
+            self.question_type_counts[question.kcse_question_type] += sign
+        
+        if sign > 0:
+            self.ids.add(question_id)
+            self.by_marks[question.marks][question_id] = question
+        else:
+            self.ids.discard(question_id)
+            self.by_marks[question.marks].pop(question_id, None)
+    
+    def _insert(self, question, index: int):
+        """Put a question at `index`, moving the current occupant to the end"""
+        if index < len(self.questions):
+            occupant = self.questions[index]
+            self._positions[str(occupant.id)] = len(self.questions)
+            self.questions.append(occupant)
+            self.questions[index] = question
+        else:
+            self.questions.append(question)
+        self._positions[str(question.id)] = index
+        self._count(question, 1)
+    
+    def _pop(self, question) -> int:
+        """Remove a question, filling its slot with the last question; returns the slot"""
+        index = self._positions.pop(str(question.id))
+        last = self.questions.pop()
+        if str(last.id) != str(question.id):
+            self.questions[index] = last
+            self._positions[str(last.id)] = index
+        self._count(question, -1)
+        return index
+    
+    def _swap(self, old_question, new_question):
+        index = self._positions.pop(str(old_question.id))
+        self._count(old_question, -1)
+        self.questions[index] = new_question
+        self._positions[str(new_question.id)] = index
+        self._count(new_question, 1)
+    
+    def add(self, question):
+        self._insert(question, len(self.questions))
+        self._journal.append(('add', question))
+    
+    def remove(self, question):
+        index = self._pop(question)
+        self._journal.append(('remove', question, index))
+    
+    def replace(self, old_question, new_question):
+        """Swap a selected question for another one in the same slot"""
+        self._swap(old_question, new_question)
+        self._journal.append(('replace', old_question, new_question))
+    
+    def checkpoint(self) -> int:
+        return len(self._journal)
+    
+    def undo(self):
+        """Revert the most recent change"""
+        entry = self._journal.pop()
+        if entry[0] == 'add':
+            self._pop(entry[1])
+        elif entry[0] == 'remove':
+            self._insert(entry[1], entry[2])
+        else:
+            self._swap(entry[2], entry[1])
+    
+    def rollback(self, checkpoint: int):
+        """Revert every change made after `checkpoint`"""
+        while len(self._journal) > checkpoint:
+            self.undo()
+
+
 class BiologyPaper1Generator:
     """
     KCSE Biology Paper 1 Generator
@@ -50,23 +164,11 @@ class BiologyPaper1Generator:
         self.config = None
         self.selected_topics = []
         self.topic_constraints = {}
+        self.sampler = None  # Random access over the eligible question pool
         
-        # Tracking variables for generation
-        self.total_marks = 0
-        self.selected_questions = []
-        self.selected_question_ids = set()
-        
-        # Counters - Extended to support nested questions up to 8 marks
-        self.mark_value_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        self.topic_mark_counts = {}
-        self.question_type_counts = {
-            'name_identify': 0,
-            'state_give_reasons': 0,
-            'distinguish': 0,
-            'explain_account': 0,
-            'describe': 0,
-            'calculate': 0,
-        }
+        # Tracking for generation: totals, mark/topic/type counters (up to 8-mark nested)
+        self.state = SelectionState()
+        self.selected_questions = self.state.questions
         
         # Statistics
         self.generation_start_time = None
@@ -81,7 +183,29 @@ class BiologyPaper1Generator:
         self.target_nested_marks = 0
         self.actual_nested_marks = 0  # Actual marks achieved in nested phase
         self.selected_nested_questions = []
-        self.selected_standalone_questions = []    
+        self.selected_standalone_questions = []
+    
+    # Counters are views of the incremental selection state
+    @property
+    def total_marks(self) -> int:
+        return self.state.total_marks
+    
+    @property
+    def selected_question_ids(self) -> set:
+        return self.state.ids
+    
+    @property
+    def mark_value_counts(self) -> Dict[int, int]:
+        return self.state.mark_value_counts
+    
+    @property
+    def topic_mark_counts(self) -> Dict[str, int]:
+        return self.state.topic_mark_counts
+    
+    @property
+    def question_type_counts(self) -> Dict[str, int]:
+        return self.state.question_type_counts
+    
     def generate(self) -> GeneratedPaper:
         """
         Main entry point for paper generation
@@ -112,6 +236,9 @@ class BiologyPaper1Generator:
                     self._reset_tracking_variables()
                     self._select_questions()
                     
+                    # Fetch full rows (text, answers) only for the selected questions
+                    self.selected_questions = hydrate_questions(self.selected_questions)
+                    
                     # Step 5: Arrange questions
                     logger.info(f"[STEP 5] Arranging {len(self.selected_questions)} questions")
                     self._arrange_questions()
@@ -183,9 +310,13 @@ class BiologyPaper1Generator:
         
         logger.info(f"[INIT] Loaded {len(self.selected_topics)} topics: {[t.name for t in self.selected_topics]}")
         
-        # Initialize topic tracking
+        # Load the eligible pool once; all selection steps sample from it in memory
+        pool = get_question_pool(self.paper, [topic.id for topic in self.selected_topics])
+        self.sampler = PoolSampler(pool)
+        logger.info(f"[INIT] Loaded {len(pool)} eligible questions")
+        
+        # Initialize topic constraints (mark counters are seeded per attempt)
         for topic in self.selected_topics:
-            self.topic_mark_counts[str(topic.id)] = 0
             self.topic_constraints[str(topic.id)] = {
                 'name': topic.name,
                 'min_marks': topic.min_marks,
@@ -635,24 +766,11 @@ class BiologyPaper1Generator:
     
     def _reset_tracking_variables(self):
         """Reset all tracking variables for a fresh generation attempt"""
-        self.total_marks = 0
-        self.selected_questions = []
-        self.selected_question_ids = set()
+        self.state = SelectionState(list(self.topic_constraints))
+        self.selected_questions = self.state.questions
         self.selected_nested_questions = []  # Clear nested tracking
         self.selected_standalone_questions = []  # Clear standalone tracking
         self.actual_nested_marks = 0  # Reset actual nested marks achieved
-        self.mark_value_counts = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0, 6: 0, 7: 0, 8: 0}
-        self.question_type_counts = {
-            'name_identify': 0,
-            'state_give_reasons': 0,
-            'distinguish': 0,
-            'explain_account': 0,
-            'describe': 0,
-            'calculate': 0,
-        }
-        
-        for topic_id in self.topic_mark_counts:
-            self.topic_mark_counts[topic_id] = 0
         
         self.backtracking_count = 0
     
@@ -908,7 +1026,7 @@ class BiologyPaper1Generator:
         selected = random.choices(available_mark_values, weights=weights, k=1)[0]
         return selected
     
-    def _query_nested_questions_by_marks(self, exact_marks: int) -> List[Question]:
+    def _query_nested_questions_by_marks(self, exact_marks: int) -> List[PoolRecord]:
         """
         Query for nested questions with a specific mark value.
         
@@ -920,24 +1038,17 @@ class BiologyPaper1Generator:
         Returns:
             List of available nested questions with that exact mark value
         """
-        # Get already selected question IDs to exclude
-        selected_ids = [q.id for q in self.selected_nested_questions + self.selected_standalone_questions]
-        
-        # Query nested questions with exact marks that haven't been selected
-        queryset = Question.objects.filter(
-            topic_id__in=self.selected_topic_ids,
+        # Nested questions with exact marks that haven't been selected
+        available_questions = self.sampler.sample(
+            exclude=self.selected_question_ids,
             is_nested=True,
             marks=exact_marks
-        ).exclude(
-            id__in=selected_ids
         )
-        
-        available_questions = list(queryset)
         logger.debug(f"[QUERY] Found {len(available_questions)} nested questions with exactly {exact_marks} marks")
         
         return available_questions
     
-    def _query_standalone_questions_by_marks(self, mark_value: int, limit: int = 50) -> List[Question]:
+    def _query_standalone_questions_by_marks(self, mark_value: int, limit: int = 50) -> List[PoolRecord]:
         """
         Query for standalone questions with a specific mark value.
         
@@ -948,19 +1059,13 @@ class BiologyPaper1Generator:
         Returns:
             List of available standalone questions with that mark value
         """
-        # Get already selected question IDs to exclude
-        selected_ids = [q.id for q in self.selected_nested_questions + self.selected_standalone_questions]
-        
-        # Query standalone questions with specific marks that haven't been selected
-        queryset = Question.objects.filter(
-            topic_id__in=self.selected_topic_ids,
+        # Standalone questions with specific marks that haven't been selected
+        available_questions = self.sampler.sample(
+            limit,
+            exclude=self.selected_question_ids,
             is_nested=False,
             marks=mark_value
-        ).exclude(
-            id__in=selected_ids
-        )[:limit]
-        
-        available_questions = list(queryset)
+        )
         logger.debug(f"[QUERY] Found {len(available_questions)} standalone questions with {mark_value} marks")
         
         return available_questions
@@ -969,7 +1074,8 @@ class BiologyPaper1Generator:
         """
         Fine-tune the selected questions to reach exactly 80 marks.
         
-        Uses backtracking and replacement to adjust the final mark count.
+        Replaces one question per adjustment; candidates come from the per-mark
+        index of the selection state and replacements from the in-memory sampler.
         """
         max_adjustments = 50
         adjustments = 0
@@ -979,61 +1085,42 @@ class BiologyPaper1Generator:
             marks_diff = self.paper.total_marks - self.total_marks
             
             if marks_diff > 0:
-                # Need to add marks - try replacing a lower-mark question with higher-mark
+                # Need to add marks - replace 1-mark (then 2-mark) with 2, 3, or 4-mark
                 logger.info(f"[FINE-TUNE] Need {marks_diff} more marks")
-                
-                # Try to replace 1-mark with 2, 3, or 4-mark
-                for i, q in enumerate(self.selected_questions):
-                    if q.marks == 1 and marks_diff >= 1:
-                        # Try to find a replacement with more marks
-                        target_marks = min(4, q.marks + marks_diff)
-                        replacement = self._find_replacement_question(q, target_marks)
-                        if replacement:
-                            self._replace_question(i, replacement)
-                            logger.info(f"[FINE-TUNE] Replaced {q.marks}-mark with {replacement.marks}-mark")
-                            break
-                else:
-                    # Try replacing 2-mark with 3 or 4-mark
-                    for i, q in enumerate(self.selected_questions):
-                        if q.marks == 2 and marks_diff >= 1:
-                            target_marks = min(4, q.marks + marks_diff)
-                            replacement = self._find_replacement_question(q, target_marks)
-                            if replacement:
-                                self._replace_question(i, replacement)
-                                logger.info(f"[FINE-TUNE] Replaced {q.marks}-mark with {replacement.marks}-mark")
-                                break
-                    else:
-                        break  # Can't fine-tune further
+                adjusted = self._fine_tune_step([1, 2], marks_diff)
+            else:
+                # Need to remove marks - replace 4-mark (then 3-mark) with 3, 2, or 1-mark
+                logger.info(f"[FINE-TUNE] Need to remove {abs(marks_diff)} marks")
+                adjusted = self._fine_tune_step([4, 3], marks_diff)
             
-            else:  # marks_diff < 0
-                # Need to remove marks - try replacing a higher-mark question with lower-mark
-                marks_to_remove = abs(marks_diff)
-                logger.info(f"[FINE-TUNE] Need to remove {marks_to_remove} marks")
-                
-                # Try to replace 4-mark with 3, 2, or 1-mark
-                for i, q in enumerate(self.selected_questions):
-                    if q.marks == 4 and marks_to_remove >= 1:
-                        target_marks = max(1, q.marks - marks_to_remove)
-                        replacement = self._find_replacement_question(q, target_marks)
-                        if replacement:
-                            self._replace_question(i, replacement)
-                            logger.info(f"[FINE-TUNE] Replaced {q.marks}-mark with {replacement.marks}-mark")
-                            break
-                else:
-                    # Try replacing 3-mark with 2 or 1-mark
-                    for i, q in enumerate(self.selected_questions):
-                        if q.marks == 3 and marks_to_remove >= 1:
-                            target_marks = max(1, q.marks - marks_to_remove)
-                            replacement = self._find_replacement_question(q, target_marks)
-                            if replacement:
-                                self._replace_question(i, replacement)
-                                logger.info(f"[FINE-TUNE] Replaced {q.marks}-mark with {replacement.marks}-mark")
-                                break
-                    else:
-                        break  # Can't fine-tune further
+            if not adjusted:
+                break  # Can't fine-tune further
         
         logger.info(f"[FINE-TUNE] Complete after {adjustments} adjustments: {self.total_marks} marks")
     
+    def _fine_tune_step(self, mark_values: List[int], marks_diff: int) -> bool:
+        """
+        Replace one selected question of the first possible mark value so the total
+        moves by up to `marks_diff` (positive adds marks, negative removes them).
+        
+        Returns:
+            True if a replacement was made
+        """
+        for mark_value in mark_values:
+            for question in list(self.state.by_marks[mark_value].values()):
+                if marks_diff > 0:
+                    target_marks = min(4, question.marks + marks_diff)
+                else:
+                    target_marks = max(1, question.marks + marks_diff)
+                
+                replacement = self._find_replacement_question(question, target_marks)
+                if replacement:
+                    self.state.replace(question, replacement)
+                    logger.info(f"[FINE-TUNE] Replaced {question.marks}-mark with {replacement.marks}-mark")
+                    return True
+        
+        return False
+    
     def _find_replacement_question(self, current_question, target_marks: int):
         """Find a replacement question with target marks from the same topic."""
         eligible = self._query_eligible_questions(
@@ -1044,41 +1131,7 @@ class BiologyPaper1Generator:
     
     def _replace_question(self, index: int, new_question):
         """Replace a question at the given index with a new question."""
-        old_question = self.selected_questions[index]
-        
-        # Remove old question's contribution
-        self.selected_question_ids.remove(str(old_question.id))
-        self.total_marks -= old_question.marks
-        self.mark_value_counts[old_question.marks] -= 1
-        
-        # Use .get() with default 0 to handle missing topic_ids gracefully
-        old_topic_id = str(old_question.topic_id)
-        if old_topic_id in self.topic_mark_counts:
-            self.topic_mark_counts[old_topic_id] -= old_question.marks
-        
-        # Handle question_type safely
-        if old_question.question_type and old_question.question_type in self.question_type_counts:
-            self.question_type_counts[old_question.question_type] -= 1
-        
-        # Add new question
-        self.selected_questions[index] = new_question
-        self.selected_question_ids.add(str(new_question.id))
-        self.total_marks += new_question.marks
-        self.mark_value_counts[new_question.marks] += 1
-        
-        # Use .get() with default for new question too
-        new_topic_id = str(new_question.topic_id)
-        if new_topic_id in self.topic_mark_counts:
-            self.topic_mark_counts[new_topic_id] += new_question.marks
-        else:
-            self.topic_mark_counts[new_topic_id] = new_question.marks
-        
-        # Handle question_type safely for new question too
-        if new_question.question_type:
-            if new_question.question_type in self.question_type_counts:
-                self.question_type_counts[new_question.question_type] += 1
-            else:
-                self.question_type_counts[new_question.question_type] = 1
+        self.state.replace(self.selected_questions[index], new_question)
     
     def _try_exact_completion(self, remaining_marks: int) -> bool:
         """
@@ -1128,7 +1181,9 @@ class BiologyPaper1Generator:
         Returns:
             True if combination successfully added, False otherwise
         """
-        questions_to_add = []
+        # Questions are added as they are found (so later picks exclude them)
+        # and rolled back together if the combination cannot be completed
+        checkpoint = self.state.checkpoint()
         
         logger.info(f"[SMART COMPLETION] Trying combination: {mark_values}")
         
@@ -1148,6 +1203,7 @@ class BiologyPaper1Generator:
             
             if suitable_topic is None:
                 logger.info(f"[SMART COMPLETION] No suitable topic for {mark_value}-mark question")
+                self.state.rollback(checkpoint)
                 return False
             
             # Query for question
@@ -1158,22 +1214,17 @@ class BiologyPaper1Generator:
             
             if not eligible_questions:
                 logger.info(f"[SMART COMPLETION] No eligible {mark_value}-mark questions found")
+                self.state.rollback(checkpoint)
                 return False
             
             # Select random question from eligible
-            question = random.choice(eligible_questions)
-            questions_to_add.append(question)
-        
-        # Check if adding all questions would violate constraints
-        # For exact completion, we're more lenient
-        test_total = self.total_marks + sum(q.marks for q in questions_to_add)
-        if test_total != self.paper.total_marks:
-            logger.info(f"[SMART COMPLETION] Total would be {test_total}, need {self.paper.total_marks}")
-            return False
+            self._add_question(random.choice(eligible_questions))
         
-        # Add all questions
-        for question in questions_to_add:
-            self._add_question(question)
+        # For exact completion, we're more lenient - only the total must match
+        if self.total_marks != self.paper.total_marks:
+            logger.info(f"[SMART COMPLETION] Total would be {self.total_marks}, need {self.paper.total_marks}")
+            self.state.rollback(checkpoint)
+            return False
         
         logger.info(f"[SMART COMPLETION] Successfully added combination: {mark_values} marks")
         return True
@@ -1319,102 +1370,77 @@ class BiologyPaper1Generator:
         
         return random.choice(weighted_options) if weighted_options else None
     
-    def _query_eligible_questions(self, topic_id: str, mark_value: int) -> List[Question]:
+    def _query_eligible_questions(self, topic_id: str, mark_value: int) -> List[PoolRecord]:
         """
-        Query database for eligible questions
+        Sample eligible questions
         
         Args:
             topic_id: UUID of topic
             mark_value: Mark value (1, 2, 3, or 4)
         
         Returns:
-            List of eligible Question objects
+            List of eligible pool records
         """
-        questions = Question.objects.filter(
-            paper=self.paper,
-            topic_id=topic_id,
-            marks=mark_value,
-            is_active=True
-        ).exclude(
-            id__in=self.selected_question_ids
-        ).order_by('?')[:50]  # Random sample of up to 50
-        
-        return list(questions)
+        return self.sampler.sample(
+            50,  # Random sample of up to 50
+            exclude=self.selected_question_ids,
+            topic_ids=[topic_id],
+            marks=mark_value
+        )
     
-    def _query_nested_questions(self, min_marks: int, max_marks: int) -> List[Question]:
+    def _query_nested_questions(self, min_marks: int, max_marks: int) -> List[PoolRecord]:
         """
-        Query database for nested questions (is_nested=True) within mark range.
+        Sample nested questions (is_nested=True) within mark range.
         
         Args:
             min_marks: Minimum marks
             max_marks: Maximum marks
         
         Returns:
-            List of eligible nested Question objects
+            List of eligible nested pool records
         """
-        topic_ids = [str(topic.id) for topic in self.selected_topics]
-        
-        questions = Question.objects.filter(
-            paper=self.paper,
-            topic_id__in=topic_ids,
+        return self.sampler.sample(
+            50,
+            exclude=self.selected_question_ids,
             is_nested=True,
-            marks__gte=min_marks,
-            marks__lte=max_marks,
-            is_active=True
-        ).exclude(
-            id__in=self.selected_question_ids
-        ).order_by('?')[:50]
-        
-        return list(questions)
+            min_marks=min_marks,
+            max_marks=max_marks
+        )
     
-    def _query_standalone_questions(self, mark_value: int) -> List[Question]:
+    def _query_standalone_questions(self, mark_value: int) -> List[PoolRecord]:
         """
-        Query database for standalone questions (is_nested=False) of specific mark value.
+        Sample standalone questions (is_nested=False) of specific mark value.
         
         Args:
             mark_value: Mark value (1, 2, 3, 4, 5, or 6)
         
         Returns:
-            List of eligible standalone Question objects
+            List of eligible standalone pool records
         """
-        topic_ids = [str(topic.id) for topic in self.selected_topics]
-        
-        questions = Question.objects.filter(
-            paper=self.paper,
-            topic_id__in=topic_ids,
+        return self.sampler.sample(
+            100,
+            exclude=self.selected_question_ids,
             is_nested=False,
-            marks=mark_value,
-            is_active=True
-        ).exclude(
-            id__in=self.selected_question_ids
-        ).order_by('?')[:100]
-        
-        return list(questions)
+            marks=mark_value
+        )
     
-    def _query_all_eligible_questions(self, mark_value: int) -> List[Question]:
+    def _query_all_eligible_questions(self, mark_value: int) -> List[PoolRecord]:
         """
-        Query database for ALL eligible questions of a given mark value,
+        Sample ALL eligible questions of a given mark value,
         regardless of topic. Used for flexible selection.
         
         Args:
             mark_value: Mark value (1, 2, 3, or 4)
         
         Returns:
-            List of eligible Question objects from all selected topics
+            List of eligible pool records from all selected topics
         """
-        # Get topic IDs from selected topics
-        topic_ids = [str(topic.id) for topic in self.selected_topics]
-        
-        questions = Question.objects.filter(
-            paper=self.paper,
-            topic_id__in=topic_ids,
-            marks=mark_value,
-            is_active=True
-        ).exclude(
-            id__in=self.selected_question_ids
-        ).order_by('?')[:100]  # Random sample of up to 100
-        
-        return list(questions)
+        # The sampler only holds questions of the selected topics
+        return self.sampler.sample(
+            100,  # Random sample of up to 100
+            exclude=self.selected_question_ids,
+            marks=mark_value
+        )
     
     def _can_add_question(self, question: Question) -> bool:
         """
@@ -1477,18 +1503,7 @@ class BiologyPaper1Generator:
     
     def _add_question(self, question: Question):
         """Add question to selected list and update all tracking variables"""
-        self.selected_questions.append(question)
-        self.selected_question_ids.add(str(question.id))  # Store as string for consistency
-        self.total_marks += question.marks
-        self.mark_value_counts[question.marks] += 1
-        
-        topic_id = str(question.topic_id)
-        if topic_id in self.topic_mark_counts:
-            self.topic_mark_counts[topic_id] += question.marks
-        
-        if question.kcse_question_type:
-            if question.kcse_question_type in self.question_type_counts:
-                self.question_type_counts[question.kcse_question_type] += 1
+        self.state.add(question)
     
     def _attempt_backtracking(self) -> bool:
         """
@@ -1508,19 +1523,17 @@ class BiologyPaper1Generator:
         
         if remaining_marks > 0:
             # Need more marks - try to upgrade questions
-            for i, question in enumerate(self.selected_questions):
+            for question in self.selected_questions:
                 if question.marks < 4:  # Can upgrade
                     # Try to find higher-mark replacement from same topic
                     higher_mark = question.marks + 1
                     
-                    replacements = Question.objects.filter(
-                        paper=self.paper,
-                        topic=question.topic,
-                        marks=higher_mark,
-                        is_active=True
-                    ).exclude(
-                        id__in=self.selected_question_ids
-                    )[:10]
+                    replacements = self.sampler.sample(
+                        10,
+                        exclude=self.selected_question_ids,
+                        topic_ids=[question.topic_id],
+                        marks=higher_mark
+                    )
                     
                     for replacement in replacements:
                         # Check if replacement would be valid
@@ -1550,15 +1563,7 @@ class BiologyPaper1Generator:
                                 
                                 if test_topic_marks <= max_topic_marks + 2:  # Allow 2 marks tolerance
                                     # Perform replacement
-                                    self.selected_questions[i] = replacement
-                                    self.selected_question_ids.remove(question.id)
-                                    self.selected_question_ids.add(replacement.id)
-                                    self.total_marks = test_total
-                                    self.mark_value_counts[question.marks] -= 1
-                                    self.mark_value_counts[replacement.marks] += 1
-                                    
-                                    if topic_id in self.topic_mark_counts:
-                                        self.topic_mark_counts[topic_id] += (replacement.marks - question.marks)
+                                    self.state.replace(question, replacement)
                                     
                                     logger.info(f"[BACKTRACK] Replaced {question.marks}-mark with {replacement.marks}-mark question")
                                     return True
@@ -1597,32 +1602,20 @@ class BiologyPaper1Generator:
         Returns:
             True if reduction successful, False otherwise
         """
-        for i, question in enumerate(self.selected_questions):
+        for question in self.selected_questions:
             if question.marks > 1:
                 lower_mark = question.marks - 1
                 
-                replacements = Question.objects.filter(
-                    paper=self.paper,
-                    topic=question.topic,
-                    marks=lower_mark,
-                    is_active=True
-                ).exclude(
-                    id__in=self.selected_question_ids
-                )[:10]
+                replacements = self.sampler.sample(
+                    10,
+                    exclude=self.selected_question_ids,
+                    topic_ids=[question.topic_id],
+                    marks=lower_mark
+                )
                 
                 for replacement in replacements:
                     # Perform replacement
-                    self.selected_questions[i] = replacement
-                    self.selected_question_ids.remove(question.id)
-                    self.selected_question_ids.add(replacement.id)
-                    self.total_marks += (replacement.marks - question.marks)
-                    self.mark_value_counts[question.marks] -= 1
-                    self.mark_value_counts[replacement.marks] += 1
-                    
-                    topic_id = str(question.topic_id)
-                    if topic_id in self.topic_mark_counts:
-                        self.topic_mark_counts[topic_id] += (replacement.marks - question.marks)
-                    
+                    self.state.replace(question, replacement)
                     return True
         
         return False
@@ -1828,8 +1821,7 @@ class BiologyPaper1Generator:
             GeneratedPaper instance
         """
         # Generate unique code
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        unique_code = f"KCSE-BIO-P1-{timestamp}"
+        unique_code = allocate_unique_code('BIOP1')
         
         # Prepare distributions
         mark_distribution = {
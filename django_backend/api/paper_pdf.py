@@ -0,0 +1,241 @@
+"""
+Paper PDF Export
+Server-side PDF rendering of generated papers and marking schemes
+
+download_paper used to answer with JSON only, so every client rendered and printed
+the paper in the browser. With ?output=file it now returns a PDF of the same HTML
+preview_full_exam serves, rendered with WeasyPrint:
+- the PDF is stored in the PaperPdf table under a hash of the render key
+  (coverpage data, template version, question snapshot, see api/render_cache.py),
+  so it is rendered once and then served to every download
+- the first download renders within its own request (no background threads, which
+  do not outlive the response on serverless deployments); concurrent requests for
+  the same PDF in one process share that render
+- question images are loaded from the image store by content hash, whatever host
+  (or none) their URL carries
+- responses carry an ETag and honour If-None-Match and single byte Range requests
+
+WeasyPrint is optional (it needs the Pango system libraries); without it the file
+output answers 501 and the JSON output keeps working.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+
+from .image_store import load_image, stored_image_sha256
+from .models import PaperPdf
+
+logger = logging.getLogger(__name__)
+
+
+RANGE_PATTERN = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Base for relative image paths when IMAGE_BASE_URL is not set; stored images are
+# served by _url_fetcher and the .invalid host never resolves for anything else
+FALLBACK_BASE_URL = 'http://image-store.invalid/'
+
+_render_locks = {}  # (generated paper id, view type, key) -> Lock
+_render_locks_lock = threading.Lock()
+
+
+class PdfEngineUnavailable(Exception):
+    """Raised when WeasyPrint (or its system libraries) is not installed"""
+
+
+def pdf_engine_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+        return True
+    except (ImportError, OSError):
+        # OSError: the package is installed but Pango/Cairo are missing
+        return False
+
+
+def pdf_key(render_key) -> str:
+    """SHA-256 of a render cache key, identifying what a PDF was rendered from"""
+    payload = json.dumps(list(render_key), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _url_fetcher(url, *args, **kwargs):
+    """Load stored question images from the image store (by SHA-256) instead of over HTTP"""
+    from weasyprint import default_url_fetcher
+
+    sha256 = stored_image_sha256(url)
+    if sha256:
+        image = load_image(sha256)
+        if image is not None:
+            content_type, data = image
+            return {'string': data, 'mime_type': content_type}
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+def html_to_pdf(html: str) -> bytes:
+    """Render an HTML document to PDF bytes"""
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError) as e:
+        raise PdfEngineUnavailable(f"WeasyPrint is not available: {str(e)}")
+
+    # Stored image paths are relative; a base lets them reach _url_fetcher as URLs
+    base_url = getattr(settings, 'IMAGE_BASE_URL', '') or FALLBACK_BASE_URL
+    return HTML(string=html, base_url=base_url, url_fetcher=_url_fetcher).write_pdf()
+
+
+def get_stored_pdf(generated_paper, view_type: str, key: str) -> Optional[PaperPdf]:
+    """The ready PDF of a paper view if it was rendered from this key"""
+    return PaperPdf.objects.filter(
+        generated_paper=generated_paper,
+        view_type=view_type,
+        key=key,
+        status='ready'
+    ).first()
+
+
+def _render_and_store(generated_paper, view_type: str, html: str, key: str) -> PaperPdf:
+    """Render the HTML and store the PDF under the key it was built for"""
+    try:
+        pdf = html_to_pdf(html)
+    except PdfEngineUnavailable:
+        raise
+    except Exception as e:
+        logger.error(f"[PDF] Rendering {view_type} of {generated_paper.unique_code} failed: {str(e)}", exc_info=True)
+        PaperPdf.objects.update_or_create(
+            generated_paper=generated_paper,
+            view_type=view_type,
+            defaults={'key': key, 'status': 'failed', 'data': None, 'size': 0, 'error': str(e)}
+        )
+        raise
+
+    stored, _ = PaperPdf.objects.update_or_create(
+        generated_paper=generated_paper,
+        view_type=view_type,
+        defaults={'key': key, 'status': 'ready', 'data': pdf, 'size': len(pdf), 'error': ''}
+    )
+    logger.info(f"[PDF] Rendered {view_type} of {generated_paper.unique_code} ({len(pdf)} bytes)")
+    return stored
+
+
+def request_pdf(generated_paper, view_type: str, key: str,
+                page_builder: Callable[[], Tuple[str, str]]) -> PaperPdf:
+    """
+    Return the stored PDF, rendering it first if needed
+
+    Args:
+        generated_paper: GeneratedPaper instance
+        view_type: 'questions' or 'marking_scheme'
+        key: pdf_key() of the page's current render key, to look up a stored PDF
+        page_builder: Returns (page HTML, pdf_key() of the render key that HTML was
+            built from); the PDF is stored under that key, so it always matches
+            the HTML it was rendered from
+
+    Returns:
+        The PaperPdf
+
+    Raises:
+        PdfEngineUnavailable, or the rendering error
+    """
+    pdf = get_stored_pdf(generated_paper, view_type, key)
+    if pdf is not None:
+        return pdf
+
+    if not pdf_engine_available():
+        raise PdfEngineUnavailable('WeasyPrint is not installed on this server')
+
+    lock_key = (str(generated_paper.id), view_type, key)
+    with _render_locks_lock:
+        lock = _render_locks.setdefault(lock_key, threading.Lock())
+
+    try:
+        with lock:
+            # Another request may have rendered it while this one waited
+            pdf = get_stored_pdf(generated_paper, view_type, key)
+            if pdf is not None:
+                return pdf
+            html, built_key = page_builder()
+            return _render_and_store(generated_paper, view_type, html, built_key)
+    finally:
+        with _render_locks_lock:
+            if _render_locks.get(lock_key) is lock and not lock.locked():
+                _render_locks.pop(lock_key, None)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (a list of tags or *) against an ETag"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in header.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _parse_range(header: str, size: int):
+    """(start, end) of a single byte range, None to send everything, False if unsatisfiable"""
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or not (match.group(1) or match.group(2)):
+        # Multiple or malformed ranges: the full file is a valid answer
+        return None
+    start, end = match.group(1), match.group(2)
+    if start:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(end), 0)
+        end = size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def pdf_response(request, pdf: PaperPdf, filename: str) -> HttpResponse:
+    """Serve a stored PDF with ETag, conditional and Range request support"""
+    etag = f'"{pdf.key}"'
+    headers = {
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, max-age=0, must-revalidate',
+    }
+
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponseNotModified()
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    data = bytes(pdf.data)
+    size = len(data)
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if range_header and request.headers.get('If-Range', etag) == etag:
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range:
+        start, end = byte_range
+        response = HttpResponse(data[start:end + 1], content_type='application/pdf', status=206)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    else:
+        response = HttpResponse(data, content_type='application/pdf')
+
+    for name, value in headers.items():
+        response[name] = value
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
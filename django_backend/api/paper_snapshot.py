@@ -0,0 +1,166 @@
+"""
+Generated Paper Snapshots
+Materialized question payloads for the view, preview and download endpoints
+
+get_generated_paper, view_full_paper, download_paper and preview_full_exam used to
+re-query every question of the paper and rebuild the same dicts on each request.
+A GeneratedPaperSnapshot now holds, in paper order, one entry per question with
+everything those endpoints show: question text and images, answer text and images,
+answer lines, marks, nested parts, topic and section.
+
+- The snapshot is written when the paper is created (see api/signals.py) and
+  rebuilt on read if it is missing, was built from a different question_ids list,
+  or has an older SNAPSHOT_VERSION.
+- Saving or deleting a referenced question, or renaming a topic/section of the
+  paper, deletes the affected snapshots.
+
+Endpoints fetch the paper together with its snapshot in one query via
+select_related('snapshot') and shape their responses with question_payload() /
+marking_scheme_payload().
+"""
+
+import logging
+from typing import Dict, List
+
+from django.utils import timezone
+
+from .image_store import public_images
+from .models import GeneratedPaperSnapshot, Question
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the entry format changes so stored snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+
+def _snapshot_entry(question: Question) -> Dict:
+    """Everything the paper endpoints show about one question"""
+    return {
+        'id': str(question.id),
+        'question_text': question.question_text,
+        'question_inline_images': question.question_inline_images,
+        'question_image_positions': question.question_image_positions,
+        'question_answer_lines': question.question_answer_lines,
+        'answer_text': question.answer_text,
+        'answer_inline_images': question.answer_inline_images,
+        'answer_image_positions': question.answer_image_positions,
+        'answer_answer_lines': question.answer_answer_lines,
+        'marks': question.marks,
+        'is_nested': question.is_nested,
+        'nested_parts': question.nested_parts if question.is_nested else None,
+        'question_type': question.question_type,
+        'kcse_question_type': question.kcse_question_type,
+        'difficulty': question.difficulty,
+        'topic': {
+            'id': str(question.topic.id),
+            'name': question.topic.name
+        } if question.topic else None,
+        'section': {
+            'id': str(question.section.id),
+            'name': question.section.name,
+            'order': question.section.order
+        } if question.section else None,
+    }
+
+
+def build_snapshot_entries(question_ids: List[str]) -> List[Dict]:
+    """Load the questions of a paper in one query and serialize them in paper order"""
+    questions = Question.objects.filter(id__in=question_ids).select_related('topic', 'section')
+    question_map = {str(q.id): q for q in questions}
+    # Questions deleted since generation are skipped, as the endpoints always did
+    return [_snapshot_entry(question_map[qid]) for qid in question_ids if qid in question_map]
+
+
+def store_paper_snapshot(generated_paper) -> List[Dict]:
+    """Build and persist the snapshot of a generated paper"""
+    question_ids = list(generated_paper.question_ids or [])
+    entries = build_snapshot_entries(question_ids)
+    snapshot, _ = GeneratedPaperSnapshot.objects.update_or_create(
+        generated_paper=generated_paper,
+        defaults={
+            'version': SNAPSHOT_VERSION,
+            'question_ids': question_ids,
+            'questions': entries,
+            'created_at': timezone.now(),  # build time, also on rebuilds (render cache key)
+        }
+    )
+    generated_paper.snapshot = snapshot
+    return entries
+
+
+def get_paper_snapshot(generated_paper) -> List[Dict]:
+    """
+    Return the ordered snapshot entries of a generated paper
+
+    Uses the stored snapshot when it is current (no question queries) and
+    rebuilds it otherwise.
+    """
+    try:
+        snapshot = generated_paper.snapshot
+    except GeneratedPaperSnapshot.DoesNotExist:
+        snapshot = None
+
+    if (snapshot is not None and snapshot.version == SNAPSHOT_VERSION and
+            snapshot.question_ids == list(generated_paper.question_ids or [])):
+        return snapshot.questions
+
+    return store_paper_snapshot(generated_paper)
+
+
+def invalidate_question_snapshots(question_id) -> List:
+    """Drop snapshots of every paper that contains the question; returns their paper IDs"""
+    snapshots = GeneratedPaperSnapshot.objects.filter(question_ids__contains=[str(question_id)])
+    generated_paper_ids = list(snapshots.values_list('generated_paper_id', flat=True))
+    if generated_paper_ids:
+        GeneratedPaperSnapshot.objects.filter(generated_paper_id__in=generated_paper_ids).delete()
+    return generated_paper_ids
+
+
+def invalidate_paper_snapshots(paper_id) -> List:
+    """Drop snapshots of every generated paper of a paper (topic/section renames)"""
+    snapshots = GeneratedPaperSnapshot.objects.filter(generated_paper__paper_id=paper_id)
+    generated_paper_ids = list(snapshots.values_list('generated_paper_id', flat=True))
+    if generated_paper_ids:
+        GeneratedPaperSnapshot.objects.filter(generated_paper_id__in=generated_paper_ids).delete()
+    return generated_paper_ids
+
+
+def _text_preview(text: str) -> str:
+    return text[:100] + '...' if len(text) > 100 else text
+
+
+def question_payload(entry: Dict, **extra) -> Dict:
+    """Question as shown on the paper (no answers); `extra` adds numbering keys"""
+    return {
+        'id': entry['id'],
+        **extra,
+        'question_text': entry['question_text'],
+        'question_inline_images': public_images(entry['question_inline_images']),
+        'question_image_positions': entry['question_image_positions'],
+        'question_answer_lines': entry['question_answer_lines'],
+        'marks': entry['marks'],
+        'is_nested': entry['is_nested'],
+        'nested_parts': entry['nested_parts'],
+        'question_type': entry['question_type'],
+        'kcse_question_type': entry['kcse_question_type'],
+        'difficulty': entry['difficulty'],
+        'topic': entry['topic'],
+        'section': entry['section'],
+    }
+
+
+def marking_scheme_payload(entry: Dict, **extra) -> Dict:
+    """Answer as shown in the marking scheme; `extra` adds numbering keys"""
+    return {
+        'question_id': entry['id'],
+        **extra,
+        'question_text_preview': _text_preview(entry['question_text']),
+        'answer_text': entry['answer_text'],
+        'answer_inline_images': public_images(entry['answer_inline_images']),
+        'answer_image_positions': entry['answer_image_positions'],
+        'answer_answer_lines': entry['answer_answer_lines'],
+        'marks': entry['marks'],
+        'is_nested': entry['is_nested'],
+        'marking_points': entry['nested_parts'],
+    }
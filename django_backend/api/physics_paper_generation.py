@@ -20,14 +20,18 @@ import time
 import logging
 from collections import defaultdict
 from typing import List, Dict, Optional
-from datetime import datetime
 
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.db import transaction
 
-from .models import Paper, Topic, Question, Section, Subject, GeneratedPaper
+from .models import Paper, Topic, Section, Subject, GeneratedPaper
 from .page_number_extrctor import extract_paper_number_from_name
+from .mark_solver import SectionSpec, InfeasibleSelectionError, solve_sections
+from .question_pool import get_question_pool, hydrate_questions
+from .pool_census import PoolCensus
+from .generation_jobs import generation_job
+from .unique_codes import allocate_unique_code
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -145,12 +149,7 @@ class KCSEPhysicsPaperGenerator:
             logger.info(f"  {i}. {topic.name}")
         
         # Load ALL questions for selected topics
-        self.all_questions = list(Question.objects.filter(
-            subject=self.subject,
-            paper=self.paper,
-            topic__in=self.topics,
-            is_active=True
-        ).select_related('topic', 'section'))
+        self.all_questions = get_question_pool(self.paper, [t.id for t in self.topics])
         
         if not self.all_questions:
             logger.error("✗ No questions found")
@@ -158,7 +157,7 @@ class KCSEPhysicsPaperGenerator:
         
         # Separate questions by section and marks
         for q in self.all_questions:
-            if q.section == self.section_a:
+            if q.section_id == self.section_a.id:
                 # Section A: 1, 2, 3 mark questions
                 if q.marks == 1:
                     self.one_mark_pool.append(q)
@@ -166,7 +165,7 @@ class KCSEPhysicsPaperGenerator:
                     self.two_mark_pool.append(q)
                 elif q.marks == 3:
                     self.three_mark_pool.append(q)
-            elif q.section == self.section_b:
+            elif q.section_id == self.section_b.id:
                 # Section B: 8+ marks questions
                 if q.marks >= self.SECTION_B_MIN_MARKS:
                     self.section_b_pool.append(q)
@@ -212,109 +211,63 @@ class KCSEPhysicsPaperGenerator:
         
         logger.info("✓ Data loaded and validated successfully")
     
-    def _select_section_a(self) -> bool:
-        """Select Section A questions based on paper-specific distribution"""
+    def _section_specs(self) -> List[SectionSpec]:
+        """Declare Section A and Section B structure for the exact mark solver"""
         distribution = self.get_section_a_distribution()
-        
-        # Get required counts
-        one_mark_needed = distribution.get(1, 0)
-        two_mark_needed = distribution.get(2, 0)
-        three_mark_needed = distribution.get(3, 0)
-        
-        # Get available questions
-        available_1mark = [q for q in self.one_mark_pool if q.id not in self.used_ids]
-        available_2mark = [q for q in self.two_mark_pool if q.id not in self.used_ids]
-        available_3mark = [q for q in self.three_mark_pool if q.id not in self.used_ids]
-        
-        # Check availability
-        if (len(available_1mark) < one_mark_needed or 
-            len(available_2mark) < two_mark_needed or 
-            len(available_3mark) < three_mark_needed):
-            return False
-        
-        # Select questions
-        selected = []
-        selected.extend(available_1mark[:one_mark_needed])
-        selected.extend(available_2mark[:two_mark_needed])
-        selected.extend(available_3mark[:three_mark_needed])
-        
-        # Verify counts and marks
-        total_questions = len(selected)
-        total_marks = sum(q.marks for q in selected)
-        
-        if total_questions != self.SECTION_A_QUESTIONS:
-            logger.warning(f"Section A question count mismatch: {total_questions} != {self.SECTION_A_QUESTIONS}")
-            return False
-        
-        if total_marks != self.SECTION_A_TOTAL_MARKS:
-            logger.warning(f"Section A marks mismatch: {total_marks} != {self.SECTION_A_TOTAL_MARKS}")
+        section_a_pool = [
+            q for q in self.one_mark_pool + self.two_mark_pool + self.three_mark_pool
+            if q.id not in self.used_ids
+        ]
+        section_b_pool = [q for q in self.section_b_pool if q.id not in self.used_ids]
+        
+        return [
+            SectionSpec(
+                'section_a',
+                section_a_pool,
+                min_questions=self.SECTION_A_QUESTIONS,
+                max_questions=self.SECTION_A_QUESTIONS,
+                min_marks=self.SECTION_A_TOTAL_MARKS,
+                max_marks=self.SECTION_A_TOTAL_MARKS,
+                mark_counts={marks: (count, count) for marks, count in distribution.items()}
+            ),
+            SectionSpec(
+                'section_b',
+                section_b_pool,
+                min_questions=self.SECTION_B_QUESTIONS,
+                max_questions=self.SECTION_B_QUESTIONS,
+                min_marks=self.SECTION_B_TOTAL_MARKS,
+                max_marks=self.SECTION_B_TOTAL_MARKS
+            ),
+        ]
+    
+    def _select_sections(self) -> bool:
+        """
+        Select Section A (paper-specific distribution, 25 marks) and Section B
+        (5 questions, exactly 55 marks) in one pass using the exact mark solver
+        """
+        try:
+            selection = solve_sections(self._section_specs())
+        except InfeasibleSelectionError as e:
+            logger.warning(f"Physics selection infeasible: {e}")
             return False
         
-        # Shuffle to randomize order
-        random.shuffle(selected)
-        
-        # Accept selection
-        self.selected_section_a = selected
-        for q in selected:
+        self.selected_section_a = selection['section_a']
+        self.selected_section_b = selection['section_b']
+        for q in self.selected_section_a + self.selected_section_b:
             self.used_ids.add(q.id)
         
+        distribution = self.get_section_a_distribution()
         logger.info(f"\n[SECTION A SELECTED]")
-        logger.info(f"  Questions: {total_questions} (all compulsory)")
-        logger.info(f"  Distribution: {one_mark_needed}x1-mark, {two_mark_needed}x2-mark, {three_mark_needed}x3-mark")
-        logger.info(f"  Total marks: {total_marks}")
+        logger.info(f"  Questions: {len(self.selected_section_a)} (all compulsory)")
+        logger.info(f"  Distribution: {distribution.get(1, 0)}x1-mark, {distribution.get(2, 0)}x2-mark, {distribution.get(3, 0)}x3-mark")
+        logger.info(f"  Total marks: {sum(q.marks for q in self.selected_section_a)}")
+        logger.info(f"\n[SECTION B SELECTED]")
+        logger.info(f"  Questions: {len(self.selected_section_b)} (all compulsory)")
+        logger.info(f"  Question marks: {[q.marks for q in self.selected_section_b]}")
+        logger.info(f"  Total marks: {sum(q.marks for q in self.selected_section_b)}")
         
         return True
     
-    def _select_section_b(self) -> bool:
-        """Select Section B questions: 5 questions totaling exactly 55 marks"""
-        available = [q for q in self.section_b_pool if q.id not in self.used_ids]
-        
-        if len(available) < self.SECTION_B_QUESTIONS:
-            return False
-        
-        # Try to find combination of 5 questions that sum to exactly 55 marks
-        from itertools import combinations
-        
-        for combo in combinations(available, self.SECTION_B_QUESTIONS):
-            total_marks = sum(q.marks for q in combo)
-            if total_marks == self.SECTION_B_TOTAL_MARKS:
-                # Found exact match!
-                self.selected_section_b = list(combo)
-                for q in combo:
-                    self.used_ids.add(q.id)
-                
-                logger.info(f"\n[SECTION B SELECTED]")
-                logger.info(f"  Questions: {len(combo)} (all compulsory)")
-                logger.info(f"  Question marks: {[q.marks for q in combo]}")
-                logger.info(f"  Total marks: {total_marks}")
-                
-                return True
-        
-        # If no exact match, find closest
-        logger.warning("No exact 55-mark combination found, trying closest match...")
-        best_combo = None
-        best_diff = float('inf')
-        
-        for combo in combinations(available, self.SECTION_B_QUESTIONS):
-            total_marks = sum(q.marks for q in combo)
-            diff = abs(total_marks - self.SECTION_B_TOTAL_MARKS)
-            
-            if diff < best_diff:
-                best_diff = diff
-                best_combo = combo
-        
-        if best_combo:
-            self.selected_section_b = list(best_combo)
-            for q in best_combo:
-                self.used_ids.add(q.id)
-            
-            total_marks = sum(q.marks for q in best_combo)
-            logger.warning(f"Using closest match: {total_marks} marks (diff: {best_diff})")
-            
-            return best_diff <= 2  # Accept if within 2 marks
-        
-        return False
-    
     def generate(self) -> Dict:
         """Generate Physics Paper"""
         max_attempts = 100
@@ -340,17 +293,11 @@ class KCSEPhysicsPaperGenerator:
             self.selected_question_ids = []
             self.used_ids = set()
             
-            # Select Section A (13 questions, 25 marks)
-            if not self._select_section_a():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section A selection")
-                continue
-            
-            # Select Section B (5 questions, 55 marks)
-            if not self._select_section_b():
-                if attempt % 10 == 0:
-                    print(f"[ATTEMPT {attempt}] Failed at Section B selection")
-                continue
+            # Select Section A (13 questions, 25 marks) and Section B (5 questions, 55 marks)
+            # The solver is exact, so a failure means no valid combination exists
+            if not self._select_sections():
+                print(f"[ATTEMPT {attempt}] No valid Section A/B combination in this pool")
+                break
             
             # Success!
             generation_time = time.time() - self.generation_start_time
@@ -391,7 +338,7 @@ class KCSEPhysicsPaperGenerator:
         
         # Failed
         raise Exception(
-            f"Failed to generate paper after {max_attempts} attempts. "
+            f"Failed to generate paper after {self.attempts} attempts. "
             f"Available: 1-mark={len(self.one_mark_pool)}, "
             f"2-mark={len(self.two_mark_pool)}, "
             f"3-mark={len(self.three_mark_pool)}, "
@@ -401,6 +348,10 @@ class KCSEPhysicsPaperGenerator:
     def _build_result(self, generation_time: float) -> Dict:
         """Build result with strictly ordered sections"""
         
+        # Fetch full rows (text, answers) only for the selected questions
+        self.selected_section_a = hydrate_questions(self.selected_section_a)
+        self.selected_section_b = hydrate_questions(self.selected_section_b)
+        
         # Combine sections in strict order: Section A (1-13), then Section B (14-18)
         all_questions = self.selected_section_a + self.selected_section_b
         
@@ -625,38 +576,12 @@ def validate_physics_paper_pool(request):
                 'message': 'No valid topics found'
             }, status=404)
         
-        # Count questions by type
-        one_mark_count = Question.objects.filter(
-            paper=paper,
-            section=section_a,
-            topic__in=topics,
-            marks=1,
-            is_active=True
-        ).count()
-        
-        two_mark_count = Question.objects.filter(
-            paper=paper,
-            section=section_a,
-            topic__in=topics,
-            marks=2,
-            is_active=True
-        ).count()
-        
-        three_mark_count = Question.objects.filter(
-            paper=paper,
-            section=section_a,
-            topic__in=topics,
-            marks=3,
-            is_active=True
-        ).count()
-        
-        section_b_count = Question.objects.filter(
-            paper=paper,
-            section=section_b,
-            topic__in=topics,
-            marks__gte=8,
-            is_active=True
-        ).count()
+        # Count questions by type (one grouped query)
+        census = PoolCensus.for_paper(paper.id, [t.id for t in topics])
+        one_mark_count = census.count(sections=[section_a.id], marks=1)
+        two_mark_count = census.count(sections=[section_a.id], marks=2)
+        three_mark_count = census.count(sections=[section_a.id], marks=3)
+        section_b_count = census.count(sections=[section_b.id], min_marks=8)
         
         # Get required distribution based on paper number
         if paper_number == 1:
@@ -726,6 +651,7 @@ def validate_physics_paper_pool(request):
 
 
 @require_http_methods(["POST"])
+@generation_job('physics')
 def generate_physics_paper(request):
     """Generate KCSE Physics Paper 1 or 2"""
     try:
@@ -776,14 +702,7 @@ def generate_physics_paper(request):
         result = generator.generate()
         
         # Generate unique code
-        current_year = datetime.now().year
-        paper = generator.paper
-        year_count = GeneratedPaper.objects.filter(
-            paper=paper,
-            created_at__year=current_year
-        ).count()
-        
-        unique_code = f"PHY{paper_number}-{current_year}-{year_count + 1:03d}"
+        unique_code = allocate_unique_code(f"PHY{paper_number}")
         
         # Create GeneratedPaper record
         with transaction.atomic():
@@ -0,0 +1,124 @@
+"""
+Question Pool Census
+Histogram of a paper's active questions, answered in memory by the pool validators
+
+get_topic_statistics ran four queries per topic, and the validate-pool endpoints
+either counted every combination with its own query (physics, the Biology Paper 1
+QuestionPoolValidator with one count per topic) or loaded the whole pool to count
+it in Python (geography loaded full question rows). They now build a PoolCensus:
+- one grouped `values(...).annotate(Count('id'))` query over the paper's active
+  questions (optionally restricted to the selected topics)
+- one bucket per (topic, section, is_nested, marks, is_graph, is_map), with the
+  section name kept for validators that match on it
+- count(), by_marks(), by_topic() and by_section() filter and sum the buckets
+
+A validation is therefore one question query however many topics are selected.
+"""
+
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+from django.db.models import Count
+
+from .models import Question
+
+
+class CensusKey(NamedTuple):
+    """Attributes shared by the questions of one census bucket"""
+    topic_id: str
+    section_id: Optional[str]
+    section_name: str
+    is_nested: bool
+    marks: int
+    is_graph: bool
+    is_map: bool
+
+
+CENSUS_FIELDS = ('topic_id', 'section_id', 'section__name', 'is_nested', 'marks', 'is_graph', 'is_map')
+
+
+class PoolCensus:
+    """Question counts of a paper's active questions per CensusKey"""
+
+    def __init__(self, buckets: Dict[CensusKey, int]):
+        self.buckets = buckets
+
+    @classmethod
+    def for_paper(cls, paper_id, topic_ids: Optional[Iterable] = None) -> 'PoolCensus':
+        """Census of the paper's active questions (of the given topics only, if any)"""
+        queryset = Question.objects.filter(paper_id=paper_id, is_active=True)
+        if topic_ids is not None:
+            queryset = queryset.filter(topic_id__in=list(topic_ids))
+
+        buckets = {}
+        rows = queryset.order_by().values(*CENSUS_FIELDS).annotate(count=Count('id'))
+        for row in rows:
+            key = CensusKey(
+                topic_id=str(row['topic_id']),
+                section_id=str(row['section_id']) if row['section_id'] else None,
+                section_name=(row['section__name'] or '').upper(),
+                is_nested=bool(row['is_nested']),
+                marks=row['marks'],
+                is_graph=bool(row['is_graph']),
+                is_map=bool(row['is_map']),
+            )
+            buckets[key] = buckets.get(key, 0) + row['count']
+        return cls(buckets)
+
+    def _matching(self, topics=None, sections=None, nested=None, marks=None,
+                  min_marks=None, max_marks=None, where: Optional[Callable[[CensusKey], bool]] = None):
+        topics = {str(topic) for topic in topics} if topics is not None else None
+        sections = {str(section) for section in sections} if sections is not None else None
+        if marks is not None:
+            marks = set(marks) if isinstance(marks, (list, tuple, set, frozenset)) else {marks}
+        for key, count in self.buckets.items():
+            if topics is not None and key.topic_id not in topics:
+                continue
+            if sections is not None and key.section_id not in sections:
+                continue
+            if nested is not None and key.is_nested != nested:
+                continue
+            if marks is not None and key.marks not in marks:
+                continue
+            if min_marks is not None and key.marks < min_marks:
+                continue
+            if max_marks is not None and key.marks > max_marks:
+                continue
+            if where is not None and not where(key):
+                continue
+            yield key, count
+
+    def count(self, **filters) -> int:
+        """
+        Number of questions matching the filters
+
+        Filters: topics, sections (ids), nested (bool), marks (value or collection),
+        min_marks / max_marks (inclusive) and where (predicate on the CensusKey)
+        """
+        return sum(count for _, count in self._matching(**filters))
+
+    def by_marks(self, **filters) -> Dict[int, int]:
+        """marks -> number of matching questions"""
+        totals = Counter()
+        for key, count in self._matching(**filters):
+            totals[key.marks] += count
+        return dict(totals)
+
+    def by_topic(self, **filters) -> Dict[str, int]:
+        """topic id -> number of matching questions"""
+        totals = defaultdict(int)
+        for key, count in self._matching(**filters):
+            totals[key.topic_id] += count
+        return dict(totals)
+
+    def by_section(self, **filters) -> Dict[Optional[str], int]:
+        """section id -> number of matching questions"""
+        totals = defaultdict(int)
+        for key, count in self._matching(**filters):
+            totals[key.section_id] += count
+        return dict(totals)
+
+
+def in_section(*names: str) -> Callable[[CensusKey], bool]:
+    """Predicate for questions whose section name contains any of the (upper case) names"""
+    return lambda key: any(name in key.section_name for name in names)
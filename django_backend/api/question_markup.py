@@ -0,0 +1,676 @@
+"""
+Question Markup
+Tokenizer, parser and HTML emitters for the markup used in question and answer text
+
+Question and answer text is stored with inline markup (see docs/TEXT_FORMATTING.md):
+- **bold**, *italic* / _italic_, __underline__, [SUP]..[/SUP], [SUB]..[/SUB]
+- [FRAC:num:den], [MIX:whole:num:den]
+- [TABLE:RxC:cells(:W:widths)(:H:heights)(:M:merges)], [MATRIX:RxC:cells]
+- [IMAGE:id:WxHpx] / [IMAGE:id:Wpx], [LINES:id], [SPACE:id], [GRAPH:id:WxHcm]
+
+The exam paper and marking scheme templates each rebuilt the tokenizer regex,
+split the text and dispatched with chains of startswith checks, then re-split
+every fraction and table cell the same way. Rendering is now done in two steps:
+1. parse() splits the text once with the module-level compiled patterns and
+   returns a tuple of Node objects (memoized per text, so a question rendered for
+   the paper, the marking scheme and the printable document is parsed once)
+2. an HtmlEmitter turns the nodes into HTML
+
+QuestionHtmlEmitter and AnswerHtmlEmitter only differ in inline tag classes,
+answer lines and image output, and produce the same HTML the templates did.
+"""
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import re
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+
+# Bump whenever emitter output changes; part of the fragment cache keys (api/fragment_cache.py)
+RENDERER_VERSION = 3
+
+# Top-level tokens of question/answer text
+MARKUP_PATTERN = re.compile(
+    r'(\*\*.*?\*\*|\*.*?\*|__.*?__|_.*?_|\[SUP\].*?\[/SUP\]|\[SUB\].*?\[/SUB\]'
+    r'|\[FRAC:(?:[^:\[\]]|\[[^\]]+\])+:(?:[^:\[\]]|\[[^\]]+\])+\]'
+    r'|\[MIX:(?:[^:\[\]]|\[[^\]]+\])+:(?:[^:\[\]]|\[[^\]]+\])+:(?:[^:\[\]]|\[[^\]]+\])+\]'
+    r'|\[TABLE:(?:[^\[\]]|\[[^\]]+\])+\]|\[MATRIX:(?:[^\[\]]|\[[^\]]+\])+\]'
+    r'|\[GRAPH:[\d.]+:[\d.]+x[\d.]+cm\]|\[IMAGE:[\d.]+:(?:\d+x\d+|\d+)px\]'
+    r'|\[LINES:[\d.]+\]|\[SPACE:[\d.]+\])'
+)
+
+# Tokens allowed inside fractions, table and matrix cells
+INLINE_PATTERN = re.compile(
+    r'(\[SUP\].*?\[/SUP\]|\[SUB\].*?\[/SUB\]|\*\*.*?\*\*|\*(?!\*)[^*]+?\*|__.*?__|_(?!_)[^_]+?_)'
+)
+
+_BLOCK_TAG_PATTERN = re.compile(r'\[(TABLE|MATRIX|FRAC|MIX|LINES|SPACE|GRAPH|IMAGE):')
+_DIMENSION_PATTERN = re.compile(r'(\d+)x(\d+)')
+_LINES_PATTERN = re.compile(r'\[LINES:([\d.]+)\]')
+_SPACE_PATTERN = re.compile(r'\[SPACE:([\d.]+)\]')
+_GRAPH_PATTERN = re.compile(r'\[GRAPH:([\d.]+):([\d.]+)x([\d.]+)cm\]')
+_IMAGE_PATTERN = re.compile(r'\[IMAGE:([\d.]+):(\d+)x(\d+)px\]')
+_IMAGE_PATTERN_OLD = re.compile(r'\[IMAGE:([\d.]+):(\d+)px\]')
+
+# Node kinds
+TEXT = 'text'
+BOLD = 'bold'
+ITALIC = 'italic'
+UNDERLINE = 'underline'
+SUP = 'sup'
+SUB = 'sub'
+FRAC = 'frac'
+MIX = 'mix'
+TABLE = 'table'
+MATRIX = 'matrix'
+LINES = 'lines'
+SPACE = 'space'
+GRAPH = 'graph'
+IMAGE = 'image'
+
+
+class Node:
+    """One parsed piece of markup; `raw` is the source text, `attrs` the parsed values"""
+
+    __slots__ = ('kind', 'raw', 'attrs')
+
+    def __init__(self, kind: str, raw: str, **attrs):
+        self.kind = kind
+        self.raw = raw
+        self.attrs = attrs
+
+    def __repr__(self):
+        return f"Node({self.kind!r}, {self.raw!r})"
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+def _inline_node(part: str) -> Node:
+    """Classify a segment as SUP/SUB/bold/italic/underline, or plain text"""
+    first = part[0]
+    if first == '[':
+        if part.startswith('[SUP]') and part.endswith('[/SUP]'):
+            return Node(SUP, part, text=part[5:-6])
+        if part.startswith('[SUB]') and part.endswith('[/SUB]'):
+            return Node(SUB, part, text=part[5:-6])
+    elif first == '*' and part.endswith('*'):
+        if part.startswith('**'):
+            if len(part) > 4 and part.endswith('**'):
+                return Node(BOLD, part, text=part[2:-2])
+        elif len(part) > 2:
+            return Node(ITALIC, part, text=part[1:-1])
+    elif first == '_' and part.endswith('_'):
+        if part.startswith('__'):
+            if len(part) > 4 and part.endswith('__'):
+                return Node(UNDERLINE, part, text=part[2:-2])
+        elif len(part) > 2:
+            return Node(ITALIC, part, text=part[1:-1])
+    return Node(TEXT, part, text=part)
+
+
+@lru_cache(maxsize=4096)
+def parse_inline(content: str) -> Tuple[Node, ...]:
+    """Parse the content of a fraction part or table/matrix cell"""
+    if not content:
+        return ()
+    return tuple(_inline_node(part) for part in INLINE_PATTERN.split(content) if part)
+
+
+def _top_level_colons(inner: str) -> List[int]:
+    """Positions of ':' that are not inside nested [...] tags"""
+    positions = []
+    bracket_depth = 0
+    for i, char in enumerate(inner):
+        if char == '[':
+            bracket_depth += 1
+        elif char == ']':
+            bracket_depth -= 1
+        elif char == ':' and bracket_depth == 0:
+            positions.append(i)
+    return positions
+
+
+def _parse_cells(part: str, prefix_length: int) -> Optional[Dict]:
+    """Dimensions and cell contents shared by [TABLE:...] and [MATRIX:...]"""
+    parts_list = part[prefix_length:-1].split(':')
+    dimension_match = _DIMENSION_PATTERN.match(parts_list[0])
+    if not dimension_match:
+        return None
+    rows = int(dimension_match.group(1))
+    cols = int(dimension_match.group(2))
+    cell_data = parts_list[1].split('|') if len(parts_list) > 1 else []
+    cells = []
+    for cell_index in range(rows * cols):
+        cell_value = cell_data[cell_index] if cell_index < len(cell_data) else ''
+        cells.append(parse_inline(cell_value) if cell_value else None)
+    return {'rows': rows, 'cols': cols, 'cells': cells, 'parts_list': parts_list}
+
+
+def _parse_table(part: str) -> Node:
+    layout = _parse_cells(part, 7)
+    if layout is None:
+        return Node(TEXT, part, text=part)
+    parts_list = layout.pop('parts_list')
+    rows, cols = layout['rows'], layout['cols']
+
+    # Optional widths (W:w1,w2,...), heights (H:h1,h2,...) and merged cells (M:r,c,colspan,rowspan;...)
+    col_widths = [60] * cols
+    row_heights = [30] * rows
+    merged_cells = {}
+
+    try:
+        width_index = parts_list.index('W')
+        if len(parts_list) > width_index + 1:
+            col_widths = [int(w) or 60 for w in parts_list[width_index + 1].split(',')]
+    except (ValueError, IndexError):
+        pass
+
+    try:
+        height_index = parts_list.index('H')
+        if len(parts_list) > height_index + 1:
+            row_heights = [int(h) or 30 for h in parts_list[height_index + 1].split(',')]
+    except (ValueError, IndexError):
+        pass
+
+    try:
+        merge_index = parts_list.index('M')
+        if len(parts_list) > merge_index + 1:
+            for m in parts_list[merge_index + 1].split(';'):
+                cell_info = m.split(',')
+                if len(cell_info) == 4:
+                    r, c, colspan, rowspan = map(int, cell_info)
+                    merged_cells.setdefault(r, {})[c] = {'colspan': colspan, 'rowspan': rowspan}
+    except (ValueError, IndexError):
+        pass
+
+    covered = table_occupancy(merged_cells, rows, cols)
+    return Node(TABLE, part, col_widths=col_widths, row_heights=row_heights, merged_cells=merged_cells,
+                covered=covered, **layout)
+
+
+def table_occupancy(merged_cells: Dict, rows: int, cols: int) -> List[List[bool]]:
+    """
+    Occupancy grid of a table: True where a cell lies inside another cell's merged span
+
+    Filled once from the merge list, so rendering checks each cell in constant time
+    instead of scanning every earlier merge origin. Spans are clipped to the table.
+    """
+    covered = [[False] * cols for _ in range(rows)]
+    for r, row_merges in merged_cells.items():
+        if not 0 <= r < rows:
+            continue
+        for c, cell in row_merges.items():
+            if not 0 <= c < cols:
+                continue
+            end_row = min(r + cell.get('rowspan', 1), rows)
+            end_col = min(c + cell.get('colspan', 1), cols)
+            for row_idx in range(r, end_row):
+                grid_row = covered[row_idx]
+                for col_idx in range(c, end_col):
+                    if row_idx != r or col_idx != c:
+                        grid_row[col_idx] = True
+    return covered
+
+
+def _parse_matrix(part: str) -> Node:
+    layout = _parse_cells(part, 8)
+    if layout is None:
+        return Node(TEXT, part, text=part)
+    del layout['parts_list']
+    return Node(MATRIX, part, **layout)
+
+
+def _parse_frac(part: str) -> Node:
+    inner = part[6:-1]
+    colons = _top_level_colons(inner)
+    if colons:
+        num, den = inner[:colons[0]], inner[colons[0] + 1:]
+    else:
+        num, den = inner, ''
+    return Node(FRAC, part, num=parse_inline(num), den=parse_inline(den))
+
+
+def _parse_mix(part: str) -> Node:
+    inner = part[5:-1]
+    colons = _top_level_colons(inner)
+    if len(colons) >= 2:
+        whole = inner[:colons[0]]
+        num = inner[colons[0] + 1:colons[1]]
+        den = inner[colons[1] + 1:]
+    else:
+        whole, num, den = inner, '', ''
+    return Node(MIX, part, whole=parse_inline(whole), num=parse_inline(num), den=parse_inline(den))
+
+
+def _parse_lines(part: str) -> Optional[Node]:
+    match = _LINES_PATTERN.match(part)
+    if not match:
+        return None
+    return Node(LINES, part, id=float(match.group(1)))
+
+
+def _parse_space(part: str) -> Optional[Node]:
+    match = _SPACE_PATTERN.match(part)
+    if not match:
+        return None
+    return Node(SPACE, part, id=float(match.group(1)))
+
+
+def _parse_graph(part: str) -> Optional[Node]:
+    match = _GRAPH_PATTERN.match(part)
+    if not match:
+        return None
+    return Node(
+        GRAPH, part,
+        id=float(match.group(1)),
+        width_cm=max(1, float(match.group(2))),
+        height_cm=max(1, float(match.group(3))),
+    )
+
+
+def _parse_image(part: str) -> Optional[Node]:
+    if not part.endswith('px]'):
+        return Node(TEXT, part, text=part)
+    match = _IMAGE_PATTERN.match(part)
+    if match:
+        return Node(IMAGE, part, id=float(match.group(1)), width=int(match.group(2)), height=int(match.group(3)))
+    match = _IMAGE_PATTERN_OLD.match(part)
+    if match:
+        return Node(IMAGE, part, id=float(match.group(1)), width=int(match.group(2)), height=None)
+    return None
+
+
+_BLOCK_PARSERS = {
+    'TABLE': _parse_table,
+    'MATRIX': _parse_matrix,
+    'FRAC': _parse_frac,
+    'MIX': _parse_mix,
+    'LINES': _parse_lines,
+    'SPACE': _parse_space,
+    'GRAPH': _parse_graph,
+    'IMAGE': _parse_image,
+}
+
+
+def _block_node(part: str) -> Optional[Node]:
+    """
+    Classify a top-level segment
+
+    Returns None for malformed [LINES]/[SPACE]/[GRAPH]/[IMAGE] tags, which are
+    dropped from the output. Malformed tables, matrices and any tag that fails to
+    parse are kept as plain text.
+    """
+    if part[0] == '[' and part.endswith(']'):
+        tag_match = _BLOCK_TAG_PATTERN.match(part)
+        if tag_match:
+            try:
+                return _BLOCK_PARSERS[tag_match.group(1)](part)
+            except Exception:
+                return Node(TEXT, part, text=part)
+    return _inline_node(part)
+
+
+@lru_cache(maxsize=4096)
+def parse(text: str) -> Tuple[Node, ...]:
+    """Parse question/answer text into a tuple of nodes (single pass, memoized)"""
+    if not text:
+        return ()
+    nodes = []
+    for part in MARKUP_PATTERN.split(text):
+        if part:
+            node = _block_node(part)
+            if node is not None:
+                nodes.append(node)
+    return tuple(nodes)
+
+
+# ============================================================================
+# HTML EMITTERS
+# ============================================================================
+
+FRACTION_HTML = (
+    '<span style="display: inline-block; vertical-align: middle; text-align: center; line-height: 1;">'
+    '<span style="display: block; font-size: 0.85em;">{num}</span>'
+    '<span style="display: block; border-top: 1px solid; padding-top: 1px; font-size: 0.85em;">{den}</span>'
+    '</span>'
+)
+
+
+# Graph paper grid lines per millimetre position within a 1 cm square:
+# (stroke, stroke width) for the 1 cm, 5 mm and 1 mm lines
+GRAPH_CM_LINE = ('#000000', 0.45)
+GRAPH_HALF_CM_LINE = ('rgba(15, 23, 42, 0.9)', 0.28)
+GRAPH_MM_LINE = ('rgba(156, 163, 175, 0.65)', 0.18)
+
+
+def _graph_grid_pattern() -> str:
+    """
+    One 10x10 mm tile of graph paper as an SVG <pattern>
+
+    Every millimetre line is drawn once with its own stroke, as the per-line SVG
+    did. The 1 cm lines lie on the tile edges, so each tile draws both edges and
+    neighbouring tiles complete each other's half of the stroke.
+    """
+    vertical = []
+    horizontal = []
+    for position in range(11):
+        if position % 10 == 0:
+            stroke, stroke_width = GRAPH_CM_LINE
+        elif position % 5 == 0:
+            stroke, stroke_width = GRAPH_HALF_CM_LINE
+        else:
+            stroke, stroke_width = GRAPH_MM_LINE
+        vertical.append(
+            f'<line x1="{position}" y1="0" x2="{position}" y2="10" stroke="{stroke}" stroke-width="{stroke_width}" />'
+        )
+        horizontal.append(
+            f'<line x1="0" y1="{position}" x2="10" y2="{position}" stroke="{stroke}" stroke-width="{stroke_width}" />'
+        )
+    return (
+        '<defs><pattern id="{pattern_id}" x="0" y="0" width="10" height="10" patternUnits="userSpaceOnUse">'
+        f'{"".join(vertical)}{"".join(horizontal)}'
+        '</pattern></defs>'
+    )
+
+
+GRAPH_GRID_PATTERN = _graph_grid_pattern()
+
+
+def build_graph_html(width_cm, height_cm) -> str:
+    """
+    Graph paper as SVG line art (browser print often omits background graphics)
+
+    The grid is a single 1 cm <pattern> tile filling the graph area instead of one
+    <line> per millimetre, and the markup is memoized per size. Every graph gets its
+    own pattern id, since a page usually holds several graphs.
+    """
+    pattern_id = f'graph-paper-grid-{uuid.uuid4().hex[:12]}'
+    return _graph_html_markup(width_cm, height_cm).replace('{pattern_id}', pattern_id)
+
+
+@lru_cache(maxsize=256)
+def _graph_html_markup(width_cm, height_cm) -> str:
+    """Graph markup of one size with a {pattern_id} placeholder"""
+    width_mm = max(10, int(round(width_cm * 10)))
+    height_mm = max(10, int(round(height_cm * 10)))
+    return (
+        '<span style="display:inline-block; margin:8px 4px; vertical-align:middle;">'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width_cm}cm" height="{height_cm}cm" '
+        f'viewBox="0 0 {width_mm} {height_mm}" preserveAspectRatio="none" '
+        f'style="display:block; background:#fff; border:2px solid #0f766e; border-radius:4px; box-sizing:border-box;">'
+        f'{GRAPH_GRID_PATTERN}'
+        f'<rect x="0" y="0" width="{width_mm}" height="{height_mm}" fill="#ffffff" />'
+        f'<rect x="0" y="0" width="{width_mm}" height="{height_mm}" fill="url(#{{pattern_id}})" />'
+        f'<rect x="0" y="0" width="{width_mm}" height="{height_mm}" fill="none" stroke="#000000" stroke-width="0.5" />'
+        '</svg>'
+        '</span>'
+    )
+
+
+class HtmlEmitter(ABC):
+    """
+    Renders parsed nodes to HTML
+
+    Subclasses implement image_html() and override the tag attributes or the
+    emit_<kind> methods to change how a node kind is rendered.
+    """
+
+    name = 'html'
+    bold_tag = '<strong>'
+    italic_tag = '<em>'
+    underline_tag = '<u>'
+
+    def render(self, nodes, images: Dict = None, lines: Dict = None) -> str:
+        """
+        Args:
+            nodes: Result of parse()
+            images: Image objects keyed by float(id)
+            lines: Answer line configurations keyed by float(id)
+        """
+        images = images or {}
+        lines = lines or {}
+        result = []
+        for node in nodes:
+            html = getattr(self, 'emit_' + node.kind)(node, images, lines)
+            if html:
+                result.append(html)
+        return ''.join(result)
+
+    def render_inline(self, nodes) -> str:
+        return ''.join(self.inline(node) for node in nodes)
+
+    def inline(self, node: Node) -> str:
+        kind = node.kind
+        text = node.attrs['text']
+        if kind == TEXT:
+            return text
+        if kind == BOLD:
+            return f'{self.bold_tag}{text}</strong>'
+        if kind == ITALIC:
+            return f'{self.italic_tag}{text}</em>'
+        if kind == UNDERLINE:
+            return f'{self.underline_tag}{text}</u>'
+        if kind == SUP:
+            return f'<sup style="font-size: 0.75em;">{text}</sup>'
+        return f'<sub style="font-size: 0.75em;">{text}</sub>'
+
+    def _cell(self, cell) -> str:
+        return self.render_inline(cell) if cell is not None else '&nbsp;'
+
+    # Inline formatting
+    def emit_text(self, node, images, lines):
+        return self.inline(node)
+
+    emit_bold = emit_italic = emit_underline = emit_sup = emit_sub = emit_text
+
+    def emit_frac(self, node, images, lines):
+        attrs = node.attrs
+        return FRACTION_HTML.format(num=self.render_inline(attrs['num']), den=self.render_inline(attrs['den']))
+
+    def emit_mix(self, node, images, lines):
+        attrs = node.attrs
+        fraction = FRACTION_HTML.format(num=self.render_inline(attrs['num']), den=self.render_inline(attrs['den']))
+        return (
+            '<span style="display: inline-flex; align-items: center; gap: 4px;">'
+            f'<span style="font-size: 0.95em;">{self.render_inline(attrs["whole"])}</span>'
+            f'{fraction}</span>'
+        )
+
+    def emit_table(self, node, images, lines):
+        attrs = node.attrs
+        rows, cols = attrs['rows'], attrs['cols']
+        cells = attrs['cells']
+        col_widths = attrs['col_widths']
+        row_heights = attrs['row_heights']
+        merged_cells = attrs['merged_cells']
+        covered = attrs['covered']
+
+        html = ['<table style="border: 1px solid #000; border-collapse: collapse; margin: 8px 0; display: inline-table;"><tbody>']
+        for row_idx in range(rows):
+            html.append('<tr>')
+            covered_row = covered[row_idx]
+            for col_idx in range(cols):
+                if covered_row[col_idx]:
+                    continue
+                cell_html = self._cell(cells[row_idx * cols + col_idx])
+                width = col_widths[col_idx] if col_idx < len(col_widths) else 60
+                height = row_heights[row_idx] if row_idx < len(row_heights) else 30
+                merge_info = merged_cells.get(row_idx, {}).get(col_idx, {'colspan': 1, 'rowspan': 1})
+                colspan = merge_info.get('colspan', 1)
+                rowspan = merge_info.get('rowspan', 1)
+                colspan_attr = f' colspan="{colspan}"' if colspan > 1 else ''
+                rowspan_attr = f' rowspan="{rowspan}"' if rowspan > 1 else ''
+                html.append(
+                    f'<td{colspan_attr}{rowspan_attr} style="border: 1px solid #000; padding: 8px; width: {width}px; '
+                    f'height: {height}px; min-width: 60px; min-height: 30px;">{cell_html}</td>'
+                )
+            html.append('</tr>')
+        html.append('</tbody></table>')
+        return ''.join(html)
+
+    def emit_matrix(self, node, images, lines):
+        attrs = node.attrs
+        rows, cols = attrs['rows'], attrs['cols']
+        cells = attrs['cells']
+
+        html = [
+            '<span style="display: inline-flex; align-items: center; margin: 8px 4px; font-size: 1.2em;">'
+            '<span style="font-size: 2em; line-height: 1;">⎡</span>'
+            '<table style="border-collapse: collapse; margin: 0 4px;"><tbody>'
+        ]
+        for row_idx in range(rows):
+            html.append('<tr>')
+            for col_idx in range(cols):
+                cell_html = self._cell(cells[row_idx * cols + col_idx])
+                html.append(f'<td style="padding: 4px 8px; text-align: center; min-width: 40px;">{cell_html}</td>')
+            html.append('</tr>')
+        html.append(
+            '</tbody></table>'
+            '<span style="font-size: 2em; line-height: 1;">⎤</span>'
+            '</span>'
+        )
+        return ''.join(html)
+
+    def emit_space(self, node, images, lines):
+        # A4 printable width is approximately 170mm = ~640px at 96 DPI
+        return (
+            '<div style="margin: 8px 0; max-width: 700px;">'
+            '<div style="height: 100px; width: 100%; background: white; border: none;"></div></div>'
+        )
+
+    def emit_graph(self, node, images, lines):
+        return build_graph_html(node.attrs['width_cm'], node.attrs['height_cm'])
+
+    # Answer lines and images differ between the exam paper and the marking scheme
+    line_extra_style = ''
+
+    def line_class(self, line_style: str) -> str:
+        return f'answer-line {line_style}'
+
+    def emit_lines(self, node, images, lines):
+        line_config = lines.get(node.attrs['id'])
+        if not line_config:
+            return self.missing_lines(node)
+
+        num_lines = line_config.get('numberOfLines', 5)
+        line_height = line_config.get('lineHeight', 30)
+        line_style = line_config.get('lineStyle', 'dotted')
+        opacity = line_config.get('opacity', 0.5)
+
+        line_class = self.line_class(line_style)
+        html = ['<div class="answer-lines">']
+        heights = [line_height] * int(num_lines)
+        # Half line if needed
+        if (num_lines % 1) != 0:
+            heights.append(line_height / 2)
+        for height in heights:
+            html.append(
+                f'<div class="{line_class}" style="height: {height}px; border-bottom: 2px {line_style} '
+                f'rgba(0, 0, 0, {opacity});{self.line_extra_style}"></div>'
+            )
+        html.append('</div>')
+        return ''.join(html)
+
+    def missing_lines(self, node) -> str:
+        return ''
+
+    def emit_image(self, node, images, lines):
+        image = images.get(node.attrs['id'])
+        if not (image and image.get('url')):
+            return self.missing_image(node)
+        return self.image_html(image, node.attrs['width'], node.attrs['height'])
+
+    @abstractmethod
+    def image_html(self, image: Dict, width: int, height: Optional[int]) -> str:
+        """<img> markup for an image with a URL, sized in pixels"""
+
+    def missing_image(self, node) -> str:
+        return ''
+
+
+class QuestionHtmlEmitter(HtmlEmitter):
+    """Exam paper rendering: placeholders for missing lines/images"""
+
+    name = 'question'
+
+    def missing_lines(self, node) -> str:
+        return (
+            '<div style="margin: 10px 0; padding: 10px; background: #fff3cd; border: 1px solid #ffc107; '
+            f'border-radius: 4px; font-size: 11pt;"> Answer Lines (ID: {int(node.attrs["id"])})</div>'
+        )
+
+    def image_html(self, image, width, height):
+        style = f"width: {width}px;"
+        if height:
+            style += f" height: {height}px;"
+        return f'<img src="{image["url"]}" alt="{image.get("name", "Question image")}" class="question-image" style="{style}" />'
+
+    def missing_image(self, node) -> str:
+        return (
+            '<div style="margin: 10px 0; padding: 10px; background: #f8d7da; border: 1px solid #dc3545; '
+            f'border-radius: 4px; font-size: 11pt;">❌ Image Not Found (ID: {int(node.attrs["id"])})</div>'
+        )
+
+
+class AnswerHtmlEmitter(HtmlEmitter):
+    """Marking scheme rendering: classed inline tags, missing lines/images are left out"""
+
+    name = 'answer'
+    bold_tag = '<strong class="bold">'
+    italic_tag = '<em class="italic">'
+    underline_tag = '<u class="underline">'
+    line_extra_style = ' margin: 0; padding: 0;'
+
+    def line_class(self, line_style: str) -> str:
+        return 'answer-line'
+
+    def image_html(self, image, width, height):
+        style = f"width: {width}px;"
+        if height:
+            style += f" height: {height}px;"
+        else:
+            style += " height: auto;"
+        return f'<br><img src="{image["url"]}" alt="{image.get("name", "Answer image")}" class="answer-image" style="{style}" /><br>'
+
+
+question_emitter = QuestionHtmlEmitter()
+answer_emitter = AnswerHtmlEmitter()
+
+
+def _by_id(items) -> Dict:
+    lookup = {}
+    if items:
+        for item in items:
+            lookup[float(item.get('id', 0))] = item
+    return lookup
+
+
+def render_markup(text: str, images: List[Dict] = None, answer_lines: List[Dict] = None,
+                  emitter: HtmlEmitter = None) -> str:
+    """
+    Render question/answer text to HTML
+
+    Args:
+        text: Text with markup
+        images: Image objects with id, url, name
+        answer_lines: Answer line configurations with id, numberOfLines, lineHeight, ...
+        emitter: HtmlEmitter to use (defaults to the exam paper rendering)
+    """
+    if not text:
+        return ''
+    return (emitter or question_emitter).render(parse(text), _by_id(images), _by_id(answer_lines))
+
+
+def render_question_html(text, images=None, answer_lines=None) -> str:
+    """Question text as rendered on the exam paper"""
+    return render_markup(text, images, answer_lines, question_emitter)
+
+
+def render_answer_html(text, images=None, answer_lines=None) -> str:
+    """Answer text as rendered in the marking scheme"""
+    if not text:
+        return "No answer provided"
+    return render_markup(text, images, answer_lines, answer_emitter)
@@ -0,0 +1,155 @@
+"""
+Question Pagination
+Keyset (cursor) pages of questions, newest first, with optional cached totals
+
+The question listing endpoints paginated with OFFSET over `-created_at` and ran a
+full count() on every page, so each infinite-scroll page was slower than the one
+before it. With `?cursor=` they now page by keyset instead:
+- rows are ordered by (created_at, id) descending; `id` breaks ties between
+  questions created in the same instant
+- the opaque cursor encodes the (created_at, id) of the last row served, and the
+  next page starts right after it (`created_at <= last` lets Postgres range-scan
+  the -created_at index), so page 200 costs the same as page 1
+- the total is optional (`?count=`): 'cached' (default, per process for
+  QUESTION_COUNT_CACHE_SECONDS and dropped when a question changes), 'estimate'
+  (planner row estimate, no scan), 'exact' or 'none'
+
+Requests with `page` and no `cursor` keep the previous OFFSET behaviour.
+"""
+
+import base64
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+# Keyset ordering; must be unique so no row is skipped or repeated between pages
+CURSOR_ORDERING = ('-created_at', '-id')
+
+COUNT_MODES = ('cached', 'estimate', 'exact', 'none')
+
+
+class InvalidCursor(ValueError):
+    """Raised for cursor tokens that were not produced by encode_cursor()"""
+
+
+def encode_cursor(question) -> str:
+    """Opaque token pointing right after the given question"""
+    payload = json.dumps([question.created_at.isoformat(), str(question.id)])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Tuple[datetime, uuid.UUID]:
+    """(created_at, id) of a cursor token"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, question_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), uuid.UUID(question_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {token[:40]}') from e
+
+
+class CountCache:
+    """Process-level cache of queryset counts, keyed by their SQL"""
+
+    def __init__(self, ttl: int = 60, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (count, stored_at)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(queryset: QuerySet) -> Tuple:
+        sql, params = queryset.order_by().query.sql_with_params()
+        return (sql, tuple(str(param) for param in params))
+
+    def count(self, queryset: QuerySet) -> int:
+        key = self._key(queryset)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                return entry[0]
+
+        total = queryset.count()
+        with self._lock:
+            self._entries[key] = (total, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return total
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache(ttl=getattr(settings, 'QUESTION_COUNT_CACHE_SECONDS', 60))
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """Row count the query planner expects for the queryset (EXPLAIN only, no scan)"""
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def question_total(queryset: QuerySet, mode: str = 'cached') -> Optional[int]:
+    """Total of a question queryset according to a COUNT_MODES mode (None for 'none')"""
+    if mode == 'none':
+        return None
+    if mode == 'estimate':
+        return estimate_count(queryset)
+    if mode == 'exact':
+        return queryset.count()
+    return count_cache.count(queryset)
+
+
+def cursor_page(queryset: QuerySet, params, limit: int) -> Tuple[List, Dict]:
+    """
+    One keyset page of a filtered question queryset
+
+    Args:
+        queryset: Filtered Question queryset (any ordering is replaced)
+        params: Request query parameters; reads `cursor` and `count`
+        limit: Page size
+
+    Returns:
+        (questions, pagination) where pagination holds limit, next_cursor,
+        has_next, total and count_mode
+
+    Raises:
+        InvalidCursor: if the cursor token cannot be decoded
+    """
+    token = params.get('cursor') or ''
+    count_mode = params.get('count', 'cached')
+    if count_mode not in COUNT_MODES:
+        count_mode = 'cached'
+
+    page_queryset = queryset
+    if token:
+        created_at, question_id = decode_cursor(token)
+        page_queryset = page_queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=question_id),
+            created_at__lte=created_at,
+        )
+
+    # One extra row tells whether there is a next page without counting
+    questions = list(page_queryset.order_by(*CURSOR_ORDERING)[:limit + 1])
+    has_next = len(questions) > limit
+    questions = questions[:limit]
+
+    return questions, {
+        'limit': limit,
+        'cursor': token or None,
+        'next_cursor': encode_cursor(questions[-1]) if has_next else None,
+        'has_next': has_next,
+        'total': question_total(queryset, count_mode),
+        'count_mode': count_mode,
+    }
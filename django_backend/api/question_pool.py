@@ -0,0 +1,268 @@
+"""
+Question Pool Snapshot Cache
+Process-level cache of compact question records used by the paper generators
+
+Every generate call used to run the same `Question.objects.filter(...)` scan for the
+same paper and topic set. The cache keeps a compact snapshot of the active questions
+per (paper, topic set):
+- One PoolRecord per question: id, marks, topic, section, is_nested and the flags
+  the generators select on. No question/answer text or inline images.
+- Entries expire after QUESTION_POOL_CACHE_TTL seconds and the least recently used
+  entry is evicted once QUESTION_POOL_CACHE_SIZE snapshots are held.
+- Saving or deleting a Question or Topic drops every snapshot of its paper
+  (see api/signals.py). Other worker processes pick the change up on TTL expiry.
+
+Generators select from the snapshot and only fetch full Question rows for the
+finally selected IDs via hydrate_questions().
+"""
+
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from .models import Question
+
+
+# Columns needed to select questions - deliberately excludes text and image JSON
+POOL_FIELDS = (
+    'id', 'marks', 'is_nested', 'is_graph', 'is_essay', 'is_map',
+    'kcse_question_type', 'paper2_category', 'difficulty', 'question_type',
+    'topic_id', 'topic__name',
+    'section_id', 'section__name', 'section__order',
+)
+
+
+class PoolTopic:
+    """Minimal topic reference shared by all records of the same topic"""
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+class PoolSection:
+    """Minimal section reference shared by all records of the same section"""
+    __slots__ = ('id', 'name', 'order')
+
+    def __init__(self, id, name, order):
+        self.id = id
+        self.name = name
+        self.order = order
+
+
+class PoolRecord:
+    """
+    Compact, read-only view of a question used during selection
+
+    Exposes the same attribute names as Question for the fields the generators
+    select on (marks, is_nested, topic.name, section.name, ...), so selection code
+    works unchanged on records.
+    """
+    __slots__ = (
+        'id', 'marks', 'is_nested', 'is_graph', 'is_essay', 'is_map',
+        'kcse_question_type', 'paper2_category', 'difficulty', 'question_type',
+        'topic_id', 'topic', 'section_id', 'section',
+    )
+
+    def __init__(self, row: Tuple, topics: dict, sections: dict):
+        (self.id, self.marks, self.is_nested, self.is_graph, self.is_essay, self.is_map,
+         self.kcse_question_type, self.paper2_category, self.difficulty, self.question_type,
+         self.topic_id, topic_name, self.section_id, section_name, section_order) = row
+
+        if self.topic_id not in topics:
+            topics[self.topic_id] = PoolTopic(self.topic_id, topic_name)
+        self.topic = topics[self.topic_id]
+
+        if self.section_id is None:
+            self.section = None
+        else:
+            if self.section_id not in sections:
+                sections[self.section_id] = PoolSection(self.section_id, section_name, section_order)
+            self.section = sections[self.section_id]
+
+    def __repr__(self):
+        return f"PoolRecord({self.id}, {self.marks} marks)"
+
+
+class QuestionPoolCache:
+    """Thread-safe TTL + LRU cache of question pool snapshots"""
+
+    def __init__(self, max_entries: int = 64, ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, records)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(paper_id, topic_ids: Iterable) -> Tuple[str, frozenset]:
+        return (str(paper_id), frozenset(str(tid) for tid in topic_ids))
+
+    def get(self, key) -> Optional[Tuple[PoolRecord, ...]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, records = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return records
+
+    def set(self, key, records: Tuple[PoolRecord, ...]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, records)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_paper(self, paper_id):
+        """Drop every snapshot belonging to a paper"""
+        paper_key = str(paper_id)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == paper_key]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+pool_cache = QuestionPoolCache(
+    max_entries=getattr(settings, 'QUESTION_POOL_CACHE_SIZE', 64),
+    ttl_seconds=getattr(settings, 'QUESTION_POOL_CACHE_TTL', 300),
+)
+
+
+def get_question_pool(paper, topic_ids: Iterable) -> List[PoolRecord]:
+    """
+    Return compact records of all active questions of `paper` in the given topics
+
+    The returned list is a fresh copy, so callers may shuffle or filter it freely.
+    """
+    topic_ids = list(topic_ids)
+    key = pool_cache.make_key(paper.id, topic_ids)
+    records = pool_cache.get(key)
+
+    if records is None:
+        records = tuple(load_pool_records(Question.objects.filter(
+            paper=paper,
+            topic_id__in=topic_ids,
+            is_active=True
+        )))
+        pool_cache.set(key, records)
+
+    return list(records)
+
+
+def load_pool_records(queryset) -> List[PoolRecord]:
+    """
+    Project an arbitrary Question queryset onto compact PoolRecords (uncached)
+
+    For generators whose candidate queries do not fit the (paper, topic set) pool,
+    e.g. English questions filtered by question_type.
+    """
+    topics, sections = {}, {}
+    return [PoolRecord(row, topics, sections) for row in queryset.values_list(*POOL_FIELDS)]
+
+
+class PoolSampler:
+    """
+    Random access over a pool snapshot, replacing per-step `.order_by('?')[:n]` queries
+
+    Records are bucketed by (topic, marks, is_nested) once; every sample is then a
+    filter over the matching buckets plus random.sample, with no database access.
+    """
+
+    def __init__(self, records: Iterable[PoolRecord], rng=None):
+        self.rng = rng or random
+        self._buckets = defaultdict(list)
+        for record in records:
+            self._buckets[(str(record.topic_id), record.marks, record.is_nested)].append(record)
+
+    def sample(self, limit: Optional[int] = None, exclude: Iterable = (),
+               topic_ids: Optional[Iterable] = None, marks: Optional[int] = None,
+               min_marks: Optional[int] = None, max_marks: Optional[int] = None,
+               is_nested: Optional[bool] = None) -> List[PoolRecord]:
+        """
+        Return up to `limit` random matching records in random order
+
+        Args:
+            limit: Maximum number of records (None returns every match)
+            exclude: Question IDs (str or UUID) that must not be returned
+            topic_ids: Restrict to these topics
+            marks / min_marks / max_marks: Exact mark value or inclusive range
+            is_nested: Restrict to nested (True) or standalone (False) questions
+        """
+        topic_ids = {str(t) for t in topic_ids} if topic_ids is not None else None
+        excluded = {str(i) for i in exclude}
+
+        candidates = []
+        for (topic_id, record_marks, record_nested), bucket in self._buckets.items():
+            if topic_ids is not None and topic_id not in topic_ids:
+                continue
+            if marks is not None and record_marks != marks:
+                continue
+            if min_marks is not None and record_marks < min_marks:
+                continue
+            if max_marks is not None and record_marks > max_marks:
+                continue
+            if is_nested is not None and record_nested != is_nested:
+                continue
+            candidates.extend(r for r in bucket if str(r.id) not in excluded)
+
+        if limit is not None and len(candidates) > limit:
+            return self.rng.sample(candidates, limit)
+        self.rng.shuffle(candidates)
+        return candidates
+
+
+def hydrate_questions(records: Sequence) -> List[Question]:
+    """
+    Fetch full Question rows for the selected records, preserving their order
+
+    Accepts PoolRecords or Questions; Questions are passed through unchanged.
+    """
+    ids = [r.id for r in records if not isinstance(r, Question)]
+    if not ids:
+        return list(records)
+
+    by_id = Question.objects.select_related('topic', 'section').in_bulk(ids)
+    missing = [str(i) for i in ids if i not in by_id]
+    if missing:
+        # A selected question was deleted between snapshot and hydration
+        raise ValueError(f"Selected questions no longer exist: {', '.join(missing)}")
+
+    return [r if isinstance(r, Question) else by_id[r.id] for r in records]
+
+
+def hydrate_question_map(records: Iterable) -> Dict:
+    """
+    Fetch full Question rows for selected records in one query, keyed by id
+
+    For generators that keep their selection in nested structures (combined
+    questions, one attribute per paper slot) rather than a flat list. None
+    entries are skipped.
+    """
+    records = [r for r in records if r is not None]
+    return {q.id: q for q in hydrate_questions(records)}
@@ -0,0 +1,119 @@
+"""
+Question Search
+Ranked full-text and trigram search over the question bank
+
+Question search used to filter with `question_text ILIKE '%...%' OR answer_text
+ILIKE '%...%'`, a sequential scan over every question body that grew linearly with
+the bank. Search now runs on Postgres indexes (migration 0018):
+- questions.search_vector: tsvector of the question text (weight A) and answer
+  text (weight B), maintained by a BEFORE INSERT/UPDATE trigger, so bulk_create
+  and raw updates keep it current as well; GIN indexed
+- gin_trgm_ops (pg_trgm) GIN indexes on the question and answer text, which
+  serve substring and fuzzy (trigram word similarity) matches. Substring
+  matches use the `ilike_contains` lookup (`col ILIKE '%...%'`): Django's
+  icontains compiles to UPPER(col) LIKE, which an index on the bare column
+  cannot serve
+
+Two modes, ranked by ts_rank:
+- 'text': every word must match (websearch syntax: "quoted phrases", -excluded),
+  or the text occurs as a substring, or it is a near miss (typos; pg_trgm's
+  word_similarity_threshold, 0.6 by default); trigram word similarity adds
+  to the rank
+- 'similar': any significant word matches; ranks questions sharing the most
+  words first (keyword candidates of the authoring duplicate check)
+
+substring_questions() keeps the plain "text occurs in the question or answer"
+filter, newest first, for callers that want exact substring semantics.
+"""
+
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, TrigramWordSimilarity,
+)
+from django.db.models import F, FloatField, Q, QuerySet, TextField, Value
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import PatternLookup
+
+# Text search configuration used by the trigger in migration 0018 (must match)
+SEARCH_CONFIG = 'english'
+
+# Words of a 'similar' query that are used (the first ones, in order)
+MAX_SIMILAR_TERMS = 32
+
+WORD_PATTERN = re.compile(r'\w{3,}', re.UNICODE)
+
+
+@TextField.register_lookup
+class ILikeContains(PatternLookup):
+    """Case-insensitive substring match as `col ILIKE '%text%'`, served by gin_trgm_ops indexes"""
+    lookup_name = 'ilike_contains'
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        params.extend(rhs_params)
+        return f'{lhs_sql} ILIKE {rhs_sql}', params
+
+
+def _substring_match(text: str) -> Q:
+    """The text occurs in the question or the answer"""
+    return Q(question_text__ilike_contains=text) | Q(answer_text__ilike_contains=text)
+
+
+def _similar_query(text: str):
+    """OR query of the significant words of the text, or None if there are none"""
+    words = []
+    for word in WORD_PATTERN.findall(text.lower()):
+        if word not in words:
+            words.append(word)
+        if len(words) == MAX_SIMILAR_TERMS:
+            break
+    if not words:
+        return None
+    # Quoted lexemes are still stemmed by the configuration's dictionaries
+    raw = ' | '.join("'" + word.replace("'", "''") + "'" for word in words)
+    return SearchQuery(raw, search_type='raw', config=SEARCH_CONFIG)
+
+
+def search_questions(queryset: QuerySet, text: str, mode: str = 'text') -> QuerySet:
+    """
+    Filter a Question queryset to the questions matching the text, best first
+
+    Args:
+        queryset: Question queryset, already filtered (subject, paper, ...)
+        text: Search text typed by the user
+        mode: 'text' (all words, substring or fuzzy) or 'similar' (any word)
+
+    Returns:
+        The queryset annotated with `search_rank` and ordered by it (then newest
+        first); empty when the text has nothing searchable
+    """
+    text = (text or '').strip()
+    if not text:
+        return queryset.none()
+
+    if mode == 'similar':
+        query = _similar_query(text)
+        if query is None:
+            return queryset.none()
+        match = Q(search_vector=query)
+    else:
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        match = Q(search_vector=query) | _substring_match(text)
+        if len(text) >= 3:
+            match |= Q(question_text__trigram_word_similar=text)
+
+    rank = Coalesce(SearchRank(F('search_vector'), query), Value(0.0), output_field=FloatField())
+    if mode != 'similar':
+        rank = rank + TrigramWordSimilarity(text, 'question_text')
+
+    return queryset.filter(match).annotate(search_rank=rank).order_by('-search_rank', '-created_at')
+
+
+def substring_questions(queryset: QuerySet, text: str) -> QuerySet:
+    """Questions whose question or answer text contains the text (case-insensitive), newest first"""
+    text = (text or '').strip()
+    if not text:
+        return queryset.none()
+    return queryset.filter(_substring_match(text)).order_by('-created_at')
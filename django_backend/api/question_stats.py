@@ -0,0 +1,116 @@
+"""
+Question Bank Statistics
+Dashboard statistics aggregated from the materialized question_stats table
+
+question_statistics_only, get_question_stats and get_creator_statistics used to run
+seven or more aggregate queries over the whole questions table on every dashboard
+visit. The QuestionStat table holds one row per
+(subject, paper, topic, creator, marks, is_nested, is_active) with the number of
+questions and the sum of their times_used:
+- a trigger on questions (migration 0020) adjusts the matching rows on every
+  insert, update and delete, including bulk_create/bulk_update, in the same
+  transaction
+- `python manage.py rebuild_question_stats` recomputes the table from scratch
+
+The endpoints load the rows in one query (with subject, paper, topic and creator
+names) and group them in Python with group_stats(). Marks are part of the key, so
+marks sums and distributions need no extra query.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from django.db import connection, transaction
+
+from .models import QuestionStat
+
+
+STAT_FIELDS = (
+    'subject_id', 'subject__name',
+    'paper_id', 'paper__name',
+    'topic_id', 'topic__name',
+    'created_by_id', 'created_by__full_name', 'created_by__phone_number',
+    'marks', 'is_nested', 'is_active', 'question_count', 'usage_sum',
+)
+
+REBUILD_SQL = """
+DELETE FROM question_stats;
+INSERT INTO question_stats
+    (subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active, question_count, usage_sum)
+SELECT subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active, COUNT(*), COALESCE(SUM(times_used), 0)
+FROM questions
+GROUP BY subject_id, paper_id, topic_id, created_by_id, marks, is_nested, is_active;
+"""
+
+
+class StatGroup:
+    """Totals of the stat rows sharing a grouping key"""
+    __slots__ = ('row', 'total', 'active', 'inactive', 'marks_sum', 'usage_sum', 'marks', 'creators')
+
+    def __init__(self, row: dict):
+        self.row = row  # first row of the group, for names and ids
+        self.total = 0
+        self.active = 0
+        self.inactive = 0
+        self.marks_sum = 0
+        self.usage_sum = 0
+        self.marks = Counter()  # marks -> number of questions
+        self.creators = set()
+
+    def add(self, row: dict):
+        count = row['question_count']
+        self.total += count
+        if row['is_active']:
+            self.active += count
+        else:
+            self.inactive += count
+        self.marks_sum += row['marks'] * count
+        self.usage_sum += row['usage_sum']
+        self.marks[row['marks']] += count
+        if row['created_by_id']:
+            self.creators.add(row['created_by_id'])
+
+    @property
+    def avg_marks(self) -> float:
+        return round(self.marks_sum / self.total, 2) if self.total else 0
+
+    def marks_distribution(self) -> List[Dict]:
+        return [{'marks': marks, 'count': count} for marks, count in sorted(self.marks.items())]
+
+
+def load_stats(**filters) -> List[dict]:
+    """Stat rows (STAT_FIELDS dicts) matching the filters, in one query"""
+    return list(QuestionStat.objects.filter(question_count__gt=0, **filters).values(*STAT_FIELDS))
+
+
+def group_stats(rows: Iterable[dict], key: Optional[Callable[[dict], Hashable]] = None) -> 'OrderedDict[Hashable, StatGroup]':
+    """Sum stat rows per key (all rows in one group under None when no key is given)"""
+    groups = OrderedDict()
+    for row in rows:
+        group_key = key(row) if key else None
+        group = groups.get(group_key)
+        if group is None:
+            group = groups[group_key] = StatGroup(row)
+        group.add(row)
+    return groups
+
+
+def total_stats(rows: Iterable[dict]) -> StatGroup:
+    """Totals of all rows"""
+    return group_stats(rows).get(None) or StatGroup({})
+
+
+def rebuild_stats() -> int:
+    """
+    Recompute question_stats from the questions table
+
+    Question writes wait while the table is rebuilt, so no trigger update is lost.
+
+    Returns:
+        Number of stat rows written
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("LOCK TABLE questions IN SHARE MODE")
+            cursor.execute(REBUILD_SQL)
+    return QuestionStat.objects.count()
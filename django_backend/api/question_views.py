@@ -3,14 +3,17 @@ Question Management Views for Examination System
 Equivalent to Node.js questions routes
 """
 
+import itertools
 import logging
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Count
 from django.utils import timezone
-from django.http import HttpResponse
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from django.template.loader import render_to_string
 
 from .models import Question, Subject, Paper, Topic, Section
@@ -20,7 +23,12 @@ from .serializers import (
     QuestionListLightweightSerializer
 )
 from .utils import success_response, error_response
-from .exam_paper_template import _process_question_text
+from .fragment_cache import fragment_source, prefetch_fragments, render_question_fragment
+from .image_store import load_image, public_images
+from .near_duplicates import find_near_duplicates
+from .question_pagination import CURSOR_ORDERING, InvalidCursor, cursor_page, question_total
+from .question_search import search_questions, substring_questions
+from .question_stats import group_stats, load_stats, total_stats
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +41,7 @@ def questions_list_create(request):
     """
     List all questions with pagination (GET) or create new question (POST)
     GET /api/questions?page=1&limit=50
+    GET /api/questions?cursor=<next_cursor>&limit=50&count=cached
     POST /api/questions
     
     NEW: Returns lightweight metadata only by default. For full question details, use /api/questions/<id>
@@ -70,17 +79,35 @@ def questions_list_create(request):
         if is_active is not None:
             queryset = queryset.filter(is_active=(is_active.lower() == 'true'))
         
-        total = queryset.count()
+        serializer_class = QuestionListSerializer if include_details else QuestionListLightweightSerializer
+        
+        # Keyset pagination: ?cursor= (empty for the first page), see api/question_pagination.py
+        if 'cursor' in request.query_params:
+            try:
+                questions, pagination = cursor_page(queryset, request.query_params, limit)
+            except InvalidCursor as e:
+                return error_response(str(e), status=status.HTTP_400_BAD_REQUEST)
+            
+            serializer = serializer_class(questions, many=True)
+            return success_response(
+                'Questions retrieved successfully',
+                {
+                    'questions': serializer.data,
+                    'total': pagination['total'],
+                    'limit': limit,
+                    'next_cursor': pagination['next_cursor'],
+                    'has_next': pagination['has_next']
+                }
+            )
+        
+        total = question_total(queryset, request.query_params.get('count', 'exact'))
         start = (page - 1) * limit
         end = start + limit
-        questions = queryset.order_by('-created_at')[start:end]
+        questions = queryset.order_by(*CURSOR_ORDERING)[start:end]
         
         # Use lightweight serializer by default (excludes text and images for performance)
         # Use full serializer only if explicitly requested
-        if include_details:
-            serializer = QuestionListSerializer(questions, many=True)
-        else:
-            serializer = QuestionListLightweightSerializer(questions, many=True)
+        serializer = serializer_class(questions, many=True)
         
         if len(serializer.data) > 0 and include_details:
             first_q = serializer.data[0]
@@ -93,7 +120,7 @@ def questions_list_create(request):
                 'total': total,
                 'page': page,
                 'limit': limit,
-                'pages': (total + limit - 1) // limit
+                'pages': (total + limit - 1) // limit if total is not None else None
             }
         )
     
@@ -298,9 +325,13 @@ def list_questions_paginated(request):
     Frontend loads 50 at a time as user scrolls (social media style).
     
     GET /api/questions/paginated/scroll?page=1&limit=50&subject=...&paper=...
+    GET /api/questions/paginated/scroll?cursor=<next_cursor>&limit=50&subject=...
     
     Query Parameters:
-    - page: Page number (default 1)
+    - cursor: Keyset pagination token (empty for the first page; use next_cursor
+      of the previous page). Pages cost the same however deep the scroll is.
+    - count: Total with cursor pages: cached (default), estimate, exact or none
+    - page: Page number (default 1), OFFSET pagination when no cursor is given
     - limit: Items per page (default 50, max 100)
     - subject: Filter by subject ID
     - paper: Filter by paper ID
@@ -343,20 +374,35 @@ def list_questions_paginated(request):
     if is_active is not None:
         queryset = queryset.filter(is_active=(is_active.lower() == 'true'))
     
+    # Keyset pagination: ?cursor= (empty for the first page), see api/question_pagination.py
+    if 'cursor' in request.query_params:
+        try:
+            questions, pagination = cursor_page(queryset, request.query_params, limit)
+        except InvalidCursor as e:
+            return error_response(str(e), status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = QuestionListLightweightSerializer(questions, many=True)
+        return success_response(
+            'Questions paginated successfully',
+            {
+                'questions': serializer.data,
+                'pagination': pagination
+            }
+        )
+    
     # Get total count before pagination
-    total = queryset.count()
+    total = question_total(queryset, request.query_params.get('count', 'exact'))
     
-    # Apply pagination
+    # Apply pagination (one extra row tells whether there is a next page)
     start = (page - 1) * limit
     end = start + limit
-    questions = queryset.order_by('-created_at')[start:end]
+    questions = list(queryset.order_by(*CURSOR_ORDERING)[start:end + 1])
+    has_next = len(questions) > limit
+    questions = questions[:limit]
     
     # Use lightweight serializer
     serializer = QuestionListLightweightSerializer(questions, many=True)
     
-    # Determine if there's a next page (useful for infinite scroll)
-    has_next = (start + limit) < total
-    
     return success_response(
         'Questions paginated successfully',
         {
@@ -365,7 +411,7 @@ def list_questions_paginated(request):
                 'page': page,
                 'limit': limit,
                 'total': total,
-                'pages': (total + limit - 1) // limit,
+                'pages': (total + limit - 1) // limit if total is not None else None,
                 'has_next': has_next,
                 'has_previous': page > 1
             }
@@ -472,11 +518,7 @@ def search_similar_questions(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Build query with text search
-    queryset = Question.objects.filter(
-        Q(question_text__icontains=text) | Q(answer_text__icontains=text),
-        is_active=True
-    )
+    queryset = Question.objects.filter(is_active=True)
     
     if subject_id:
         queryset = queryset.filter(subject_id=subject_id)
@@ -485,10 +527,10 @@ def search_similar_questions(request):
     if topic_id:
         queryset = queryset.filter(topic_id=topic_id)
     
-    # Get questions
-    questions = queryset.select_related(
+    # Questions containing the text, newest first (trigram indexed, see api/question_search.py)
+    questions = substring_questions(queryset, text).select_related(
         'subject', 'paper', 'topic'
-    ).order_by('-created_at')[:limit]
+    )[:limit]
     
     serializer = QuestionListSerializer(questions, many=True)
     
@@ -502,13 +544,17 @@ def search_similar_questions(request):
 @permission_classes([IsAuthenticated])
 def search_similar_questions_post(request):
     """
-    Search for similar questions using POST method (better for longer text)
+    Search for near-duplicates of a question being authored (better for longer text)
     POST /api/questions/search-similar/
-    Body: { "question_text": "...", "subject": "subject_id", "limit": 5 }
+    Body: { "question_text": "...", "subject": "subject name", "limit": 5, "exclude": "question_id" }
+    
+    similarity_score is the estimated Jaccard similarity of the texts' character
+    shingles, in percent (MinHash/LSH over the whole subject, see api/near_duplicates.py).
     """
     text = request.data.get('question_text', '')
     subject_name = request.data.get('subject', '')
     limit = request.data.get('limit', 5)
+    exclude_id = request.data.get('exclude') or None
     
     if not text or len(text) < 15:
         return success_response(
@@ -531,65 +577,40 @@ def search_similar_questions_post(request):
             {'similar_questions': []}
         )
     
-    # Split text into words for better matching
-    words = [word.strip().lower() for word in text.split() if len(word.strip()) > 3]
+    try:
+        limit = max(1, min(int(limit), 50))
+    except (TypeError, ValueError):
+        limit = 5
     
     logger.info(f'[SIMILAR] Searching for similar questions in subject: {subject_name}')
     logger.info(f'[SIMILAR] Search text: {text[:100]}...')
-    logger.info(f'[SIMILAR] Extracted keywords: {words[:10]}')
     
-    if not words:
-        return success_response(
-            'No significant words found',
-            {'similar_questions': []}
-        )
+    # Near-duplicates by estimated Jaccard similarity (MinHash/LSH, see api/near_duplicates.py)
+    matches = find_near_duplicates(text, subject=subject, limit=limit, exclude_id=exclude_id)
     
-    # Build query - search for questions containing multiple keywords
-    query = Q()
-    for word in words[:10]:  # Limit to first 10 significant words
-        query |= Q(question_text__icontains=word)
-    
-    # Filter by subject and active status
-    queryset = Question.objects.filter(
-        query,
-        subject=subject,
-        is_active=True
-    ).select_related(
-        'subject', 'paper', 'topic', 'section'
-    ).distinct()
-    
-    # Calculate similarity score (simple keyword matching)
     results = []
-    for question in queryset[:limit * 2]:  # Get more and filter later
-        question_words = set(question.question_text.lower().split())
-        matching_words = sum(1 for word in words if any(word in qword for qword in question_words))
-        similarity_score = (matching_words / len(words)) * 100 if words else 0
-        
-        if similarity_score > 10:  # Only include if >10% similarity (lowered from 20%)
-            results.append({
-                'id': question.id,
-                'question_text': question.question_text,
-                'question_inline_images': question.question_inline_images,
-                'question_image_positions': question.question_image_positions,
-                'question_answer_lines': question.question_answer_lines,
-                'answer_text': question.answer_text,
-                'answer_inline_images': question.answer_inline_images,
-                'answer_image_positions': question.answer_image_positions,
-                'answer_answer_lines': question.answer_answer_lines,
-                'topic': question.topic.name if question.topic else 'N/A',
-                'paper': question.paper.name if question.paper else 'N/A',
-                'section': question.section.name if question.section else 'N/A',
-                'marks': question.marks,
-                'status': 'Active' if question.is_active else 'Inactive',
-                'similarity_score': round(similarity_score, 1),
-                'timestamp': question.created_at.isoformat()
-            })
-    
-    # Sort by similarity score and limit results
-    results.sort(key=lambda x: x['similarity_score'], reverse=True)
-    results = results[:limit]
+    for question, jaccard in matches:
+        results.append({
+            'id': question.id,
+            'question_text': question.question_text,
+            'question_inline_images': public_images(question.question_inline_images),
+            'question_image_positions': question.question_image_positions,
+            'question_answer_lines': question.question_answer_lines,
+            'answer_text': question.answer_text,
+            'answer_inline_images': public_images(question.answer_inline_images),
+            'answer_image_positions': question.answer_image_positions,
+            'answer_answer_lines': question.answer_answer_lines,
+            'topic': question.topic.name if question.topic else 'N/A',
+            'paper': question.paper.name if question.paper else 'N/A',
+            'section': question.section.name if question.section else 'N/A',
+            'marks': question.marks,
+            'status': 'Active' if question.is_active else 'Inactive',
+            'similarity_score': round(jaccard * 100, 1),
+            'jaccard': round(jaccard, 3),
+            'timestamp': question.created_at.isoformat()
+        })
     
-    logger.info(f'[SIMILAR] Found {len(results)} similar questions with >10% similarity')
+    logger.info(f'[SIMILAR] Found {len(results)} near-duplicate questions')
     if results:
         logger.info(f'[SIMILAR] Top match: {results[0]["similarity_score"]}% - {results[0]["question_text"][:50]}')
     
@@ -641,51 +662,61 @@ def get_question_stats(request):
     
     GET /api/questions/stats/overview?subject=...&paper=...
     
-    OPTIMIZED: Uses aggregate queries only, never loads question text/images/answers.
-    This is intentionally separated from question list endpoint to prevent frontend freezing.
+    OPTIMIZED: Reads the materialized question_stats table (one query, two with
+    subject/paper filters), never loads question rows. This is intentionally separated from question list endpoint to
+    prevent frontend freezing.
     """
     subject_id = request.query_params.get('subject')
     paper_id = request.query_params.get('paper')
     
-    # Build query for all questions (not just active)
-    queryset = Question.objects.all()
-    
+    # Materialized stats table (see api/question_stats.py), filtered in the query
+    filters = {}
     if subject_id:
-        queryset = queryset.filter(subject_id=subject_id)
+        filters['subject_id'] = subject_id
     if paper_id:
-        queryset = queryset.filter(paper_id=paper_id)
-    
-    # Get total counts
-    total_questions = queryset.count()
-    active_questions = queryset.filter(is_active=True).count()
-    inactive_questions = queryset.filter(is_active=False).count()
+        filters['paper_id'] = paper_id
+    filtered = load_stats(**filters)
+    totals = total_stats(filtered)
+    total_questions = totals.total
+    active_questions = totals.active
+    inactive_questions = totals.inactive
     
     # Get overview statistics for active questions only
-    overview = queryset.filter(is_active=True).aggregate(
-        total_marks=Sum('marks'),
-        avg_marks=Avg('marks'),
-        total_usage=Sum('times_used')
-    )
+    active_totals = total_stats(row for row in filtered if row['is_active'])
+    overview = {
+        'total_marks': active_totals.marks_sum,
+        'avg_marks': active_totals.avg_marks,
+        'total_usage': active_totals.usage_sum
+    }
     
-    # Get questions by subject
-    by_subject = Question.objects.filter(
-        is_active=True
-    ).values(
-        'subject__name'
-    ).annotate(
-        count=Count('id')
-    ).order_by('-count')
+    # Get questions by subject (all subjects)
+    if filters:
+        active_rows = load_stats(is_active=True)
+    else:
+        active_rows = [row for row in filtered if row['is_active']]
+    by_subject = sorted(
+        (
+            {'subject__name': group.row['subject__name'], 'count': group.total}
+            for group in group_stats(active_rows, key=lambda row: row['subject_id']).values()
+        ),
+        key=lambda item: -item['count']
+    )
     
     # Get questions by subject and creator
-    by_subject_creator = Question.objects.filter(
-        is_active=True
-    ).select_related('subject', 'created_by').values(
-        'subject__name',
-        'created_by__id',
-        'created_by__full_name'
-    ).annotate(
-        count=Count('id')
-    ).order_by('subject__name', '-count')
+    by_subject_creator = sorted(
+        (
+            {
+                'subject__name': group.row['subject__name'],
+                'created_by__id': group.row['created_by_id'],
+                'created_by__full_name': group.row['created_by__full_name'],
+                'count': group.total
+            }
+            for group in group_stats(
+                active_rows, key=lambda row: (row['subject_id'], row['created_by_id'])
+            ).values()
+        ),
+        key=lambda item: (item['subject__name'], -item['count'])
+    )
     
     # Organize by subject with creator breakdown
     subject_breakdown = {}
@@ -723,9 +754,9 @@ def get_question_stats(request):
                 'totalQuestions': total_questions,
                 'activeQuestions': active_questions,
                 'inactiveQuestions': inactive_questions,
-                'totalMarks': overview['total_marks'] or 0,
-                'avgMarks': round(overview['avg_marks'], 2) if overview['avg_marks'] else 0,
-                'totalUsage': overview['total_usage'] or 0
+                'totalMarks': overview['total_marks'],
+                'avgMarks': overview['avg_marks'],
+                'totalUsage': overview['total_usage']
             },
             'bySubject': [
                 {
@@ -745,8 +776,8 @@ def get_question_stats(request):
 def generate_topic_printable_document(request, topic_id):
     """
     Generate printable HTML fragments for all questions in a topic.
-    This view processes full question and answer text through `_process_question_text`
-    so that graph tokens, image tokens and answer-line tokens are expanded into
+    This view processes full question and answer text through `render_question_fragment`
+    (api/fragment_cache.py) so that graph tokens, image tokens and answer-line tokens are expanded into
     HTML suitable for printing (matching the frontend `renderTextWithImages`).
 
     GET /api/questions/topic/<topic_id>/printable/
@@ -761,7 +792,7 @@ def generate_topic_printable_document(request, topic_id):
     # Load questions for the topic (only active ones by default)
     questions_qs = Question.objects.filter(topic=topic, is_active=True).order_by('id')
 
-    processed = []
+    sources = []
     for q in questions_qs:
         try:
             q_images_raw = q.question_inline_images or []
@@ -798,9 +829,31 @@ def generate_topic_printable_document(request, topic_id):
             else:
                 a_images.append({'id': len(a_images) + 1, 'url': img, 'name': f'Image {len(a_images) + 1}'})
 
+        sources.append({
+            'id': str(q.id),
+            'question': q,
+            'question_text': q.question_text or '',
+            'question_inline_images': q_images,
+            'question_answer_lines': q_lines,
+            'answer_text': q.answer_text or '',
+            'answer_inline_images': a_images,
+            'answer_answer_lines': a_lines,
+        })
+
+    # Load stored fragments of all questions in one query before rendering
+    prefetch_fragments(sources, kinds=('question', 'answer_printable'))
+
+    processed = []
+    for source in sources:
+        q = source['question']
+
         # Process question and answer text into HTML using shared template logic
-        processed_question_html = _process_question_text(q.question_text or '', images=q_images, answer_lines=q_lines)
-        processed_answer_html = _process_question_text(q.answer_text or '', images=a_images, answer_lines=a_lines)
+        processed_question_html = render_question_fragment(
+            source['question_text'], images=source['question_inline_images'], answer_lines=source['question_answer_lines']
+        )
+        processed_answer_html = render_question_fragment(
+            source['answer_text'], images=source['answer_inline_images'], answer_lines=source['answer_answer_lines']
+        )
 
         processed.append({
             'id': q.id,
@@ -808,9 +861,9 @@ def generate_topic_printable_document(request, topic_id):
             'marks': getattr(q, 'marks', None),
             'question_html': processed_question_html,
             'answer_html': processed_answer_html,
-            'question_inline_images': q_images,
+            'question_inline_images': public_images(source['question_inline_images']),
             'question_image_positions': getattr(q, 'question_image_positions', None) or {},
-            'question_answer_lines': q_lines,
+            'question_answer_lines': source['question_answer_lines'],
         })
 
     return success_response(
@@ -829,26 +882,29 @@ def get_creator_statistics(request):
     
     GET /api/questions/creator-statistics/
     
-    OPTIMIZED: Uses aggregation queries only. Separated from question list to prevent frontend freeze.
+    OPTIMIZED: Reads the materialized question_stats table (one query). Separated from question list to prevent frontend freeze.
     """
     
-    # Get all active questions with creator info
-    questions = Question.objects.filter(
-        is_active=True
-    ).select_related('created_by', 'subject')
+    # Active questions, from the materialized stats table (one query, see api/question_stats.py)
+    rows = load_stats(is_active=True)
     
-    total_questions = questions.count()
+    total_questions = total_stats(rows).total
     
     # Get all creators who have created questions
-    creator_stats = questions.values(
-        'created_by__id',
-        'created_by__full_name',
-        'created_by__phone_number'
-    ).annotate(
-        total_questions=Count('id')
-    ).order_by('-total_questions')
-    
-    total_creators = creator_stats.count()
+    creator_stats = sorted(
+        (
+            {
+                'created_by__id': group.row['created_by_id'],
+                'created_by__full_name': group.row['created_by__full_name'],
+                'created_by__phone_number': group.row['created_by__phone_number'],
+                'total_questions': group.total
+            }
+            for group in group_stats(rows, key=lambda row: row['created_by_id']).values()
+        ),
+        key=lambda item: -item['total_questions']
+    )
+    
+    total_creators = len(creator_stats)
     average_per_creator = round(total_questions / total_creators, 2) if total_creators > 0 else 0
     
     # Build top contributors list
@@ -870,14 +926,21 @@ def get_creator_statistics(request):
         })
     
     # Get subject breakdown per creator
-    creator_subject_breakdown = questions.values(
-        'created_by__id',
-        'created_by__full_name',
-        'subject__id',
-        'subject__name'
-    ).annotate(
-        count=Count('id')
-    ).order_by('created_by__full_name', 'subject__name')
+    creator_subject_breakdown = sorted(
+        (
+            {
+                'created_by__id': group.row['created_by_id'],
+                'created_by__full_name': group.row['created_by__full_name'],
+                'subject__id': group.row['subject_id'],
+                'subject__name': group.row['subject__name'],
+                'count': group.total
+            }
+            for group in group_stats(
+                rows, key=lambda row: (row['created_by_id'], row['subject_id'])
+            ).values()
+        ),
+        key=lambda item: (item['created_by__full_name'] or '', item['subject__name'])
+    )
     
     # Organize by creator
     creators_with_subjects = {}
@@ -908,13 +971,18 @@ def get_creator_statistics(request):
     )
     
     # Get questions by subject
-    questions_by_subject = questions.values(
-        'subject__id',
-        'subject__name'
-    ).annotate(
-        total_questions=Count('id'),
-        unique_creators=Count('created_by__id', distinct=True)
-    ).order_by('-total_questions')
+    questions_by_subject = sorted(
+        (
+            {
+                'subject__id': group.row['subject_id'],
+                'subject__name': group.row['subject__name'],
+                'total_questions': group.total,
+                'unique_creators': len(group.creators)
+            }
+            for group in group_stats(rows, key=lambda row: row['subject_id']).values()
+        ),
+        key=lambda item: -item['total_questions']
+    )
     
     subjects_summary = []
     for subject in questions_by_subject:
@@ -1022,6 +1090,140 @@ def set_question_mode(request, question_id):
 
 # ==================== PRINTABLE TOPIC DOCUMENT VIEW ====================
 
+# Questions read (and their fragments prefetched) per batch while streaming
+PRINTABLE_BATCH_SIZE = 50
+
+
+def _batched(iterable, size):
+    """Yield lists of up to `size` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _image_list(images, label):
+    """Inline images as dicts (plain URL strings are wrapped)"""
+    images_list = []
+    for img in images or []:
+        # Handle both dict objects and plain URL strings
+        if isinstance(img, dict):
+            images_list.append(img)
+        else:
+            images_list.append({
+                'id': len(images_list) + 1,
+                'url': img,
+                'name': f'{label} image {len(images_list) + 1}'
+            })
+    return images_list
+
+
+def _printable_source(question):
+    """
+    Fragment inputs of a question exactly as the printable document renders them
+
+    Used for both the batch prefetch and the render, so their fragment keys match
+    also for questions whose inline images are plain URL strings.
+    """
+    source = fragment_source(question)
+    source['question_inline_images'] = _image_list(question.question_inline_images, 'Question')
+    source['answer_inline_images'] = _image_list(question.answer_inline_images, 'Answer')
+    source['question_answer_lines'] = question.question_answer_lines or []
+    source['answer_answer_lines'] = question.answer_answer_lines or []
+    return source
+
+
+def _printable_question_html(question, source, number, topic_name, is_paper_level):
+    """HTML block of one question and its answer in the printable document"""
+    # Process question and answer text with all formatting (images, fractions, tables, etc.)
+    processed_question_text = render_question_fragment(
+        source['question_text'],
+        images=source['question_inline_images'],
+        answer_lines=source['question_answer_lines']
+    )
+    processed_answer_text = render_question_fragment(
+        source['answer_text'],
+        images=source['answer_inline_images'],
+        answer_lines=source['answer_answer_lines']
+    )
+    
+    html = f"""
+    <div class="question-container">
+        <div class="question-header">
+            <span class="question-number">Question {number}</span>
+            <div class="question-meta">
+                <span class="paper-badge">{question.paper.name}</span>"""
+    
+    # Show topic badge for paper-level documents
+    if is_paper_level:
+        html += f"""
+                <span class="topic-badge">{topic_name}</span>"""
+    
+    html += f"""
+                <span class="marks-badge">{question.marks} marks</span>
+            </div>
+        </div>
+        
+        <div class="question-section">
+            <div class="section-title">Question</div>
+            <div class="question-text">{processed_question_text}</div>
+        </div>
+        
+        <div class="answer-section">
+            <div class="section-title">Answer</div>
+            <div class="answer-text">{processed_answer_text}</div>
+        </div>
+    </div>
+"""
+    return html
+
+
+def _iter_printable_questions(questions, is_paper_level, topic_counts):
+    """
+    Yield the numbered question blocks of a printable document
+    
+    Questions are read with a server-side iterator and their stored fragments are
+    loaded one batch at a time, so memory stays flat however large the topic or paper.
+    Questions must be ordered by topic for the topic sections to be contiguous.
+    """
+    # Topic headers only for paper-level documents with multiple topics
+    with_sections = is_paper_level and len(topic_counts) > 1
+    current_topic = None
+    number = 0
+    
+    for batch in _batched(questions.iterator(chunk_size=PRINTABLE_BATCH_SIZE), PRINTABLE_BATCH_SIZE):
+        sources = [_printable_source(question) for question in batch]
+        prefetch_fragments(sources, kinds=('question', 'answer_printable'))
+        
+        for question, source in zip(batch, sources):
+            number += 1
+            topic_name = question.topic.name if question.topic else 'Uncategorized'
+            
+            if with_sections and topic_name != current_topic:
+                if current_topic is not None:
+                    yield """
+    </div>
+"""
+                current_topic = topic_name
+                yield f"""
+    <div class="topic-section">
+        <div class="topic-header">
+            <h2>{topic_name}</h2>
+            <div class="topic-count">{topic_counts.get(topic_name, 0)} question(s)</div>
+        </div>
+"""
+            
+            yield _printable_question_html(question, source, number, topic_name, is_paper_level)
+    
+    # Close the last topic section
+    if with_sections and current_topic is not None:
+        yield """
+    </div>
+"""
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def generate_topic_printable_document(request):
@@ -1103,22 +1305,11 @@ def generate_topic_printable_document(request):
                     status.HTTP_404_NOT_FOUND
                 )
             
-            # Group questions by topic
-            from collections import defaultdict
-            questions_by_topic = defaultdict(list)
-            question_number = 1
-            
-            for question in questions:
-                topic_name = question.topic.name if question.topic else 'Uncategorized'
-                questions_by_topic[topic_name].append({
-                    'number': question_number,
-                    'question': question,
-                    'paper_name': question.paper.name,
-                    'topic_name': topic_name,
-                    'section_name': question.section.name if question.section else None,
-                    'marks': question.marks,
-                })
-                question_number += 1
+            # Question count per topic (for the topic headers); questions are streamed below
+            topic_counts = {}
+            for row in questions.order_by().values('topic__name').annotate(count=Count('id')):
+                topic_name = row['topic__name'] or 'Uncategorized'
+                topic_counts[topic_name] = topic_counts.get(topic_name, 0) + row['count']
             
             document_title = f"{paper.name}"
             total_questions = questions.count()
@@ -1150,28 +1341,12 @@ def generate_topic_printable_document(request):
                     status.HTTP_404_NOT_FOUND
                 )
             
-            # Group as single topic
-            questions_by_topic = {
-                topic.name: [
-                    {
-                        'number': index,
-                        'question': question,
-                        'paper_name': question.paper.name,
-                        'topic_name': topic.name,
-                        'section_name': question.section.name if question.section else None,
-                        'marks': question.marks,
-                    }
-                    for index, question in enumerate(questions, start=1)
-                ]
-            }
-            
-            document_title = topic.name
-            total_questions = questions.count()
             document_title = topic.name
             total_questions = questions.count()
+            topic_counts = {topic.name: total_questions}
         
-        # Create HTML content
-        html_content = f"""
+        # Document head; the questions are streamed after it
+        head_html = f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1397,113 +1572,17 @@ def generate_topic_printable_document(request):
         Total Questions: {total_questions}
     </div>
 """
-        
-        # Add questions grouped by topic
-        for topic_name, questions_data in questions_by_topic.items():
-            # Add topic header only for paper-level documents with multiple topics
-            if is_paper_level and len(questions_by_topic) > 1:
-                html_content += f"""
-    <div class="topic-section">
-        <div class="topic-header">
-            <h2>{topic_name}</h2>
-            <div class="topic-count">{len(questions_data)} question(s)</div>
-        </div>
-"""
-            
-            # Add each question in this topic
-            for q_data in questions_data:
-                question = q_data['question']
-                
-                # Prepare images for question text processing
-                question_images_list = []
-                if question.question_inline_images:
-                    for img in question.question_inline_images:
-                        # Handle both dict objects and plain URL strings
-                        if isinstance(img, dict):
-                            # Already a dict with id, url, etc.
-                            question_images_list.append(img)
-                        else:
-                            # Plain URL string - create a dict
-                            question_images_list.append({
-                                'id': len(question_images_list) + 1,
-                                'url': img,
-                                'name': f'Question image {len(question_images_list) + 1}'
-                            })
-                
-                # Process question text with all formatting (images, fractions, tables, etc.)
-                processed_question_text = _process_question_text(
-                    question.question_text,
-                    images=question_images_list,
-                    answer_lines=question.question_answer_lines or []
-                )
-                
-                # Prepare images for answer text processing
-                answer_images_list = []
-                if question.answer_inline_images:
-                    for img in question.answer_inline_images:
-                        # Handle both dict objects and plain URL strings
-                        if isinstance(img, dict):
-                            # Already a dict with id, url, etc.
-                            answer_images_list.append(img)
-                        else:
-                            # Plain URL string - create a dict
-                            answer_images_list.append({
-                                'id': len(answer_images_list) + 1,
-                                'url': img,
-                                'name': f'Answer image {len(answer_images_list) + 1}'
-                            })
-                
-                # Process answer text with all formatting
-                processed_answer_text = _process_question_text(
-                    question.answer_text,
-                    images=answer_images_list,
-                    answer_lines=question.answer_answer_lines or []
-                )
-                
-                html_content += f"""
-    <div class="question-container">
-        <div class="question-header">
-            <span class="question-number">Question {q_data['number']}</span>
-            <div class="question-meta">
-                <span class="paper-badge">{q_data['paper_name']}</span>"""
-                
-                # Show topic badge for paper-level documents
-                if is_paper_level:
-                    html_content += f"""
-                <span class="topic-badge">{q_data['topic_name']}</span>"""
-                
-                html_content += f"""
-                <span class="marks-badge">{q_data['marks']} marks</span>
-            </div>
-        </div>
-        
-        <div class="question-section">
-            <div class="section-title">Question</div>
-            <div class="question-text">{processed_question_text}</div>
-        </div>
-        
-        <div class="answer-section">
-            <div class="section-title">Answer</div>
-            <div class="answer-text">{processed_answer_text}</div>
-        </div>
-    </div>
-"""
-            
-            # Close topic section for paper-level documents
-            if is_paper_level and len(questions_by_topic) > 1:
-                html_content += """
-    </div>
-"""
-        
-        # Close HTML
-        html_content += """
-</body>
-</html>
-"""
-        
-        # Return HTML response
+
+        # Stream the document: questions are read and rendered in batches
         filename_safe = document_title.replace(" ", "_").replace("/", "-")
-        response = HttpResponse(html_content, content_type='text/html')
+        response = StreamingHttpResponse(
+            itertools.chain(
+                [head_html],
+                _iter_printable_questions(questions, is_paper_level, topic_counts),
+                ["\n</body>\n</html>\n"]
+            ),
+            content_type='text/html'
+        )
         response['Content-Disposition'] = f'inline; filename="{filename_safe}_Questions_Answers.html"'
         
         logger.info(f"Generated printable document for {document_title} ({total_questions} questions)")
@@ -1545,145 +1624,81 @@ def question_statistics_only(request):
     """
     GET /api/questions/statistics-only/
     Returns aggregated statistics across ALL questions in the DB (no question objects).
-    Includes marks distribution per topic and paper.
+    Includes marks distribution per topic and paper. Grouped from the materialized
+    question_stats table in one query.
     """
     try:
-        queryset = Question.objects.all()
+        # All questions, from the materialized stats table (one query, see api/question_stats.py)
+        rows = load_stats()
+        totals = total_stats(rows)
 
         # Core counts
-        total_questions = queryset.count()
-        active_questions = queryset.filter(is_active=True).count()
-        inactive_questions = queryset.filter(is_active=False).count()
-        unknown_topics = queryset.filter(Q(topic__isnull=True) | Q(topic__name='')).count()
-
-        # Overview aggregates
-        overview = queryset.aggregate(
-            total_marks=Sum('marks'),
-            avg_marks=Avg('marks'),
-            total_usage=Sum('times_used')
-        )
+        total_questions = totals.total
+        active_questions = totals.active
+        inactive_questions = totals.inactive
+        unknown_topics = total_stats(row for row in rows if not row['topic__name']).total
 
         # ── Global marks distribution 
-        global_marks_qs = queryset.values('marks').annotate(
-            count=Count('id')
-        ).order_by('marks')
-
-        global_marks_distribution = [
-            {'marks': item['marks'], 'count': item['count']}
-            for item in global_marks_qs
-        ]
+        global_marks_distribution = totals.marks_distribution()
 
         # ── Breakdown by subject
-        by_subject_qs = queryset.values('subject__id', 'subject__name').annotate(
-            total=Count('id'),
-            active=Count('id', filter=Q(is_active=True)),
-            inactive=Count('id', filter=Q(is_active=False))
-        ).order_by('-total')
-
-        by_subject = [
-            {
-                'subjectId': str(item['subject__id']) if item['subject__id'] else None,
-                'subjectName': item['subject__name'] or 'Unknown',
-                'total': item['total'] or 0,
-                'active': item['active'] or 0,
-                'inactive': item['inactive'] or 0,
-            }
-            for item in by_subject_qs
-        ]
+        by_subject = sorted(
+            (
+                {
+                    'subjectId': str(group.row['subject_id']) if group.row['subject_id'] else None,
+                    'subjectName': group.row['subject__name'] or 'Unknown',
+                    'total': group.total,
+                    'active': group.active,
+                    'inactive': group.inactive,
+                }
+                for group in group_stats(rows, key=lambda row: row['subject_id']).values()
+            ),
+            key=lambda item: -item['total']
+        )
 
         # ── Breakdown by paper WITH marks distribution ─
-        # Step 1: core paper stats
-        by_paper_qs = queryset.values(
-            'subject__id', 'subject__name', 'paper__id', 'paper__name'
-        ).annotate(
-            total=Count('id'),
-            active=Count('id', filter=Q(is_active=True)),
-            inactive=Count('id', filter=Q(is_active=False)),
-            total_marks_sum=Sum('marks'),
-            avg_marks_val=Avg('marks'),
-        ).order_by('subject__name', '-total')
-
-        # Step 2: marks distribution per paper
-        paper_marks_qs = queryset.values('paper__id', 'marks').annotate(
-            count=Count('id')
-        ).order_by('paper__id', 'marks')
-
-        # Build a lookup: { paper_id: [ {marks, count}, ... ] }
-        paper_marks_lookup = {}
-        for row in paper_marks_qs:
-            pid = str(row['paper__id']) if row['paper__id'] else None
-            paper_marks_lookup.setdefault(pid, []).append({
-                'marks': row['marks'],
-                'count': row['count']
-            })
-
-        by_paper = [
-            {
-                'subjectId': str(item['subject__id']) if item['subject__id'] else None,
-                'subject': item['subject__name'] or 'Unknown',
-                'paperId': str(item['paper__id']) if item['paper__id'] else None,
-                'paper': item['paper__name'] or 'Unknown',
-                'total': item['total'] or 0,
-                'active': item['active'] or 0,
-                'inactive': item['inactive'] or 0,
-                'totalMarksSum': item['total_marks_sum'] or 0,
-                'avgMarks': float(round(item['avg_marks_val'], 2)) if item['avg_marks_val'] else 0,
-                # e.g. [{"marks": 2, "count": 30}, {"marks": 5, "count": 12}]
-                'marksDistribution': paper_marks_lookup.get(
-                    str(item['paper__id']) if item['paper__id'] else None, []
-                ),
-            }
-            for item in by_paper_qs
-        ]
+        by_paper = sorted(
+            (
+                {
+                    'subjectId': str(group.row['subject_id']) if group.row['subject_id'] else None,
+                    'subject': group.row['subject__name'] or 'Unknown',
+                    'paperId': str(group.row['paper_id']) if group.row['paper_id'] else None,
+                    'paper': group.row['paper__name'] or 'Unknown',
+                    'total': group.total,
+                    'active': group.active,
+                    'inactive': group.inactive,
+                    'totalMarksSum': group.marks_sum,
+                    'avgMarks': group.avg_marks,
+                    # e.g. [{"marks": 2, "count": 30}, {"marks": 5, "count": 12}]
+                    'marksDistribution': group.marks_distribution(),
+                }
+                for group in group_stats(rows, key=lambda row: row['paper_id']).values()
+            ),
+            key=lambda item: (item['subject'], -item['total'])
+        )
 
         # ── Breakdown by topic WITH marks distribution 
-        # Step 1: core topic stats
-        by_topic_qs = queryset.values(
-            'subject__id', 'subject__name',
-            'paper__id', 'paper__name',
-            'topic__id', 'topic__name'
-        ).annotate(
-            total=Count('id'),
-            active=Count('id', filter=Q(is_active=True)),
-            inactive=Count('id', filter=Q(is_active=False)),
-            total_marks_sum=Sum('marks'),
-            avg_marks_val=Avg('marks'),
-        ).order_by('-total')
-
-        # Step 2: marks distribution per topic
-        topic_marks_qs = queryset.values('topic__id', 'marks').annotate(
-            count=Count('id')
-        ).order_by('topic__id', 'marks')
-
-        # Build a lookup: { topic_id: [ {marks, count}, ... ] }
-        topic_marks_lookup = {}
-        for row in topic_marks_qs:
-            tid = str(row['topic__id']) if row['topic__id'] else None
-            topic_marks_lookup.setdefault(tid, []).append({
-                'marks': row['marks'],
-                'count': row['count']
-            })
-
-        by_topic = [
-            {
-                'subjectId': str(item['subject__id']) if item['subject__id'] else None,
-                'subject': item['subject__name'] or 'Unknown',
-                'paperId': str(item['paper__id']) if item['paper__id'] else None,
-                'paper': item['paper__name'] or 'Unknown',
-                'topicId': str(item['topic__id']) if item['topic__id'] else None,
-                'topicName': item['topic__name'] or 'Unknown',
-                'total': item['total'] or 0,
-                'active': item['active'] or 0,
-                'inactive': item['inactive'] or 0,
-                'totalMarksSum': item['total_marks_sum'] or 0,
-                'avgMarks': float(round(item['avg_marks_val'], 2)) if item['avg_marks_val'] else 0,
-                # e.g. [{"marks": 2, "count": 8}, {"marks": 10, "count": 3}]
-                'marksDistribution': topic_marks_lookup.get(
-                    str(item['topic__id']) if item['topic__id'] else None, []
-                ),
-            }
-            for item in by_topic_qs
-        ]
+        by_topic = sorted(
+            (
+                {
+                    'subjectId': str(group.row['subject_id']) if group.row['subject_id'] else None,
+                    'subject': group.row['subject__name'] or 'Unknown',
+                    'paperId': str(group.row['paper_id']) if group.row['paper_id'] else None,
+                    'paper': group.row['paper__name'] or 'Unknown',
+                    'topicId': str(group.row['topic_id']) if group.row['topic_id'] else None,
+                    'topicName': group.row['topic__name'] or 'Unknown',
+                    'total': group.total,
+                    'active': group.active,
+                    'inactive': group.inactive,
+                    'totalMarksSum': group.marks_sum,
+                    'avgMarks': group.avg_marks,
+                    # e.g. [{"marks": 2, "count": 8}, {"marks": 10, "count": 3}]
+                    'marksDistribution': group.marks_distribution(),
+                }
+                for group in group_stats(rows, key=lambda row: row['topic_id']).values()
+            ),
+            key=lambda item: -item['total']
+        )
 
         return Response({
             'success': True,
@@ -1696,9 +1711,9 @@ def question_statistics_only(request):
                     'totalQuestions': total_questions,
                     'activeQuestions': active_questions,
                     'inactiveQuestions': inactive_questions,
-                    'totalMarks': overview['total_marks'] or 0,
-                    'avgMarks': float(round(overview['avg_marks'], 2)) if overview['avg_marks'] else 0,
-                    'totalUsage': overview['total_usage'] or 0,
+                    'totalMarks': totals.marks_sum,
+                    'avgMarks': totals.avg_marks,
+                    'totalUsage': totals.usage_sum,
                     'marksDistribution': global_marks_distribution,
                 },
                 'bySubject': by_subject,
@@ -1725,7 +1740,11 @@ def questions_paginated(request):
     - topic: filter by topic UUID
     - section: filter by section UUID
     - isActive: filter by active status (true/false)
-    - search: search in question text
+    - search: search in question and answer text (ranked, best matches first)
+    - cursor: keyset pagination token instead of page (empty for the first page,
+      then next_cursor); 400 together with search, whose results are ranked
+    - count: total to compute: exact (default with page), cached (default with
+      cursor), estimate or none
     """
     try:
         # Get pagination parameters
@@ -1762,13 +1781,41 @@ def questions_paginated(request):
             queryset = queryset.filter(is_active=is_active_bool)
         
         search = request.GET.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(question_text__icontains=search) | Q(answer_text__icontains=search)
+        
+        # Keyset pagination: ?cursor= (empty for the first page), see api/question_pagination.py
+        if 'cursor' in request.GET and search:
+            # Search results are ordered by rank, which has no stable keyset
+            return Response(
+                {'success': False, 'error': 'cursor cannot be combined with search; use page instead'},
+                status=400
             )
+        if 'cursor' in request.GET:
+            try:
+                questions, pagination = cursor_page(
+                    queryset.select_related('subject', 'paper', 'topic', 'section', 'created_by'),
+                    request.GET,
+                    limit
+                )
+            except InvalidCursor as e:
+                return Response({'success': False, 'error': str(e)}, status=400)
+            
+            serializer = QuestionDetailSerializer(questions, many=True)
+            return Response({
+                'success': True,
+                'data': {
+                    'questions': serializer.data,
+                    'pagination': pagination
+                }
+            })
+        
+        queryset = queryset.order_by(*CURSOR_ORDERING)
+        
+        if search:
+            # Best matches first (full-text, substring and fuzzy, see api/question_search.py)
+            queryset = search_questions(queryset, search)
         
         # Get total count
-        total_count = queryset.count()
+        total_count = question_total(queryset, request.GET.get('count', 'exact'))
         
         # Calculate offset
         offset = (page - 1) * limit
@@ -1776,17 +1823,16 @@ def questions_paginated(request):
         # Get paginated results
         questions = queryset.select_related(
             'subject', 'paper', 'topic', 'section', 'created_by'
-        ).order_by('-created_at')[offset:offset + limit]
+        )[offset:offset + limit]
 
         serializer = QuestionDetailSerializer(questions, many=True)
         questions_data = serializer.data
         
         # Calculate pagination metadata
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
+        total_pages = (total_count + limit - 1) // limit if total_count is not None else None
+        has_next = page < total_pages if total_pages is not None else len(questions_data) == limit
         has_previous = page > 1
         
-        from rest_framework.response import Response
         return Response({
             'success': True,
             'data': {
@@ -1803,8 +1849,45 @@ def questions_paginated(request):
             }
         })
     except Exception as e:
-        from rest_framework.response import Response
         return Response({
             'success': False,
             'error': str(e)
         }, status=500)
+
+
+# ==================== STORED IMAGES ====================
+
+@require_GET
+def serve_stored_image(request, image_name):
+    """
+    Serve a question image from the content-addressed store
+    
+    GET /api/images/<sha256>.<ext>
+    
+    Plain Django view without JWT authentication, since <img> tags cannot send
+    the Authorization header; images are only reachable by their content hash.
+    The bytes behind a hash never change, so responses are cacheable for
+    IMAGE_CACHE_SECONDS and marked immutable.
+    """
+    sha256 = image_name.split('.', 1)[0].lower()
+    etag = f'"{sha256}"'
+    cache_control = f"public, max-age={getattr(settings, 'IMAGE_CACHE_SECONDS', 31536000)}, immutable"
+    
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
+    
+    image = load_image(sha256)
+    if image is None:
+        raise Http404('Image not found')
+    
+    content_type, data = image
+    response = HttpResponse(data, content_type=content_type)
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    # SVG may contain scripts; never let an image run in this origin
+    response['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'"
+    response['X-Content-Type-Options'] = 'nosniff'
+    return response
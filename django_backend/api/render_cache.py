@@ -0,0 +1,165 @@
+"""
+Rendered HTML Cache
+Process-level cache of rendered exam, marking scheme and coverpage HTML
+
+preview_full_exam?output=html and coverpage_data?output=html used to run the whole
+template pipeline (question text processing, SVG graphs, coverpage HTML) on every
+request. Rendered pages are now cached per:
+- generated paper id
+- view type ('questions', 'marking_scheme', 'coverpage')
+- hash of the coverpage data the page was rendered with
+- RENDER_TEMPLATE_VERSION (bump when templates change)
+- build time of the paper's question snapshot (see api/paper_snapshot.py)
+
+The snapshot build time changes whenever a referenced question is edited, so stale
+pages are never served even by processes that missed the invalidation. Entries are
+evicted least recently used once RENDER_CACHE_MAX_BYTES of HTML are held. Posting
+coverpage data or editing a question also drops the paper's entries right away.
+
+Pages rendered incrementally are served with streaming_html_response(), which can
+fill the cache while streaming. Only pages up to RENDER_CACHE_STREAM_MAX_BYTES are
+collected for that; larger documents are passed straight through, so a streamed
+response never holds more than that cap in memory.
+"""
+
+import hashlib
+import itertools
+import json
+import threading
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+
+# Bump whenever exam/marking scheme/coverpage templates change their output
+RENDER_TEMPLATE_VERSION = 3
+
+
+def content_hash(data) -> str:
+    """Stable hash of JSON-like data (dict key order does not matter)"""
+    encoded = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class RenderCache:
+    """Thread-safe LRU cache of rendered HTML, bounded by total size"""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> html
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _entry_size(html: str) -> int:
+        return len(html)
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return html
+
+    def set(self, key, html: str):
+        size = self._entry_size(html)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= self._entry_size(previous)
+            self._entries[key] = html
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= self._entry_size(evicted)
+
+    def invalidate_paper(self, generated_paper_id):
+        """Drop every rendered page of a generated paper"""
+        paper_key = str(generated_paper_id)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == paper_key]:
+                self._size -= self._entry_size(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+render_cache = RenderCache(
+    max_bytes=getattr(settings, 'RENDER_CACHE_MAX_BYTES', 32 * 1024 * 1024),
+)
+
+# Largest streamed page collected for the cache
+STREAM_CACHE_MAX_BYTES = getattr(settings, 'RENDER_CACHE_STREAM_MAX_BYTES', 1024 * 1024)
+
+
+def make_render_key(generated_paper, view_type: str, coverpage_data: dict) -> Tuple:
+    """Cache key of one rendered page of a generated paper"""
+    snapshot = getattr(generated_paper, 'snapshot', None) if view_type != 'coverpage' else None
+    snapshot_stamp = snapshot.created_at.isoformat() if snapshot is not None and snapshot.created_at else ''
+    return (
+        str(generated_paper.id),
+        view_type,
+        content_hash(coverpage_data),
+        RENDER_TEMPLATE_VERSION,
+        snapshot_stamp,
+    )
+
+
+def cache_stream(key, chunks: Iterable[str], max_bytes: Optional[int] = None) -> Iterator[str]:
+    """
+    Pass chunks through and cache the whole page once it is complete
+
+    Chunks are only collected while the page stays within max_bytes
+    (STREAM_CACHE_MAX_BYTES by default); past that the collected chunks are
+    dropped and the rest of the document is streamed without being held.
+    """
+    limit = min(max_bytes or STREAM_CACHE_MAX_BYTES, render_cache.max_bytes)
+    collected = []
+    size = 0
+    for chunk in chunks:
+        if collected is not None:
+            size += len(chunk)
+            if size > limit:
+                collected = None  # too large to cache, stop holding on to it
+            else:
+                collected.append(chunk)
+        yield chunk
+    if collected is not None:
+        render_cache.set(key, ''.join(collected))
+
+
+def streaming_html_response(chunks: Iterable[str], cache_key=None) -> StreamingHttpResponse:
+    """
+    Stream an HTML document from a chunk generator
+
+    The first chunk (document head) is rendered before the response is returned,
+    so setup errors still reach the view's error handling instead of cutting off
+    a response that has already started.
+    """
+    chunks = iter(chunks)
+    first_chunk = next(chunks, '')
+    chunks = itertools.chain([first_chunk], chunks)
+    if cache_key is not None:
+        chunks = cache_stream(cache_key, chunks)
+    return StreamingHttpResponse(chunks, content_type='text/html')
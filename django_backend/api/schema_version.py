@@ -0,0 +1,141 @@
+"""
+Database Schema Version
+Cheap check of whether the database has every migration of this build applied
+
+AutoMigrateMiddleware used to build a MigrationExecutor (importing every migration
+module and computing the full plan) inside the first request of every worker
+process, followed by a User count. Migrations now run outside the request path:
+- build.sh and post_deploy.py run `migrate` at deploy time, then `check_schema`
+- processes started with MIGRATE_ON_STARTUP (cPanel/Passenger, which has no deploy
+  hook) call startup_migrate() while the WSGI app loads; it only runs `migrate`
+  when the check finds pending migrations, under a Postgres advisory lock so
+  concurrently starting workers apply them once
+- /api/database/health reports schema_status(), cached for SCHEMA_CHECK_CACHE_SECONDS
+
+The check compares the migration file names shipped with each app (no migration
+module is imported) with the django_migrations table, which is one query.
+"""
+
+import logging
+import pkgutil
+import threading
+import time
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, FrozenSet, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+
+logger = logging.getLogger(__name__)
+
+
+# pg_advisory_lock key shared by every process applying migrations
+MIGRATION_LOCK_ID = 872301
+
+_status = None
+_status_checked_at = 0.0
+_status_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def shipped_migrations() -> FrozenSet[Tuple[str, str]]:
+    """(app label, migration name) of every migration file in this build"""
+    migrations = set()
+    for app_config in apps.get_app_configs():
+        module_name, _ = MigrationLoader.migrations_module(app_config.label)
+        if module_name is None:
+            continue
+        try:
+            spec = find_spec(module_name)
+        except (ImportError, ValueError):
+            continue
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for module in pkgutil.iter_modules(spec.submodule_search_locations):
+            # Same filter as Django's MigrationLoader
+            if not module.ispkg and module.name[0] not in '_~':
+                migrations.add((app_config.label, module.name))
+    return frozenset(migrations)
+
+
+def _latest(migrations, app_label: str) -> str:
+    names = [name for label, name in migrations if label == app_label]
+    return max(names) if names else ''
+
+
+def _check() -> Dict:
+    recorder = MigrationRecorder(connection)
+    applied = set(recorder.applied_migrations()) if recorder.has_table() else set()
+    shipped = shipped_migrations()
+    pending = sorted(shipped - applied)
+    return {
+        'schema_version': _latest(shipped, 'api'),
+        'applied_schema_version': _latest(applied, 'api'),
+        'pending_migrations': len(pending),
+        'pending': [f"{app_label}.{name}" for app_label, name in pending[:20]],
+    }
+
+
+def schema_status(refresh: bool = False) -> Dict:
+    """
+    Compare the shipped migrations with the applied ones (cached per process)
+
+    Returns:
+        Dict with schema_version (latest api migration of this build),
+        applied_schema_version, pending_migrations (count), pending (first 20)
+        and checked_seconds_ago
+    """
+    global _status, _status_checked_at
+
+    max_age = getattr(settings, 'SCHEMA_CHECK_CACHE_SECONDS', 60)
+    with _status_lock:
+        if refresh or _status is None or time.monotonic() - _status_checked_at > max_age:
+            _status = _check()
+            _status_checked_at = time.monotonic()
+        status = dict(_status)
+        status['checked_seconds_ago'] = round(time.monotonic() - _status_checked_at, 1)
+    return status
+
+
+def migrate_if_needed(verbosity: int = 0) -> bool:
+    """
+    Apply pending migrations, if the cheap check finds any
+
+    Returns:
+        True if `migrate` was run
+    """
+    if not schema_status(refresh=True)['pending_migrations']:
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_lock(%s)", [MIGRATION_LOCK_ID])
+    try:
+        # Another process may have applied them while this one waited for the lock
+        pending = schema_status(refresh=True)['pending_migrations']
+        if not pending:
+            return False
+        logger.warning(f"[MIGRATIONS] Applying {pending} pending migrations")
+        call_command('migrate', '--noinput', verbosity=verbosity)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [MIGRATION_LOCK_ID])
+
+    status = schema_status(refresh=True)
+    logger.info(f"[MIGRATIONS] Schema at {status['applied_schema_version']}")
+    return True
+
+
+def startup_migrate():
+    """Run migrate_if_needed() while a WSGI process starts, when MIGRATE_ON_STARTUP is set"""
+    if not getattr(settings, 'MIGRATE_ON_STARTUP', False):
+        return
+    try:
+        migrate_if_needed()
+    except Exception as e:
+        # Serve anyway; /api/database/health reports the pending migrations
+        logger.error(f"[MIGRATIONS] Startup migration failed: {e}")
@@ -5,6 +5,10 @@ Django REST Framework Serializers for Examination System
 import logging
 from rest_framework import serializers
 from .models import User, OTPLog, Subject, Paper, Topic, Section, Question
+from .image_store import INLINE_IMAGE_FIELDS, extract_question_images, public_images
+from .near_duplicates import store_question_signature
+from .question_pagination import count_cache
+from .question_pool import pool_cache
 
 logger = logging.getLogger(__name__)
 
@@ -471,7 +475,18 @@ class SubjectCreateSerializer(serializers.ModelSerializer):
 
 # ==================== QUESTION SERIALIZERS ====================
 
-class QuestionListSerializer(serializers.ModelSerializer):
+class PublicImagesMixin:
+    """Serve stored inline image paths with IMAGE_BASE_URL (rows keep them relative)"""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for field in INLINE_IMAGE_FIELDS:
+            if field in data:
+                data[field] = public_images(data[field])
+        return data
+
+
+class QuestionListSerializer(PublicImagesMixin, serializers.ModelSerializer):
     """Optimized serializer for listing questions - uses direct field access for 10x performance boost"""
     
     subject_name = serializers.CharField(source='subject.name', read_only=True)
@@ -516,7 +531,7 @@ class QuestionListLightweightSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'times_used']
 
 
-class QuestionDetailSerializer(serializers.ModelSerializer):
+class QuestionDetailSerializer(PublicImagesMixin, serializers.ModelSerializer):
     """Serializer for question detail view"""
     subject_name = serializers.SerializerMethodField()
     paper_name = serializers.SerializerMethodField()
@@ -554,7 +569,7 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'times_used', 'last_used']
 
 
-class QuestionCreateSerializer(serializers.ModelSerializer):
+class QuestionCreateSerializer(PublicImagesMixin, serializers.ModelSerializer):
     """Serializer for creating/updating questions"""
     
     is_graph = serializers.BooleanField(required=False, allow_null=True, default=False)
@@ -661,4 +676,19 @@ class QuestionBulkCreateSerializer(serializers.Serializer):
             for question_data in questions_data
         ]
         
-        return Question.objects.bulk_create(questions)
+        # bulk_create does not send pre_save either: store base64 images here
+        for question in questions:
+            extract_question_images(question)
+        
+        created = Question.objects.bulk_create(questions)
+        
+        # bulk_create does not send post_save, so drop cached pools explicitly
+        for paper_id in {q.paper_id for q in created}:
+            pool_cache.invalidate_paper(paper_id)
+        count_cache.clear()
+        
+        # ... and index the new questions for near-duplicate search
+        for question in created:
+            store_question_signature(question)
+        
+        return created
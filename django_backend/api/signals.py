@@ -0,0 +1,135 @@
+"""
+Signal handlers for the API app
+Connected in ApiConfig.ready()
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .models import GeneratedPaper, Question, Section, Topic
+from .fragment_cache import store_question_fragments
+from .image_store import INLINE_IMAGE_FIELDS, extract_question_images
+from .near_duplicates import store_question_signature
+from .paper_snapshot import invalidate_paper_snapshots, invalidate_question_snapshots, store_paper_snapshot
+from .question_pagination import count_cache
+from .question_pool import pool_cache
+from .render_cache import render_cache
+
+logger = logging.getLogger(__name__)
+
+# Question fields whose changes do not alter how a paper looks
+USAGE_FIELDS = {'times_used', 'last_used'}
+
+
+@receiver(pre_save, sender=Question)
+def extract_inline_images_on_save(sender, instance, update_fields=None, **kwargs):
+    """Keep base64 image data out of the question JSON (stored by content hash instead)"""
+    if update_fields and not set(update_fields) & set(INLINE_IMAGE_FIELDS):
+        return
+    try:
+        # Savepoint, so a failed image write never breaks the caller's transaction
+        with transaction.atomic():
+            extract_question_images(instance)
+    except Exception as e:
+        # Never fail a save over the image store; the data URLs still render
+        logger.warning(f"[IMAGES] Could not extract images of question {instance.id}: {str(e)}")
+
+
+@receiver(pre_save, sender=Question)
+@receiver(pre_save, sender=Topic)
+def remember_previous_paper(sender, instance, update_fields=None, **kwargs):
+    """Record the stored paper of a question or topic, so a move invalidates both papers"""
+    instance._previous_paper_id = None
+    if instance._state.adding:
+        return
+    if update_fields and not set(update_fields) & {'paper', 'paper_id'}:
+        return
+    instance._previous_paper_id = sender.objects.filter(pk=instance.pk).values_list('paper_id', flat=True).first()
+
+
+def _invalidate_pools_of(instance):
+    pool_cache.invalidate_paper(instance.paper_id)
+    previous_paper_id = getattr(instance, '_previous_paper_id', None)
+    if previous_paper_id is not None and previous_paper_id != instance.paper_id:
+        pool_cache.invalidate_paper(previous_paper_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_pool_for_question(sender, instance, **kwargs):
+    """Drop cached question pools of the paper this question belongs to (and the one it left)"""
+    _invalidate_pools_of(instance)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question_counts(sender, instance, update_fields=None, **kwargs):
+    """Drop cached listing totals of this process"""
+    if update_fields and set(update_fields) <= USAGE_FIELDS:
+        return
+    count_cache.clear()
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def invalidate_question_pool_for_topic(sender, instance, **kwargs):
+    """Drop cached question pools of the paper this topic belongs to (and the one it left)"""
+    _invalidate_pools_of(instance)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_snapshots_for_question(sender, instance, update_fields=None, **kwargs):
+    """Drop snapshots and rendered pages of generated papers that contain this question"""
+    if update_fields and set(update_fields) <= USAGE_FIELDS:
+        return
+    for generated_paper_id in invalidate_question_snapshots(instance.id):
+        render_cache.invalidate_paper(generated_paper_id)
+
+
+@receiver(post_save, sender=Question)
+def refresh_question_fragments(sender, instance, update_fields=None, **kwargs):
+    """Re-render the question's cached HTML fragments"""
+    if update_fields and set(update_fields) <= USAGE_FIELDS:
+        return
+    try:
+        store_question_fragments(instance)
+    except Exception as e:
+        # Never fail a save over the cache; fragments are rendered on demand
+        logger.warning(f"[FRAGMENTS] Could not render fragments of question {instance.id}: {str(e)}")
+
+
+@receiver(post_save, sender=Question)
+def refresh_question_signature(sender, instance, update_fields=None, **kwargs):
+    """Recompute the near-duplicate signature when the question text may have changed"""
+    if update_fields and 'question_text' not in update_fields:
+        return
+    try:
+        store_question_signature(instance)
+    except Exception as e:
+        # Never fail a save over the index; build_question_signatures catches up
+        logger.warning(f"[SIGNATURES] Could not index question {instance.id}: {str(e)}")
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Section)
+def invalidate_snapshots_for_paper(sender, instance, created=False, **kwargs):
+    """Topic and section names are part of the snapshot"""
+    if not created:
+        for generated_paper_id in invalidate_paper_snapshots(instance.paper_id):
+            render_cache.invalidate_paper(generated_paper_id)
+
+
+@receiver(post_save, sender=GeneratedPaper)
+def snapshot_new_generated_paper(sender, instance, created, **kwargs):
+    """Materialize the snapshot once, right after generation"""
+    if not created:
+        return
+    try:
+        store_paper_snapshot(instance)
+    except Exception as e:
+        # Never fail a generation over the snapshot; it is rebuilt on first read
+        logger.warning(f"[SNAPSHOT] Could not snapshot {instance.unique_code}: {str(e)}")
@@ -0,0 +1,86 @@
+"""
+Startup Timing Report
+Where a cold start spends its time before the first response
+
+Serverless cold starts (vercel_app.py) and Passenger restarts
+(passenger_wsgi_simple.py -> examination_system/wsgi.py) pay for Django setup and
+every module imported before the first request is answered. The WSGI entry points
+time their phases with `phase()` and print one report to stderr:
+- duration of each phase (settings and app registry, URLconf) and the total
+- number of api modules imported, and whether the big coverpage templates were
+- lazily resolved modules (api/lazy_registry.py) that are still unloaded
+
+Disable with STARTUP_TIMING_REPORT=False. The module only uses the standard
+library, so it can be imported before Django is configured.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Set when this module is first imported, i.e. at the top of the entry point
+_started = time.perf_counter()
+_phases = []  # (name, seconds)
+
+
+def enabled() -> bool:
+    return os.getenv('STARTUP_TIMING_REPORT', 'True') == 'True'
+
+
+@contextmanager
+def phase(name: str):
+    """Time one startup phase"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - started))
+
+
+def warm_urlconf():
+    """
+    Import the URL modules during startup instead of in the first request
+    
+    Errors are only printed: the first request raises them again through the
+    normal error handling.
+    """
+    try:
+        with phase('URLconf'):
+            from django.urls import get_resolver
+            get_resolver().url_patterns
+    except Exception as e:
+        print(f"✗ URLconf import failed: {type(e).__name__}: {str(e)}", file=sys.stderr)
+
+
+def report(stream=None) -> dict:
+    """Print the startup timing report (if enabled) and return it as a dict"""
+    total = time.perf_counter() - _started
+    api_modules = sorted(name for name in sys.modules if name.startswith('api.'))
+
+    try:
+        from api.lazy_registry import pending_modules
+        deferred = pending_modules()
+    except Exception:
+        deferred = []
+
+    data = {
+        'total_seconds': round(total, 3),
+        'phases': [{'name': name, 'seconds': round(seconds, 3)} for name, seconds in _phases],
+        'api_modules_loaded': len(api_modules),
+        'coverpage_templates_loaded': 'api.coverpage_templates' in sys.modules,
+        'deferred_modules': deferred,
+    }
+
+    if enabled():
+        stream = stream or sys.stderr
+        print("-" * 80, file=stream)
+        print(f"STARTUP TIMING: {total * 1000:.0f} ms since entry point import", file=stream)
+        for name, seconds in _phases:
+            print(f"  {name:<32} {seconds * 1000:8.0f} ms", file=stream)
+        print(f"  api modules loaded: {len(api_modules)}"
+              f" (coverpage templates: {'yes' if data['coverpage_templates_loaded'] else 'no'})", file=stream)
+        print(f"  deferred until first use: {len(deferred)} modules", file=stream)
+        print("-" * 80, file=stream)
+
+    return data
@@ -0,0 +1,134 @@
+"""
+Tests for the exact mark-sum solver (api/mark_solver.py)
+
+The solver is pure Python, so these run without a database:
+    python -m pytest api/tests/test_mark_solver.py
+"""
+
+import random
+import time
+import unittest
+from collections import Counter
+
+from api.mark_solver import InfeasibleSelectionError, SectionSpec, solve_section, solve_sections
+
+
+class FakeQuestion:
+    def __init__(self, marks, label=''):
+        self.marks = marks
+        self.label = label
+
+    def __repr__(self):
+        return f"FakeQuestion({self.marks}, {self.label!r})"
+
+
+def random_pool(size, mark_values, seed=1):
+    rng = random.Random(seed)
+    return [FakeQuestion(rng.choice(mark_values), str(i)) for i in range(size)]
+
+
+class ExactTotalTests(unittest.TestCase):
+
+    def test_single_section_hits_exact_total(self):
+        pool = random_pool(60, [1, 2, 3])
+        for seed in range(20):
+            selected = solve_sections(
+                [SectionSpec('standalone', pool, min_questions=1)],
+                total_marks=40,
+                rng=random.Random(seed),
+            )['standalone']
+            self.assertEqual(sum(q.marks for q in selected), 40)
+            self.assertEqual(len(set(map(id, selected))), len(selected))
+            self.assertTrue(all(q in pool for q in selected))
+
+    def test_sections_share_the_exact_total(self):
+        nested = random_pool(30, [4, 5, 6, 7, 8], seed=2)
+        standalone = random_pool(60, [1, 2, 3], seed=3)
+        for seed in range(20):
+            selection = solve_sections([
+                SectionSpec('nested', nested, min_questions=2, max_questions=6),
+                SectionSpec('standalone', standalone, min_questions=5),
+            ], total_marks=80, rng=random.Random(seed))
+            nested_marks = sum(q.marks for q in selection['nested'])
+            standalone_marks = sum(q.marks for q in selection['standalone'])
+            self.assertEqual(nested_marks + standalone_marks, 80)
+            self.assertTrue(2 <= len(selection['nested']) <= 6)
+            self.assertGreaterEqual(len(selection['standalone']), 5)
+
+    def test_mark_counts_are_exact(self):
+        # Physics Paper 1 Section A: 4x1 + 6x2 + 3x3 = 25 marks
+        pool = random_pool(80, [1, 2, 3])
+        selected = solve_section(SectionSpec(
+            'section_a', pool, min_questions=13, max_questions=13,
+            min_marks=25, max_marks=25,
+            mark_counts={1: (4, 4), 2: (6, 6), 3: (3, 3)},
+        ), rng=random.Random(5))
+        self.assertEqual(Counter(q.marks for q in selected), {1: 4, 2: 6, 3: 3})
+
+    def test_draws_are_uniform(self):
+        # Four valid papers of 3 marks: one 1-mark question and one 2-mark question
+        pool = [FakeQuestion(1, 'a'), FakeQuestion(1, 'b'), FakeQuestion(2, 'c'), FakeQuestion(2, 'd')]
+        rng = random.Random(7)
+        seen = Counter()
+        for _ in range(4000):
+            selected = solve_sections([SectionSpec('s', pool)], total_marks=3, rng=rng)['s']
+            seen[''.join(sorted(q.label for q in selected))] += 1
+        self.assertEqual(set(seen), {'ac', 'ad', 'bc', 'bd'})
+        for count in seen.values():
+            self.assertTrue(800 <= count <= 1200, seen)
+
+
+class InfeasibleTests(unittest.TestCase):
+
+    def test_unreachable_total(self):
+        pool = [FakeQuestion(3, str(i)) for i in range(20)]
+        with self.assertRaises(InfeasibleSelectionError):
+            solve_sections([SectionSpec('standalone', pool)], total_marks=10)
+
+    def test_pool_too_small_for_total(self):
+        pool = [FakeQuestion(2, str(i)) for i in range(5)]
+        with self.assertRaises(InfeasibleSelectionError):
+            solve_sections([SectionSpec('standalone', pool)], total_marks=12)
+
+    def test_missing_required_mark_value(self):
+        pool = [FakeQuestion(1, str(i)) for i in range(10)]
+        with self.assertRaises(InfeasibleSelectionError):
+            solve_section(SectionSpec('section_a', pool, mark_counts={3: (1, 1)}))
+
+    def test_question_count_out_of_range(self):
+        pool = [FakeQuestion(5, str(i)) for i in range(10)]
+        with self.assertRaises(InfeasibleSelectionError):
+            solve_sections([SectionSpec('s', pool, min_questions=3, max_questions=3)], total_marks=20)
+
+
+class LargePoolTests(unittest.TestCase):
+
+    def test_large_standalone_pool_stays_fast(self):
+        # Tables are bounded by the paper total, not by the pool sum
+        for size in (800, 3000):
+            pool = random_pool(size, [1, 2, 3], seed=size)
+            started = time.monotonic()
+            selected = solve_sections(
+                [SectionSpec('standalone', pool, min_questions=1)],
+                total_marks=80,
+                rng=random.Random(size),
+            )['standalone']
+            elapsed = time.monotonic() - started
+            self.assertEqual(sum(q.marks for q in selected), 80)
+            self.assertLess(elapsed, 2.0, f"{size} questions took {elapsed:.2f}s")
+
+    def test_large_pool_with_sections(self):
+        nested = random_pool(500, [2, 3, 4, 5, 6, 7, 8], seed=11)
+        standalone = random_pool(1500, [1, 2, 3], seed=12)
+        started = time.monotonic()
+        selection = solve_sections([
+            SectionSpec('nested', nested, min_questions=1, max_questions=6),
+            SectionSpec('standalone', standalone, min_questions=1),
+        ], total_marks=80, rng=random.Random(3))
+        self.assertLess(time.monotonic() - started, 2.0)
+        total = sum(q.marks for questions in selection.values() for q in questions)
+        self.assertEqual(total, 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Tests for the MinHash/LSH helpers of the near-duplicate search (api/near_duplicates.py)
+
+No database access; run with the project settings:
+    python manage.py test api.tests.test_near_duplicates
+"""
+
+from django.test import SimpleTestCase
+
+from api.near_duplicates import (
+    BANDS, NUM_PERMUTATIONS, SHINGLE_SIZE, band_buckets, estimate_jaccard, minhash,
+    normalize_text, shingles, text_hash,
+)
+
+
+ORIGINAL = "Describe the process of photosynthesis in green plants and name its products."
+EDITED = "Describe the process of photosynthesis in green plants and name two of its products."
+UNRELATED = "Calculate the resistance of a wire carrying a current of 2 amperes at 12 volts."
+
+
+def signature(text):
+    return minhash(shingles(normalize_text(text)))
+
+
+class NormalizeTextTests(SimpleTestCase):
+
+    def test_lowercases_and_drops_punctuation(self):
+        self.assertEqual(normalize_text("What IS  photosynthesis?!"), "what is photosynthesis")
+
+    def test_drops_placeholders(self):
+        text = "Study the diagram [IMAGE:3] below. [LINES:4] Name part A [GRAPH:10x8]"
+        self.assertEqual(normalize_text(text), "study the diagram below name part a")
+
+    def test_text_hash_ignores_formatting(self):
+        self.assertEqual(text_hash("Name  the organelle."), text_hash("name the ORGANELLE"))
+        self.assertNotEqual(text_hash("Name the organelle"), text_hash("Name the organ"))
+
+
+class ShingleTests(SimpleTestCase):
+
+    def test_one_shingle_per_position(self):
+        text = "abcdefgh"
+        self.assertEqual(len(shingles(text)), len(text) - SHINGLE_SIZE + 1)
+
+    def test_short_and_empty_text(self):
+        self.assertEqual(len(shingles("abc")), 1)
+        self.assertEqual(shingles(""), set())
+
+
+class MinHashTests(SimpleTestCase):
+
+    def test_signature_length_and_determinism(self):
+        first = signature(ORIGINAL)
+        self.assertEqual(len(first), NUM_PERMUTATIONS)
+        self.assertEqual(first, signature(ORIGINAL))
+
+    def test_empty_set_has_no_signature(self):
+        self.assertEqual(minhash([]), [])
+
+    def test_estimate_tracks_jaccard(self):
+        self.assertEqual(estimate_jaccard(signature(ORIGINAL), signature(ORIGINAL)), 1.0)
+        edited = estimate_jaccard(signature(ORIGINAL), signature(EDITED))
+        unrelated = estimate_jaccard(signature(ORIGINAL), signature(UNRELATED))
+        self.assertGreater(edited, 0.5)
+        self.assertLess(unrelated, 0.2)
+
+    def test_estimate_of_mismatched_signatures_is_zero(self):
+        self.assertEqual(estimate_jaccard([], []), 0.0)
+        self.assertEqual(estimate_jaccard([1, 2], [1, 2, 3]), 0.0)
+
+
+class BandBucketTests(SimpleTestCase):
+
+    def test_one_signed_64_bit_bucket_per_band(self):
+        buckets = band_buckets(signature(ORIGINAL))
+        self.assertEqual(len(buckets), BANDS)
+        for bucket in buckets:
+            self.assertTrue(-2 ** 63 <= bucket < 2 ** 63)
+
+    def test_similar_texts_share_a_bucket(self):
+        shared = set(band_buckets(signature(ORIGINAL))) & set(band_buckets(signature(EDITED)))
+        self.assertTrue(shared)
+
+    def test_equal_rows_in_different_bands_do_not_collide(self):
+        buckets = band_buckets([7] * NUM_PERMUTATIONS)
+        self.assertEqual(len(set(buckets)), BANDS)
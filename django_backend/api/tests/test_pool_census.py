@@ -0,0 +1,63 @@
+"""
+Tests for the in-memory filters of the question pool census (api/pool_census.py)
+
+No database access; run with the project settings:
+    python manage.py test api.tests.test_pool_census
+"""
+
+from django.test import SimpleTestCase
+
+from api.pool_census import CensusKey, PoolCensus, in_section
+
+
+def key(topic, marks, section=None, section_name='', nested=False, graph=False, map_=False):
+    return CensusKey(
+        topic_id=topic, section_id=section, section_name=section_name,
+        is_nested=nested, marks=marks, is_graph=graph, is_map=map_,
+    )
+
+
+CENSUS = PoolCensus({
+    key('t1', 1, 's1', 'SECTION A'): 10,
+    key('t1', 2, 's1', 'SECTION A'): 4,
+    key('t1', 8, 's2', 'SECTION B', nested=True, graph=True): 2,
+    key('t2', 1, 's1', 'SECTION A'): 6,
+    key('t2', 3, 's2', 'SECTION B', nested=True): 3,
+})
+
+
+class CountTests(SimpleTestCase):
+
+    def test_without_filters_counts_everything(self):
+        self.assertEqual(CENSUS.count(), 25)
+
+    def test_filters_combine(self):
+        self.assertEqual(CENSUS.count(topics=['t1']), 16)
+        self.assertEqual(CENSUS.count(nested=True), 5)
+        self.assertEqual(CENSUS.count(topics=['t2'], nested=False), 6)
+        self.assertEqual(CENSUS.count(sections=['s2'], marks=8), 2)
+
+    def test_marks_value_collection_and_range(self):
+        self.assertEqual(CENSUS.count(marks=1), 16)
+        self.assertEqual(CENSUS.count(marks=[2, 3]), 7)
+        self.assertEqual(CENSUS.count(min_marks=2, max_marks=3), 7)
+
+    def test_where_predicate(self):
+        self.assertEqual(CENSUS.count(where=lambda k: k.is_graph), 2)
+        self.assertEqual(CENSUS.count(where=in_section('SECTION B')), 5)
+
+    def test_topic_ids_are_compared_as_strings(self):
+        census = PoolCensus({key('42', 1): 3})
+        self.assertEqual(census.count(topics=[42]), 3)
+
+
+class GroupingTests(SimpleTestCase):
+
+    def test_by_marks(self):
+        self.assertEqual(CENSUS.by_marks(), {1: 16, 2: 4, 3: 3, 8: 2})
+        self.assertEqual(CENSUS.by_marks(nested=False), {1: 16, 2: 4})
+
+    def test_by_topic(self):
+        self.assertEqual(CENSUS.by_topic(), {'t1': 16, 't2': 9})
+        self.assertEqual(CENSUS.by_topic(marks=1), {'t1': 10, 't2': 6})
+        self.assertEqual(CENSUS.by_topic(topics=['t3']), {})
@@ -0,0 +1,49 @@
+"""
+Tests for the keyset cursor tokens of the question listing (api/question_pagination.py)
+
+No database access; run with the project settings:
+    python manage.py test api.tests.test_question_pagination
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from api.question_pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+class CursorTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        question = SimpleNamespace(
+            created_at=datetime(2026, 3, 14, 9, 26, 53, 589793, tzinfo=timezone.utc),
+            id=uuid.uuid4(),
+        )
+        self.assertEqual(decode_cursor(encode_cursor(question)), (question.created_at, question.id))
+
+    def test_token_is_url_safe_without_padding(self):
+        question = SimpleNamespace(created_at=datetime(2026, 1, 1, tzinfo=timezone.utc), id=uuid.uuid4())
+        token = encode_cursor(question)
+        self.assertNotIn('=', token)
+        self.assertFalse(set(token) & set('+/'))
+
+    def test_invalid_tokens(self):
+        def token(value):
+            return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii')
+
+        bad_tokens = [
+            'not a cursor!',
+            'e30',  # {}
+            token(['2026-01-01T00:00:00', 'not-a-uuid']),
+            token(['yesterday', str(uuid.uuid4())]),
+            token(['2026-01-01T00:00:00']),
+            token(5),
+        ]
+        for bad in bad_tokens:
+            with self.subTest(token=bad):
+                with self.assertRaises(InvalidCursor):
+                    decode_cursor(bad)
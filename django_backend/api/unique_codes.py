@@ -0,0 +1,68 @@
+"""
+GeneratedPaper Unique Codes
+Race-free allocation of `<PREFIX>-<YEAR>-<NNN>` codes for generated papers
+
+Codes used to be computed as "papers of this paper this year + 1", which cost a
+COUNT per generation and handed the same code to concurrent generations. The next
+number now comes from a UniqueCodeCounter row per (prefix, year), incremented under
+`SELECT ... FOR UPDATE`. The counter is keyed by prefix rather than paper because
+the code itself does not contain the paper: two papers sharing a prefix must draw
+from the same sequence to stay unique.
+
+A counter created for the first time is seeded from the highest existing code with
+the same prefix and year, so codes issued by the old scheme are never reused.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from django.db import transaction
+
+from .models import GeneratedPaper, UniqueCodeCounter
+
+
+def format_unique_code(prefix: str, year: int, number: int) -> str:
+    return f"{prefix}-{year}-{number:03d}"
+
+
+def _highest_existing_number(prefix: str, year: int) -> int:
+    """Highest sequence number already used by a code with this prefix and year"""
+    code_start = f"{prefix}-{year}-"
+    highest = 0
+    for code in GeneratedPaper.objects.filter(unique_code__startswith=code_start).values_list('unique_code', flat=True):
+        suffix = code[len(code_start):]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest
+
+
+def allocate_unique_codes(prefix: str, count: int, year: Optional[int] = None) -> List[str]:
+    """
+    Reserve `count` consecutive unique codes for one prefix
+
+    Args:
+        prefix: Subject/paper prefix, e.g. 'PHY1' or 'BI'
+        count: Number of codes to reserve (e.g. one per batch variant)
+        year: Year part of the code (defaults to the current year)
+
+    Returns:
+        List of codes in ascending order
+    """
+    year = year or datetime.now().year
+
+    with transaction.atomic():
+        counter, _ = UniqueCodeCounter.objects.select_for_update().get_or_create(
+            prefix=prefix,
+            year=year,
+            defaults={'last_value': lambda: _highest_existing_number(prefix, year)}
+        )
+        first = counter.last_value + 1
+        counter.last_value += count
+        counter.save(update_fields=['last_value'])
+
+    return [format_unique_code(prefix, year, number) for number in range(first, first + count)]
+
+
+def allocate_unique_code(prefix: str, year: Optional[int] = None) -> str:
+    """Reserve the next unique code for a prefix"""
+    return allocate_unique_codes(prefix, 1, year)[0]
@@ -1,8 +1,9 @@
 from django.urls import path
 from django.http import JsonResponse
-from . import auth_views, physics_paper_generation, subject_views, question_views, database_views, paper_generation_views, georaphy_paper_generator,kiswahili_paper_generator, business_paper_generator,cre_paper_generator,agriculture_paper_generator
+from . import auth_views, subject_views, question_views, database_views, paper_generation_views
+from .lazy_registry import lazy_view
 
-from . import biology_paper2_generation
+# Subject generator modules are imported on their first request (see api/lazy_registry.py)
 
 
 # test route to check API status
@@ -80,12 +81,17 @@ urlpatterns = [
     path('questions/stats/overview', question_views.get_question_stats, name='question-stats'),
     path('questions/creator-statistics/', question_views.get_creator_statistics, name='creator-statistics'),
     
+    # QUESTION IMAGES (content-addressed, long-lived cache)
+    path('images/<str:image_name>', question_views.serve_stored_image, name='stored-image'),
+    
     # TOPIC PRINTABLE DOCUMENT ROUTE
     path('topics/printable-document', question_views.generate_topic_printable_document, name='topic-printable-document'),
     
     # PAPER GENERATION ROUTES 
     # KCSE Biology Paper 1 generation endpoints
     path('papers/generate', paper_generation_views.generate_paper, name='generate-paper'),
+    path('papers/generate/batch', paper_generation_views.generate_paper_batch, name='generate-paper-batch'),
+    path('papers/jobs/<uuid:job_id>', paper_generation_views.get_generation_job, name='get-generation-job'),
     path('papers/generated', paper_generation_views.list_generated_papers, name='list-generated-papers'),
     path('papers/generated/<uuid:paper_id>', paper_generation_views.get_generated_paper, name='get-generated-paper'),
     path('papers/generated/<uuid:paper_id>/view/', paper_generation_views.view_full_paper, name='view-full-paper'),
@@ -100,12 +106,12 @@ urlpatterns = [
     
     # BIOLOGY PAPER 2 GENERATION ROUTES 
     # KCSE Biology Paper 2 specific generation endpoints
-    path('papers/biology-paper2/validate', biology_paper2_generation.validate_paper2_pool, name='validate-paper2-pool'),
-    path('papers/biology-paper2/generate', biology_paper2_generation.generate_biology_paper2, name='generate-biology-paper2'),
+    path('papers/biology-paper2/validate', lazy_view('api.biology_paper2_generation.validate_paper2_pool'), name='validate-paper2-pool'),
+    path('papers/biology-paper2/generate', lazy_view('api.biology_paper2_generation.generate_biology_paper2'), name='generate-biology-paper2'),
     
     # PHYSICS GENERATION ROUTES 
-    path('papers/physics-paper/validate', physics_paper_generation.validate_physics_paper_pool, name='validate-physics-paper'),
-    path('papers/physics-paper/generate', physics_paper_generation.generate_physics_paper, name='generate-physics-paper'),
+    path('papers/physics-paper/validate', lazy_view('api.physics_paper_generation.validate_physics_paper_pool'), name='validate-physics-paper'),
+    path('papers/physics-paper/generate', lazy_view('api.physics_paper_generation.generate_physics_paper'), name='generate-physics-paper'),
 
 
     # CHEMISTRY GENERATION ROUTES 
@@ -117,28 +123,28 @@ urlpatterns = [
     path('papers/mathematics-paper/validate', paper_generation_views.validate_mathematics_paper_pool, name='validate-mathematics-paper'),
     path('papers/mathematics-paper/generate', paper_generation_views.generate_mathematics_paper, name='generate-mathematics-paper'),
     # GEOGRAPHY GENERATION ROUTES 
-    path('papers/geography-paper/validate', georaphy_paper_generator.validate_geography_paper_pool, name='validate-geography-paper'),
-    path('papers/geography-paper/generate', georaphy_paper_generator.generate_geography_paper, name='generate-geography-paper'),
+    path('papers/geography-paper/validate', lazy_view('api.georaphy_paper_generator.validate_geography_paper_pool'), name='validate-geography-paper'),
+    path('papers/geography-paper/generate', lazy_view('api.georaphy_paper_generator.generate_geography_paper'), name='generate-geography-paper'),
 
     # ENGLISH GENERATION ROUTES 
     path('papers/english-paper/validate', paper_generation_views.validate_english_paper_pool, name='validate-english-paper'),
     path('papers/english-paper/generate', paper_generation_views.generate_english_paper, name='generate-english-paper'),
     
     # KISWAHILI GENERATION ROUTES 
-    path('papers/kiswahili-paper/validate', kiswahili_paper_generator.validate_kiswahili_paper_pool, name='validate-kiswahili-paper'),
-    path('papers/kiswahili-paper/generate', kiswahili_paper_generator.generate_kiswahili_paper, name='generate-kiswahili-paper'),
+    path('papers/kiswahili-paper/validate', lazy_view('api.kiswahili_paper_generator.validate_kiswahili_paper_pool'), name='validate-kiswahili-paper'),
+    path('papers/kiswahili-paper/generate', lazy_view('api.kiswahili_paper_generator.generate_kiswahili_paper'), name='generate-kiswahili-paper'),
     
     # BUSINESS STUDIES GENERATION ROUTES 
-    path('papers/business-paper/validate', business_paper_generator.validate_business_paper_pool, name='validate-business-paper'),
-    path('papers/business-paper/generate', business_paper_generator.generate_business_paper, name='generate-business-paper'),
+    path('papers/business-paper/validate', lazy_view('api.business_paper_generator.validate_business_paper_pool'), name='validate-business-paper'),
+    path('papers/business-paper/generate', lazy_view('api.business_paper_generator.generate_business_paper'), name='generate-business-paper'),
     
     # CHRISTIAN RELIGIOUS EDUCATION GENERATION ROUTES 
-    path('papers/cre-paper/validate', cre_paper_generator.validate_cre_paper_pool, name='validate-cre-paper'),
-    path('papers/cre-paper/generate', cre_paper_generator.generate_cre_paper, name='generate-cre-paper'),
+    path('papers/cre-paper/validate', lazy_view('api.cre_paper_generator.validate_cre_paper_pool'), name='validate-cre-paper'),
+    path('papers/cre-paper/generate', lazy_view('api.cre_paper_generator.generate_cre_paper'), name='generate-cre-paper'),
     
     # AGRICULTURE GENERATION ROUTES 
-    path('papers/agriculture-paper/validate', agriculture_paper_generator.validate_agriculture_paper_pool, name='validate-agriculture-paper'),
-    path('papers/agriculture-paper/generate', agriculture_paper_generator.generate_agriculture_paper, name='generate-agriculture-paper'),
+    path('papers/agriculture-paper/validate', lazy_view('api.agriculture_paper_generator.validate_agriculture_paper_pool'), name='validate-agriculture-paper'),
+    path('papers/agriculture-paper/generate', lazy_view('api.agriculture_paper_generator.generate_agriculture_paper'), name='generate-agriculture-paper'),
 ]
 
 
@@ -125,3 +125,24 @@ def error_response(message, errors=None, status=400):
         response_data['errors'] = errors
     
     return Response(response_data, status=status)
+
+
+def format_time_allocation(minutes):
+    """
+    Convert time in minutes to human-readable hours format
+    
+    Args:
+        minutes (int): Time in minutes
+    
+    Returns:
+        str: Formatted time string (e.g., "2 hours", "1 hour 30 minutes", "45 minutes")
+    """
+    if minutes >= 60:
+        hours = minutes // 60
+        remaining_minutes = minutes % 60
+        if remaining_minutes == 0:
+            return f"{hours} {'HOUR' if hours == 1 else 'HOURS'}"
+        else:
+            return f"{hours} {'HOUR' if hours == 1 else 'HOURS'} {remaining_minutes} MINUTES"
+    else:
+        return f"{minutes} MINUTES"
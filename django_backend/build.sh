@@ -22,6 +22,12 @@ python manage.py migrate --noinput --settings=examination_system.settings_produc
 
 echo "==================== MIGRATIONS COMPLETED SUCCESSFULLY ===================="
 
+# Fail the build if the database still misses a migration of this build
+python manage.py check_schema --settings=examination_system.settings_production || {
+    echo "ERROR: Database schema does not match this build."
+    exit 1
+}
+
 # Create default admin and editor users
 echo "==================== CREATING DEFAULT USERS ===================="
 python manage.py create_default_users --settings=examination_system.settings_production || {
@@ -29,4 +35,17 @@ python manage.py create_default_users --settings=examination_system.settings_pro
 }
 
 echo "==================== DEFAULT USERS SETUP COMPLETED ===================="
+
+# Move base64 question images into the image store (idempotent)
+echo "==================== EXTRACTING INLINE IMAGES ===================="
+python manage.py extract_inline_images --settings=examination_system.settings_production || {
+    echo "WARNING: Failed to extract inline images, but continuing..."
+}
+
+# Index questions for near-duplicate search (idempotent)
+echo "==================== BUILDING QUESTION SIGNATURES ===================="
+python manage.py build_question_signatures --settings=examination_system.settings_production || {
+    echo "WARNING: Failed to build question signatures, but continuing..."
+}
+
 echo "==================== BUILD SCRIPT COMPLETED ===================="
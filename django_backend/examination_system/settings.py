@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Question search lookups (pg_trgm, full-text)
     
     # Third-party apps
     'rest_framework',
@@ -232,6 +233,34 @@ MAX_SYSTEM_MESSAGES_PER_MINUTE = int(os.getenv('MAX_SYSTEM_MESSAGES_PER_MINUTE',
 MESSAGE_MAX_LENGTH = int(os.getenv('MESSAGE_MAX_LENGTH', '5000'))
 SMS_MAX_LENGTH = int(os.getenv('SMS_MAX_LENGTH', '160'))
 
+# Paper Generation - in-process question pool snapshot cache
+QUESTION_POOL_CACHE_TTL = int(os.getenv('QUESTION_POOL_CACHE_TTL', '300'))  # seconds
+QUESTION_POOL_CACHE_SIZE = int(os.getenv('QUESTION_POOL_CACHE_SIZE', '64'))  # snapshots per process
+
+# Paper Generation - background jobs (requires `manage.py run_generation_jobs` to be running)
+GENERATION_JOBS_ENABLED = os.getenv('GENERATION_JOBS_ENABLED', 'False') == 'True'
+GENERATION_JOB_POOL_THRESHOLD = int(os.getenv('GENERATION_JOB_POOL_THRESHOLD', '400'))  # active questions
+GENERATION_JOB_LEASE_SECONDS = int(os.getenv('GENERATION_JOB_LEASE_SECONDS', '900'))  # running jobs older than this are requeued
+GENERATION_JOB_MAX_ATTEMPTS = int(os.getenv('GENERATION_JOB_MAX_ATTEMPTS', '3'))  # claims before a job is failed
+
+# Paper previews - in-process rendered HTML cache
+RENDER_CACHE_MAX_BYTES = int(os.getenv('RENDER_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # per process
+RENDER_CACHE_STREAM_MAX_BYTES = int(os.getenv('RENDER_CACHE_STREAM_MAX_BYTES', str(1024 * 1024)))  # larger streamed pages are not cached
+FRAGMENT_CACHE_MAX_BYTES = int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))  # per-question HTML, per process
+
+# Question images - content-addressed store served from /api/images/<sha256>.<ext>
+# Origin added to stored image paths when they are served or rendered (rows keep paths relative)
+IMAGE_BASE_URL = os.getenv('IMAGE_BASE_URL', 'http://localhost:8000' if DEBUG else '').rstrip('/')
+IMAGE_CACHE_SECONDS = int(os.getenv('IMAGE_CACHE_SECONDS', str(365 * 24 * 60 * 60)))
+
+# Question listing - keyset pagination totals (?count=cached)
+QUESTION_COUNT_CACHE_SECONDS = int(os.getenv('QUESTION_COUNT_CACHE_SECONDS', '60'))  # per process
+
+# Database migrations - applied at deploy time (build.sh / post_deploy.py), not in requests
+MIGRATE_ON_STARTUP = os.getenv('MIGRATE_ON_STARTUP', 'False') == 'True'  # apply pending ones when a WSGI process starts
+AUTO_MIGRATE_ON_REQUEST = os.getenv('AUTO_MIGRATE_ON_REQUEST', 'False') == 'True'  # legacy first-request check
+SCHEMA_CHECK_CACHE_SECONDS = int(os.getenv('SCHEMA_CHECK_CACHE_SECONDS', '60'))  # /api/database/health
+
 # Logging Configuration
 LOGGING = {
     'version': 1,
@@ -39,7 +39,7 @@ if ENVIRONMENT == 'vercel':
         print(f"✗ Failed to import dj_database_url: {e}", file=sys.stderr)
         raise
     
-    # Add auto-migration middleware for Vercel
+    # Migrations run in build.sh; the middleware is only active with AUTO_MIGRATE_ON_REQUEST=True
     MIDDLEWARE = ['api.middleware.AutoMigrateMiddleware'] + MIDDLEWARE
     
     ALLOWED_HOSTS = ['.vercel.app', 'examination-s3np.vercel.app']
@@ -72,7 +72,9 @@ if ENVIRONMENT == 'vercel':
 elif ENVIRONMENT == 'cpanel':
     # cPanel production environment
     
-    # Add auto-migration middleware for cPanel
+    # cPanel deploys have no build step: pending migrations are applied when the
+    # Passenger process starts instead of in its first request
+    MIGRATE_ON_STARTUP = os.getenv('MIGRATE_ON_STARTUP', 'True') == 'True'
     MIDDLEWARE = ['api.middleware.AutoMigrateMiddleware'] + MIDDLEWARE
     
     ALLOWED_HOSTS = ['speedstarexams.co.ke', '51.91.24.182', 'www.speedstarexams.co.ke']
@@ -13,11 +13,18 @@ import sys
 # Add the project directory to the Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
+from api import startup_timing
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'examination_system.settings')
 
-application = get_wsgi_application()
+with startup_timing.phase('settings + app registry'):
+    application = get_wsgi_application()
+startup_timing.warm_urlconf()
+with startup_timing.phase('migration check'):
+    from api.schema_version import startup_migrate
+    startup_migrate()
+startup_timing.report()
 
 # Vercel compatibility
 app = application
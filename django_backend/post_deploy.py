@@ -44,6 +44,20 @@ def run_migrations():
         print(f"\n✗ Migration failed: {e}\n")
         return False
 
+def verify_schema():
+    """Verify that every migration of this build is applied"""
+    try:
+        from api.schema_version import schema_status
+        schema = schema_status(refresh=True)
+        if schema['pending_migrations']:
+            print(f"✗ {schema['pending_migrations']} migrations still pending: {', '.join(schema['pending'])}")
+            return False
+        print(f"✓ Schema up-to-date at {schema['applied_schema_version']}")
+        return True
+    except Exception as e:
+        print(f"✗ Schema verification failed: {e}")
+        return False
+
 def verify_tables():
     """Verify that required tables exist"""
     try:
@@ -72,7 +86,12 @@ def main():
         print("\n⚠️  WARNING: Migrations failed!")
         sys.exit(1)
     
-    # Step 3: Verify tables
+    # Step 3: Verify schema version
+    if not verify_schema():
+        print("\n⚠️  WARNING: Schema verification failed!")
+        sys.exit(1)
+    
+    # Step 4: Verify tables
     if not verify_tables():
         print("\n⚠️  WARNING: Table verification failed!")
         sys.exit(1)
@@ -19,6 +19,9 @@ sys.path.insert(0, os.path.dirname(__file__))
 # Set Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'examination_system.settings_production')
 
+# Starts the cold start clock (standard library only, safe before Django setup)
+from api import startup_timing
+
 # Minimal placeholder WSGI app so Vercel can statically detect a top-level `app`
 def _vercel_placeholder_app(environ, start_response):
     start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
@@ -77,7 +80,12 @@ try:
     from django.core.wsgi import get_wsgi_application
     
     print("Initializing Django WSGI application...", file=sys.stderr)
-    django_application = get_wsgi_application()
+    with startup_timing.phase('settings + app registry'):
+        django_application = get_wsgi_application()
+    startup_timing.warm_urlconf()
+    with startup_timing.phase('migration check'):
+        from api.schema_version import startup_migrate
+        startup_migrate()
     
     # Wrap with error handler
     application = ErrorCatchingWSGI(django_application)
@@ -85,6 +93,7 @@ try:
     
     print("✓ Django initialized successfully!", file=sys.stderr)
     print("=" * 80, file=sys.stderr)
+    startup_timing.report()
     
 except Exception as e:
     # Print detailed error for debugging
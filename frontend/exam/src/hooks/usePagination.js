@@ -15,6 +15,8 @@ export function usePagination() {
     const hasNextRef = useRef(false);
     const lastReturnedRef = useRef(0);
     const dbTotalRef = useRef(0);
+    // Cursor of each page reached so far (page 1: ''); search results are paged by number
+    const cursorsRef = useRef({ 1: '' });
 
 
     const abortControllerRef = useRef(null);
@@ -38,6 +40,9 @@ export function usePagination() {
         if (filtersChanged && abortControllerRef.current) {
             abortControllerRef.current.abort();
         }
+        if (filtersChanged) {
+            cursorsRef.current = { 1: '' };
+        }
         lastFiltersRef.current = filterKey;
 
         const controller = new AbortController();
@@ -48,8 +53,9 @@ export function usePagination() {
             inFlightRef.current = true;
             setIsLoadingMore(true);
 
+            const cursor = filters.search ? undefined : cursorsRef.current[targetPage];
             const params = {
-                page: targetPage,
+                ...(cursor !== undefined ? { cursor } : { page: targetPage }),
                 limit: 50,
                 ...filters,
             };
@@ -64,6 +70,9 @@ export function usePagination() {
             const pagination = result?.pagination || {};
 
             hasNextRef.current = !!pagination.has_next;
+            if (pagination.next_cursor) {
+                cursorsRef.current[targetPage + 1] = pagination.next_cursor;
+            }
             lastReturnedRef.current = questions.length;
 
             const serverTotal = Number(pagination.total || 0);
@@ -139,6 +148,7 @@ export function usePagination() {
         currentPageRef.current = 0;
         inFlightRef.current = false;
         paginatedRef.current = [];
+        cursorsRef.current = { 1: '' };
 
         fetchPage(1, filters, false);
     }, [fetchPage]);
@@ -89,7 +89,9 @@ export const getPaginatedQuestions = async (filters = {}, signal = null) => {
     try {
         const params = new URLSearchParams();
 
-        if (filters.page) params.append('page', filters.page);
+        // Keyset pagination: a cursor ('' for the first page) replaces the page number
+        if (filters.cursor !== undefined && filters.cursor !== null) params.append('cursor', filters.cursor);
+        else if (filters.page) params.append('page', filters.page);
         params.append('limit', filters.limit || 50);
 
         if (filters.subject) params.append('subject', filters.subject);
@@ -8,5 +8,8 @@ sys.path.insert(0, '/home/zbhxqeap/public_html/api')
 # Set Django settings
 os.environ['DJANGO_SETTINGS_MODULE'] = 'examination_system.settings_production'
 
+# Start the startup timing clock before Django is imported (report printed by wsgi.py)
+from api import startup_timing
+
 # Import application
 from examination_system.wsgi import application